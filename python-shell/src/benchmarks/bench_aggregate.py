@@ -0,0 +1,88 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Measures the rate at which a stream of edges is aggregated by a
+GroupByAggregator, with a limited number of aggregated edges held in memory
+and the rest spilled to disk, and with every aggregated edge in memory.
+
+Run from the src directory with:
+
+python3 -m benchmarks.bench_aggregate [number of elements] [number of keys]
+"""
+
+import resource
+import sys
+import time
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_aggregate
+from gafferpy import gaffer_compact
+
+BINARY_OPERATOR = 'uk.gov.gchq.koryphe.impl.binaryoperator.'
+
+AGGREGATE = g.Aggregate(edges=[g.AggregatePair(
+    group='RoadUse',
+    element_aggregator=g.ElementAggregateDefinition(operators=[
+        g.BinaryOperatorContext(
+            selection=[name],
+            binary_operator=g.BinaryOperator(BINARY_OPERATOR + operator))
+        for name, operator in [('count', 'Sum'), ('maxSpeed', 'Max'),
+                               ('minSpeed', 'Min')]
+    ] + [g.BinaryOperatorContext(
+        selection=['vehicles'],
+        binary_operator=g.BinaryOperator(
+            'uk.gov.gchq.gaffer.types.function.FreqMapAggregator'))]))])
+
+VEHICLES = ['car', 'bus', 'lorry', 'van']
+
+
+def elements(num_elements, num_keys):
+    for i in range(num_elements):
+        key = (i * 7919) % num_keys
+        yield gaffer_compact.CompactEdge(
+            'RoadUse', key, key + 1, True, {
+                'count': {'java.lang.Long': 1},
+                'maxSpeed': i % 70,
+                'minSpeed': i % 70,
+                'vehicles': {'uk.gov.gchq.gaffer.types.FreqMap': {
+                    VEHICLES[i % len(VEHICLES)]: 1}}
+            })
+
+
+def run(num_elements, num_keys, max_entries):
+    start = time.perf_counter()
+    aggregator = gaffer_aggregate.GroupByAggregator(AGGREGATE, max_entries)
+    aggregator.update(elements(num_elements, num_keys))
+    count = sum(1 for element in aggregator.results())
+    duration = time.perf_counter() - start
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    assert count == num_keys
+    print('  max entries %-9s %7.2f s %9.0f elements/s %7.1f MB max RSS, '
+          '%d spills' % (max_entries, duration, num_elements / duration,
+                         max_rss / 1024, aggregator.spills))
+
+
+def main(num_elements=20000000, num_keys=1000000):
+    print('Aggregating ' + str(num_elements) + ' edges into ' +
+          str(num_keys) + ' keys')
+    # The bounded run goes first as the max RSS never decreases
+    run(num_elements, num_keys, num_keys // 10)
+    run(num_elements, num_keys, None)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
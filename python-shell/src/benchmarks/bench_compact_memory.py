@@ -0,0 +1,80 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Measures the memory used per element when a GetElements response is decoded
+into standard and compact elements.
+
+Run from the src directory with:
+
+python3 -m benchmarks.bench_compact_memory [number of elements]
+"""
+
+import gc
+import json
+import sys
+import tracemalloc
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_compact
+
+
+def response_text(num_elements, with_properties):
+    elements = []
+    for i in range(num_elements):
+        properties = None
+        if with_properties:
+            properties = {'count': {'java.lang.Long': i}}
+        if i % 10 == 0:
+            elements.append(g.Entity(
+                'junction', i, properties).to_json())
+        else:
+            elements.append(g.Edge(
+                'road', i, i + 1, True, properties,
+                matched_vertex='SOURCE').to_json())
+    return json.dumps(elements)
+
+
+def measure(text, object_hook):
+    gc.collect()
+    tracemalloc.start()
+    elements = json.loads(text, object_hook=object_hook)
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elements, size
+
+
+def main(num_elements=100000):
+    for with_properties in [False, True]:
+        text = response_text(num_elements, with_properties)
+        print('Decoding ' + str(num_elements) + ' elements ' +
+              ('with' if with_properties else 'without') + ' properties')
+
+        results = {}
+        for name, object_hook in [
+                ('standard', g.JsonConverter.object_decoder),
+                ('compact', gaffer_compact.object_decoder)]:
+            elements, size = measure(text, object_hook)
+            results[name] = size / num_elements
+            print('  %-10s %8.1f bytes per element' % (name, results[name]))
+            del elements
+
+        print('  compact elements use %.1f%% of the memory' % (
+            100 * results['compact'] / results['standard']))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
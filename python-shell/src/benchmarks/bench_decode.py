@@ -0,0 +1,71 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Measures how many elements per second a GetElements response is decoded at.
+
+Run from the src directory with:
+
+python3 -m benchmarks.bench_decode [number of elements]
+"""
+
+import io
+import json
+import sys
+import time
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_compact
+from gafferpy import gaffer_connector
+from gafferpy import gaffer_json_stream
+
+
+def response_text(num_elements):
+    return json.dumps([
+        g.Edge('road', 'v' + str(i), 'v' + str(i + 1), True,
+               {'count': {'java.lang.Long': i}},
+               matched_vertex='SOURCE').to_json()
+        for i in range(num_elements)])
+
+
+def run(name, num_elements, decode):
+    start_time = time.perf_counter()
+    decode()
+    duration = time.perf_counter() - start_time
+    print('%-30s %10.0f elements per second' % (
+        name, num_elements / duration))
+
+
+def main(num_elements=1000000):
+    text = response_text(num_elements)
+    body = text.encode('utf-8')
+    print('Decoding ' + str(num_elements) + ' edges')
+
+    run('json.loads only', num_elements, lambda: json.loads(text))
+    run('result_from_json', num_elements,
+        lambda: gaffer_connector.result_from_json(text))
+    run('JsonConverter.from_json', num_elements,
+        lambda: g.JsonConverter.from_json(json.loads(text)))
+    run('streamed', num_elements, lambda: list(
+        gaffer_json_stream.iter_json_array(
+            io.BytesIO(body),
+            object_hook=g.JsonConverter.object_decoder)))
+    run('compact', num_elements,
+        lambda: json.loads(text, object_hook=gaffer_compact.object_decoder))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,88 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Compares the latency percentiles of small GetElements calls with and
+without a HedgingPolicy, against a local stub of the REST API where a few
+requests are much slower than the rest.
+
+Run from the src directory with:
+
+python3 -m benchmarks.bench_hedge [requests] [slow percent] [slow ms]
+"""
+
+import random
+import sys
+import threading
+import time
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_connector
+from gafferpy import gaffer_hedge
+from test.gaffer_stub_server import GafferStubServer
+
+FAST_DELAY = 0.002
+
+
+def routes(slow_percent, slow_delay):
+    generator = random.Random(0)
+    lock = threading.Lock()
+
+    def get_elements(body, headers):
+        with lock:
+            slow = generator.random() * 100 < slow_percent
+        time.sleep(slow_delay if slow else FAST_DELAY)
+        return [{'class': g.Entity.CLASS, 'group': 'Junction',
+                 'vertex': 'M5'}]
+    return {('POST', '/graph/operations/execute'): get_elements}
+
+
+def percentile(latencies, percent):
+    return latencies[min(int(len(latencies) * percent / 100),
+                         len(latencies) - 1)]
+
+
+def run(name, num_requests, slow_percent, slow_delay, hedging_policy):
+    with GafferStubServer(routes(slow_percent, slow_delay)) as server:
+        connector = gaffer_connector.GafferConnector(
+            server.host, hedging_policy=hedging_policy)
+        operation = g.GetElements(input=[g.EntitySeed('M5')])
+        latencies = []
+        for i in range(num_requests):
+            start = time.perf_counter()
+            connector.execute_operation(operation)
+            latencies.append(time.perf_counter() - start)
+        connector.close()
+        num_sent = len(server.requests)
+    latencies.sort()
+    print('  %-8s p50 %6.1f ms  p99 %6.1f ms  p99.9 %6.1f ms  %5d requests '
+          'sent' % (name, percentile(latencies, 50) * 1000,
+                    percentile(latencies, 99) * 1000,
+                    percentile(latencies, 99.9) * 1000, num_sent))
+
+
+def main(num_requests=2000, slow_percent=2, slow_ms=100):
+    print('%d requests, %d%% taking %d ms' % (num_requests, slow_percent,
+                                               slow_ms))
+    run('plain', num_requests, slow_percent, slow_ms / 1000, None)
+    policy = gaffer_hedge.HedgingPolicy()
+    run('hedged', num_requests, slow_percent, slow_ms / 1000, policy)
+    policy.close()
+    print('  ' + str(policy.get_metrics()))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,67 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Measures the cold start cost of importing gafferpy. Each statement is timed
+in a new python process, after json has been imported, and the best of
+several runs is reported.
+
+Run from the src directory with:
+
+python3 -m benchmarks.bench_import [number of runs]
+"""
+
+import os
+import subprocess
+import sys
+
+STATEMENTS = [
+    'from gafferpy import gaffer as g',
+    'from gafferpy import gaffer as g; g.GetElements',
+    'from gafferpy import gaffer as g; '
+    'g.JsonConverter.from_json(\'{"class": "uk.gov.gchq.gaffer.operation.'
+    'impl.get.GetElements"}\')',
+    'from gafferpy import gaffer as g; g.conf',
+    'from gafferpy import gaffer_connector'
+]
+
+_TIMER = 'import json, time\n' \
+         'start_time = time.perf_counter()\n' \
+         '{}\n' \
+         'print(time.perf_counter() - start_time)\n'
+
+
+def time_statement(statement, runs):
+    durations = []
+    for i in range(runs):
+        output = subprocess.check_output(
+            [sys.executable, '-W', 'ignore', '-c',
+             _TIMER.format(statement)], cwd=os.getcwd())
+        durations.append(float(output))
+    return min(durations)
+
+
+def main(runs=20):
+    # Compile every module first so that each run reads the bytecode cache
+    time_statement('; '.join(STATEMENTS), 1)
+    print('Best of %d runs' % runs)
+    for statement in STATEMENTS:
+        duration = time_statement(statement, runs)
+        print('%8.1f ms  %s' % (duration * 1000, statement))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
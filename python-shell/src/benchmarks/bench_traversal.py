@@ -0,0 +1,115 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Compares the requests sent and elements received by a Traversal with a
+loop running a batched GetElements for the end of every walk at each hop,
+against a local stub of the REST API serving a random graph.
+
+Run from the src directory with:
+
+python3 -m benchmarks.bench_traversal [vertices] [degree] [hops] [seeds]
+"""
+
+import json
+import random
+import sys
+import time
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_batch
+from gafferpy import gaffer_connector
+from gafferpy import gaffer_traversal
+from test.gaffer_stub_server import GafferStubServer
+
+BATCH_SIZE = 1000
+
+
+def random_graph(num_vertices, degree):
+    generator = random.Random(0)
+    return {vertex: generator.sample(range(num_vertices), degree)
+            for vertex in range(num_vertices)}
+
+
+def routes(graph, received):
+    def get_elements(body, headers):
+        operation = json.loads(body)
+        if 'operations' in operation:
+            operation = operation['operations'][0]
+        results = []
+        for seed in operation['input']:
+            source = seed['vertex']
+            for destination in graph[source]:
+                results.append({'class': g.Edge.CLASS, 'group': 'Road',
+                                'source': source,
+                                'destination': destination,
+                                'directed': True,
+                                'matchedVertex': 'SOURCE'})
+        received.append(len(results))
+        return results
+    return {('POST', '/graph/operations/execute'): get_elements}
+
+
+def naive_walks(connector, hop, seeds, num_hops):
+    """
+    Expands the end of every walk at every hop, without deduplicating.
+    """
+    walks = [(seed,) for seed in seeds]
+    for hop_number in range(num_hops):
+        operation = gaffer_batch.with_input(
+            hop, [g.EntitySeed(walk[-1]) for walk in walks])
+        adjacent = {}
+        for results in connector.stream_batched(operation, BATCH_SIZE):
+            for edge in results:
+                # Vertices queried more than once return their edges again
+                adjacent.setdefault(edge.source, {})[edge.destination] = None
+        walks = [walk + (vertex,) for walk in walks
+                 for vertex in adjacent.get(walk[-1], {})]
+    return len(walks)
+
+
+def run(name, graph, walk):
+    received = []
+    with GafferStubServer(routes(graph, received)) as server:
+        connector = gaffer_connector.GafferConnector(server.host,
+                                                     pooled=True)
+        start = time.perf_counter()
+        num_walks = walk(connector)
+        duration = time.perf_counter() - start
+        connector.close()
+        print('  %-10s %8d walks %5d requests %9d elements received '
+              '%7.2f s' % (name, num_walks, len(server.requests),
+                           sum(received), duration))
+
+
+def main(num_vertices=2000, degree=10, num_hops=3, num_seeds=50):
+    graph = random_graph(num_vertices, degree)
+    seeds = list(range(num_seeds))
+    hop = g.GetElements(view=g.View(edges=[g.ElementDefinition('Road')]),
+                        include_incoming_out_going='OUTGOING')
+    print('%d hops from %d seeds over %d vertices with degree %d' % (
+        num_hops, num_seeds, num_vertices, degree))
+
+    run('naive', graph, lambda connector: naive_walks(
+        connector, hop, seeds, num_hops))
+    run('traversal', graph, lambda connector: sum(
+        1 for walk in gaffer_traversal.Traversal(
+            connector, [hop] * num_hops,
+            batch_size=BATCH_SIZE).stream(seeds)))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,110 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Compares filtering the rows of an ElementBatch with NumPy masks against
+evaluating the same predicates one row at a time with gaffer_local.
+
+Run from the src directory with:
+
+python3 -m benchmarks.bench_vectorised_filter [number of rows]
+"""
+
+import sys
+import time
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_element_batch
+from gafferpy import gaffer_local
+from gafferpy import gaffer_vectorised
+
+ROADS = ['M1', 'M4', 'M5', 'M32', 'A4', 'A38', 'B3130']
+
+DAY = 24 * 60 * 60 * 1000
+START_TIME = 1546300800000
+
+CONTEXTS = [
+    g.PredicateContext(
+        selection=['count'],
+        predicate=g.And(predicates=[g.IsMoreThan(100),
+                                    g.Not(g.IsMoreThan(900))])),
+    g.PredicateContext(
+        selection=['speed'],
+        predicate=g.Or(predicates=[g.InRange(start=30.0, end=50.0),
+                                   g.IsMoreThan(65.0)])),
+    g.PredicateContext(selection=['road'],
+                       predicate=g.IsIn(['M1', 'M4', 'M5', 'A4'])),
+    g.PredicateContext(selection=['road'], predicate=g.Regex('M[0-9]+')),
+    g.PredicateContext(selection=['time'],
+                       predicate=g.InDateRange(start='2019/01/02',
+                                               end='2019/01/30'))
+]
+
+
+def elements(num_rows):
+    for i in range(num_rows):
+        yield {
+            'class': g.Edge.CLASS,
+            'group': 'RoadUse',
+            'source': i,
+            'destination': i + 1,
+            'directed': True,
+            'properties': {
+                'count': {'java.lang.Long': (i * 7919) % 1000},
+                'speed': float((i * 31) % 80),
+                'road': ROADS[i % len(ROADS)],
+                'time': {'java.util.Date': START_TIME + (i % 40) * DAY}
+            }
+        }
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main(num_rows=10000000):
+    print('Building a batch of ' + str(num_rows) + ' rows')
+    batch = gaffer_element_batch.ElementBatch.from_elements(
+        elements(num_rows))
+    columns = gaffer_vectorised.BatchColumns(batch)
+    # The unwrapped values used by both methods are read up front
+    rows = [columns.rows(name) for name in ('count', 'speed', 'road', 'time')]
+    tests = [(gaffer_local.compile_predicate(context.predicate), index)
+             for context, index in zip(CONTEXTS, [0, 1, 2, 2, 3])]
+
+    def row_wise():
+        return [all(test(rows[index][row]) for test, index in tests)
+                for row in range(num_rows)]
+
+    expected, row_time = timed(row_wise)
+    print('  row wise               %8.2f s' % row_time)
+
+    mask, first_time = timed(lambda: gaffer_vectorised.predicate_mask(
+        columns, CONTEXTS))
+    print('  vectorised, converting %8.2f s' % first_time)
+    mask, vectorised_time = timed(lambda: gaffer_vectorised.predicate_mask(
+        columns, CONTEXTS))
+    print('  vectorised, converted  %8.2f s' % vectorised_time)
+
+    assert mask.tolist() == expected
+    print('  %d rows passed, %.1fx faster (%.1fx including conversion)' % (
+        mask.sum(), row_time / vectorised_time, row_time / first_time))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
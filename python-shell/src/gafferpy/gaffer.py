@@ -31,7 +31,7 @@ g.op.X()
 g.pred.X()
 
 
-Specifically the imports are done as follows:
+The components behave as if the imports were done as follows:
 
 from gafferpy.gaffer_core import *
 from gafferpy.gaffer_predicates import *
@@ -47,19 +47,34 @@ import gafferpy.gaffer_binaryoperators as bop
 import gafferpy.gaffer_operations as op
 import gafferpy.gaffer_config as conf
 import gafferpy.gaffer_types as t
+
+Only gaffer_core is imported up front. The other modules are imported the
+first time one of their components is used, using gaffer_class_index to find
+where each component is defined, which keeps importing this module cheap.
 """
 
+import importlib as _importlib
+
+from gafferpy import gaffer_class_index as _class_index
 from gafferpy.gaffer_core import *
-from gafferpy.gaffer_predicates import *
-from gafferpy.gaffer_functions import *
-from gafferpy.gaffer_binaryoperators import *
-from gafferpy.gaffer_operations import *
-from gafferpy.gaffer_config import *
-from gafferpy.gaffer_types import *
 
-import gafferpy.gaffer_predicates as pred
-import gafferpy.gaffer_functions as func
-import gafferpy.gaffer_binaryoperators as bop
-import gafferpy.gaffer_operations as op
-import gafferpy.gaffer_config as conf
-import gafferpy.gaffer_types as t
+__all__ = sorted(
+    set(name for name in globals() if not name.startswith('_')) |
+    set(_class_index.NAMES))
+
+
+def __getattr__(name):
+    location = _class_index.NAMES.get(name)
+    if location is None:
+        raise AttributeError(
+            "module '" + __name__ + "' has no attribute '" + name + "'")
+    module_name, attribute = location
+    value = _importlib.import_module(module_name)
+    if attribute is not None:
+        value = getattr(value, attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return __all__
@@ -0,0 +1,325 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module aggregates streams of elements by group, identifiers and group
+by properties, as an Aggregate operation does, holding a bounded number of
+aggregated elements in memory
+"""
+
+import pickle
+import tempfile
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_local
+from gafferpy import gaffer_seed_index
+
+DEFAULT_SPILL_PARTITIONS = 16
+
+_SIMPLE_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def _split_wrapper(value):
+    """
+    Returns the java type wrapper of a value, or None, and the unwrapped
+    value.
+    """
+    if type(value) is dict and len(value) == 1:
+        for wrapper, inner in value.items():
+            if '.' in wrapper:
+                return wrapper, inner
+    return None, value
+
+
+class _PairAggregator:
+    """
+    The compiled key and binary operators of an AggregatePair. Aggregated
+    values are held unwrapped, with the wrapper of the first value seen,
+    and only wrapped again when the aggregated element is created.
+    """
+
+    def __init__(self, kind, aggregate_pair):
+        self.aggregator_key = (kind, aggregate_pair.group)
+        self.is_entity = kind == g.Entity.CLASS
+        self.group_by = [gaffer_local.value_getter(name)
+                         for name in aggregate_pair.group_by or []]
+        names = []
+        operators = []
+        element_aggregator = aggregate_pair.element_aggregator
+        if element_aggregator is not None:
+            for context in element_aggregator.operators or []:
+                if isinstance(context, g.ToJson):
+                    context = context.to_json()
+                operator = gaffer_local.compile_binary_operator(
+                    context['binaryOperator'], unwrapped=True)
+                for name in context.get('selection') or []:
+                    names.append(name)
+                    operators.append(operator)
+        self.names = names
+        self.operators = operators
+
+    def key(self, element):
+        if self.is_entity:
+            vertex = element.vertex
+            if type(vertex) not in _SIMPLE_TYPES:
+                vertex = gaffer_seed_index.vertex_key(vertex)
+            key = (element.group, vertex)
+        else:
+            source = element.source
+            if type(source) not in _SIMPLE_TYPES:
+                source = gaffer_seed_index.vertex_key(source)
+            destination = element.destination
+            if type(destination) not in _SIMPLE_TYPES:
+                destination = gaffer_seed_index.vertex_key(destination)
+            key = (element.group, source, destination, element.directed)
+        if self.group_by:
+            key += tuple(gaffer_seed_index.vertex_key(getter(element))
+                         for getter in self.group_by)
+        return key
+
+    def new_entry(self, element):
+        properties = element.properties or {}
+        wrappers = []
+        values = []
+        for name in self.names:
+            wrapper, value = _split_wrapper(properties.get(name))
+            wrappers.append(wrapper)
+            values.append(value)
+        return [element, values, wrappers]
+
+    def merge(self, entry, element):
+        properties = element.properties
+        if not properties:
+            return
+        values = entry[1]
+        operators = self.operators
+        for index, name in enumerate(self.names):
+            value = properties.get(name)
+            if type(value) is dict:
+                wrapper, value = _split_wrapper(value)
+                if entry[2][index] is None:
+                    entry[2][index] = wrapper
+            values[index] = operators[index](values[index], value)
+
+    def merge_entry(self, entry, other):
+        values = entry[1]
+        wrappers = entry[2]
+        operators = self.operators
+        for index, (value, wrapper) in enumerate(zip(other[1], other[2])):
+            if wrappers[index] is None:
+                wrappers[index] = wrapper
+            values[index] = operators[index](values[index], value)
+
+    def element(self, entry):
+        element, values, wrappers = entry
+        element = gaffer_local.copy_element(element)
+        if element.properties is None:
+            element.properties = {}
+        for name, value, wrapper in zip(self.names, values, wrappers):
+            if value is None:
+                continue
+            element.properties[name] = value if wrapper is None \
+                else {wrapper: value}
+        return element
+
+
+class GroupByAggregator:
+    """
+    This class aggregates elements added one at a time or in batches, for
+    example from several streamed results, using the AggregatePairs of an
+    Aggregate operation and the binary operators of gaffer_local. Elements
+    of groups the operation does not list are returned unchanged.
+
+    Aggregated elements are held in a dictionary keyed by group, vertices
+    and group by values. If max_entries is set, whenever the dictionary
+    holds that many elements they are pickled to temporary files, split
+    into spill_partitions partitions by key, and the dictionary is cleared.
+    results() then aggregates one partition at a time, so memory use is
+    bounded by max_entries plus the size of a partition.
+
+    Elements added are not modified.
+    """
+
+    def __init__(self, aggregate, max_entries=None,
+                 spill_partitions=DEFAULT_SPILL_PARTITIONS, spill_dir=None):
+        if max_entries is not None and max_entries < 1:
+            raise ValueError('max_entries must be at least 1')
+        self._aggregators = {}
+        for kind, definitions in ((g.Entity.CLASS, aggregate.entities),
+                                  (g.Edge.CLASS, aggregate.edges)):
+            for pair in definitions or []:
+                aggregator = _PairAggregator(kind, pair)
+                self._aggregators[aggregator.aggregator_key] = aggregator
+        self._max_entries = max_entries
+        self._spill_partitions = spill_partitions
+        self._spill_dir = spill_dir
+        self._entries = {}
+        self._unaggregated = []
+        self._partitions = None
+        self._unaggregated_file = None
+        self.added = 0
+        self.spills = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        """
+        Returns the number of elements held in memory.
+        """
+        return len(self._entries) + len(self._unaggregated)
+
+    def add(self, element):
+        """
+        Adds an Entity or Edge, aggregating it with the elements already
+        added that have the same key.
+        """
+        self.added += 1
+        aggregator = self._aggregators.get(
+            (getattr(element, 'CLASS', None), element.group))
+        if aggregator is None:
+            self._unaggregated.append(element)
+        else:
+            _add(self._entries, aggregator, element)
+        if self._max_entries is not None and len(self._entries) + \
+                len(self._unaggregated) >= self._max_entries:
+            self._spill()
+
+    def update(self, elements):
+        """
+        Adds each element of an iterable, such as a streamed result or an
+        ElementBatch.
+        """
+        add = self.add
+        for element in elements:
+            add(element)
+        return self
+
+    def results(self):
+        """
+        Returns an iterator of the aggregated elements, followed by the
+        elements of groups that are not aggregated. The aggregator is
+        emptied as the results are read.
+        """
+        if self._partitions is None:
+            entries = self._entries
+            unaggregated = self._unaggregated
+            self._entries = {}
+            self._unaggregated = []
+            yield from _elements(entries)
+            yield from unaggregated
+            return
+
+        self._spill()
+        partitions = self._partitions
+        unaggregated_file = self._unaggregated_file
+        self._partitions = None
+        self._unaggregated_file = None
+        try:
+            for partition in partitions:
+                entries = {}
+                for chunk in _read_chunks(partition):
+                    for key, aggregator_key, entry in chunk:
+                        current = entries.get(key)
+                        if current is None:
+                            entries[key] = (self._aggregators[aggregator_key],
+                                            entry)
+                        else:
+                            current[0].merge_entry(current[1], entry)
+                partition.close()
+                yield from _elements(entries)
+            for chunk in _read_chunks(unaggregated_file):
+                yield from chunk
+        finally:
+            for partition in partitions:
+                partition.close()
+            unaggregated_file.close()
+
+    def close(self):
+        """
+        Discards the elements held and removes any temporary files.
+        """
+        self._entries = {}
+        self._unaggregated = []
+        for spill_file in (self._partitions or []) + \
+                [self._unaggregated_file]:
+            if spill_file is not None:
+                spill_file.close()
+        self._partitions = None
+        self._unaggregated_file = None
+
+    def _temporary_file(self):
+        return tempfile.TemporaryFile(dir=self._spill_dir)
+
+    def _spill(self):
+        if self._partitions is None:
+            self._partitions = [self._temporary_file()
+                                for partition in range(self._spill_partitions)]
+            self._unaggregated_file = self._temporary_file()
+        self.spills += 1
+        # Each partition gets one pickled list of (key, aggregator key,
+        # entry) per spill
+        chunks = [[] for partition in self._partitions]
+        for key, (aggregator, entry) in self._entries.items():
+            chunks[hash(key) % len(chunks)].append(
+                (key, aggregator.aggregator_key, entry))
+        for partition, chunk in zip(self._partitions, chunks):
+            if chunk:
+                pickle.dump(chunk, partition, pickle.HIGHEST_PROTOCOL)
+        if self._unaggregated:
+            pickle.dump(self._unaggregated, self._unaggregated_file,
+                        pickle.HIGHEST_PROTOCOL)
+        self._entries = {}
+        self._unaggregated = []
+
+
+def _add(entries, aggregator, element):
+    key = aggregator.key(element)
+    current = entries.get(key)
+    if current is None:
+        entries[key] = (aggregator, aggregator.new_entry(element))
+    else:
+        aggregator.merge(current[1], element)
+
+
+def _elements(entries):
+    for aggregator, entry in entries.values():
+        yield aggregator.element(entry)
+
+
+def _read_chunks(spill_file):
+    spill_file.flush()
+    spill_file.seek(0)
+    while True:
+        try:
+            yield pickle.load(spill_file)
+        except EOFError:
+            return
+
+
+def aggregate(aggregate_operation, elements, max_entries=None,
+              spill_partitions=DEFAULT_SPILL_PARTITIONS):
+    """
+    Returns an iterator of the elements of an iterable aggregated by an
+    Aggregate operation, spilling to temporary files if more than
+    max_entries elements would be held in memory.
+    """
+    aggregator = GroupByAggregator(aggregate_operation, max_entries,
+                                   spill_partitions)
+    return aggregator.update(elements).results()
@@ -0,0 +1,194 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module splits the seeds of large Get operations into batches and runs
+the batches concurrently against a Gaffer REST API
+"""
+
+import collections
+import concurrent.futures
+import copy
+import itertools
+import logging
+import time
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_deadline
+from gafferpy import gaffer_metrics
+
+LOGGER = logging.getLogger(__name__)
+
+BATCHABLE_OPERATIONS = (g.GetElements, g.GetAdjacentIds,
+                        g.GetElementsWithinSet)
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_MAX_WORKERS = 4
+
+
+def split_batches(items, batch_size):
+    """
+    Lazily splits an iterable into lists of at most batch_size items.
+    """
+    if batch_size < 1:
+        raise ValueError('batch_size must be at least 1')
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def get_batchable_operation(operation_chain):
+    """
+    Returns the operation whose input can be split into batches: either the
+    operation itself or the first operation of an operation chain.
+    Returns None if there is no such operation.
+    """
+    operation = operation_chain
+    if isinstance(operation, g.OperationChain):
+        if not operation.operations:
+            return None
+        operation = operation.operations[0]
+    if isinstance(operation, BATCHABLE_OPERATIONS) and \
+            operation.input is not None:
+        return operation
+    return None
+
+
+def with_input(operation_chain, input):
+    """
+    Returns a shallow copy of the operation or operation chain with the
+    input of its batchable operation replaced.
+    """
+    if isinstance(operation_chain, g.OperationChain):
+        chain = copy.copy(operation_chain)
+        chain.operations = [with_input(chain.operations[0], input)] + \
+            list(chain.operations[1:])
+        return chain
+    operation = copy.copy(operation_chain)
+    operation.input = input
+    return operation
+
+
+def as_get_elements(operation, input):
+    """
+    Returns a copy of a GetElements or GetAdjacentIds operation as a
+    GetElements with the input replaced. A GetAdjacentIds keeps its views,
+    include incoming outgoing and options, so the GetElements returns the
+    edges it would follow.
+    """
+    if isinstance(operation, g.GetElements):
+        return with_input(operation, input)
+    get_elements = g.GetElements(
+        input=input, view=operation.view,
+        include_incoming_out_going=operation.include_incoming_out_going,
+        options=operation.options)
+    get_elements.views = operation.views
+    return get_elements
+
+
+def as_seed_list(input):
+    """
+    Returns the input of an operation as an iterable of seeds, wrapping a
+    single seed or vertex in a list.
+    """
+    if isinstance(input, (g.ElementSeed, str)) or \
+            not hasattr(input, '__iter__'):
+        return [input]
+    return input
+
+
+def run_batches(execute, operation_chain, batch_size=DEFAULT_BATCH_SIZE,
+                max_workers=DEFAULT_MAX_WORKERS, metrics_listener=None,
+                deadline=None):
+    """
+    Splits the input of the operation chain into batches, executes them
+    concurrently using the execute function and yields the results of each
+    batch as a list, in the same order as the input.
+
+    At most max_workers batches are in flight at once and only a bounded
+    number of batches are read ahead from the input. After each batch the
+    number of seeds queried for per second and the number of results
+    returned per second are logged and, if a metrics_listener is given,
+    passed to it as QueryMetrics.
+
+    If a gaffer_deadline.Deadline is given and it passes while waiting for
+    a batch, the batches that have not started are cancelled and
+    DeadlineExceeded is raised.
+    """
+    operation = get_batchable_operation(operation_chain)
+    if operation is None:
+        yield _to_list(execute(operation_chain))
+        return
+
+    batches = split_batches(as_seed_list(operation.input), batch_size)
+
+    def query_batch(batch):
+        start_time = time.perf_counter()
+        results = _to_list(execute(with_input(operation_chain, batch)))
+        return results, time.perf_counter() - start_time
+
+    pending = collections.deque()
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        try:
+            for batch in itertools.islice(batches, max_workers * 2):
+                pending.append((len(batch),
+                                executor.submit(query_batch, batch)))
+
+            batch_number = 0
+            while pending:
+                num_seeds, future = pending.popleft()
+                if deadline is not None and not concurrent.futures.wait(
+                        [future], timeout=deadline.remaining()).done:
+                    raise gaffer_deadline.DeadlineExceeded(
+                        'Deadline exceeded after ' + str(batch_number) +
+                        ' batches')
+                results, duration = future.result()
+                batch = next(batches, None)
+                if batch is not None:
+                    pending.append((len(batch),
+                                    executor.submit(query_batch, batch)))
+                batch_number += 1
+                _log_batch(batch_number, num_seeds, len(results), duration,
+                           metrics_listener)
+                yield results
+        finally:
+            for num_seeds, future in pending:
+                future.cancel()
+
+
+def _to_list(results):
+    if results is None:
+        return []
+    if isinstance(results, list):
+        return results
+    return [results]
+
+
+def _log_batch(batch_number, num_seeds, num_results, duration,
+               metrics_listener):
+    duration = max(duration, 1e-9)
+    seed_rate = num_seeds / duration
+    results_rate = num_results / duration
+    LOGGER.info('Batch number = %d: %d ids queried for in %f seconds (rate '
+                'was %f per second), %d results were returned (rate was %f '
+                'per second)', batch_number, num_seeds, duration, seed_rate,
+                num_results, results_rate)
+    if metrics_listener is not None:
+        metrics_listener.update(
+            gaffer_metrics.QueryMetrics(seed_rate, results_rate))
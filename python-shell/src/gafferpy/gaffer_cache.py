@@ -0,0 +1,496 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module contains the caches a GafferConnector can use to avoid
+repeating requests to Gaffer
+"""
+
+import collections
+import hashlib
+import json
+import threading
+import time
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_batch
+from gafferpy import gaffer_metrics
+from gafferpy import gaffer_seed_index
+
+
+class _Missing:
+    def __repr__(self):
+        return 'MISSING'
+
+
+# Returned by get when a key is not in the cache
+MISSING = _Missing()
+
+# Operations that change the graph or the state held for the user
+WRITE_OPERATIONS = frozenset([
+    'uk.gov.gchq.gaffer.operation.impl.add.AddElements',
+    'uk.gov.gchq.gaffer.operation.impl.add.AddElementsFromFile',
+    'uk.gov.gchq.gaffer.operation.impl.add.AddElementsFromKafka',
+    'uk.gov.gchq.gaffer.operation.impl.add.AddElementsFromSocket',
+    'uk.gov.gchq.gaffer.named.operation.AddNamedOperation',
+    'uk.gov.gchq.gaffer.named.operation.DeleteNamedOperation',
+    'uk.gov.gchq.gaffer.named.view.AddNamedView',
+    'uk.gov.gchq.gaffer.named.view.DeleteNamedView',
+    'uk.gov.gchq.gaffer.operation.impl.export.resultcache'
+    '.ExportToGafferResultCache',
+    'uk.gov.gchq.gaffer.operation.impl.export.set.ExportToSet',
+    'uk.gov.gchq.gaffer.operation.export.graph.ExportToOtherGraph',
+    'uk.gov.gchq.gaffer.operation.export.graph.ExportToOtherAuthorisedGraph',
+    'uk.gov.gchq.gaffer.operation.impl.SplitStoreFromFile',
+    'uk.gov.gchq.gaffer.operation.impl.SplitStoreFromIterable',
+    'uk.gov.gchq.gaffer.federatedstore.operation.AddGraph',
+    'uk.gov.gchq.gaffer.federatedstore.operation.AddGraphWithHooks',
+    'uk.gov.gchq.gaffer.federatedstore.operation.RemoveGraph',
+    'uk.gov.gchq.gaffer.operation.impl.SetVariable'
+])
+
+# Operations that only read, but whose results depend on earlier operations
+# rather than on the graph
+STATEFUL_OPERATIONS = frozenset([
+    'uk.gov.gchq.gaffer.operation.impl.export.GetExports',
+    'uk.gov.gchq.gaffer.operation.impl.export.resultcache'
+    '.GetGafferResultCacheExport',
+    'uk.gov.gchq.gaffer.operation.impl.export.set.GetSetExport',
+    'uk.gov.gchq.gaffer.operation.impl.job.GetAllJobDetails',
+    'uk.gov.gchq.gaffer.operation.impl.job.GetJobDetails',
+    'uk.gov.gchq.gaffer.operation.impl.job.GetJobResults',
+    'uk.gov.gchq.gaffer.operation.impl.GetVariable',
+    'uk.gov.gchq.gaffer.operation.impl.GetVariables'
+])
+
+# Fields holding seeds or elements, whose order does not change the result
+_UNORDERED_FIELDS = frozenset(['input', 'inputB'])
+
+_SEPARATORS = (',', ':')
+
+
+def fingerprint(operation_chain):
+    """
+    Returns a hash of an operation, operation chain or json dictionary that
+    does not depend on the order of dictionary keys or of input seeds.
+    """
+    return fingerprint_with_classes(operation_chain)[0]
+
+
+def fingerprint_with_classes(operation_chain):
+    """
+    Returns the fingerprint of an operation chain and the set of class names
+    in it, outside of its inputs.
+    """
+    if hasattr(operation_chain, 'to_json'):
+        operation_chain = operation_chain.to_json()
+    classes = set()
+    text = _canonical_json(operation_chain, classes)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest(), classes
+
+
+def operation_class_names(operation_chain):
+    """
+    Returns the class names of the operations of an operation chain, json
+    operation chain or single operation, without looking inside inputs.
+    """
+    if isinstance(operation_chain, dict):
+        operations = operation_chain.get('operations', [operation_chain])
+    else:
+        operations = getattr(operation_chain, 'operations', None) or \
+            [operation_chain]
+    return [operation.get('class') if isinstance(operation, dict)
+            else getattr(operation, '_class_name', None)
+            for operation in operations]
+
+
+def _canonical_json(obj, classes):
+    """
+    Returns json for obj with sorted keys and sorted input items, adding the
+    class names found outside of the inputs to classes.
+    """
+    if isinstance(obj, dict):
+        class_name = obj.get('class')
+        if isinstance(class_name, str):
+            classes.add(class_name)
+        parts = []
+        for key in sorted(obj):
+            value = obj[key]
+            if key in _UNORDERED_FIELDS and isinstance(value, list):
+                text = '[' + ','.join(sorted(
+                    json.dumps(item, sort_keys=True, separators=_SEPARATORS)
+                    for item in value)) + ']'
+            else:
+                text = _canonical_json(value, classes)
+            parts.append(json.dumps(key) + ':' + text)
+        return '{' + ','.join(parts) + '}'
+    if isinstance(obj, list):
+        return '[' + ','.join(_canonical_json(item, classes)
+                              for item in obj) + ']'
+    return json.dumps(obj, sort_keys=True, separators=_SEPARATORS)
+
+
+class TtlLruCache:
+    """
+    A thread safe cache where each entry expires after its own time to live.
+    When the cache holds more than max_entries entries, or the sizes of its
+    entries add up to more than max_size, the least recently used entries
+    are evicted. Either limit can be None.
+    """
+
+    def __init__(self, max_entries=None, max_size=None):
+        self._max_entries = max_entries
+        self._max_size = max_size
+        self._entries = collections.OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._clock = time.monotonic
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Returns the value stored for key, or MISSING if there is no entry or
+        it has expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is not None and \
+                    entry[1] <= self._clock():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, ttl=None, size=1):
+        """
+        Stores value against key for ttl seconds, or until it is evicted if
+        ttl is None. A value larger than max_size is not stored.
+        """
+        if ttl is not None and ttl <= 0:
+            return
+        if self._max_size is not None and size > self._max_size:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            expires = None if ttl is None else self._clock() + ttl
+            self._entries[key] = (value, expires, size)
+            self._size += size
+            while (self._max_entries is not None and
+                   len(self._entries) > self._max_entries) or \
+                    (self._max_size is not None and
+                     self._size > self._max_size):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def invalidate_matching(self, predicate):
+        """
+        Removes every entry whose key matches the predicate.
+        """
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def size(self):
+        return self._size
+
+    def get_metrics(self):
+        """
+        Returns the hits, misses, evictions and hit ratio as CacheMetrics.
+        """
+        with self._lock:
+            return gaffer_metrics.CacheMetrics(self.hits, self.misses,
+                                               self.evictions)
+
+    def _remove(self, key):
+        value, expires, size = self._entries.pop(key)
+        self._size -= size
+
+
+class MetadataCache(TtlLruCache):
+    """
+    Caches the responses of the GET endpoints used by execute_get and
+    is_operation_supported, such as the schema and the list of supported
+    operations.
+
+    The time to live of a response is chosen by the longest path prefix in
+    ttls that matches its URL path, falling back to default_ttl.
+    """
+
+    DEFAULT_TTLS = {
+        '/graph/config/schema': 300,
+        '/graph/config/storeTraits': 3600,
+        '/graph/config/serialisedFields': 3600,
+        '/graph/config/filterFunctions': 3600,
+        '/graph/config/transformFunctions': 3600,
+        '/graph/config/elementGenerators': 3600,
+        '/graph/config/objectGenerators': 3600,
+        '/graph/operations': 300
+    }
+
+    def __init__(self, max_entries=256, default_ttl=300, ttls=None):
+        super().__init__(max_entries=max_entries)
+        self._default_ttl = default_ttl
+        self._ttls = dict(self.DEFAULT_TTLS)
+        if ttls is not None:
+            self._ttls.update(ttls)
+
+    def ttl_for(self, path):
+        ttl = self._default_ttl
+        prefix_length = -1
+        for prefix, prefix_ttl in self._ttls.items():
+            if path.startswith(prefix) and len(prefix) > prefix_length:
+                ttl = prefix_ttl
+                prefix_length = len(prefix)
+        return ttl
+
+    def get_response(self, host, path, headers):
+        return self.get(self._key(host, path, headers))
+
+    def put_response(self, host, path, headers, response_text):
+        self.put(self._key(host, path, headers), response_text,
+                 self.ttl_for(path))
+
+    def invalidate_path(self, path=None):
+        """
+        Removes the cached responses for URL paths starting with path, or
+        every response if path is None.
+        """
+        if path is None:
+            self.clear()
+        else:
+            self.invalidate_matching(lambda key: key[1].startswith(path))
+
+    @staticmethod
+    def _key(host, path, headers):
+        return host, path, tuple(sorted(headers.items()))
+
+
+class ResultCache(TtlLruCache):
+    """
+    Caches the responses of operation chains executed by a GafferConnector,
+    keyed by the host, the headers and the fingerprint of the chain. The
+    responses are held as text and the cache holds at most max_size
+    characters of responses.
+
+    A response expires after the smallest time to live in ttls of the
+    operations in its chain, falling back to default_ttl. Chains containing
+    a write operation are never cached and, if invalidate_on_write is True,
+    remove every response cached for their host. Chains reading exports,
+    jobs or variables are not cached.
+    """
+
+    def __init__(self, max_size=64 * 1024 * 1024, default_ttl=60, ttls=None,
+                 invalidate_on_write=True):
+        super().__init__(max_size=max_size)
+        self._default_ttl = default_ttl
+        self._ttls = dict(ttls or {})
+        self._invalidate_on_write = invalidate_on_write
+        self.bypasses = 0
+
+    def ttl_for(self, classes):
+        ttls = [self._ttls[class_name] for class_name in classes
+                if class_name in self._ttls]
+        return min(ttls) if ttls else self._default_ttl
+
+    def get_or_execute(self, host, operation_chain, headers, execute):
+        """
+        Returns the cached response text for the operation chain, or calls
+        execute to get the response text and caches it.
+        """
+        chain_fingerprint, classes = fingerprint_with_classes(
+            operation_chain)
+        if not classes.isdisjoint(WRITE_OPERATIONS):
+            with self._lock:
+                self.bypasses += 1
+            try:
+                return execute()
+            finally:
+                if self._invalidate_on_write:
+                    self.invalidate_host(host)
+        if not classes.isdisjoint(STATEFUL_OPERATIONS):
+            with self._lock:
+                self.bypasses += 1
+            return execute()
+
+        key = (host, tuple(sorted(headers.items())), chain_fingerprint)
+        response_text = self.get(key)
+        if response_text is MISSING:
+            response_text = execute()
+            self.put(key, response_text, self.ttl_for(classes),
+                     len(response_text))
+        return response_text
+
+    def invalidate_host(self, host):
+        """
+        Removes every response cached for the host.
+        """
+        self.invalidate_matching(lambda key: key[0] == host)
+
+
+class AdjacencyCache(TtlLruCache):
+    """
+    Caches the elements found for each vertex by GetElements and
+    GetAdjacentIds operations executed by a GafferConnector, keyed by the
+    host, the headers, the vertex and the fingerprint of the rest of the
+    operation: its view, directed type, include incoming outgoing and
+    options. At most max_vertices vertices and max_elements elements are
+    held, evicting the least recently used vertices, and each vertex expires
+    after ttl seconds. Hits and misses are counted per vertex.
+
+    Only operations executed on their own with entity seeds or vertices as
+    input are cached. Cached seeds are removed from the input, only the
+    others are sent to Gaffer, and the results are returned grouped by seed
+    in input order. A GetAdjacentIds is sent as a GetElements with the same
+    view, so its edges can be matched to its seeds, and the adjacent ids are
+    read from the cached edges. GetElements and GetAdjacentIds with the same
+    view therefore share cached vertices.
+
+    Chains containing a write operation remove every vertex cached for
+    their host if invalidate_on_write is True. Cached elements are shared
+    between calls and should not be modified.
+    """
+
+    def __init__(self, max_vertices=100000, max_elements=1000000, ttl=300,
+                 invalidate_on_write=True):
+        super().__init__(max_entries=max_vertices, max_size=max_elements)
+        self._ttl = ttl
+        self._invalidate_on_write = invalidate_on_write
+
+    @staticmethod
+    def cacheable_operation(operation_chain):
+        """
+        Returns the GetElements or GetAdjacentIds operation whose results can
+        be cached: the operation itself or the only operation of a chain.
+        Returns None if there is no such operation.
+        """
+        operation = operation_chain
+        if isinstance(operation, g.OperationChain):
+            if len(operation.operations) != 1 or operation.options:
+                return None
+            operation = operation.operations[0]
+        if not isinstance(operation, (g.GetElements, g.GetAdjacentIds)) or \
+                operation.input is None:
+            return None
+        return operation
+
+    def execute(self, host, operation_chain, headers, execute):
+        """
+        Returns the results of the operation chain, calling execute with an
+        operation chain to get any results that are not cached.
+        """
+        operation = self.cacheable_operation(operation_chain)
+        vertices = None
+        if operation is not None:
+            vertices = self._input_vertices(operation.input)
+        if vertices is None:
+            if self._invalidate_on_write and not WRITE_OPERATIONS.isdisjoint(
+                    operation_class_names(operation_chain)):
+                try:
+                    return execute(operation_chain)
+                finally:
+                    self.invalidate_host(host)
+            return execute(operation_chain)
+
+        prefix = (host, tuple(sorted(headers.items())),
+                  self.view_fingerprint(operation))
+        found = {}
+        misses = []
+        for key, vertex in vertices.items():
+            elements = self.get(prefix + (key,))
+            if elements is MISSING:
+                misses.append((key, vertex))
+            else:
+                found[key] = elements
+
+        if misses:
+            index = gaffer_seed_index.index_results(
+                [vertex for key, vertex in misses],
+                execute(self._fetch_operation(
+                    operation, [vertex for key, vertex in misses])) or [])
+            for key, vertex in misses:
+                elements = index[vertex]
+                self.put(prefix + (key,), elements, self._ttl, len(elements))
+                found[key] = elements
+
+        results = []
+        if isinstance(operation, g.GetAdjacentIds):
+            for key in vertices:
+                results.extend(
+                    g.EntitySeed(gaffer_seed_index.adjacent_vertex(
+                        element, key))
+                    for element in found[key]
+                    if getattr(element, 'CLASS', None) == g.Edge.CLASS)
+        else:
+            for key in vertices:
+                results.extend(found[key])
+        return results
+
+    @staticmethod
+    def view_fingerprint(operation):
+        """
+        Returns the fingerprint of everything in a GetElements or
+        GetAdjacentIds operation other than its class and input.
+        """
+        operation_json = gaffer_batch.with_input(operation, None).to_json()
+        operation_json.pop('class', None)
+        return fingerprint(operation_json)
+
+    @staticmethod
+    def _input_vertices(input):
+        """
+        Returns a dictionary from vertex key to vertex for the seeds of an
+        input, in input order, or None if any seed is not an entity seed.
+        """
+        vertices = {}
+        for seed in gaffer_batch.as_seed_list(input):
+            if isinstance(seed, g.ElementSeed):
+                if not isinstance(seed, g.EntitySeed):
+                    return None
+                seed = seed.vertex
+            vertices.setdefault(gaffer_seed_index.vertex_key(seed), seed)
+        return vertices
+
+    @staticmethod
+    def _fetch_operation(operation, vertices):
+        return gaffer_batch.as_get_elements(
+            operation, [g.EntitySeed(vertex) for vertex in vertices])
+
+    def invalidate_host(self, host):
+        """
+        Removes every vertex cached for the host.
+        """
+        self.invalidate_matching(lambda key: key[0] == host)
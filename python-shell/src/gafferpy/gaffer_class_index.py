@@ -0,0 +1,699 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module is generated by gaffer_class_index_builder, do not edit it.
+
+It records where each Gaffer class and each name provided by gafferpy.gaffer
+is defined, so that modules can be imported when they are first needed.
+"""
+
+MODULES = (
+    'gafferpy.gaffer_core',
+    'gafferpy.gaffer_predicates',
+    'gafferpy.gaffer_functions',
+    'gafferpy.gaffer_binaryoperators',
+    'gafferpy.gaffer_operations',
+    'gafferpy.gaffer_config',
+    'gafferpy.gaffer_types'
+)
+
+CLASSES = {
+    'gaffer.AggregatorContext':
+        ('gafferpy.gaffer_binaryoperators', 'BinaryOperatorContext'),
+    'gaffer.FunctionContext': ('gafferpy.gaffer_functions', 'FunctionContext'),
+    'gaffer.NamedOperationParameter':
+        ('gafferpy.gaffer_operations', 'NamedOperationParameter'),
+    'gaffer.NamedViewParameter':
+        ('gafferpy.gaffer_operations', 'NamedViewParameter'),
+    'gaffer.PredicateContext':
+        ('gafferpy.gaffer_predicates', 'PredicateContext'),
+    'java.util.function.BinaryOperator':
+        ('gafferpy.gaffer_binaryoperators', 'BinaryOperator'),
+    'java.util.function.Function': ('gafferpy.gaffer_functions', 'Function'),
+    'java.util.function.Predicate':
+        ('gafferpy.gaffer_predicates', 'Predicate'),
+    'uk.gov.gchq.gaffer.accumulostore.operation.impl.GetElementsBetweenSets':
+        ('gafferpy.gaffer_operations', 'GetElementsBetweenSets'),
+    'uk.gov.gchq.gaffer.accumulostore.operation.impl.GetElementsInRanges':
+        ('gafferpy.gaffer_operations', 'GetElementsInRanges'),
+    'uk.gov.gchq.gaffer.accumulostore.operation.impl.GetElementsWithinSet':
+        ('gafferpy.gaffer_operations', 'GetElementsWithinSet'),
+    ('uk.gov.gchq.gaffer.accumulostore.operation.impl.'
+     'SummariseGroupOverRanges'):
+        ('gafferpy.gaffer_operations', 'SummariseGroupOverRanges'),
+    'uk.gov.gchq.gaffer.commonutil.pair.Pair':
+        ('gafferpy.gaffer_core', 'SeedPair'),
+    'uk.gov.gchq.gaffer.data.element.Edge': ('gafferpy.gaffer_core', 'Edge'),
+    'uk.gov.gchq.gaffer.data.element.Entity':
+        ('gafferpy.gaffer_core', 'Entity'),
+    'uk.gov.gchq.gaffer.data.element.Property':
+        ('gafferpy.gaffer_operations', 'Property'),
+    'uk.gov.gchq.gaffer.data.element.comparison.ElementJoinComparator':
+        ('gafferpy.gaffer_predicates', 'ElementJoinComparator'),
+    'uk.gov.gchq.gaffer.data.element.comparison.ElementPropertyComparator':
+        ('gafferpy.gaffer_core', 'ElementPropertyComparator'),
+    'uk.gov.gchq.gaffer.data.element.function.ExtractGroup':
+        ('gafferpy.gaffer_functions', 'ExtractGroup'),
+    'uk.gov.gchq.gaffer.data.element.function.ExtractId':
+        ('gafferpy.gaffer_functions', 'ExtractId'),
+    'uk.gov.gchq.gaffer.data.element.function.ExtractProperty':
+        ('gafferpy.gaffer_functions', 'ExtractProperty'),
+    'uk.gov.gchq.gaffer.data.element.function.UnwrapEntityId':
+        ('gafferpy.gaffer_functions', 'UnwrapEntityId'),
+    ('uk.gov.gchq.gaffer.data.elementdefinition.view.'
+     'GlobalViewElementDefinition'):
+        ('gafferpy.gaffer_operations', 'GlobalElementDefinition'),
+    'uk.gov.gchq.gaffer.data.elementdefinition.view.NamedView':
+        ('gafferpy.gaffer_operations', 'NamedView'),
+    'uk.gov.gchq.gaffer.data.elementdefinition.view.View':
+        ('gafferpy.gaffer_operations', 'View'),
+    'uk.gov.gchq.gaffer.data.elementdefinition.view.ViewElementDefinition':
+        ('gafferpy.gaffer_operations', 'ElementDefinition'),
+    'uk.gov.gchq.gaffer.data.generator.CsvGenerator':
+        ('gafferpy.gaffer_functions', 'CsvGenerator'),
+    'uk.gov.gchq.gaffer.data.generator.ElementGenerator':
+        ('gafferpy.gaffer_functions', 'ElementGenerator'),
+    'uk.gov.gchq.gaffer.data.generator.JsonToElementGenerator':
+        ('gafferpy.gaffer_functions', 'JsonToElementGenerator'),
+    'uk.gov.gchq.gaffer.data.generator.MapGenerator':
+        ('gafferpy.gaffer_functions', 'MapGenerator'),
+    'uk.gov.gchq.gaffer.data.graph.function.walk.ExtractWalkEdges':
+        ('gafferpy.gaffer_functions', 'ExtractWalkEdges'),
+    'uk.gov.gchq.gaffer.data.graph.function.walk.ExtractWalkEdgesFromHop':
+        ('gafferpy.gaffer_functions', 'ExtractWalkEdgesFromHop'),
+    'uk.gov.gchq.gaffer.data.graph.function.walk.ExtractWalkEntities':
+        ('gafferpy.gaffer_functions', 'ExtractWalkEntities'),
+    'uk.gov.gchq.gaffer.data.graph.function.walk.ExtractWalkEntitiesFromHop':
+        ('gafferpy.gaffer_functions', 'ExtractWalkEntitiesFromHop'),
+    'uk.gov.gchq.gaffer.data.graph.function.walk.ExtractWalkVertex':
+        ('gafferpy.gaffer_functions', 'ExtractWalkVertex'),
+    'uk.gov.gchq.gaffer.federatedstore.operation.AddGraph':
+        ('gafferpy.gaffer_operations', 'AddGraph'),
+    'uk.gov.gchq.gaffer.federatedstore.operation.AddGraphWithHooks':
+        ('gafferpy.gaffer_operations', 'AddGraphWithHooks'),
+    'uk.gov.gchq.gaffer.federatedstore.operation.GetAllGraphIds':
+        ('gafferpy.gaffer_operations', 'GetAllGraphIds'),
+    'uk.gov.gchq.gaffer.federatedstore.operation.RemoveGraph':
+        ('gafferpy.gaffer_operations', 'RemoveGraph'),
+    'uk.gov.gchq.gaffer.named.operation.AddNamedOperation':
+        ('gafferpy.gaffer_operations', 'AddNamedOperation'),
+    'uk.gov.gchq.gaffer.named.operation.DeleteNamedOperation':
+        ('gafferpy.gaffer_operations', 'DeleteNamedOperation'),
+    'uk.gov.gchq.gaffer.named.operation.GetAllNamedOperations':
+        ('gafferpy.gaffer_operations', 'GetAllNamedOperations'),
+    'uk.gov.gchq.gaffer.named.operation.NamedOperation':
+        ('gafferpy.gaffer_operations', 'NamedOperation'),
+    'uk.gov.gchq.gaffer.named.view.AddNamedView':
+        ('gafferpy.gaffer_operations', 'AddNamedView'),
+    'uk.gov.gchq.gaffer.named.view.DeleteNamedView':
+        ('gafferpy.gaffer_operations', 'DeleteNamedView'),
+    'uk.gov.gchq.gaffer.named.view.GetAllNamedViews':
+        ('gafferpy.gaffer_operations', 'GetAllNamedViews'),
+    'uk.gov.gchq.gaffer.operation.OperationChain':
+        ('gafferpy.gaffer_operations', 'OperationChain'),
+    'uk.gov.gchq.gaffer.operation.OperationChainDAO':
+        ('gafferpy.gaffer_operations', 'OperationChainDAO'),
+    'uk.gov.gchq.gaffer.operation.data.EdgeSeed':
+        ('gafferpy.gaffer_core', 'EdgeSeed'),
+    'uk.gov.gchq.gaffer.operation.data.EntitySeed':
+        ('gafferpy.gaffer_core', 'EntitySeed'),
+    'uk.gov.gchq.gaffer.operation.export.graph.ExportToOtherAuthorisedGraph':
+        ('gafferpy.gaffer_operations', 'ExportToOtherAuthorisedGraph'),
+    'uk.gov.gchq.gaffer.operation.export.graph.ExportToOtherGraph':
+        ('gafferpy.gaffer_operations', 'ExportToOtherGraph'),
+    'uk.gov.gchq.gaffer.operation.function.FromElementId':
+        ('gafferpy.gaffer_functions', 'FromElementId'),
+    'uk.gov.gchq.gaffer.operation.function.FromEntityId':
+        ('gafferpy.gaffer_functions', 'FromEntityId'),
+    'uk.gov.gchq.gaffer.operation.function.ToElementId':
+        ('gafferpy.gaffer_functions', 'ToElementId'),
+    'uk.gov.gchq.gaffer.operation.function.ToEntityId':
+        ('gafferpy.gaffer_functions', 'ToEntityId'),
+    'uk.gov.gchq.gaffer.operation.impl.Count':
+        ('gafferpy.gaffer_operations', 'Count'),
+    'uk.gov.gchq.gaffer.operation.impl.CountGroups':
+        ('gafferpy.gaffer_operations', 'CountGroups'),
+    'uk.gov.gchq.gaffer.operation.impl.DiscardOutput':
+        ('gafferpy.gaffer_operations', 'DiscardOutput'),
+    'uk.gov.gchq.gaffer.operation.impl.ForEach':
+        ('gafferpy.gaffer_operations', 'ForEach'),
+    'uk.gov.gchq.gaffer.operation.impl.GetVariable':
+        ('gafferpy.gaffer_operations', 'GetVariable'),
+    'uk.gov.gchq.gaffer.operation.impl.GetVariables':
+        ('gafferpy.gaffer_operations', 'GetVariables'),
+    'uk.gov.gchq.gaffer.operation.impl.GetWalks':
+        ('gafferpy.gaffer_operations', 'GetWalks'),
+    'uk.gov.gchq.gaffer.operation.impl.If':
+        ('gafferpy.gaffer_operations', 'If'),
+    'uk.gov.gchq.gaffer.operation.impl.Limit':
+        ('gafferpy.gaffer_operations', 'Limit'),
+    'uk.gov.gchq.gaffer.operation.impl.Map':
+        ('gafferpy.gaffer_operations', 'Map'),
+    'uk.gov.gchq.gaffer.operation.impl.Reduce':
+        ('gafferpy.gaffer_operations', 'Reduce'),
+    'uk.gov.gchq.gaffer.operation.impl.SampleElementsForSplitPoints':
+        ('gafferpy.gaffer_operations', 'SampleElementsForSplitPoints'),
+    'uk.gov.gchq.gaffer.operation.impl.ScoreOperationChain':
+        ('gafferpy.gaffer_operations', 'ScoreOperationChain'),
+    'uk.gov.gchq.gaffer.operation.impl.SetVariable':
+        ('gafferpy.gaffer_operations', 'SetVariable'),
+    'uk.gov.gchq.gaffer.operation.impl.SplitStoreFromFile':
+        ('gafferpy.gaffer_operations', 'SplitStoreFromFile'),
+    'uk.gov.gchq.gaffer.operation.impl.SplitStoreFromIterable':
+        ('gafferpy.gaffer_operations', 'SplitStoreFromIterable'),
+    'uk.gov.gchq.gaffer.operation.impl.Validate':
+        ('gafferpy.gaffer_operations', 'Validate'),
+    'uk.gov.gchq.gaffer.operation.impl.ValidateOperationChain':
+        ('gafferpy.gaffer_operations', 'ValidateOperationChain'),
+    'uk.gov.gchq.gaffer.operation.impl.While':
+        ('gafferpy.gaffer_operations', 'While'),
+    'uk.gov.gchq.gaffer.operation.impl.add.AddElements':
+        ('gafferpy.gaffer_operations', 'AddElements'),
+    'uk.gov.gchq.gaffer.operation.impl.add.AddElementsFromFile':
+        ('gafferpy.gaffer_operations', 'AddElementsFromFile'),
+    'uk.gov.gchq.gaffer.operation.impl.add.AddElementsFromKafka':
+        ('gafferpy.gaffer_operations', 'AddElementsFromKafka'),
+    'uk.gov.gchq.gaffer.operation.impl.add.AddElementsFromSocket':
+        ('gafferpy.gaffer_operations', 'AddElementsFromSocket'),
+    'uk.gov.gchq.gaffer.operation.impl.compare.Max':
+        ('gafferpy.gaffer_operations', 'Max'),
+    'uk.gov.gchq.gaffer.operation.impl.compare.Min':
+        ('gafferpy.gaffer_operations', 'Min'),
+    'uk.gov.gchq.gaffer.operation.impl.compare.Sort':
+        ('gafferpy.gaffer_operations', 'Sort'),
+    'uk.gov.gchq.gaffer.operation.impl.export.GetExports':
+        ('gafferpy.gaffer_operations', 'GetExports'),
+    ('uk.gov.gchq.gaffer.operation.impl.export.resultcache.'
+     'ExportToGafferResultCache'):
+        ('gafferpy.gaffer_operations', 'ExportToGafferResultCache'),
+    ('uk.gov.gchq.gaffer.operation.impl.export.resultcache.'
+     'GetGafferResultCacheExport'):
+        ('gafferpy.gaffer_operations', 'GetGafferResultCacheExport'),
+    'uk.gov.gchq.gaffer.operation.impl.export.set.ExportToSet':
+        ('gafferpy.gaffer_operations', 'ExportToSet'),
+    'uk.gov.gchq.gaffer.operation.impl.export.set.GetSetExport':
+        ('gafferpy.gaffer_operations', 'GetSetExport'),
+    'uk.gov.gchq.gaffer.operation.impl.function.Aggregate':
+        ('gafferpy.gaffer_operations', 'Aggregate'),
+    'uk.gov.gchq.gaffer.operation.impl.function.ElementAggregateDefinition':
+        ('gafferpy.gaffer_operations', 'ElementAggregateDefinition'),
+    'uk.gov.gchq.gaffer.operation.impl.function.ElementFilterDefinition':
+        ('gafferpy.gaffer_operations', 'ElementFilterDefinition'),
+    'uk.gov.gchq.gaffer.operation.impl.function.ElementTransformDefinition':
+        ('gafferpy.gaffer_operations', 'ElementTransformDefinition'),
+    'uk.gov.gchq.gaffer.operation.impl.function.Filter':
+        ('gafferpy.gaffer_operations', 'Filter'),
+    ('uk.gov.gchq.gaffer.operation.impl.function.'
+     'GlobalElementFilterDefinition'):
+        ('gafferpy.gaffer_operations', 'GlobalElementFilterDefinition'),
+    'uk.gov.gchq.gaffer.operation.impl.function.Transform':
+        ('gafferpy.gaffer_operations', 'Transform'),
+    'uk.gov.gchq.gaffer.operation.impl.generate.GenerateElements':
+        ('gafferpy.gaffer_operations', 'GenerateElements'),
+    'uk.gov.gchq.gaffer.operation.impl.generate.GenerateObjects':
+        ('gafferpy.gaffer_operations', 'GenerateObjects'),
+    'uk.gov.gchq.gaffer.operation.impl.get.GetAdjacentIds':
+        ('gafferpy.gaffer_operations', 'GetAdjacentIds'),
+    'uk.gov.gchq.gaffer.operation.impl.get.GetAllElements':
+        ('gafferpy.gaffer_operations', 'GetAllElements'),
+    'uk.gov.gchq.gaffer.operation.impl.get.GetElements':
+        ('gafferpy.gaffer_operations', 'GetElements'),
+    'uk.gov.gchq.gaffer.operation.impl.get.GetFromEndpoint':
+        ('gafferpy.gaffer_operations', 'GetFromEndpoint'),
+    'uk.gov.gchq.gaffer.operation.impl.job.GetAllJobDetails':
+        ('gafferpy.gaffer_operations', 'GetAllJobDetails'),
+    'uk.gov.gchq.gaffer.operation.impl.job.GetJobDetails':
+        ('gafferpy.gaffer_operations', 'GetJobDetails'),
+    'uk.gov.gchq.gaffer.operation.impl.job.GetJobResults':
+        ('gafferpy.gaffer_operations', 'GetJobResults'),
+    'uk.gov.gchq.gaffer.operation.impl.join.Join':
+        ('gafferpy.gaffer_operations', 'Join'),
+    'uk.gov.gchq.gaffer.operation.impl.join.merge.Merge':
+        ('gafferpy.gaffer_operations', 'Merge'),
+    'uk.gov.gchq.gaffer.operation.impl.output.ToArray':
+        ('gafferpy.gaffer_operations', 'ToArray'),
+    'uk.gov.gchq.gaffer.operation.impl.output.ToCsv':
+        ('gafferpy.gaffer_operations', 'ToCsv'),
+    'uk.gov.gchq.gaffer.operation.impl.output.ToEntitySeeds':
+        ('gafferpy.gaffer_operations', 'ToEntitySeeds'),
+    'uk.gov.gchq.gaffer.operation.impl.output.ToList':
+        ('gafferpy.gaffer_operations', 'ToList'),
+    'uk.gov.gchq.gaffer.operation.impl.output.ToMap':
+        ('gafferpy.gaffer_operations', 'ToMap'),
+    'uk.gov.gchq.gaffer.operation.impl.output.ToSet':
+        ('gafferpy.gaffer_operations', 'ToSet'),
+    'uk.gov.gchq.gaffer.operation.impl.output.ToSingletonList':
+        ('gafferpy.gaffer_operations', 'ToSingletonList'),
+    'uk.gov.gchq.gaffer.operation.impl.output.ToStream':
+        ('gafferpy.gaffer_operations', 'ToStream'),
+    'uk.gov.gchq.gaffer.operation.impl.output.ToVertices':
+        ('gafferpy.gaffer_operations', 'ToVertices'),
+    'uk.gov.gchq.gaffer.operation.util.AggregatePair':
+        ('gafferpy.gaffer_operations', 'AggregatePair'),
+    'uk.gov.gchq.gaffer.operation.util.Conditional':
+        ('gafferpy.gaffer_operations', 'Conditional'),
+    ('uk.gov.gchq.gaffer.sketches.clearspring.cardinality.predicate.'
+     'HyperLogLogPlusIsLessThan'):
+        ('gafferpy.gaffer_predicates', 'HyperLogLogPlusIsLessThan'),
+    ('uk.gov.gchq.gaffer.sketches.datasketches.cardinality.predicate.'
+     'HllSketchIsLessThan'):
+        ('gafferpy.gaffer_predicates', 'HllSketchIsLessThan'),
+    'uk.gov.gchq.gaffer.store.operation.GetSchema':
+        ('gafferpy.gaffer_config', 'GetSchema'),
+    'uk.gov.gchq.gaffer.store.operation.GetTraits':
+        ('gafferpy.gaffer_operations', 'GetTraits'),
+    'uk.gov.gchq.gaffer.store.operation.handler.join.match.ElementMatch':
+        ('gafferpy.gaffer_operations', 'ElementMatch'),
+    'uk.gov.gchq.gaffer.store.operation.handler.join.merge.ElementMerge':
+        ('gafferpy.gaffer_operations', 'ElementMerge'),
+    'uk.gov.gchq.gaffer.types.function.FreqMapExtractor':
+        ('gafferpy.gaffer_functions', 'FreqMapExtractor'),
+    'uk.gov.gchq.gaffer.types.function.FreqMapPredicator':
+        ('gafferpy.gaffer_functions', 'FreqMapPredicator'),
+    'uk.gov.gchq.gaffer.types.function.ToFreqMap':
+        ('gafferpy.gaffer_functions', 'ToFreqMap'),
+    'uk.gov.gchq.gaffer.types.function.ToTypeSubTypeValue':
+        ('gafferpy.gaffer_functions', 'ToTypeSubTypeValue'),
+    'uk.gov.gchq.gaffer.types.function.ToTypeValue':
+        ('gafferpy.gaffer_functions', 'ToTypeValue'),
+    'uk.gov.gchq.koryphe.function.FunctionMap':
+        ('gafferpy.gaffer_functions', 'FunctionMap'),
+    'uk.gov.gchq.koryphe.impl.function.CallMethod':
+        ('gafferpy.gaffer_functions', 'CallMethod'),
+    'uk.gov.gchq.koryphe.impl.function.Cast':
+        ('gafferpy.gaffer_functions', 'Cast'),
+    'uk.gov.gchq.koryphe.impl.function.Concat':
+        ('gafferpy.gaffer_functions', 'Concat'),
+    'uk.gov.gchq.koryphe.impl.function.Divide':
+        ('gafferpy.gaffer_functions', 'Divide'),
+    'uk.gov.gchq.koryphe.impl.function.DivideBy':
+        ('gafferpy.gaffer_functions', 'DivideBy'),
+    'uk.gov.gchq.koryphe.impl.function.ExtractKeys':
+        ('gafferpy.gaffer_functions', 'ExtractKeys'),
+    'uk.gov.gchq.koryphe.impl.function.ExtractValue':
+        ('gafferpy.gaffer_functions', 'ExtractValue'),
+    'uk.gov.gchq.koryphe.impl.function.ExtractValues':
+        ('gafferpy.gaffer_functions', 'ExtractValues'),
+    'uk.gov.gchq.koryphe.impl.function.FirstItem':
+        ('gafferpy.gaffer_functions', 'FirstItem'),
+    'uk.gov.gchq.koryphe.impl.function.Identity':
+        ('gafferpy.gaffer_functions', 'Identity'),
+    'uk.gov.gchq.koryphe.impl.function.If':
+        ('gafferpy.gaffer_functions', 'If'),
+    'uk.gov.gchq.koryphe.impl.function.IsEmpty':
+        ('gafferpy.gaffer_functions', 'IsEmpty'),
+    'uk.gov.gchq.koryphe.impl.function.IterableConcat':
+        ('gafferpy.gaffer_functions', 'IterableConcat'),
+    'uk.gov.gchq.koryphe.impl.function.IterableFilter':
+        ('gafferpy.gaffer_functions', 'IterableFilter'),
+    'uk.gov.gchq.koryphe.impl.function.IterableFunction':
+        ('gafferpy.gaffer_functions', 'IterableFunction'),
+    'uk.gov.gchq.koryphe.impl.function.LastItem':
+        ('gafferpy.gaffer_functions', 'LastItem'),
+    'uk.gov.gchq.koryphe.impl.function.Length':
+        ('gafferpy.gaffer_functions', 'Length'),
+    'uk.gov.gchq.koryphe.impl.function.MapFilter':
+        ('gafferpy.gaffer_functions', 'MapFilter'),
+    'uk.gov.gchq.koryphe.impl.function.Multiply':
+        ('gafferpy.gaffer_functions', 'Multiply'),
+    'uk.gov.gchq.koryphe.impl.function.MultiplyBy':
+        ('gafferpy.gaffer_functions', 'MultiplyBy'),
+    'uk.gov.gchq.koryphe.impl.function.NthItem':
+        ('gafferpy.gaffer_functions', 'NthItem'),
+    'uk.gov.gchq.koryphe.impl.function.SetValue':
+        ('gafferpy.gaffer_functions', 'SetValue'),
+    'uk.gov.gchq.koryphe.impl.function.Size':
+        ('gafferpy.gaffer_functions', 'Size'),
+    'uk.gov.gchq.koryphe.impl.function.ToArray':
+        ('gafferpy.gaffer_functions', 'ToArray'),
+    'uk.gov.gchq.koryphe.impl.function.ToInteger':
+        ('gafferpy.gaffer_functions', 'ToInteger'),
+    'uk.gov.gchq.koryphe.impl.function.ToList':
+        ('gafferpy.gaffer_functions', 'ToList'),
+    'uk.gov.gchq.koryphe.impl.function.ToLong':
+        ('gafferpy.gaffer_functions', 'ToLong'),
+    'uk.gov.gchq.koryphe.impl.function.ToLowerCase':
+        ('gafferpy.gaffer_functions', 'ToLowerCase'),
+    'uk.gov.gchq.koryphe.impl.function.ToNull':
+        ('gafferpy.gaffer_functions', 'ToNull'),
+    'uk.gov.gchq.koryphe.impl.function.ToSet':
+        ('gafferpy.gaffer_functions', 'ToSet'),
+    'uk.gov.gchq.koryphe.impl.function.ToString':
+        ('gafferpy.gaffer_functions', 'ToString'),
+    'uk.gov.gchq.koryphe.impl.function.ToUpperCase':
+        ('gafferpy.gaffer_functions', 'ToUpperCase'),
+    'uk.gov.gchq.koryphe.impl.predicate.AgeOff':
+        ('gafferpy.gaffer_predicates', 'AgeOff'),
+    'uk.gov.gchq.koryphe.impl.predicate.AgeOffFromDays':
+        ('gafferpy.gaffer_predicates', 'AgeOffFromDays'),
+    'uk.gov.gchq.koryphe.impl.predicate.And':
+        ('gafferpy.gaffer_predicates', 'And'),
+    'uk.gov.gchq.koryphe.impl.predicate.AreEqual':
+        ('gafferpy.gaffer_predicates', 'AreEqual'),
+    'uk.gov.gchq.koryphe.impl.predicate.AreIn':
+        ('gafferpy.gaffer_predicates', 'AreIn'),
+    'uk.gov.gchq.koryphe.impl.predicate.CollectionContains':
+        ('gafferpy.gaffer_predicates', 'CollectionContains'),
+    'uk.gov.gchq.koryphe.impl.predicate.Exists':
+        ('gafferpy.gaffer_predicates', 'Exists'),
+    'uk.gov.gchq.koryphe.impl.predicate.If':
+        ('gafferpy.gaffer_predicates', 'If'),
+    'uk.gov.gchq.koryphe.impl.predicate.IsA':
+        ('gafferpy.gaffer_predicates', 'IsA'),
+    'uk.gov.gchq.koryphe.impl.predicate.IsEqual':
+        ('gafferpy.gaffer_predicates', 'IsEqual'),
+    'uk.gov.gchq.koryphe.impl.predicate.IsFalse':
+        ('gafferpy.gaffer_predicates', 'IsFalse'),
+    'uk.gov.gchq.koryphe.impl.predicate.IsIn':
+        ('gafferpy.gaffer_predicates', 'IsIn'),
+    'uk.gov.gchq.koryphe.impl.predicate.IsLessThan':
+        ('gafferpy.gaffer_predicates', 'IsLessThan'),
+    'uk.gov.gchq.koryphe.impl.predicate.IsLongerThan':
+        ('gafferpy.gaffer_predicates', 'IsLongerThan'),
+    'uk.gov.gchq.koryphe.impl.predicate.IsMoreThan':
+        ('gafferpy.gaffer_predicates', 'IsMoreThan'),
+    'uk.gov.gchq.koryphe.impl.predicate.IsShorterThan':
+        ('gafferpy.gaffer_predicates', 'IsShorterThan'),
+    'uk.gov.gchq.koryphe.impl.predicate.IsTrue':
+        ('gafferpy.gaffer_predicates', 'IsTrue'),
+    'uk.gov.gchq.koryphe.impl.predicate.IsXLessThanY':
+        ('gafferpy.gaffer_predicates', 'IsXLessThanY'),
+    'uk.gov.gchq.koryphe.impl.predicate.IsXMoreThanY':
+        ('gafferpy.gaffer_predicates', 'IsXMoreThanY'),
+    'uk.gov.gchq.koryphe.impl.predicate.MapContains':
+        ('gafferpy.gaffer_predicates', 'MapContains'),
+    'uk.gov.gchq.koryphe.impl.predicate.MapContainsPredicate':
+        ('gafferpy.gaffer_predicates', 'MapContainsPredicate'),
+    'uk.gov.gchq.koryphe.impl.predicate.MultiRegex':
+        ('gafferpy.gaffer_predicates', 'MultiRegex'),
+    'uk.gov.gchq.koryphe.impl.predicate.Not':
+        ('gafferpy.gaffer_predicates', 'Not'),
+    'uk.gov.gchq.koryphe.impl.predicate.Or':
+        ('gafferpy.gaffer_predicates', 'Or'),
+    'uk.gov.gchq.koryphe.impl.predicate.Regex':
+        ('gafferpy.gaffer_predicates', 'Regex'),
+    'uk.gov.gchq.koryphe.impl.predicate.StringContains':
+        ('gafferpy.gaffer_predicates', 'StringContains'),
+    'uk.gov.gchq.koryphe.impl.predicate.range.InDateRange':
+        ('gafferpy.gaffer_predicates', 'InDateRange'),
+    'uk.gov.gchq.koryphe.impl.predicate.range.InDateRangeDual':
+        ('gafferpy.gaffer_predicates', 'InDateRangeDual'),
+    'uk.gov.gchq.koryphe.impl.predicate.range.InRange':
+        ('gafferpy.gaffer_predicates', 'InRange'),
+    'uk.gov.gchq.koryphe.impl.predicate.range.InRangeDual':
+        ('gafferpy.gaffer_predicates', 'InRangeDual'),
+    'uk.gov.gchq.koryphe.impl.predicate.range.InTimeRange':
+        ('gafferpy.gaffer_predicates', 'InTimeRange'),
+    'uk.gov.gchq.koryphe.impl.predicate.range.InTimeRangeDual':
+        ('gafferpy.gaffer_predicates', 'InTimeRangeDual'),
+    'uk.gov.gchq.koryphe.predicate.PredicateMap':
+        ('gafferpy.gaffer_predicates', 'PredicateMap'),
+    'uk.gov.gchq.koryphe.tuple.predicate.IntegerTupleAdaptedPredicate':
+        ('gafferpy.gaffer_predicates', 'NestedPredicate')
+}
+
+NAMES = {
+    'AbstractFunction': ('gafferpy.gaffer_functions', 'AbstractFunction'),
+    'AbstractPredicate': ('gafferpy.gaffer_predicates', 'AbstractPredicate'),
+    'AddElements': ('gafferpy.gaffer_operations', 'AddElements'),
+    'AddElementsFromFile':
+        ('gafferpy.gaffer_operations', 'AddElementsFromFile'),
+    'AddElementsFromKafka':
+        ('gafferpy.gaffer_operations', 'AddElementsFromKafka'),
+    'AddElementsFromSocket':
+        ('gafferpy.gaffer_operations', 'AddElementsFromSocket'),
+    'AddGraph': ('gafferpy.gaffer_operations', 'AddGraph'),
+    'AddGraphWithHooks': ('gafferpy.gaffer_operations', 'AddGraphWithHooks'),
+    'AddNamedOperation': ('gafferpy.gaffer_operations', 'AddNamedOperation'),
+    'AddNamedView': ('gafferpy.gaffer_operations', 'AddNamedView'),
+    'AgeOff': ('gafferpy.gaffer_predicates', 'AgeOff'),
+    'AgeOffFromDays': ('gafferpy.gaffer_predicates', 'AgeOffFromDays'),
+    'Aggregate': ('gafferpy.gaffer_operations', 'Aggregate'),
+    'AggregatePair': ('gafferpy.gaffer_operations', 'AggregatePair'),
+    'And': ('gafferpy.gaffer_predicates', 'And'),
+    'AreEqual': ('gafferpy.gaffer_predicates', 'AreEqual'),
+    'AreIn': ('gafferpy.gaffer_predicates', 'AreIn'),
+    'BinaryOperator': ('gafferpy.gaffer_binaryoperators', 'BinaryOperator'),
+    'BinaryOperatorContext':
+        ('gafferpy.gaffer_binaryoperators', 'BinaryOperatorContext'),
+    'CallMethod': ('gafferpy.gaffer_functions', 'CallMethod'),
+    'Cast': ('gafferpy.gaffer_functions', 'Cast'),
+    'CollectionContains': ('gafferpy.gaffer_predicates', 'CollectionContains'),
+    'Concat': ('gafferpy.gaffer_functions', 'Concat'),
+    'Conditional': ('gafferpy.gaffer_operations', 'Conditional'),
+    'Count': ('gafferpy.gaffer_operations', 'Count'),
+    'CountGroups': ('gafferpy.gaffer_operations', 'CountGroups'),
+    'CsvGenerator': ('gafferpy.gaffer_functions', 'CsvGenerator'),
+    'DeleteNamedOperation':
+        ('gafferpy.gaffer_operations', 'DeleteNamedOperation'),
+    'DeleteNamedView': ('gafferpy.gaffer_operations', 'DeleteNamedView'),
+    'DiscardOutput': ('gafferpy.gaffer_operations', 'DiscardOutput'),
+    'Divide': ('gafferpy.gaffer_functions', 'Divide'),
+    'DivideBy': ('gafferpy.gaffer_functions', 'DivideBy'),
+    'ElementAggregateDefinition':
+        ('gafferpy.gaffer_operations', 'ElementAggregateDefinition'),
+    'ElementDefinition': ('gafferpy.gaffer_operations', 'ElementDefinition'),
+    'ElementFilterDefinition':
+        ('gafferpy.gaffer_operations', 'ElementFilterDefinition'),
+    'ElementGenerator': ('gafferpy.gaffer_functions', 'ElementGenerator'),
+    'ElementJoinComparator':
+        ('gafferpy.gaffer_predicates', 'ElementJoinComparator'),
+    'ElementMatch': ('gafferpy.gaffer_operations', 'ElementMatch'),
+    'ElementMerge': ('gafferpy.gaffer_operations', 'ElementMerge'),
+    'ElementTransformDefinition':
+        ('gafferpy.gaffer_operations', 'ElementTransformDefinition'),
+    'Exists': ('gafferpy.gaffer_predicates', 'Exists'),
+    'ExportToGafferResultCache':
+        ('gafferpy.gaffer_operations', 'ExportToGafferResultCache'),
+    'ExportToOtherAuthorisedGraph':
+        ('gafferpy.gaffer_operations', 'ExportToOtherAuthorisedGraph'),
+    'ExportToOtherGraph': ('gafferpy.gaffer_operations', 'ExportToOtherGraph'),
+    'ExportToSet': ('gafferpy.gaffer_operations', 'ExportToSet'),
+    'ExtractGroup': ('gafferpy.gaffer_functions', 'ExtractGroup'),
+    'ExtractId': ('gafferpy.gaffer_functions', 'ExtractId'),
+    'ExtractKeys': ('gafferpy.gaffer_functions', 'ExtractKeys'),
+    'ExtractProperty': ('gafferpy.gaffer_functions', 'ExtractProperty'),
+    'ExtractValue': ('gafferpy.gaffer_functions', 'ExtractValue'),
+    'ExtractValues': ('gafferpy.gaffer_functions', 'ExtractValues'),
+    'ExtractWalkEdges': ('gafferpy.gaffer_functions', 'ExtractWalkEdges'),
+    'ExtractWalkEdgesFromHop':
+        ('gafferpy.gaffer_functions', 'ExtractWalkEdgesFromHop'),
+    'ExtractWalkEntities':
+        ('gafferpy.gaffer_functions', 'ExtractWalkEntities'),
+    'ExtractWalkEntitiesFromHop':
+        ('gafferpy.gaffer_functions', 'ExtractWalkEntitiesFromHop'),
+    'ExtractWalkVertex': ('gafferpy.gaffer_functions', 'ExtractWalkVertex'),
+    'Filter': ('gafferpy.gaffer_operations', 'Filter'),
+    'FirstItem': ('gafferpy.gaffer_functions', 'FirstItem'),
+    'ForEach': ('gafferpy.gaffer_operations', 'ForEach'),
+    'FreqMapExtractor': ('gafferpy.gaffer_functions', 'FreqMapExtractor'),
+    'FreqMapPredicator': ('gafferpy.gaffer_functions', 'FreqMapPredicator'),
+    'FromElementId': ('gafferpy.gaffer_functions', 'FromElementId'),
+    'FromEntityId': ('gafferpy.gaffer_functions', 'FromEntityId'),
+    'Function': ('gafferpy.gaffer_functions', 'Function'),
+    'FunctionContext': ('gafferpy.gaffer_functions', 'FunctionContext'),
+    'FunctionMap': ('gafferpy.gaffer_functions', 'FunctionMap'),
+    'GenerateElements': ('gafferpy.gaffer_operations', 'GenerateElements'),
+    'GenerateObjects': ('gafferpy.gaffer_operations', 'GenerateObjects'),
+    'GetAdjacentIds': ('gafferpy.gaffer_operations', 'GetAdjacentIds'),
+    'GetAllElements': ('gafferpy.gaffer_operations', 'GetAllElements'),
+    'GetAllGraphIds': ('gafferpy.gaffer_operations', 'GetAllGraphIds'),
+    'GetAllJobDetails': ('gafferpy.gaffer_operations', 'GetAllJobDetails'),
+    'GetAllNamedOperations':
+        ('gafferpy.gaffer_operations', 'GetAllNamedOperations'),
+    'GetAllNamedViews': ('gafferpy.gaffer_operations', 'GetAllNamedViews'),
+    'GetClassFilterFunctions':
+        ('gafferpy.gaffer_config', 'GetClassFilterFunctions'),
+    'GetElementGenerators': ('gafferpy.gaffer_config', 'GetElementGenerators'),
+    'GetElements': ('gafferpy.gaffer_operations', 'GetElements'),
+    'GetElementsBetweenSets':
+        ('gafferpy.gaffer_operations', 'GetElementsBetweenSets'),
+    'GetElementsInRanges':
+        ('gafferpy.gaffer_operations', 'GetElementsInRanges'),
+    'GetElementsWithinSet':
+        ('gafferpy.gaffer_operations', 'GetElementsWithinSet'),
+    'GetExports': ('gafferpy.gaffer_operations', 'GetExports'),
+    'GetFilterFunctions': ('gafferpy.gaffer_config', 'GetFilterFunctions'),
+    'GetFromEndpoint': ('gafferpy.gaffer_operations', 'GetFromEndpoint'),
+    'GetGafferResultCacheExport':
+        ('gafferpy.gaffer_operations', 'GetGafferResultCacheExport'),
+    'GetGraph': ('gafferpy.gaffer_config', 'GetGraph'),
+    'GetJobDetails': ('gafferpy.gaffer_operations', 'GetJobDetails'),
+    'GetJobResults': ('gafferpy.gaffer_operations', 'GetJobResults'),
+    'GetObjectGenerators': ('gafferpy.gaffer_config', 'GetObjectGenerators'),
+    'GetOperation': ('gafferpy.gaffer_operations', 'GetOperation'),
+    'GetOperations': ('gafferpy.gaffer_config', 'GetOperations'),
+    'GetSchema': ('gafferpy.gaffer_config', 'GetSchema'),
+    'GetSerialisedFields': ('gafferpy.gaffer_config', 'GetSerialisedFields'),
+    'GetSetExport': ('gafferpy.gaffer_operations', 'GetSetExport'),
+    'GetStoreTraits': ('gafferpy.gaffer_config', 'GetStoreTraits'),
+    'GetTraits': ('gafferpy.gaffer_operations', 'GetTraits'),
+    'GetTransformFunctions':
+        ('gafferpy.gaffer_config', 'GetTransformFunctions'),
+    'GetVariable': ('gafferpy.gaffer_operations', 'GetVariable'),
+    'GetVariables': ('gafferpy.gaffer_operations', 'GetVariables'),
+    'GetWalks': ('gafferpy.gaffer_operations', 'GetWalks'),
+    'GlobalElementDefinition':
+        ('gafferpy.gaffer_operations', 'GlobalElementDefinition'),
+    'GlobalElementFilterDefinition':
+        ('gafferpy.gaffer_operations', 'GlobalElementFilterDefinition'),
+    'HllSketchIsLessThan':
+        ('gafferpy.gaffer_predicates', 'HllSketchIsLessThan'),
+    'HyperLogLogPlusIsLessThan':
+        ('gafferpy.gaffer_predicates', 'HyperLogLogPlusIsLessThan'),
+    'Identity': ('gafferpy.gaffer_functions', 'Identity'),
+    'If': ('gafferpy.gaffer_operations', 'If'),
+    'InDateRange': ('gafferpy.gaffer_predicates', 'InDateRange'),
+    'InDateRangeDual': ('gafferpy.gaffer_predicates', 'InDateRangeDual'),
+    'InRange': ('gafferpy.gaffer_predicates', 'InRange'),
+    'InRangeDual': ('gafferpy.gaffer_predicates', 'InRangeDual'),
+    'InTimeRange': ('gafferpy.gaffer_predicates', 'InTimeRange'),
+    'InTimeRangeDual': ('gafferpy.gaffer_predicates', 'InTimeRangeDual'),
+    'IsA': ('gafferpy.gaffer_predicates', 'IsA'),
+    'IsEmpty': ('gafferpy.gaffer_functions', 'IsEmpty'),
+    'IsEqual': ('gafferpy.gaffer_predicates', 'IsEqual'),
+    'IsFalse': ('gafferpy.gaffer_predicates', 'IsFalse'),
+    'IsIn': ('gafferpy.gaffer_predicates', 'IsIn'),
+    'IsLessThan': ('gafferpy.gaffer_predicates', 'IsLessThan'),
+    'IsLongerThan': ('gafferpy.gaffer_predicates', 'IsLongerThan'),
+    'IsMoreThan': ('gafferpy.gaffer_predicates', 'IsMoreThan'),
+    'IsOperationSupported': ('gafferpy.gaffer_config', 'IsOperationSupported'),
+    'IsShorterThan': ('gafferpy.gaffer_predicates', 'IsShorterThan'),
+    'IsTrue': ('gafferpy.gaffer_predicates', 'IsTrue'),
+    'IsXLessThanY': ('gafferpy.gaffer_predicates', 'IsXLessThanY'),
+    'IsXMoreThanY': ('gafferpy.gaffer_predicates', 'IsXMoreThanY'),
+    'IterableConcat': ('gafferpy.gaffer_functions', 'IterableConcat'),
+    'IterableFilter': ('gafferpy.gaffer_functions', 'IterableFilter'),
+    'IterableFunction': ('gafferpy.gaffer_functions', 'IterableFunction'),
+    'Join': ('gafferpy.gaffer_operations', 'Join'),
+    'JsonToElementGenerator':
+        ('gafferpy.gaffer_functions', 'JsonToElementGenerator'),
+    'LastItem': ('gafferpy.gaffer_functions', 'LastItem'),
+    'Length': ('gafferpy.gaffer_functions', 'Length'),
+    'Limit': ('gafferpy.gaffer_operations', 'Limit'),
+    'Map': ('gafferpy.gaffer_operations', 'Map'),
+    'MapContains': ('gafferpy.gaffer_predicates', 'MapContains'),
+    'MapContainsPredicate':
+        ('gafferpy.gaffer_predicates', 'MapContainsPredicate'),
+    'MapFilter': ('gafferpy.gaffer_functions', 'MapFilter'),
+    'MapGenerator': ('gafferpy.gaffer_functions', 'MapGenerator'),
+    'Match': ('gafferpy.gaffer_operations', 'Match'),
+    'Max': ('gafferpy.gaffer_operations', 'Max'),
+    'Merge': ('gafferpy.gaffer_operations', 'Merge'),
+    'Min': ('gafferpy.gaffer_operations', 'Min'),
+    'MultiRegex': ('gafferpy.gaffer_predicates', 'MultiRegex'),
+    'Multiply': ('gafferpy.gaffer_functions', 'Multiply'),
+    'MultiplyBy': ('gafferpy.gaffer_functions', 'MultiplyBy'),
+    'NamedOperation': ('gafferpy.gaffer_operations', 'NamedOperation'),
+    'NamedOperationParameter':
+        ('gafferpy.gaffer_operations', 'NamedOperationParameter'),
+    'NamedView': ('gafferpy.gaffer_operations', 'NamedView'),
+    'NamedViewParameter': ('gafferpy.gaffer_operations', 'NamedViewParameter'),
+    'NestedPredicate': ('gafferpy.gaffer_predicates', 'NestedPredicate'),
+    'Not': ('gafferpy.gaffer_predicates', 'Not'),
+    'NthItem': ('gafferpy.gaffer_functions', 'NthItem'),
+    'Operation': ('gafferpy.gaffer_operations', 'Operation'),
+    'OperationChain': ('gafferpy.gaffer_operations', 'OperationChain'),
+    'OperationChainDAO': ('gafferpy.gaffer_operations', 'OperationChainDAO'),
+    'Or': ('gafferpy.gaffer_predicates', 'Or'),
+    'Predicate': ('gafferpy.gaffer_predicates', 'Predicate'),
+    'PredicateContext': ('gafferpy.gaffer_predicates', 'PredicateContext'),
+    'PredicateMap': ('gafferpy.gaffer_predicates', 'PredicateMap'),
+    'Property': ('gafferpy.gaffer_operations', 'Property'),
+    'Reduce': ('gafferpy.gaffer_operations', 'Reduce'),
+    'Regex': ('gafferpy.gaffer_predicates', 'Regex'),
+    'RemoveGraph': ('gafferpy.gaffer_operations', 'RemoveGraph'),
+    'SampleElementsForSplitPoints':
+        ('gafferpy.gaffer_operations', 'SampleElementsForSplitPoints'),
+    'ScoreOperationChain':
+        ('gafferpy.gaffer_operations', 'ScoreOperationChain'),
+    'SetValue': ('gafferpy.gaffer_functions', 'SetValue'),
+    'SetVariable': ('gafferpy.gaffer_operations', 'SetVariable'),
+    'Size': ('gafferpy.gaffer_functions', 'Size'),
+    'Sort': ('gafferpy.gaffer_operations', 'Sort'),
+    'SplitStoreFromFile': ('gafferpy.gaffer_operations', 'SplitStoreFromFile'),
+    'SplitStoreFromIterable':
+        ('gafferpy.gaffer_operations', 'SplitStoreFromIterable'),
+    'StringContains': ('gafferpy.gaffer_predicates', 'StringContains'),
+    'SummariseGroupOverRanges':
+        ('gafferpy.gaffer_operations', 'SummariseGroupOverRanges'),
+    'TimeUnit': ('gafferpy.gaffer_predicates', 'TimeUnit'),
+    'ToArray': ('gafferpy.gaffer_operations', 'ToArray'),
+    'ToCsv': ('gafferpy.gaffer_operations', 'ToCsv'),
+    'ToElementId': ('gafferpy.gaffer_functions', 'ToElementId'),
+    'ToEntityId': ('gafferpy.gaffer_functions', 'ToEntityId'),
+    'ToEntitySeeds': ('gafferpy.gaffer_operations', 'ToEntitySeeds'),
+    'ToFreqMap': ('gafferpy.gaffer_functions', 'ToFreqMap'),
+    'ToInteger': ('gafferpy.gaffer_functions', 'ToInteger'),
+    'ToList': ('gafferpy.gaffer_operations', 'ToList'),
+    'ToLong': ('gafferpy.gaffer_functions', 'ToLong'),
+    'ToLowerCase': ('gafferpy.gaffer_functions', 'ToLowerCase'),
+    'ToMap': ('gafferpy.gaffer_operations', 'ToMap'),
+    'ToNull': ('gafferpy.gaffer_functions', 'ToNull'),
+    'ToSet': ('gafferpy.gaffer_operations', 'ToSet'),
+    'ToSingletonList': ('gafferpy.gaffer_operations', 'ToSingletonList'),
+    'ToStream': ('gafferpy.gaffer_operations', 'ToStream'),
+    'ToString': ('gafferpy.gaffer_functions', 'ToString'),
+    'ToTypeSubTypeValue': ('gafferpy.gaffer_functions', 'ToTypeSubTypeValue'),
+    'ToTypeValue': ('gafferpy.gaffer_functions', 'ToTypeValue'),
+    'ToUpperCase': ('gafferpy.gaffer_functions', 'ToUpperCase'),
+    'ToVertices': ('gafferpy.gaffer_operations', 'ToVertices'),
+    'Transform': ('gafferpy.gaffer_operations', 'Transform'),
+    'UnwrapEntityId': ('gafferpy.gaffer_functions', 'UnwrapEntityId'),
+    'Validate': ('gafferpy.gaffer_operations', 'Validate'),
+    'ValidateOperationChain':
+        ('gafferpy.gaffer_operations', 'ValidateOperationChain'),
+    'View': ('gafferpy.gaffer_operations', 'View'),
+    'While': ('gafferpy.gaffer_operations', 'While'),
+    'binary_operator_context_converter':
+        ('gafferpy.gaffer_binaryoperators',
+         'binary_operator_context_converter'),
+    'binary_operator_converter':
+        ('gafferpy.gaffer_binaryoperators', 'binary_operator_converter'),
+    'bop': ('gafferpy.gaffer_binaryoperators', None),
+    'conf': ('gafferpy.gaffer_config', None),
+    'date': ('gafferpy.gaffer_types', 'date'),
+    'freq_map': ('gafferpy.gaffer_types', 'freq_map'),
+    'func': ('gafferpy.gaffer_functions', None),
+    'function_context_converter':
+        ('gafferpy.gaffer_functions', 'function_context_converter'),
+    'function_converter': ('gafferpy.gaffer_functions', 'function_converter'),
+    'gaffer_binaryoperators':
+        ('gafferpy.gaffer_operations', 'gaffer_binaryoperators'),
+    'gaffer_functions': ('gafferpy.gaffer_operations', 'gaffer_functions'),
+    'gaffer_operations': ('gafferpy.gaffer_config', 'gaffer_operations'),
+    'gaffer_predicates': ('gafferpy.gaffer_operations', 'gaffer_predicates'),
+    'load_binaryoperator_json_map':
+        ('gafferpy.gaffer_binaryoperators', 'load_binaryoperator_json_map'),
+    'load_config_json_map': ('gafferpy.gaffer_config', 'load_config_json_map'),
+    'load_function_json_map':
+        ('gafferpy.gaffer_functions', 'load_function_json_map'),
+    'load_operation_json_map':
+        ('gafferpy.gaffer_operations', 'load_operation_json_map'),
+    'load_predicate_json_map':
+        ('gafferpy.gaffer_predicates', 'load_predicate_json_map'),
+    'long': ('gafferpy.gaffer_types', 'long'),
+    'op': ('gafferpy.gaffer_operations', None),
+    'pred': ('gafferpy.gaffer_predicates', None),
+    'predicate_context_converter':
+        ('gafferpy.gaffer_predicates', 'predicate_context_converter'),
+    'predicate_converter':
+        ('gafferpy.gaffer_predicates', 'predicate_converter'),
+    't': ('gafferpy.gaffer_types', None),
+    'type_subtype_value': ('gafferpy.gaffer_types', 'type_subtype_value'),
+    'type_value': ('gafferpy.gaffer_types', 'type_value')
+}
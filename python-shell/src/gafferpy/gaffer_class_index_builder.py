@@ -0,0 +1,177 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module regenerates gaffer_class_index.py. Run it from the src directory
+after adding or renaming classes:
+
+python3 -m gafferpy.gaffer_class_index_builder
+"""
+
+import importlib
+import os
+
+MODULES = (
+    'gafferpy.gaffer_core',
+    'gafferpy.gaffer_predicates',
+    'gafferpy.gaffer_functions',
+    'gafferpy.gaffer_binaryoperators',
+    'gafferpy.gaffer_operations',
+    'gafferpy.gaffer_config',
+    'gafferpy.gaffer_types'
+)
+
+# Short names gafferpy.gaffer provides for whole modules
+MODULE_ALIASES = {
+    'pred': 'gafferpy.gaffer_predicates',
+    'func': 'gafferpy.gaffer_functions',
+    'bop': 'gafferpy.gaffer_binaryoperators',
+    'op': 'gafferpy.gaffer_operations',
+    'conf': 'gafferpy.gaffer_config',
+    't': 'gafferpy.gaffer_types'
+}
+
+_HEADER = '''#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module is generated by gaffer_class_index_builder, do not edit it.
+
+It records where each Gaffer class and each name provided by gafferpy.gaffer
+is defined, so that modules can be imported when they are first needed.
+"""
+'''
+
+
+def build_index():
+    """
+    Imports every module and returns the modules, the (module, name) of the
+    class registered for each json class name, and the (module, attribute)
+    of each name gafferpy.gaffer provides outside gaffer_core. An attribute
+    of None means the name refers to the module itself.
+    """
+    modules = [importlib.import_module(name) for name in MODULES]
+    from gafferpy.gaffer_core import JsonConverter
+
+    classes = {}
+    for class_name, converter in dict.items(
+            JsonConverter.GENERIC_JSON_CONVERTERS):
+        class_obj = converter.__defaults__[0]
+        classes[class_name] = (class_obj.__module__, class_obj.__name__)
+    for class_name, converter in dict.items(
+            JsonConverter.CUSTOM_JSON_CONVERTERS):
+        if class_name not in classes:
+            classes[class_name] = (converter.__module__, None)
+
+    core = vars(modules[0])
+    names = {}
+    for module in modules[1:]:
+        for name, value in vars(module).items():
+            if name.startswith('_'):
+                continue
+            if name in core:
+                if core[name] is not value:
+                    raise ValueError(module.__name__ + '.' + name +
+                                     ' hides gaffer_core.' + name)
+                continue
+            names[name] = (module.__name__, name)
+    for name, module_name in MODULE_ALIASES.items():
+        names[name] = (module_name, None)
+
+    return MODULES, classes, names
+
+
+_MAX_LINE_LENGTH = 79
+
+
+def _split_name(name, indent):
+    """
+    Splits a dotted name after dots into pieces that fit on a line as
+    strings, with room for a closing bracket and colon.
+    """
+    pieces = []
+    max_length = _MAX_LINE_LENGTH - len(indent) - 4
+    while len(name) > max_length:
+        cut = name.rfind('.', 0, max_length) + 1
+        if cut == 0:
+            break
+        pieces.append(name[:cut])
+        name = name[cut:]
+    pieces.append(name)
+    return pieces
+
+
+def _render_entry(key, value):
+    """
+    Returns a dict entry on one line if it fits. Otherwise the value goes on
+    the next line, a long key is split into implicitly joined strings and a
+    long value is split into one item per line.
+    """
+    line = '    ' + repr(key) + ': ' + repr(value)
+    # Allow for the comma following the entry
+    if len(line) < _MAX_LINE_LENGTH:
+        return line
+
+    pieces = _split_name(key, '     ')
+    if len(pieces) == 1:
+        lines = ['    ' + repr(key) + ':']
+    else:
+        lines = ['    (' + repr(pieces[0])]
+        lines.extend('     ' + repr(piece) for piece in pieces[1:])
+        lines[-1] += '):'
+
+    value_line = '        ' + repr(value)
+    if len(value_line) < _MAX_LINE_LENGTH:
+        lines.append(value_line)
+    else:
+        lines.append('        (' + repr(value[0]) + ',')
+        lines.append('         ' + repr(value[1]) + ')')
+    return '\n'.join(lines)
+
+
+def render_index(modules, classes, names):
+    lines = [_HEADER, 'MODULES = (']
+    lines.append(',\n'.join('    ' + repr(name) for name in modules))
+    lines.append(')\n')
+    for title, index in [('CLASSES', classes), ('NAMES', names)]:
+        lines.append(title + ' = {')
+        lines.append(',\n'.join(_render_entry(key, index[key])
+                                for key in sorted(index)))
+        lines.append('}\n')
+    return '\n'.join(lines)
+
+
+def write_index():
+    path = os.path.join(os.path.dirname(__file__), 'gaffer_class_index.py')
+    with open(path, 'w') as index_file:
+        index_file.write(render_index(*build_index()))
+
+
+if __name__ == '__main__':
+    write_index()
@@ -0,0 +1,110 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module collapses identical operation chains that are run at the same
+time into a single request to Gaffer
+"""
+
+import threading
+
+from gafferpy import gaffer_cache
+from gafferpy import gaffer_deadline
+from gafferpy import gaffer_metrics
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class RequestCoalescer:
+    """
+    While an operation chain is being executed, other threads executing an
+    identical chain, with the same host and headers, wait for it to finish
+    and share its response instead of sending their own request. Chains are
+    compared by their gaffer_cache fingerprint.
+
+    Only a successful response is shared. If the request fails, each
+    waiting thread sends the chain again, coalescing with each other.
+    Chains containing write or stateful operations, such as exports, are
+    always sent.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def run(self, host, operation_chain, headers, execute, deadline=None):
+        """
+        Returns the response text of an identical chain already in flight,
+        or calls execute to get it. If a gaffer_deadline.Deadline is given,
+        DeadlineExceeded is raised if it passes while waiting for another
+        thread's request.
+        """
+        chain_fingerprint, classes = gaffer_cache.fingerprint_with_classes(
+            operation_chain)
+        if not classes.isdisjoint(gaffer_cache.WRITE_OPERATIONS) or \
+                not classes.isdisjoint(gaffer_cache.STATEFUL_OPERATIONS):
+            return execute()
+
+        key = (host, tuple(sorted(headers.items())), chain_fingerprint)
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                if call is None:
+                    call = _Call()
+                    self._calls[key] = call
+                    self.executed += 1
+                    break
+                call.waiters += 1
+
+            timeout = None if deadline is None else deadline.remaining()
+            if not call.done.wait(timeout):
+                raise gaffer_deadline.DeadlineExceeded('Deadline exceeded')
+            if call.error is None:
+                # Only counted once the shared response is used, as a
+                # follower of a failed request executes it again
+                with self._lock:
+                    self.coalesced += 1
+                return call.result
+
+        try:
+            call.result = execute()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def get_metrics(self):
+        """
+        Returns the number of requests executed and coalesced as
+        CoalescingMetrics.
+        """
+        with self._lock:
+            return gaffer_metrics.CoalescingMetrics(self.executed,
+                                                    self.coalesced)
@@ -0,0 +1,299 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module contains memory compact versions of the Gaffer element and seed
+classes, for holding very large numbers of results in memory
+"""
+
+import json
+import sys
+
+from gafferpy import gaffer as g
+
+
+class CompactEntity(g.ToJson, g.ToCodeString):
+    """
+    An Entity stored in slots rather than an instance dictionary. It has the
+    same public attributes and json as g.Entity and compares equal to it.
+    """
+    CLASS = g.Entity.CLASS
+
+    __slots__ = ('group', 'vertex', 'properties')
+
+    def __init__(self, group, vertex, properties=None):
+        if not isinstance(group, str):
+            raise TypeError('Group must be a string')
+        if not isinstance(properties, dict) and properties is not None:
+            raise TypeError('properties must be a dictionary or None')
+        self.group = group
+        self.vertex = vertex
+        self.properties = properties
+
+    def to_json(self):
+        entity = {'class': self.CLASS, 'group': self.group}
+        if self.properties is not None:
+            entity['properties'] = self.properties
+        entity['vertex'] = self.vertex
+        return entity
+
+    def to_code_string(self, header=False, indent=''):
+        return to_standard(self).to_code_string(header, indent)
+
+
+class CompactEdge(g.ToJson, g.ToCodeString):
+    """
+    An Edge stored in slots rather than an instance dictionary. It has the
+    same public attributes and json as g.Edge and compares equal to it.
+    """
+    CLASS = g.Edge.CLASS
+
+    __slots__ = ('group', 'source', 'destination', 'directed', 'properties',
+                 'matched_vertex')
+
+    def __init__(self, group, source, destination, directed, properties=None,
+                 matched_vertex=None):
+        if not isinstance(group, str):
+            raise TypeError('Group must be a string')
+        if not isinstance(properties, dict) and properties is not None:
+            raise TypeError('properties must be a dictionary or None')
+        if not isinstance(directed, bool):
+            raise TypeError('Directed must be a boolean')
+        self.group = group
+        self.source = source
+        self.destination = destination
+        self.directed = directed
+        self.properties = properties
+        self.matched_vertex = matched_vertex
+
+    def to_json(self):
+        edge = {'class': self.CLASS, 'group': self.group}
+        if self.properties is not None:
+            edge['properties'] = self.properties
+        edge['source'] = self.source
+        edge['destination'] = self.destination
+        edge['directed'] = self.directed
+        if self.matched_vertex is not None:
+            edge['matchedVertex'] = self.matched_vertex
+        return edge
+
+    def to_code_string(self, header=False, indent=''):
+        return to_standard(self).to_code_string(header, indent)
+
+
+class CompactEntitySeed(g.ElementSeed):
+    """
+    An EntitySeed stored in a slot. It can be used anywhere a g.EntitySeed
+    can be used as an operation input.
+    """
+    CLASS = g.EntitySeed.CLASS
+
+    __slots__ = ('vertex',)
+
+    def __init__(self, vertex):
+        self.vertex = vertex
+
+    def to_json(self):
+        return {'class': self.CLASS,
+                'vertex': self.vertex}
+
+    def to_json_wrapped(self):
+        return {
+            self.CLASS: {
+                'vertex': self.vertex,
+                'class': self.CLASS
+            }
+        }
+
+    def to_code_string(self, header=False, indent=''):
+        return to_standard(self).to_code_string(header, indent)
+
+
+class CompactEdgeSeed(g.ElementSeed):
+    """
+    An EdgeSeed stored in slots. It can be used anywhere a g.EdgeSeed can be
+    used as an operation input.
+    """
+    CLASS = g.EdgeSeed.CLASS
+
+    __slots__ = ('source', 'destination', 'directed_type', 'matched_vertex')
+
+    def __init__(self, source, destination, directed_type,
+                 matched_vertex=None):
+        self.source = source
+        self.destination = destination
+        if isinstance(directed_type, str):
+            self.directed_type = directed_type
+        elif directed_type:
+            self.directed_type = g.DirectedType.DIRECTED
+        else:
+            self.directed_type = g.DirectedType.UNDIRECTED
+        self.matched_vertex = matched_vertex
+
+    def to_json(self):
+        seed = {
+            'class': self.CLASS,
+            'source': self.source,
+            'destination': self.destination,
+            'directedType': self.directed_type
+        }
+        if self.matched_vertex is not None:
+            seed['matchedVertex'] = self.matched_vertex
+        return seed
+
+    def to_json_wrapped(self):
+        seed = {
+            'source': self.source,
+            'destination': self.destination,
+            'directedType': self.directed_type,
+            'class': self.CLASS
+        }
+        if self.matched_vertex is not None:
+            seed['matchedVertex'] = self.matched_vertex
+        return {
+            self.CLASS: seed
+        }
+
+    def to_code_string(self, header=False, indent=''):
+        return to_standard(self).to_code_string(header, indent)
+
+
+class CompactSeedPair(g.ToJson, g.ToCodeString):
+    """
+    A SeedPair stored in slots, holding compact seeds. It accepts the same
+    arguments as g.SeedPair.
+    """
+    CLASS = g.SeedPair.CLASS
+
+    __slots__ = ('first', 'second')
+
+    def __init__(self, first, second):
+        pair = g.SeedPair(first, second)
+        self.first = to_compact(pair.first)
+        self.second = to_compact(pair.second)
+
+    def to_json(self):
+        return {
+            'class': self.CLASS,
+            'first': self.first.to_json_wrapped(),
+            'second': self.second.to_json_wrapped()
+        }
+
+    def to_code_string(self, header=False, indent=''):
+        return to_standard(self).to_code_string(header, indent)
+
+
+def to_compact(obj):
+    """
+    Converts an Entity, Edge, EntitySeed, EdgeSeed or SeedPair into its
+    compact version. Anything else is returned unchanged.
+    """
+    obj_type = type(obj)
+    if obj_type is g.Edge:
+        return CompactEdge(obj.group, obj.source, obj.destination,
+                           obj.directed, obj.properties, obj.matched_vertex)
+    if obj_type is g.Entity:
+        return CompactEntity(obj.group, obj.vertex, obj.properties)
+    if obj_type is g.EntitySeed:
+        return CompactEntitySeed(obj.vertex)
+    if obj_type is g.EdgeSeed:
+        return CompactEdgeSeed(obj.source, obj.destination,
+                               obj.directed_type, obj.matched_vertex)
+    if obj_type is g.SeedPair:
+        return CompactSeedPair(obj.first, obj.second)
+    return obj
+
+
+def to_standard(obj):
+    """
+    Converts a compact element, seed or seed pair back into the standard
+    gaffer class. Anything else is returned unchanged.
+    """
+    obj_type = type(obj)
+    if obj_type is CompactEdge:
+        return g.Edge(obj.group, obj.source, obj.destination, obj.directed,
+                      obj.properties, obj.matched_vertex)
+    if obj_type is CompactEntity:
+        return g.Entity(obj.group, obj.vertex, obj.properties)
+    if obj_type is CompactEntitySeed:
+        return g.EntitySeed(obj.vertex)
+    if obj_type is CompactEdgeSeed:
+        return g.EdgeSeed(obj.source, obj.destination, obj.directed_type,
+                          obj.matched_vertex)
+    if obj_type is CompactSeedPair:
+        return g.SeedPair(to_standard(obj.first), to_standard(obj.second))
+    return obj
+
+
+def _intern(value):
+    if value is None:
+        return None
+    return sys.intern(value)
+
+
+def _decode_entity(obj):
+    return CompactEntity(sys.intern(obj['group']), obj.get('vertex'),
+                         obj.get('properties'))
+
+
+def _decode_edge(obj):
+    return CompactEdge(sys.intern(obj['group']), obj.get('source'),
+                       obj.get('destination'), obj.get('directed'),
+                       obj.get('properties'),
+                       _intern(obj.get('matchedVertex')))
+
+
+def _decode_entity_seed(obj):
+    return CompactEntitySeed(obj.get('vertex'))
+
+
+def _decode_edge_seed(obj):
+    return CompactEdgeSeed(obj.get('source'), obj.get('destination'),
+                           _intern(obj.get('directedType')),
+                           _intern(obj.get('matchedVertex')))
+
+
+_DECODERS = {
+    g.Entity.CLASS: _decode_entity,
+    g.Edge.CLASS: _decode_edge,
+    g.EntitySeed.CLASS: _decode_entity_seed,
+    g.EdgeSeed.CLASS: _decode_edge_seed
+}
+
+
+def object_decoder(obj):
+    """
+    A json object_hook that decodes elements and seeds into their compact
+    versions. Group names and matched vertex and directed type values are
+    interned, so that they are shared rather than copied for every element.
+    Other objects are decoded as g.JsonConverter.object_decoder does.
+    """
+    decoder = _DECODERS.get(obj.get('class'))
+    if decoder is not None:
+        return decoder(obj)
+    return g.JsonConverter.object_decoder(obj)
+
+
+def from_json(json_obj):
+    """
+    Decodes a json string, or a list or dictionary loaded from json, into
+    python objects using compact elements and seeds.
+    """
+    if json_obj is None:
+        return None
+    if not isinstance(json_obj, str):
+        json_obj = json.dumps(json_obj)
+    return json.loads(json_obj, object_hook=object_decoder)
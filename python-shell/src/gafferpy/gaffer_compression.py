@@ -0,0 +1,120 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module compresses request bodies and decompresses responses sent to and
+from a Gaffer REST API
+"""
+
+import gzip
+import zlib
+
+ACCEPT_ENCODING = 'gzip, deflate'
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_SIZE = 1024
+
+DEFAULT_COMPRESS_LEVEL = 6
+
+_READ_SIZE = 64 * 1024
+
+
+def compress(data, level=DEFAULT_COMPRESS_LEVEL):
+    """
+    Returns data compressed with gzip.
+    """
+    return gzip.compress(data, compresslevel=level)
+
+
+def _decompressor(content_encoding):
+    encoding = (content_encoding or '').strip().lower()
+    if encoding in ('gzip', 'x-gzip'):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == 'deflate':
+        # Detects a zlib header, which deflate responses should have
+        return zlib.decompressobj(32 + zlib.MAX_WBITS)
+    if encoding in ('', 'identity'):
+        return None
+    raise ValueError('Unsupported Content-Encoding: ' + content_encoding)
+
+
+def decompress(data, content_encoding):
+    """
+    Returns a response body decompressed according to its Content-Encoding.
+    """
+    decompressor = _decompressor(content_encoding)
+    if decompressor is None:
+        return data
+    return decompressor.decompress(data) + decompressor.flush()
+
+
+def decompress_response(response):
+    """
+    Returns the response, or a DecompressingResponse wrapping it if its
+    Content-Encoding header says that it is compressed.
+    """
+    decompressor = _decompressor(response.headers.get('Content-Encoding'))
+    if decompressor is None:
+        return response
+    return DecompressingResponse(response, decompressor)
+
+
+class DecompressingResponse:
+    """
+    This class wraps a compressed HTTP response, decompressing the body as
+    it is read. read(size) only reads as much of the compressed body as it
+    needs, so a response can be decompressed and parsed incrementally.
+    Other attributes are those of the wrapped response.
+    """
+
+    def __init__(self, response, decompressor):
+        self._response = response
+        self._decompressor = decompressor
+        self._buffer = b''
+        self._eof = False
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            chunks = [self._buffer]
+            self._buffer = b''
+            while not self._eof:
+                chunks.append(self._read_chunk())
+            return b''.join(chunks)
+
+        while len(self._buffer) < size and not self._eof:
+            self._buffer += self._read_chunk()
+        data = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return data
+
+    def _read_chunk(self):
+        compressed = self._response.read(_READ_SIZE)
+        if not compressed:
+            self._eof = True
+            return self._decompressor.flush()
+        return self._decompressor.decompress(compressed)
+
+    def close(self):
+        self._response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -104,9 +104,8 @@ class IsOperationSupported:
 
 
 def load_config_json_map():
-    for name, class_obj in inspect.getmembers(
-            sys.modules[__name__], inspect.isclass):
-        if hasattr(class_obj, 'CLASS'):
+    for name, class_obj in sorted(vars(sys.modules[__name__]).items()):
+        if isinstance(class_obj, type) and hasattr(class_obj, 'CLASS'):
             JsonConverter.GENERIC_JSON_CONVERTERS[class_obj.CLASS] = \
                 lambda obj, class_obj=class_obj: class_obj(**obj)
 
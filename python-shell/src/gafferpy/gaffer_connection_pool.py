@@ -0,0 +1,421 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module keeps persistent HTTP/1.1 connections to a Gaffer REST API
+"""
+
+import collections
+import http.client
+import io
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from gafferpy import gaffer_metrics
+
+# Marks a connection whose reads use the same timeout as its connection
+_CONNECT_TIMEOUT = object()
+
+# Methods that can be sent again if a reused connection fails to answer
+IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+
+
+class Request(urllib.request.Request):
+    """
+    A urllib Request with a timeout for each read of its response. The
+    timeout given to open then only limits making the connection. If a
+    gaffer_instrumentation.CallRecorder is given as recorder, the time
+    spent connecting and waiting for the response is added to it.
+    idempotent says whether the request can safely be sent twice, or None
+    to decide from its method.
+    """
+
+    def __init__(self, url, data=None, headers={}, read_timeout=None,
+                 recorder=None, idempotent=None):
+        super().__init__(url, data=data, headers=headers)
+        self.read_timeout = read_timeout
+        self.recorder = recorder
+        self.idempotent = idempotent
+
+
+class _ConnectionMixin:
+    """
+    Applies the read timeout once connected and adds the time spent making
+    the connection, the TLS handshake and waiting for the first byte of the
+    response to the recorder, if there is one.
+    """
+
+    read_timeout = _CONNECT_TIMEOUT
+    recorder = None
+    _sent = None
+
+    def connect(self):
+        recorder = self.recorder
+        if recorder is None:
+            super().connect()
+        else:
+            create_connection = self._create_connection
+            connect_times = []
+
+            def timed_create_connection(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return create_connection(*args, **kwargs)
+                finally:
+                    connect_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            self._create_connection = timed_create_connection
+            try:
+                super().connect()
+            finally:
+                self._create_connection = create_connection
+                duration = time.perf_counter() - start
+                connect_time = sum(connect_times)
+                recorder.add(gaffer_metrics.CallMetrics.CONNECT,
+                             connect_time)
+                if isinstance(self, http.client.HTTPSConnection):
+                    recorder.add(gaffer_metrics.CallMetrics.TLS,
+                                 duration - connect_time)
+        if self.read_timeout is not _CONNECT_TIMEOUT:
+            self.sock.settimeout(self.read_timeout)
+
+    def request(self, *args, **kwargs):
+        self._sent = None
+        super().request(*args, **kwargs)
+        if self.recorder is not None:
+            self._sent = time.perf_counter()
+
+    def getresponse(self):
+        try:
+            return super().getresponse()
+        finally:
+            if self._sent is not None:
+                self.recorder.add(
+                    gaffer_metrics.CallMetrics.TIME_TO_FIRST_BYTE,
+                    time.perf_counter() - self._sent)
+                self._sent = None
+
+
+class _HTTPConnection(_ConnectionMixin, http.client.HTTPConnection):
+    pass
+
+
+class _HTTPSConnection(_ConnectionMixin, http.client.HTTPSConnection):
+    pass
+
+
+_CONNECTION_CLASSES = {
+    http.client.HTTPConnection: _HTTPConnection,
+    http.client.HTTPSConnection: _HTTPSConnection
+}
+
+
+def _connection_class(http_class, read_timeout, recorder=None):
+    connection_class = _CONNECTION_CLASSES.get(http_class)
+    if connection_class is None or \
+            (read_timeout is _CONNECT_TIMEOUT and recorder is None):
+        return http_class
+
+    def create(host, **kwargs):
+        connection = connection_class(host, **kwargs)
+        connection.read_timeout = read_timeout
+        connection.recorder = recorder
+        return connection
+    return create
+
+
+class _HandlerMixin:
+    def do_open(self, http_class, req, **http_conn_args):
+        return super().do_open(
+            _connection_class(http_class,
+                              getattr(req, 'read_timeout', _CONNECT_TIMEOUT),
+                              getattr(req, 'recorder', None)),
+            req, **http_conn_args)
+
+
+class HTTPHandler(_HandlerMixin, urllib.request.HTTPHandler):
+    """
+    A urllib HTTPHandler applying the read timeout of a Request once the
+    connection has been made, and recording the phases of the request.
+    """
+
+
+class HTTPSHandler(_HandlerMixin, urllib.request.HTTPSHandler):
+    """
+    A urllib HTTPSHandler applying the read timeout of a Request once the
+    connection has been made, and recording the phases of the request.
+    """
+
+
+class PooledConnection:
+    """
+    This class wraps a single http.client connection and records how often
+    and how recently it has been used.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.requests = 0
+        self.last_used = time.monotonic()
+
+    def is_expired(self, idle_timeout, max_requests):
+        if max_requests is not None and self.requests >= max_requests:
+            return True
+        if idle_timeout is not None and \
+                time.monotonic() - self.last_used > idle_timeout:
+            return True
+        return False
+
+    def close(self):
+        self.connection.close()
+
+
+class PooledResponse:
+    """
+    This class wraps a http.client response and hands the underlying
+    connection back to the pool once the body has been fully read.
+    """
+
+    def __init__(self, pool, key, pooled_connection, response):
+        self._pool = pool
+        self._key = key
+        self._pooled_connection = pooled_connection
+        self._response = response
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = response.headers
+
+    def getcode(self):
+        return self.status
+
+    def info(self):
+        return self.headers
+
+    def getheader(self, name, default=None):
+        return self._response.getheader(name, default)
+
+    def read(self, amt=None):
+        if self._pooled_connection is None:
+            return b''
+        try:
+            data = self._response.read(amt)
+        except BaseException:
+            self._release(reusable=False)
+            raise
+        if amt is None or not data or self._response.isclosed():
+            self._release(reusable=not self._response.will_close)
+        return data
+
+    def close(self):
+        if self._pooled_connection is not None:
+            # Discard a connection with unread body data, it cannot be reused
+            self._release(reusable=self._response.isclosed()
+                          and not self._response.will_close)
+
+    def _release(self, reusable):
+        pooled_connection = self._pooled_connection
+        if pooled_connection is not None:
+            self._pooled_connection = None
+            self._pool.release(self._key, pooled_connection, reusable)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class ConnectionPool:
+    """
+    This class keeps a pool of persistent HTTP/1.1 connections per host.
+
+    It provides the same open method as a urllib opener, so it can be used by
+    the GafferConnector in place of one. At most pool_size connections are
+    open to a host at once, idle connections are discarded after
+    idle_timeout seconds and each connection is closed after serving
+    max_requests_per_connection requests.
+    """
+
+    def __init__(self, pool_size=10, idle_timeout=60,
+                 max_requests_per_connection=100, ssl_context=None):
+        if pool_size < 1:
+            raise ValueError('pool_size must be at least 1')
+        self._pool_size = pool_size
+        self._idle_timeout = idle_timeout
+        self._max_requests = max_requests_per_connection
+        self._ssl_context = ssl_context
+        self._idle = {}
+        self._slots = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def open(self, request, timeout=None):
+        """
+        Sends a urllib Request using a pooled connection. Non 2xx responses
+        are raised as urllib.error.HTTPError, as a urllib opener would.
+
+        If a reused connection fails before the request has been sent, the
+        request is sent on another connection. If it fails while waiting for
+        the response, the request is only sent again if it is idempotent.
+
+        The timeout limits waiting for a free connection and making a new
+        connection. It also limits each read of the response unless the
+        request is a Request with its own read timeout.
+        """
+        url = request.full_url
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError('unknown url type: ' + url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or '/'
+        if parts.query:
+            path = path + '?' + parts.query
+        headers = dict(request.header_items())
+        read_timeout = getattr(request, 'read_timeout', _CONNECT_TIMEOUT)
+        if read_timeout is _CONNECT_TIMEOUT:
+            read_timeout = timeout
+        recorder = getattr(request, 'recorder', None)
+        idempotent = getattr(request, 'idempotent', None)
+        if idempotent is None:
+            idempotent = request.get_method() in IDEMPOTENT_METHODS
+
+        slots = self._get_slots(key)
+        if not slots.acquire(timeout=timeout):
+            raise TimeoutError('Timed out waiting for a pooled connection '
+                               'to ' + parts.netloc)
+        try:
+            pooled_connection, response = self._send(
+                key, request.get_method(), path, request.data, headers,
+                timeout, read_timeout, recorder, idempotent)
+        except BaseException:
+            slots.release()
+            raise
+
+        pooled_response = PooledResponse(self, key, pooled_connection,
+                                         response)
+        if not 200 <= response.status < 300:
+            body = pooled_response.read()
+            raise urllib.error.HTTPError(url, response.status,
+                                         response.reason, response.headers,
+                                         io.BytesIO(body))
+        return pooled_response
+
+    def _send(self, key, method, path, body, headers, timeout,
+              read_timeout, recorder=None, idempotent=False):
+        while True:
+            pooled_connection = self._take_idle(key)
+            reused = pooled_connection is not None
+            if not reused:
+                pooled_connection = PooledConnection(
+                    self._new_connection(key, timeout, read_timeout))
+            elif pooled_connection.connection.sock is not None:
+                pooled_connection.connection.sock.settimeout(read_timeout)
+            pooled_connection.connection.recorder = recorder
+
+            try:
+                pooled_connection.connection.request(method, path, body=body,
+                                                     headers=headers)
+            except (http.client.HTTPException, ConnectionError):
+                pooled_connection.close()
+                # The server may have dropped an idle keep-alive connection,
+                # so try again on a different one.
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                pooled_connection.close()
+                raise
+
+            try:
+                response = pooled_connection.connection.getresponse()
+            except (http.client.HTTPException, ConnectionError):
+                pooled_connection.close()
+                # The request may have reached the server, so it is only sent
+                # again if that is safe. Other requests are left to the
+                # caller's retry policy.
+                if reused and idempotent:
+                    continue
+                raise
+            except BaseException:
+                pooled_connection.close()
+                raise
+
+            pooled_connection.requests += 1
+            return pooled_connection, response
+
+    def _new_connection(self, key, timeout, read_timeout):
+        scheme, host, port = key
+        if scheme == 'https':
+            connection = _HTTPSConnection(host, port, timeout=timeout,
+                                          context=self._ssl_context)
+        else:
+            connection = _HTTPConnection(host, port, timeout=timeout)
+        connection.read_timeout = read_timeout
+        return connection
+
+    def _get_slots(self, key):
+        with self._lock:
+            slots = self._slots.get(key)
+            if slots is None:
+                slots = threading.BoundedSemaphore(self._pool_size)
+                self._slots[key] = slots
+            return slots
+
+    def _take_idle(self, key):
+        with self._lock:
+            idle = self._idle.get(key)
+            while idle:
+                pooled_connection = idle.pop()
+                if pooled_connection.is_expired(self._idle_timeout,
+                                                self._max_requests):
+                    pooled_connection.close()
+                else:
+                    return pooled_connection
+        return None
+
+    def release(self, key, pooled_connection, reusable=True):
+        """
+        Returns a connection to the pool once its response has been consumed.
+        """
+        pooled_connection.last_used = time.monotonic()
+        with self._lock:
+            if reusable and not self._closed and \
+                    not pooled_connection.is_expired(None, self._max_requests):
+                self._idle.setdefault(key, collections.deque()).append(
+                    pooled_connection)
+            else:
+                pooled_connection.close()
+        self._slots[key].release()
+
+    def idle_connection_count(self):
+        with self._lock:
+            return sum(len(idle) for idle in self._idle.values())
+
+    def close(self):
+        """
+        Closes all idle connections. Connections that are still in use are
+        closed when they are released.
+        """
+        with self._lock:
+            self._closed = True
+            for idle in self._idle.values():
+                for pooled_connection in idle:
+                    pooled_connection.close()
+            self._idle.clear()
@@ -19,10 +19,56 @@ This module queries a Gaffer REST API
 """
 
 import json
+import time
 import urllib.error
 import urllib.request
 
 from gafferpy import gaffer as g
+from gafferpy import gaffer_batch
+from gafferpy import gaffer_cache
+from gafferpy import gaffer_compression
+from gafferpy import gaffer_connection_pool
+from gafferpy import gaffer_deadline
+from gafferpy import gaffer_instrumentation
+from gafferpy import gaffer_json_encoder
+from gafferpy import gaffer_json_stream
+from gafferpy import gaffer_metrics
+from gafferpy import gaffer_seed_index
+
+
+def operation_chain_to_json(operation_chain):
+    """
+    Converts an operation chain, or a single operation, into a json
+    dictionary. Dictionaries are passed through unchanged.
+    """
+    if hasattr(operation_chain, "to_json"):
+        return operation_chain.to_json()
+    return operation_chain
+
+
+def result_from_json(response_text):
+    """
+    Converts the text of a Gaffer response into the corresponding python
+    objects. The text is decoded in a single pass, with each object
+    converted as soon as it has been parsed.
+    """
+    if response_text is None or response_text == '':
+        return None
+
+    return json.loads(response_text,
+                      object_hook=g.JsonConverter.object_decoder)
+
+
+class GafferHttpError(ConnectionError):
+    """
+    A ConnectionError for an HTTP error response from Gaffer, holding its
+    status code and the value of its Retry-After header, if any.
+    """
+
+    def __init__(self, message, code, retry_after=None):
+        super().__init__(message)
+        self.code = code
+        self.retry_after = retry_after
 
 
 class GafferConnector:
@@ -31,111 +77,554 @@ class GafferConnector:
     This class is initialised with a host to connect to.
     """
 
-    def __init__(self, host, verbose=False):
+    def __init__(self, host, verbose=False, pooled=False, pool_size=10,
+                 pool_idle_timeout=60, pool_max_requests=100,
+                 metadata_cache=None, result_cache=None, coalescer=None,
+                 compress_requests=False, adjacency_cache=None,
+                 retry_policy=None, hedging_policy=None, connect_timeout=None,
+                 read_timeout=None,
+                 deadline_option=gaffer_deadline.DEADLINE_OPTION,
+                 call_metrics_listeners=None):
         """
         This initialiser sets up a connection to the specified Gaffer server.
 
         The host (and port) of the Gaffer server, should be in the form,
         'hostname:1234/service-name/version'
+
+        If pooled is True, persistent HTTP/1.1 connections are kept open and
+        reused between calls. At most pool_size connections are opened per
+        host, idle connections are dropped after pool_idle_timeout seconds
+        and each connection serves at most pool_max_requests requests.
+
+        If a gaffer_cache.MetadataCache is given as metadata_cache, the
+        responses of execute_get, is_operation_supported and
+        supports_operation are cached in it.
+
+        If a gaffer_cache.ResultCache is given as result_cache, the responses
+        of execute_operation, execute_operations, execute_operation_chain and
+        execute_batched are cached in it. Streamed results are not cached.
+
+        If a gaffer_coalesce.RequestCoalescer is given as coalescer,
+        identical operation chains executed at the same time by several
+        threads are sent to Gaffer once and the response is shared.
+
+        If a gaffer_cache.AdjacencyCache is given as adjacency_cache, the
+        elements found for each seed of a GetElements or GetAdjacentIds
+        executed with execute_operation, execute_operations,
+        execute_operation_chain or execute_batched are cached in it, and
+        only seeds that are not cached are sent to Gaffer.
+
+        If a gaffer_retry.RetryPolicy is given as retry_policy, requests that
+        fail with a transient error, such as a 503 response or a reset
+        connection, are retried as the policy allows. Operation chains
+        containing writes are only retried if the policy's retry_writes is
+        True. Streamed results are retried until the response has started.
+
+        If a gaffer_hedge.HedgingPolicy is given as hedging_policy, operation
+        chains that only read are sent a second time if they have not been
+        answered within the policy's delay, and the first response is used.
+        Only the call metrics of the copy used are recorded. Streamed
+        results are not hedged. The policy's max_workers, if not given, is
+        set to twice pool_size, so each connection can carry a request and
+        its hedge.
+
+        Every request waits at most connect_timeout seconds to connect and
+        read_timeout seconds for each read of the response, or without
+        limit if they are None. The operation methods also take a deadline,
+        a number of seconds or a gaffer_deadline.Deadline, shared by all
+        the requests made for the call, including batches and retries.
+        Requests are not sent, and batches not started, once the deadline
+        has passed, and a gaffer_deadline.DeadlineExceeded is raised. The
+        milliseconds left are sent to Gaffer in the deadline_option option
+        of each operation, unless deadline_option is None.
+
+        If a list of gaffer_metrics.MetricsListeners is given as
+        call_metrics_listeners, each is updated with the
+        gaffer_metrics.CallMetrics of every execute, stream and get call:
+        the time spent encoding the request, connecting, waiting for and
+        reading the response and decoding it, and the bytes sent and
+        received. The metrics of a streamed call are sent when the stream
+        is closed.
+
+        Operations are sent as JSON without whitespace. If compress_requests
+        is True, request bodies of at least
+        gaffer_compression.MIN_COMPRESS_SIZE bytes are sent gzip compressed.
+        Responses compressed with gzip or deflate are always decompressed as
+        they are read.
         """
         self._host = host
         self._verbose = verbose
+        self._pooled = pooled
+        self._pool_size = pool_size
+        self._pool_idle_timeout = pool_idle_timeout
+        self._pool_max_requests = pool_max_requests
+        self._metadata_cache = metadata_cache
+        self._result_cache = result_cache
+        self._coalescer = coalescer
+        self._compress_requests = compress_requests
+        self._adjacency_cache = adjacency_cache
+        self._retry_policy = retry_policy
+        self._hedging_policy = hedging_policy
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+        self._deadline_option = deadline_option
+        self._call_metrics_listeners = call_metrics_listeners or []
+        if hedging_policy is not None:
+            hedging_policy.size_workers(2 * pool_size)
 
         # Create the opener
-        self._opener = urllib.request.build_opener(
-            urllib.request.HTTPHandler())
+        self._opener = self._create_opener()
+
+    def _create_opener(self, ssl_context=None):
+        if self._pooled:
+            return gaffer_connection_pool.ConnectionPool(
+                pool_size=self._pool_size,
+                idle_timeout=self._pool_idle_timeout,
+                max_requests_per_connection=self._pool_max_requests,
+                ssl_context=ssl_context)
+        if ssl_context is not None:
+            return urllib.request.build_opener(
+                gaffer_connection_pool.HTTPSHandler(context=ssl_context))
+        return urllib.request.build_opener(
+            gaffer_connection_pool.HTTPHandler())
+
+    @property
+    def host(self):
+        return self._host
 
-    def execute_operation(self, operation, headers={}):
+    @property
+    def retry_policy(self):
+        return self._retry_policy
+
+    def close(self):
+        """
+        Closes any persistent connections held by this connector.
+        """
+        self._opener.close()
+
+    def execute_operation(self, operation, headers={}, deadline=None):
         """
         This method queries Gaffer with the single provided operation.
         """
-        return self.execute_operations([operation], headers)
+        return self.execute_operations([operation], headers, deadline)
 
-    def execute_operations(self, operations, headers={}):
+    def execute_operations(self, operations, headers={}, deadline=None):
         """
         This method queries Gaffer with the provided array of operations.
         """
         return self.execute_operation_chain(g.OperationChain(operations),
-                                            headers)
+                                            headers, deadline)
 
-    def execute_operation_chain(self, operation_chain, headers={}):
+    def execute_operation_chain(self, operation_chain, headers={},
+                                deadline=None):
         """
         This method queries Gaffer with the provided operation chain.
         """
+        deadline = gaffer_deadline.as_deadline(deadline)
+        recorder = self._recorder('/graph/operations/execute')
+        failed = True
+        try:
+            if self._adjacency_cache is not None:
+                result = self._adjacency_cache.execute(
+                    self._host, operation_chain, headers,
+                    lambda chain: self._execute_operation_chain(
+                        chain, headers, deadline, recorder))
+            else:
+                result = self._execute_operation_chain(
+                    operation_chain, headers, deadline, recorder)
+            failed = False
+            return result
+        finally:
+            self._report(recorder, failed)
+
+    def _execute_operation_chain(self, operation_chain, headers, deadline,
+                                 recorder=None):
+        if self._result_cache is None:
+            response_text = self._send_operation_chain(
+                operation_chain, headers, deadline, recorder)
+        else:
+            response_text = self._result_cache.get_or_execute(
+                self._host, operation_chain, headers,
+                lambda: self._send_operation_chain(operation_chain, headers,
+                                                   deadline, recorder))
 
+        if recorder is None or not response_text:
+            return result_from_json(response_text)
+        return recorder.loads(response_text, g.JsonConverter.object_decoder)
+
+    def _send_operation_chain(self, operation_chain, headers, deadline,
+                              recorder=None):
+        if self._coalescer is None:
+            return self._post_operation_chain(operation_chain, headers,
+                                              deadline, recorder)
+        return self._coalescer.run(
+            self._host, operation_chain, headers,
+            lambda: self._post_operation_chain(operation_chain, headers,
+                                               deadline, recorder),
+            deadline)
+
+    def _post_operation_chain(self, operation_chain, headers, deadline,
+                              recorder=None):
         # Construct the full URL path to the Gaffer server
         url = self._host + '/graph/operations/execute'
 
-        if hasattr(operation_chain, "to_json"):
-            op_chain_json_obj = operation_chain.to_json()
-        else:
-            op_chain_json_obj = operation_chain
-
         # Query Gaffer
         if self._verbose:
             print('\nQuery operations:\n' +
-                  json.dumps(op_chain_json_obj, indent=4) + '\n')
+                  json.dumps(operation_chain_to_json(operation_chain),
+                             indent=4) + '\n')
 
-        # Convert the query dictionary into JSON and post the query to Gaffer
-        json_body = bytes(json.dumps(op_chain_json_obj), 'ascii')
-        headers['Content-Type'] = 'application/json;charset=utf-8'
+        # Convert the query into JSON and post the query to Gaffer
+        idempotent = self._is_idempotent(operation_chain)
 
-        request = urllib.request.Request(url, headers=headers, data=json_body)
+        def request(recorder=recorder):
+            json_body = self._encode(operation_chain, deadline, recorder)
+            return self._open(url, headers, json_body, deadline, recorder,
+                              idempotent).read().decode('utf-8')
 
-        try:
-            response = self._opener.open(request)
-        except urllib.error.HTTPError as error:
-            error_body = error.read().decode('utf-8')
-            new_error_string = ('HTTP error ' +
-                                str(error.code) + ' ' +
-                                error.reason + ': ' +
-                                error_body)
-            raise ConnectionError(new_error_string)
-        response_text = response.read().decode('utf-8')
+        if idempotent and self._hedging_policy is not None:
+            def hedged_request():
+                # Each copy has its own recorder, so the abandoned copy is
+                # not counted
+                copy_recorder = None if recorder is None else \
+                    gaffer_instrumentation.CallRecorder(recorder.path)
+                return request(copy_recorder), copy_recorder
+
+            response_text, copy_recorder = self._retry(
+                lambda: self._hedging_policy.run(hedged_request),
+                deadline=deadline)
+            if recorder is not None:
+                recorder.merge(copy_recorder)
+        else:
+            response_text = self._retry(request, idempotent, deadline)
 
         if self._verbose:
             print('Query response: ' + response_text)
 
-        if response_text is not None and response_text is not '':
-            result = json.loads(response_text)
-        else:
-            result = None
+        return response_text
+
+    def stream_operation(self, operation, headers={},
+                         chunk_size=gaffer_json_stream.DEFAULT_CHUNK_SIZE,
+                         object_hook=None, deadline=None):
+        """
+        This method queries Gaffer with the single provided operation and
+        returns a generator of the results.
+        """
+        return self.stream_operations([operation], headers, chunk_size,
+                                      object_hook, deadline)
 
-        return g.JsonConverter.from_json(result)
+    def stream_operations(self, operations, headers={},
+                          chunk_size=gaffer_json_stream.DEFAULT_CHUNK_SIZE,
+                          object_hook=None, deadline=None):
+        """
+        This method queries Gaffer with the provided array of operations and
+        returns a generator of the results.
+        """
+        return self.stream_operation_chain(g.OperationChain(operations),
+                                           headers, chunk_size, object_hook,
+                                           deadline)
 
-    def execute_get(self, operation, headers={}):
-        url = self._host + operation.get_url()
-        headers['Content-Type'] = 'application/json;charset=utf-8'
-        request = urllib.request.Request(url, headers=headers)
+    def stream_operation_chain(
+            self, operation_chain, headers={},
+            chunk_size=gaffer_json_stream.DEFAULT_CHUNK_SIZE,
+            object_hook=None, deadline=None):
+        """
+        This method queries Gaffer with the provided operation chain and
+        returns a generator of the results. Each item of the returned JSON
+        array is decoded as soon as it has been read, so only the current
+        item is held in memory rather than the whole result set.
+
+        Results are decoded with g.JsonConverter.object_decoder unless
+        another object_hook is given, for example
+        gaffer_compact.object_decoder.
 
+        The response is closed when the generator is exhausted or closed.
+        If a deadline is given, DeadlineExceeded is raised by the generator
+        if it is still reading results when the deadline passes.
+        """
+        url = self._host + '/graph/operations/execute'
+
+        if self._verbose:
+            print('\nQuery operations:\n' +
+                  json.dumps(operation_chain_to_json(operation_chain),
+                             indent=4) + '\n')
+
+        deadline = gaffer_deadline.as_deadline(deadline)
+        recorder = self._recorder('/graph/operations/execute')
+        idempotent = self._is_idempotent(operation_chain)
         try:
-            response = self._opener.open(request)
-        except urllib.error.HTTPError as error:
-            error_body = error.read().decode('utf-8')
-            new_error_string = ('HTTP error ' +
-                                str(error.code) + ' ' +
-                                error.reason + ': ' +
-                                error_body)
-            raise ConnectionError(new_error_string)
+            response = self._retry(
+                lambda: self._open(url, headers,
+                                   self._encode(operation_chain, deadline,
+                                                recorder),
+                                   deadline, recorder, idempotent),
+                idempotent, deadline)
+        except BaseException:
+            self._report(recorder, failed=True)
+            raise
+
+        if object_hook is None:
+            object_hook = g.JsonConverter.object_decoder
+        if recorder is None:
+            return self._stream_results(response, chunk_size, object_hook,
+                                        deadline)
+        return self._record_stream(
+            self._stream_results(response, chunk_size,
+                                 recorder.timed_object_hook(object_hook),
+                                 deadline),
+            recorder)
 
-        return response.read().decode('utf-8')
+    @staticmethod
+    def _stream_results(response, chunk_size, object_hook, deadline=None):
+        try:
+            results = gaffer_json_stream.iter_json_array(
+                response, object_hook=object_hook, chunk_size=chunk_size)
+            if deadline is None:
+                yield from results
+            else:
+                for result in results:
+                    deadline.check()
+                    yield result
+        finally:
+            response.close()
+
+    def _record_stream(self, results, recorder):
+        """
+        Yields the results, recording the time spent reading them, less the
+        download and from_json time, as json_loads. The metrics are
+        reported when the results are closed.
+        """
+        timings = recorder.timings
+        phases = (gaffer_metrics.CallMetrics.DOWNLOAD,
+                  gaffer_metrics.CallMetrics.FROM_JSON)
+        excluded = sum(timings[phase] for phase in phases)
+        reading = 0.0
+        failed = True
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    result = next(results)
+                except StopIteration:
+                    break
+                finally:
+                    reading += time.perf_counter() - start
+                yield result
+            failed = False
+        finally:
+            start = time.perf_counter()
+            results.close()
+            reading += time.perf_counter() - start
+            recorder.add(gaffer_metrics.CallMetrics.JSON_LOADS,
+                         reading - (sum(timings[phase] for phase in phases) -
+                                    excluded))
+            self._report(recorder, failed)
+
+    def execute_batched(self, operation_chain,
+                        batch_size=gaffer_batch.DEFAULT_BATCH_SIZE,
+                        max_workers=gaffer_batch.DEFAULT_MAX_WORKERS,
+                        metrics_listener=None, headers={}, deadline=None):
+        """
+        This method queries Gaffer with the provided operation, or operation
+        chain, splitting the input seeds of a GetElements, GetAdjacentIds or
+        GetElementsWithinSet operation into batches of batch_size seeds.
+        Up to max_workers batches are executed concurrently and the results
+        are concatenated in input order.
+
+        The timing of each batch is logged and, if provided, passed to the
+        metrics_listener as QueryMetrics.
+
+        If a deadline is given, batches that have not started when it passes
+        are cancelled and DeadlineExceeded is raised.
+        """
+        results = []
+        for batch_results in self.stream_batched(
+                operation_chain, batch_size, max_workers, metrics_listener,
+                headers, deadline):
+            results.extend(batch_results)
+        return results
+
+    def stream_batched(self, operation_chain,
+                       batch_size=gaffer_batch.DEFAULT_BATCH_SIZE,
+                       max_workers=gaffer_batch.DEFAULT_MAX_WORKERS,
+                       metrics_listener=None, headers={}, deadline=None):
+        """
+        This method behaves like execute_batched but returns a generator
+        yielding the list of results of each batch, in input order, as soon
+        as it is available.
+        """
+        deadline = gaffer_deadline.as_deadline(deadline)
+        return gaffer_batch.run_batches(
+            lambda chain: self.execute_operation_chain(chain, headers,
+                                                       deadline),
+            operation_chain, batch_size=batch_size, max_workers=max_workers,
+            metrics_listener=metrics_listener, deadline=deadline)
+
+    def execute_indexed(self, operation, batch_size=None,
+                        max_workers=gaffer_batch.DEFAULT_MAX_WORKERS,
+                        headers={}, deadline=None):
+        """
+        This method queries Gaffer with a GetElements or GetAdjacentIds
+        operation and returns a gaffer_seed_index.SeedIndex mapping each
+        input seed to its results. Results are streamed into the index as
+        they are read. If batch_size is given the seeds are split into
+        batches, as execute_batched does.
+
+        A GetAdjacentIds is run as a GetElements with the same view, because
+        adjacent ids do not say which seed they were found from. The index
+        maps each seed to the EntitySeeds at the other end of its edges.
+        """
+        adjacent_ids = isinstance(operation, g.GetAdjacentIds)
+        if not adjacent_ids and not isinstance(operation, g.GetElements):
+            raise TypeError('Only GetElements and GetAdjacentIds results can '
+                            'be indexed by seed')
+        seeds = list(gaffer_batch.as_seed_list(operation.input))
+        operation = gaffer_batch.as_get_elements(operation, seeds)
+
+        index = gaffer_seed_index.SeedIndex(seeds, adjacent_ids)
+        if batch_size is None:
+            index.extend(self.stream_operation(operation, headers,
+                                               deadline=deadline))
+        else:
+            for results in self.stream_batched(operation, batch_size,
+                                               max_workers, headers=headers,
+                                               deadline=deadline):
+                index.extend(results)
+        return index
+
+    def execute_get(self, operation, headers={}):
+        return self._get(operation.get_url(), headers)
 
     def is_operation_supported(self, operation=None, headers={}):
-        url = self._host + '/graph/operations/' + operation.get_operation()
+        return self._get('/graph/operations/' + operation.get_operation(),
+                         headers)
+
+    def supports_operation(self, operation, headers={}):
+        """
+        Returns whether Gaffer supports the operation, which can be an
+        operation, an operation class, an IsOperationSupported or a class
+        name. The answer comes from the /graph/operations listing, so with a
+        metadata cache any number of operations can be checked with a
+        single request.
+        """
+        if isinstance(operation, g.IsOperationSupported):
+            operation = operation.get_operation()
+        elif not isinstance(operation, str):
+            operation = operation.CLASS
+        return operation in json.loads(self._get('/graph/operations',
+                                                 headers))
+
+    def _get(self, path, headers):
+        cache = self._metadata_cache
+        if cache is not None:
+            response_text = cache.get_response(self._host, path, headers)
+            if response_text is not gaffer_cache.MISSING:
+                return response_text
+
+        recorder = self._recorder(path)
+        failed = True
+        try:
+            response_text = self._retry(
+                lambda: self._open(self._host + path, headers,
+                                   recorder=recorder).read().decode('utf-8'))
+            failed = False
+        finally:
+            self._report(recorder, failed)
+
+        if cache is not None:
+            cache.put_response(self._host, path, headers, response_text)
+        return response_text
+
+    def _retry(self, request, idempotent=True, deadline=None):
+        """
+        Calls request, retrying it as the connector's retry policy allows.
+        """
+        if self._retry_policy is None:
+            return request()
+        return self._retry_policy.call(self._host, request, idempotent,
+                                       deadline)
+
+    def _recorder(self, path):
+        """
+        Returns a new CallRecorder for a call, or None if there are no call
+        metrics listeners.
+        """
+        if not self._call_metrics_listeners:
+            return None
+        return gaffer_instrumentation.CallRecorder(path)
+
+    def _report(self, recorder, failed=False):
+        if recorder is not None:
+            gaffer_instrumentation.report(self._call_metrics_listeners,
+                                          recorder, failed)
+
+    def _encode(self, operation_chain, deadline=None, recorder=None):
+        if deadline is not None and self._deadline_option is not None:
+            operation_chain = gaffer_deadline.with_deadline_option(
+                operation_chain, deadline, self._deadline_option)
+        if recorder is None:
+            return bytes(
+                gaffer_json_encoder.encode(operation_chain, compact=True),
+                'ascii')
+        with recorder.phase(gaffer_metrics.CallMetrics.TO_JSON):
+            json_obj, inputs = gaffer_json_encoder.to_json(operation_chain)
+        with recorder.phase(gaffer_metrics.CallMetrics.JSON_DUMPS):
+            return bytes(
+                gaffer_json_encoder.dumps(json_obj, inputs, compact=True),
+                'ascii')
+
+    @staticmethod
+    def _is_idempotent(operation_chain):
+        return gaffer_cache.WRITE_OPERATIONS.isdisjoint(
+            gaffer_cache.operation_class_names(operation_chain))
+
+    def _open(self, url, headers, data=None, deadline=None, recorder=None,
+              idempotent=None):
+        """
+        Sends a request to Gaffer using the connector's opener, converting
+        any HTTP error into a GafferHttpError. The connect and read timeouts
+        are cut short if the deadline is sooner. The phases of the request
+        and the bytes sent and received are added to the recorder, if any.
+        Pooled connections only send the request again after a dropped
+        connection if it is idempotent, by default only for GETs.
+        """
+        connect_timeout = self._connect_timeout
+        read_timeout = self._read_timeout
+        if deadline is not None:
+            connect_timeout = deadline.timeout(connect_timeout)
+            read_timeout = deadline.timeout(read_timeout)
+
+        headers = dict(headers)
         headers['Content-Type'] = 'application/json;charset=utf-8'
+        headers['Accept-Encoding'] = gaffer_compression.ACCEPT_ENCODING
+        if self._compress_requests and data is not None and \
+                len(data) >= gaffer_compression.MIN_COMPRESS_SIZE:
+            data = gaffer_compression.compress(data)
+            headers['Content-Encoding'] = 'gzip'
 
-        request = urllib.request.Request(url, headers=headers)
+        request = gaffer_connection_pool.Request(url, headers=headers,
+                                                 data=data,
+                                                 read_timeout=read_timeout,
+                                                 recorder=recorder,
+                                                 idempotent=idempotent)
+        if recorder is not None:
+            recorder.count_request(len(data) if data is not None else 0)
 
         try:
-            response = self._opener.open(request)
+            response = self._opener.open(request, timeout=connect_timeout)
+            if recorder is not None:
+                response = gaffer_instrumentation.CountingResponse(response,
+                                                                   recorder)
+            return gaffer_compression.decompress_response(response)
         except urllib.error.HTTPError as error:
-            error_body = error.read().decode('utf-8')
+            error_body = gaffer_compression.decompress_response(
+                error).read().decode('utf-8')
+            if recorder is not None:
+                recorder.count_response(len(error_body))
             new_error_string = ('HTTP error ' +
                                 str(error.code) + ' ' +
                                 error.reason + ': ' +
                                 error_body)
-            raise ConnectionError(new_error_string)
-
-        response_text = response.read().decode('utf-8')
-
-        return response_text
+            raise GafferHttpError(new_error_string, error.code,
+                                  error.headers.get('Retry-After')
+                                  if error.headers is not None else None)
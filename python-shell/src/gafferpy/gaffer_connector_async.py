@@ -0,0 +1,239 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module queries a Gaffer REST API from an asyncio event loop
+"""
+
+import asyncio
+import json
+import urllib.parse
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_compression
+from gafferpy import gaffer_connector
+from gafferpy import gaffer_json_encoder
+
+
+class AsyncGafferConnector:
+    """
+    This class handles the connection to a Gaffer server using asyncio, so
+    that many operations can be in flight at once without a thread per
+    request. At most max_concurrency requests are sent at the same time and
+    HTTP/1.1 connections are kept open and reused between requests.
+
+    The connector must be used from a single event loop, for example:
+
+    async with AsyncGafferConnector('http://localhost:8080/rest/latest') as gc:
+        elements = await gc.execute_operation(g.GetElements(...))
+    """
+
+    def __init__(self, host, verbose=False, max_concurrency=10,
+                 ssl_context=None, compress_requests=False):
+        """
+        This initialiser sets up a connection to the specified Gaffer server.
+
+        The host (and port) of the Gaffer server, should be in the form,
+        'http://hostname:1234/service-name/version'
+
+        Request bodies are compressed and responses decompressed as by
+        gaffer_connector.GafferConnector.
+        """
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1')
+        self._host = host
+        self._verbose = verbose
+        self._max_concurrency = max_concurrency
+        self._ssl_context = ssl_context
+        self._compress_requests = compress_requests
+        self._semaphore = None
+        self._idle = {}
+
+    async def execute_operation(self, operation, headers={}):
+        """
+        This method queries Gaffer with the single provided operation.
+        """
+        return await self.execute_operations([operation], headers)
+
+    async def execute_operations(self, operations, headers={}):
+        """
+        This method queries Gaffer with the provided array of operations.
+        """
+        return await self.execute_operation_chain(
+            g.OperationChain(operations), headers)
+
+    async def execute_operation_chain(self, operation_chain, headers={}):
+        """
+        This method queries Gaffer with the provided operation chain.
+        """
+        url = self._host + '/graph/operations/execute'
+
+        if self._verbose:
+            print('\nQuery operations:\n' +
+                  json.dumps(gaffer_connector.operation_chain_to_json(
+                      operation_chain), indent=4) + '\n')
+
+        json_body = bytes(
+            gaffer_json_encoder.encode(operation_chain, compact=True),
+            'ascii')
+        response_text = await self._request('POST', url, headers, json_body)
+
+        if self._verbose:
+            print('Query response: ' + response_text)
+
+        return gaffer_connector.result_from_json(response_text)
+
+    async def execute_get(self, operation, headers={}):
+        url = self._host + operation.get_url()
+        return await self._request('GET', url, headers)
+
+    async def is_operation_supported(self, operation=None, headers={}):
+        url = self._host + '/graph/operations/' + operation.get_operation()
+        return await self._request('GET', url, headers)
+
+    async def close(self):
+        """
+        Closes any idle connections held by this connector.
+        """
+        for connections in self._idle.values():
+            for reader, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def _request(self, method, url, headers, data=None):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError('unknown url type: ' + url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or '/'
+        if parts.query:
+            path = path + '?' + parts.query
+
+        headers = dict(headers)
+        headers['Content-Type'] = 'application/json;charset=utf-8'
+        headers['Host'] = parts.netloc
+        headers['Connection'] = 'keep-alive'
+        headers['Accept-Encoding'] = gaffer_compression.ACCEPT_ENCODING
+        if self._compress_requests and data is not None and \
+                len(data) >= gaffer_compression.MIN_COMPRESS_SIZE:
+            data = gaffer_compression.compress(data)
+            headers['Content-Encoding'] = 'gzip'
+        if data is not None:
+            headers['Content-Length'] = str(len(data))
+        head = method + ' ' + path + ' HTTP/1.1\r\n' + ''.join(
+            name + ': ' + str(value) + '\r\n'
+            for name, value in headers.items()) + '\r\n'
+        request_bytes = head.encode('latin-1') + (data or b'')
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async with self._semaphore:
+            status, reason, response_headers, body = await self._send(
+                key, request_bytes)
+
+        body_text = gaffer_compression.decompress(
+            body, response_headers.get('content-encoding')).decode('utf-8')
+        if not 200 <= status < 300:
+            raise ConnectionError('HTTP error ' + str(status) + ' ' +
+                                  reason + ': ' + body_text)
+        return body_text
+
+    async def _send(self, key, request_bytes):
+        while True:
+            connection = self._take_idle(key)
+            reused = connection is not None
+            if not reused:
+                connection = await self._connect(key)
+            reader, writer = connection
+            try:
+                writer.write(request_bytes)
+                await writer.drain()
+                status, reason, response_headers = await _read_head(reader)
+                body = await _read_body(reader, response_headers)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                # The server may have dropped an idle keep-alive connection,
+                # so try again on a new one.
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+
+            if response_headers.get('connection', '').lower() == 'close':
+                writer.close()
+            else:
+                self._idle.setdefault(key, []).append(connection)
+            return status, reason, response_headers, body
+
+    async def _connect(self, key):
+        scheme, host, port = key
+        if scheme == 'https':
+            return await asyncio.open_connection(
+                host, port or 443, ssl=self._ssl_context or True)
+        return await asyncio.open_connection(host, port or 80)
+
+    def _take_idle(self, key):
+        connections = self._idle.get(key)
+        while connections:
+            reader, writer = connections.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer
+            writer.close()
+        return None
+
+
+async def _read_head(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('Connection closed by server')
+    version, status, reason = (
+        status_line.decode('latin-1').rstrip('\r\n').split(' ', 2) + [''])[:3]
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return int(status), reason, headers
+
+
+async def _read_body(reader, headers):
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        chunks = []
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b';', 1)[0].strip(), 16)
+            if size == 0:
+                # Skip any trailers up to the terminating blank line
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+    if 'content-length' in headers:
+        return await reader.readexactly(int(headers['content-length']))
+    headers['connection'] = 'close'
+    return await reader.read()
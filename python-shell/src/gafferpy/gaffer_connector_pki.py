@@ -20,22 +20,41 @@ This module queries a Gaffer REST API with PKI authentication
 
 import getpass
 import ssl
-import urllib.error
-import urllib.request
 
 from gafferpy import gaffer_connector
+from gafferpy import gaffer_deadline
 
 
 class GafferConnector(gaffer_connector.GafferConnector):
-    def __init__(self, host, pki, protocol=None, verbose=False):
+    def __init__(self, host, pki, protocol=None, verbose=False, pooled=False,
+                 pool_size=10, pool_idle_timeout=60, pool_max_requests=100,
+                 metadata_cache=None, result_cache=None, coalescer=None,
+                 compress_requests=False, adjacency_cache=None,
+                 retry_policy=None, hedging_policy=None, connect_timeout=None,
+                 read_timeout=None,
+                 deadline_option=gaffer_deadline.DEADLINE_OPTION,
+                 call_metrics_listeners=None):
         """
         This initialiser sets up a connection to the specified Gaffer server as
         per gafferConnector.GafferConnector and
         requires the additional pki object.
         """
-        super().__init__(host=host, verbose=verbose)
-        self._opener = urllib.request.build_opener(
-            urllib.request.HTTPSHandler(context=pki.get_ssl_context(protocol)))
+        super().__init__(host=host, verbose=verbose, pooled=pooled,
+                         pool_size=pool_size,
+                         pool_idle_timeout=pool_idle_timeout,
+                         pool_max_requests=pool_max_requests,
+                         metadata_cache=metadata_cache,
+                         result_cache=result_cache,
+                         coalescer=coalescer,
+                         compress_requests=compress_requests,
+                         adjacency_cache=adjacency_cache,
+                         retry_policy=retry_policy,
+                         hedging_policy=hedging_policy,
+                         connect_timeout=connect_timeout,
+                         read_timeout=read_timeout,
+                         deadline_option=deadline_option,
+                         call_metrics_listeners=call_metrics_listeners)
+        self._opener = self._create_opener(pki.get_ssl_context(protocol))
 
 
 ########################################################
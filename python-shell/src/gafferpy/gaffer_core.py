@@ -18,18 +18,21 @@
 This module contains Python copies of Gaffer core java classes
 """
 
+import importlib
 import json
 import re
-
-import inspect
 import sys
 
+from gafferpy import gaffer_class_index
+
 
 class ToJson:
     """
     Enables implementations to be converted to json via a to_json method
     """
 
+    __slots__ = ()
+
     def __repr__(self):
         return json.dumps(self.to_json())
 
@@ -64,6 +67,8 @@ class ToCodeString:
    python object.
    """
 
+    __slots__ = ()
+
     @staticmethod
     def obj_to_code_string(obj, indent=''):
         if obj is None:
@@ -170,6 +175,8 @@ class JoinType:
     INNER = 'INNER'
 
 class ElementSeed(ToJson, ToCodeString):
+    __slots__ = ()
+
     def __repr__(self):
         return json.dumps(self.to_json())
 
@@ -385,38 +392,161 @@ class Edge(Element):
         return edge
 
 
+_FIRST_CAP_RE = re.compile('(.)([A-Z][a-z]+)')
+_ALL_CAP_RE = re.compile('([a-z0-9])([A-Z])')
+
+# Json keys are only snake cased for classes with a converter, so the number
+# of distinct keys is small. The limit guards against unusual schemas.
+_SNAKE_CASE_CACHE_MAX_SIZE = 10000
+
+
+_all_modules_loaded = False
+
+
+def _load_module_for(class_name):
+    """
+    Imports the module that defines class_name, which registers its json
+    converters. If the class is not in the index every module is imported.
+    """
+    location = gaffer_class_index.CLASSES.get(class_name)
+    if location is not None:
+        importlib.import_module(location[0])
+    else:
+        _load_all_modules()
+
+
+def _load_all_modules():
+    global _all_modules_loaded
+    if not _all_modules_loaded:
+        for module_name in gaffer_class_index.MODULES:
+            importlib.import_module(module_name)
+        _all_modules_loaded = True
+
+
+class ConverterRegistry(dict):
+    """
+    A dictionary of json converters keyed by class name. Converters are
+    registered when the module defining the class is imported, so the first
+    time a missing class name is looked up its module is imported.
+    """
+
+    def __missing__(self, class_name):
+        _load_module_for(class_name)
+        if not dict.__contains__(self, class_name):
+            raise KeyError(class_name)
+        return dict.get(self, class_name)
+
+    def __contains__(self, class_name):
+        if dict.__contains__(self, class_name):
+            return True
+        _load_module_for(class_name)
+        return dict.__contains__(self, class_name)
+
+    def get(self, class_name, default=None):
+        if not dict.__contains__(self, class_name):
+            _load_module_for(class_name)
+        return dict.get(self, class_name, default)
+
+    def __iter__(self):
+        _load_all_modules()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        _load_all_modules()
+        return dict.__len__(self)
+
+    def keys(self):
+        _load_all_modules()
+        return dict.keys(self)
+
+    def values(self):
+        _load_all_modules()
+        return dict.values(self)
+
+    def items(self):
+        _load_all_modules()
+        return dict.items(self)
+
+
 class JsonConverter:
-    GENERIC_JSON_CONVERTERS = {}
-    CUSTOM_JSON_CONVERTERS = {}
+    GENERIC_JSON_CONVERTERS = ConverterRegistry()
+    CUSTOM_JSON_CONVERTERS = ConverterRegistry()
+
+    # Memoised results of to_snake_case
+    _SNAKE_CASE_CACHE = {}
+
+    # Compiled decoders by class name, each stored with the custom and
+    # generic converters it was compiled from so that it is rebuilt if
+    # either converter is replaced.
+    _DECODERS = {}
 
     @staticmethod
     def to_snake_case(name):
-        s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
-        return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+        snake_case = JsonConverter._SNAKE_CASE_CACHE.get(name)
+        if snake_case is None:
+            s1 = _FIRST_CAP_RE.sub(r'\1_\2', name)
+            snake_case = _ALL_CAP_RE.sub(r'\1_\2', s1).lower()
+            if len(JsonConverter._SNAKE_CASE_CACHE) < \
+                    _SNAKE_CASE_CACHE_MAX_SIZE:
+                JsonConverter._SNAKE_CASE_CACHE[name] = snake_case
+        return snake_case
 
     @staticmethod
     def object_decoder(obj, class_name=None):
         if class_name is None:
-            if 'class' in obj:
-                class_name = obj.get('class')
-            else:
+            class_name = obj.get('class')
+            if class_name is None:
                 return obj
 
         custom_json_converter = JsonConverter.CUSTOM_JSON_CONVERTERS.get(
             class_name)
         generic_json_converter = JsonConverter.GENERIC_JSON_CONVERTERS.get(
             class_name)
-        if custom_json_converter is not None or generic_json_converter is not None:
+        if custom_json_converter is None and generic_json_converter is None:
+            return obj
+
+        decoder = JsonConverter._DECODERS.get(class_name)
+        if decoder is None or decoder[0] is not custom_json_converter or \
+                decoder[1] is not generic_json_converter:
+            decoder = (custom_json_converter, generic_json_converter,
+                       JsonConverter._compile_decoder(
+                           custom_json_converter, generic_json_converter))
+            JsonConverter._DECODERS[class_name] = decoder
+        return decoder[2](obj)
+
+    @staticmethod
+    def _compile_decoder(custom_json_converter, generic_json_converter):
+        """
+        Returns a function that snake cases the keys of a json object, using
+        a field map for the class, and passes them to the converter.
+        """
+        field_map = {}
+        to_snake_case = JsonConverter.to_snake_case
+
+        def map_keys(obj):
+            try:
+                return {field_map[key]: value for key, value in obj.items()}
+            except KeyError:
+                pass
             mapped_obj = {}
             for key, value in obj.items():
-                mapped_obj[JsonConverter.to_snake_case(key)] = value
-            if custom_json_converter is not None:
-                obj = custom_json_converter(mapped_obj)
-            else:
-                mapped_obj.pop('class', None)
-                obj = generic_json_converter(mapped_obj)
+                field = field_map.get(key)
+                if field is None:
+                    field = to_snake_case(key)
+                    if len(field_map) < _SNAKE_CASE_CACHE_MAX_SIZE:
+                        field_map[key] = field
+                mapped_obj[field] = value
+            return mapped_obj
 
-        return obj
+        if custom_json_converter is not None:
+            return lambda obj: custom_json_converter(map_keys(obj))
+
+        def decode(obj):
+            mapped_obj = map_keys(obj)
+            mapped_obj.pop('class', None)
+            return generic_json_converter(mapped_obj)
+
+        return decode
 
     @staticmethod
     def from_json(json_obj, class_obj=None, class_name=None, validate=False):
@@ -477,9 +607,8 @@ class JsonConverter:
 
 
 def load_core_json_map():
-    for name, class_obj in inspect.getmembers(
-            sys.modules[__name__], inspect.isclass):
-        if hasattr(class_obj, 'CLASS'):
+    for name, class_obj in sorted(vars(sys.modules[__name__]).items()):
+        if isinstance(class_obj, type) and hasattr(class_obj, 'CLASS'):
             JsonConverter.GENERIC_JSON_CONVERTERS[class_obj.CLASS] = \
                 lambda obj, class_obj=class_obj: class_obj(**obj)
 
@@ -0,0 +1,118 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module bounds the time taken by a call to Gaffer, including every
+request it makes
+"""
+
+import copy
+import time
+
+from gafferpy import gaffer as g
+
+# The operation option holding the number of milliseconds left before the
+# deadline when an operation is sent
+DEADLINE_OPTION = 'gafferpy.deadline.remainingMillis'
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised when a call has not finished by its deadline.
+    """
+
+
+class Deadline:
+    """
+    The time by which a call must finish, timeout seconds after the deadline
+    is created. A deadline is shared by every request made for the call,
+    such as the batches of a batched operation or the retries of a request.
+    """
+
+    def __init__(self, timeout, clock=time.monotonic):
+        self._clock = clock
+        self._expires = clock() + timeout
+
+    def remaining(self):
+        """
+        Returns the number of seconds left before the deadline, or 0 if it
+        has passed.
+        """
+        return max(self._expires - self._clock(), 0.0)
+
+    def expired(self):
+        return self._clock() >= self._expires
+
+    def check(self):
+        """
+        Raises DeadlineExceeded if the deadline has passed.
+        """
+        if self.expired():
+            raise DeadlineExceeded('Deadline exceeded')
+
+    def timeout(self, timeout=None):
+        """
+        Returns the smaller of timeout and the time left before the deadline,
+        raising DeadlineExceeded if the deadline has passed.
+        """
+        remaining = self._expires - self._clock()
+        if remaining <= 0:
+            raise DeadlineExceeded('Deadline exceeded')
+        if timeout is None:
+            return remaining
+        return min(timeout, remaining)
+
+
+def as_deadline(deadline):
+    """
+    Returns a Deadline for a number of seconds, or the deadline unchanged if
+    it is already a Deadline or None.
+    """
+    if deadline is None or isinstance(deadline, Deadline):
+        return deadline
+    return Deadline(deadline)
+
+
+def with_deadline_option(operation_chain, deadline, option=DEADLINE_OPTION):
+    """
+    Returns a copy of an operation, operation chain or json operation chain
+    with the milliseconds left before the deadline added to the options of
+    each of its operations, so Gaffer can stop work that will not be used.
+    """
+    value = str(int(deadline.remaining() * 1000))
+    if isinstance(operation_chain, dict) and 'operations' in operation_chain:
+        chain = dict(operation_chain)
+        chain['operations'] = [_with_option(operation, option, value)
+                               for operation in chain['operations']]
+        return chain
+    if isinstance(operation_chain, g.OperationChain):
+        chain = copy.copy(operation_chain)
+        chain.operations = [_with_option(operation, option, value)
+                            for operation in chain.operations]
+        return chain
+    return _with_option(operation_chain, option, value)
+
+
+def _with_option(operation, option, value):
+    if isinstance(operation, dict):
+        operation = dict(operation)
+        operation['options'] = dict(operation.get('options') or {})
+        operation['options'][option] = value
+    else:
+        operation = copy.copy(operation)
+        operation.options = dict(operation.options or {})
+        operation.options[option] = value
+    return operation
@@ -0,0 +1,303 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module stores Gaffer elements column by column, so that large results
+can be analysed without creating an object per element
+"""
+
+import array
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_json_stream
+from gafferpy import gaffer_local
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Values of the kind column
+ENTITY = 0
+EDGE = 1
+
+_MATCHED_VERTEX_VALUES = (None, 'SOURCE', 'DESTINATION')
+
+
+class _Missing:
+    def __repr__(self):
+        return 'MISSING'
+
+
+# Stored in a property column for elements that do not have that property
+MISSING = _Missing()
+
+
+def keep_json(obj):
+    """
+    A json object_hook that leaves objects as dictionaries. Streaming a
+    result with this hook avoids creating element objects that are only
+    going to be added to an ElementBatch.
+    """
+    return obj
+
+
+class ElementBatch:
+    """
+    This class holds entities and edges as columns.
+
+    The group, kind (ENTITY or EDGE), directed flag, matched vertex and
+    whether properties were present are held in typed arrays. Groups and
+    matched vertices are stored as codes into a small list of distinct
+    values. Vertices, which can be of any type, are held in lists: the
+    source column holds the vertex of an entity and the destination column
+    holds None for an entity.
+
+    If property_names is given only those properties are kept, otherwise
+    every property seen gets a column. Elements without a property hold
+    MISSING in its column.
+
+    Columns can be turned into NumPy arrays with to_numpy if NumPy is
+    installed, and rows can be turned back into Entity and Edge objects.
+    """
+
+    def __init__(self, property_names=None):
+        self._select_properties = property_names is not None
+        self.group_names = []
+        self._group_codes = {}
+        self.groups = array.array('I')
+        self.kinds = array.array('b')
+        self.directed = array.array('b')
+        self.matched_vertices = array.array('b')
+        self.has_properties = array.array('b')
+        self.sources = []
+        self.destinations = []
+        self.properties = {}
+        if property_names is not None:
+            for name in property_names:
+                self.properties[name] = []
+
+    @classmethod
+    def from_elements(cls, elements, property_names=None):
+        """
+        Creates a batch from an iterable of Entity and Edge objects (standard
+        or compact) or their json dictionaries.
+        """
+        batch = cls(property_names)
+        batch.extend(elements)
+        return batch
+
+    @classmethod
+    def from_json_stream(cls, readable, property_names=None,
+                         chunk_size=gaffer_json_stream.DEFAULT_CHUNK_SIZE):
+        """
+        Creates a batch from a readable returning the bytes of a json array
+        of elements, such as a HTTP response. Elements are added as they are
+        read, without creating element objects.
+        """
+        return cls.from_elements(
+            gaffer_json_stream.iter_json_array(
+                readable, object_hook=keep_json, chunk_size=chunk_size),
+            property_names)
+
+    @classmethod
+    def from_operation(cls, connector, operation_chain, property_names=None,
+                       headers={}):
+        """
+        Executes an operation or operation chain returning elements, using
+        a GafferConnector, and streams the result into a batch.
+        """
+        return cls.from_elements(
+            connector.stream_operation_chain(operation_chain, headers,
+                                             object_hook=keep_json),
+            property_names)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, index):
+        return self.get_element(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.get_element(index)
+
+    def append(self, element):
+        """
+        Adds an Entity or Edge, or its json dictionary, to the batch.
+        """
+        if isinstance(element, dict):
+            class_name = element.get('class')
+            if class_name == g.Edge.CLASS:
+                self._append(EDGE, element['group'], element.get('source'),
+                             element.get('destination'),
+                             element.get('directed'),
+                             element.get('matchedVertex'),
+                             element.get('properties'))
+            elif class_name == g.Entity.CLASS:
+                self._append(ENTITY, element['group'], element.get('vertex'),
+                             None, None, None, element.get('properties'))
+            else:
+                raise TypeError('Only entities and edges can be added to an '
+                                'ElementBatch, got: ' + str(class_name))
+        elif getattr(element, 'CLASS', None) == g.Edge.CLASS:
+            self._append(EDGE, element.group, element.source,
+                         element.destination, element.directed,
+                         element.matched_vertex, element.properties)
+        elif getattr(element, 'CLASS', None) == g.Entity.CLASS:
+            self._append(ENTITY, element.group, element.vertex, None, None,
+                         None, element.properties)
+        else:
+            raise TypeError('Only entities and edges can be added to an '
+                            'ElementBatch, got: ' + type(element).__name__)
+
+    def extend(self, elements):
+        for element in elements:
+            self.append(element)
+
+    def _append(self, kind, group, source, destination, directed,
+                matched_vertex, properties):
+        group_code = self._group_codes.get(group)
+        if group_code is None:
+            group_code = len(self.group_names)
+            self._group_codes[group] = group_code
+            self.group_names.append(group)
+
+        row = len(self.kinds)
+        self.groups.append(group_code)
+        self.kinds.append(kind)
+        self.directed.append(-1 if directed is None else int(directed))
+        self.matched_vertices.append(
+            _MATCHED_VERTEX_VALUES.index(matched_vertex))
+        self.has_properties.append(properties is not None)
+        self.sources.append(source)
+        self.destinations.append(destination)
+
+        columns = self.properties
+        if properties:
+            for name, value in properties.items():
+                column = columns.get(name)
+                if column is None:
+                    if self._select_properties:
+                        continue
+                    column = [MISSING] * row
+                    columns[name] = column
+                column.append(value)
+        for column in columns.values():
+            if len(column) == row:
+                column.append(MISSING)
+
+    def select(self, rows):
+        """
+        Returns a new batch holding the given rows, in order. Rows are a
+        sequence of row indices or a NumPy boolean mask with a value per row.
+        """
+        if numpy is not None and isinstance(rows, numpy.ndarray) and \
+                rows.dtype == numpy.bool_:
+            rows = numpy.flatnonzero(rows)
+        rows = [int(row) for row in rows]
+
+        batch = ElementBatch()
+        batch._select_properties = self._select_properties
+        batch.group_names = list(self.group_names)
+        batch._group_codes = dict(self._group_codes)
+        for name in ('groups', 'kinds', 'directed', 'matched_vertices',
+                     'has_properties'):
+            column = getattr(self, name)
+            setattr(batch, name, array.array(column.typecode,
+                                             [column[row] for row in rows]))
+        batch.sources = [self.sources[row] for row in rows]
+        batch.destinations = [self.destinations[row] for row in rows]
+        batch.properties = {
+            name: [column[row] for row in rows]
+            for name, column in self.properties.items()}
+        return batch
+
+    def column(self, name):
+        """
+        Returns a column as a list. The name is one of 'group', 'kind',
+        'source', 'destination', 'directed' or 'matched_vertex', or the name
+        of a property.
+        """
+        if name == 'group':
+            names = self.group_names
+            return [names[code] for code in self.groups]
+        if name == 'kind':
+            return list(self.kinds)
+        if name == 'source':
+            return self.sources
+        if name == 'destination':
+            return self.destinations
+        if name == 'directed':
+            return [None if directed < 0 else bool(directed)
+                    for directed in self.directed]
+        if name == 'matched_vertex':
+            return [_MATCHED_VERTEX_VALUES[code]
+                    for code in self.matched_vertices]
+        if name in self.properties:
+            return self.properties[name]
+        raise KeyError('Unknown column: ' + name)
+
+    def to_numpy(self, name, missing=None, dtype=None):
+        """
+        Returns a column as a NumPy array. Property values wrapped in their
+        java type, for example {'java.lang.Long': 3}, are unwrapped and
+        missing values are replaced by missing. The group column holds group
+        codes, which index group_names.
+        """
+        if numpy is None:
+            raise ImportError('NumPy is required to convert an ElementBatch '
+                              'column to an array')
+        if name == 'group':
+            return numpy.frombuffer(self.groups, dtype=numpy.uint32).copy()
+        if name == 'kind':
+            return numpy.frombuffer(self.kinds, dtype=numpy.int8).copy()
+        if name == 'directed' and dtype is None:
+            return numpy.frombuffer(self.directed, dtype=numpy.int8) > 0
+        values = self.column(name)
+        if name in self.properties:
+            values = [_unwrap(value, missing) for value in values]
+        return numpy.array(values, dtype=dtype)
+
+    def get_element(self, index):
+        """
+        Returns the row at index as an Entity or Edge.
+        """
+        properties = None
+        if self.has_properties[index]:
+            properties = {}
+            for name, column in self.properties.items():
+                value = column[index]
+                if value is not MISSING:
+                    properties[name] = value
+        group = self.group_names[self.groups[index]]
+        if self.kinds[index] == ENTITY:
+            return g.Entity(group, self.sources[index], properties)
+        return g.Edge(group, self.sources[index], self.destinations[index],
+                      self.directed[index] > 0, properties,
+                      _MATCHED_VERTEX_VALUES[self.matched_vertices[index]])
+
+    def to_elements(self):
+        """
+        Returns all the rows as a list of Entity and Edge objects.
+        """
+        return list(self)
+
+
+def _unwrap(value, missing):
+    if value is MISSING:
+        return missing
+    return gaffer_local.unwrap(value)
@@ -0,0 +1,185 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module cuts the tail latency of read only requests by sending a second
+copy of a request that is slow to answer
+"""
+
+import collections
+import concurrent.futures
+import math
+import threading
+import time
+
+from gafferpy import gaffer_metrics
+
+
+DEFAULT_MAX_WORKERS = 16
+
+
+class HedgingPolicy:
+    """
+    Sends a second copy of a read only request that has not answered within
+    the hedging delay, and returns the result of whichever answers first.
+    If one copy fails the other is waited for. The copy that loses is
+    abandoned: its response is read and discarded in the background.
+
+    The delay is the given percentile of the latencies of the last window
+    requests, kept between min_delay and max_delay, or initial_delay until
+    min_samples latencies have been seen.
+
+    At most max_hedge_ratio of the requests are hedged, so hedging adds at
+    most that proportion to the load on the server. A request that could
+    not be hedged runs on the caller's thread. Others run, with their
+    hedge, on a pool of max_workers threads, or on the caller's thread,
+    unhedged, if no thread is free, so requests never queue for a thread.
+    If max_workers is None it is set by the first GafferConnector given
+    the policy, from its pool size, or DEFAULT_MAX_WORKERS.
+    """
+
+    def __init__(self, percentile=95, initial_delay=0.1, min_delay=0.005,
+                 max_delay=2, window=1000, min_samples=20,
+                 max_hedge_ratio=0.05, max_workers=None):
+        if not 0 < percentile <= 100:
+            raise ValueError('percentile must be between 0 and 100')
+        self._percentile = percentile
+        self._initial_delay = initial_delay
+        self._min_delay = min_delay
+        self._max_delay = max_delay
+        self._min_samples = min_samples
+        self._max_hedge_ratio = max_hedge_ratio
+        self._latencies = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._max_workers = max_workers
+        self._executor = None
+        self._busy_workers = 0
+        self.requests = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+
+    def size_workers(self, max_workers):
+        """
+        Sets max_workers, if it was not given and no request has been
+        hedged yet.
+        """
+        with self._lock:
+            if self._max_workers is None and self._executor is None:
+                self._max_workers = max_workers
+
+    def delay(self):
+        """
+        Returns the number of seconds to wait before hedging a request.
+        """
+        with self._lock:
+            if len(self._latencies) < self._min_samples:
+                return self._initial_delay
+            latencies = sorted(self._latencies)
+        index = math.ceil(len(latencies) * self._percentile / 100) - 1
+        return min(max(latencies[index], self._min_delay), self._max_delay)
+
+    def run(self, request):
+        """
+        Returns the result of calling request, hedging it if it is slow.
+        """
+        delay = self.delay()
+        with self._lock:
+            self.requests += 1
+            hedgeable = self._can_hedge() and self._take_worker()
+        if not hedgeable:
+            start_time = time.perf_counter()
+            result = request()
+            self._record(time.perf_counter() - start_time)
+            return result
+
+        # Latencies are measured from when the first copy starts running
+        start_times = []
+        first = self._executor.submit(self._attempt, request, start_times)
+        done, pending = concurrent.futures.wait([first], timeout=delay)
+        if done or not self._take_hedge():
+            return self._result(first, start_times)
+
+        hedge = self._executor.submit(self._attempt, request, start_times)
+        pending = [first, hedge]
+        error = None
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in (first, hedge):
+                if future in done:
+                    if future.exception() is None:
+                        if future is hedge:
+                            with self._lock:
+                                self.hedges_won += 1
+                        return self._result(future, start_times)
+                    error = future.exception()
+        raise error
+
+    def _attempt(self, request, start_times):
+        start_times.append(time.perf_counter())
+        try:
+            return request()
+        finally:
+            with self._lock:
+                self._busy_workers -= 1
+
+    def _can_hedge(self):
+        return self.hedges_fired + 1 <= \
+            self.requests * self._max_hedge_ratio
+
+    def _take_worker(self):
+        if self._executor is None:
+            if self._max_workers is None:
+                self._max_workers = DEFAULT_MAX_WORKERS
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                self._max_workers)
+        if self._busy_workers >= self._max_workers:
+            return False
+        self._busy_workers += 1
+        return True
+
+    def _take_hedge(self):
+        with self._lock:
+            if not self._can_hedge() or not self._take_worker():
+                return False
+            self.hedges_fired += 1
+            return True
+
+    def _result(self, future, start_times):
+        result = future.result()
+        self._record(time.perf_counter() - start_times[0])
+        return result
+
+    def _record(self, latency):
+        with self._lock:
+            self._latencies.append(latency)
+
+    def close(self):
+        """
+        Stops the worker threads once any abandoned requests have finished.
+        """
+        with self._lock:
+            executor = self._executor
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def get_metrics(self):
+        """
+        Returns the requests, hedges fired and hedges won as HedgingMetrics.
+        """
+        with self._lock:
+            return gaffer_metrics.HedgingMetrics(
+                self.requests, self.hedges_fired, self.hedges_won)
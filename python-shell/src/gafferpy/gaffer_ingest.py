@@ -0,0 +1,151 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module ingests large numbers of elements into Gaffer by sending them
+in chunks, with several chunks uploading at once
+"""
+
+import concurrent.futures
+import logging
+import time
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_batch
+from gafferpy import gaffer_metrics
+from gafferpy import gaffer_retry
+
+LOGGER = logging.getLogger(__name__)
+
+
+class BulkIngester:
+    """
+    This class adds elements to Gaffer using a pipeline of AddElements
+    operations.
+
+    Elements are read lazily from any iterable, so a generator reading a file
+    can be ingested without holding the file in memory. Each chunk of
+    chunk_size elements is serialised by the worker that uploads it and up to
+    max_in_flight chunks are uploaded at once.
+
+    A chunk that fails with a transient error is retried using retry_policy,
+    a gaffer_retry.RetryPolicy. By default chunks are retried up to
+    max_retries times, waiting up to backoff seconds before the first retry
+    and doubling the wait each time, up to max_backoff seconds. If the
+    connector has its own retry policy, chunks are only retried by that
+    policy, so only if its retry_writes is True, and retry_policy must not
+    be given.
+
+    After each chunk the ingest rate is logged and, if a metrics_listener is
+    given, passed to it as IngestMetrics.
+    """
+
+    def __init__(self, connector, chunk_size=10000, max_in_flight=4,
+                 max_retries=3, backoff=0.5, max_backoff=30,
+                 skip_invalid_elements=None, validate=None, options=None,
+                 metrics_listener=None, headers={}, retry_policy=None):
+        if max_in_flight < 1:
+            raise ValueError('max_in_flight must be at least 1')
+        self._connector = connector
+        self._chunk_size = chunk_size
+        self._max_in_flight = max_in_flight
+        if getattr(connector, 'retry_policy', None) is not None:
+            if retry_policy is not None:
+                raise ValueError('The connector already has a retry policy')
+        elif retry_policy is None:
+            retry_policy = gaffer_retry.RetryPolicy(
+                max_retries=max_retries, backoff=backoff,
+                max_backoff=max_backoff, retry_writes=True)
+        self._retry_policy = retry_policy
+        self._skip_invalid_elements = skip_invalid_elements
+        self._validate = validate
+        self._options = options
+        self._metrics_listener = metrics_listener
+        self._headers = headers
+
+    def ingest(self, elements):
+        """
+        Adds all the elements to Gaffer and returns the number of elements
+        added. If a chunk still fails after all its retries the error is
+        raised and no further chunks are sent.
+        """
+        chunks = gaffer_batch.split_batches(elements, self._chunk_size)
+        start_time = time.perf_counter()
+        total = 0
+        batch_number = 0
+
+        with concurrent.futures.ThreadPoolExecutor(
+                self._max_in_flight) as executor:
+            pending = set()
+            try:
+                for chunk in chunks:
+                    if len(pending) >= self._max_in_flight:
+                        done, pending = concurrent.futures.wait(
+                            pending,
+                            return_when=concurrent.futures.FIRST_COMPLETED)
+                        for future in done:
+                            batch_number += 1
+                            total += self._complete(future, batch_number,
+                                                    total, start_time)
+                    pending.add(executor.submit(self._add_chunk, chunk))
+
+                for future in concurrent.futures.as_completed(pending):
+                    batch_number += 1
+                    total += self._complete(future, batch_number, total,
+                                            start_time)
+                pending = set()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+        return total
+
+    def _complete(self, future, batch_number, total, start_time):
+        num_elements, duration = future.result()
+        batch_rate = num_elements / max(duration, 1e-9)
+        overall_rate = (total + num_elements) / max(
+            time.perf_counter() - start_time, 1e-9)
+        LOGGER.info('Batch number = %d: %d elements added in %f seconds '
+                    '(rate was %f per second, overall rate is %f per second)',
+                    batch_number, num_elements, duration, batch_rate,
+                    overall_rate)
+        if self._metrics_listener is not None:
+            metrics = gaffer_metrics.IngestMetrics()
+            metrics.put_metric(
+                gaffer_metrics.IngestMetrics.ELEMENTS_PER_SECOND_BATCH,
+                batch_rate)
+            metrics.put_metric(
+                gaffer_metrics.IngestMetrics.ELEMENTS_PER_SECOND_OVERALL,
+                overall_rate)
+            self._metrics_listener.update(metrics)
+        return num_elements
+
+    def _add_chunk(self, chunk):
+        operation = g.AddElements(
+            input=chunk,
+            skip_invalid_elements=self._skip_invalid_elements,
+            validate=self._validate,
+            options=self._options)
+        start_time = time.perf_counter()
+        if self._retry_policy is None:
+            self._connector.execute_operation_chain(operation, self._headers)
+        else:
+            self._retry_policy.call(
+                self._connector.host,
+                lambda: self._connector.execute_operation_chain(
+                    operation, self._headers),
+                idempotent=False)
+        return len(chunk), time.perf_counter() - start_time
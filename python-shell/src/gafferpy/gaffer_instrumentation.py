@@ -0,0 +1,165 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module records how long each phase of a connector call takes and how
+many bytes it sends and receives
+"""
+
+import contextlib
+import json
+import threading
+import time
+
+from gafferpy import gaffer_metrics
+
+_CallMetrics = gaffer_metrics.CallMetrics
+
+
+class CallRecorder:
+    """
+    This class adds up the time spent in each phase of a call to Gaffer and
+    the bytes sent and received. It can be updated from several threads.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.start = time.perf_counter()
+        self.timings = dict.fromkeys(_CallMetrics.PHASES, 0.0)
+        self.requests = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self._lock = threading.Lock()
+
+    def add(self, phase, seconds):
+        with self._lock:
+            self.timings[phase] += seconds
+
+    @contextlib.contextmanager
+    def phase(self, phase):
+        """
+        Adds the time spent in the with block to a phase.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - start)
+
+    def count_request(self, num_bytes):
+        with self._lock:
+            self.requests += 1
+            self.request_bytes += num_bytes
+
+    def count_response(self, num_bytes):
+        with self._lock:
+            self.response_bytes += num_bytes
+
+    def timed_object_hook(self, object_hook):
+        """
+        Returns object_hook, adding the time spent in it to from_json.
+        """
+        add = self.add
+
+        def hook(obj):
+            start = time.perf_counter()
+            try:
+                return object_hook(obj)
+            finally:
+                add(_CallMetrics.FROM_JSON, time.perf_counter() - start)
+        return hook
+
+    def loads(self, text, object_hook):
+        """
+        Parses JSON text, recording the time spent in object_hook as
+        from_json and the rest as json_loads.
+        """
+        from_json = self.timings[_CallMetrics.FROM_JSON]
+        start = time.perf_counter()
+        try:
+            return json.loads(text,
+                              object_hook=self.timed_object_hook(object_hook))
+        finally:
+            self.add(_CallMetrics.JSON_LOADS,
+                     time.perf_counter() - start -
+                     (self.timings[_CallMetrics.FROM_JSON] - from_json))
+
+    def merge(self, other):
+        """
+        Adds the timings and counts of another recorder to this one.
+        """
+        with other._lock:
+            timings = dict(other.timings)
+            counts = (other.requests, other.request_bytes,
+                      other.response_bytes)
+        with self._lock:
+            for phase, seconds in timings.items():
+                self.timings[phase] += seconds
+            self.requests += counts[0]
+            self.request_bytes += counts[1]
+            self.response_bytes += counts[2]
+
+    def metrics(self, failed=False):
+        """
+        Returns the CallMetrics recorded so far, with the total time since
+        the recorder was created.
+        """
+        metrics = _CallMetrics()
+        metrics.put_metric(_CallMetrics.PATH, self.path)
+        with self._lock:
+            for phase, seconds in self.timings.items():
+                metrics.put_metric(phase, seconds)
+            metrics.put_metric(_CallMetrics.REQUESTS, self.requests)
+            metrics.put_metric(_CallMetrics.REQUEST_BYTES,
+                               self.request_bytes)
+            metrics.put_metric(_CallMetrics.RESPONSE_BYTES,
+                               self.response_bytes)
+        metrics.put_metric(_CallMetrics.TOTAL,
+                           time.perf_counter() - self.start)
+        metrics.put_metric(_CallMetrics.FAILED, failed)
+        return metrics
+
+
+class CountingResponse:
+    """
+    This class wraps a HTTP response, counting the bytes read from it and
+    recording the time spent reading them as download. Other attributes are
+    those of the wrapped response.
+    """
+
+    def __init__(self, response, recorder):
+        self._response = response
+        self._recorder = recorder
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    def read(self, *args):
+        start = time.perf_counter()
+        data = self._response.read(*args)
+        self._recorder.add(_CallMetrics.DOWNLOAD,
+                           time.perf_counter() - start)
+        self._recorder.count_response(len(data))
+        return data
+
+
+def report(listeners, recorder, failed=False):
+    """
+    Sends the metrics of a recorder to each listener.
+    """
+    metrics = recorder.metrics(failed)
+    for listener in listeners:
+        listener.update(metrics)
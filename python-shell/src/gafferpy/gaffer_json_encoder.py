@@ -0,0 +1,343 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module serialises operations to JSON, writing elements and seeds
+straight to the output rather than building a dictionary for each one
+"""
+
+import copy
+import json
+import re
+import uuid
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_compact
+
+try:
+    from _json import encode_basestring_ascii as _encode_string
+except ImportError:
+    from json.encoder import encode_basestring_ascii as _encode_string
+
+try:
+    from _json import make_encoder as _make_c_encoder
+except ImportError:
+    _make_c_encoder = None
+
+_ITEMS_PER_CHUNK = 1000
+
+DEFAULT_SEPARATORS = (', ', ': ')
+# Separators without whitespace, for the smallest output
+COMPACT_SEPARATORS = (',', ':')
+
+# Operations whose to_json writes each item of 'input' using its to_json
+# method, in place, so their input can be written by the fast path.
+_FAST_PATH_TO_JSON = (
+    g.AddElements.to_json,
+    g.GetOperation.to_json,
+    g.GetElementsBetweenSets.to_json
+)
+
+
+class _InputPlaceholder(g.ElementSeed):
+    def __init__(self, token):
+        super().__init__()
+        self.token = token
+
+    def to_json(self):
+        return self.token
+
+
+class ElementJsonEncoder:
+    """
+    This class converts operations, operation chains, elements and seeds
+    into JSON strings. The output is identical to
+    json.dumps(obj.to_json()), but Entity, Edge, EntitySeed and EdgeSeed
+    objects are written directly, without first being converted to
+    dictionaries.
+
+    The separators are an (item_separator, key_separator) tuple, as for
+    json.dumps. COMPACT_SEPARATORS writes no whitespace.
+    """
+
+    def __init__(self, separators=DEFAULT_SEPARATORS):
+        item_separator, key_separator = separators
+        self._item_separator = item_separator
+        self._encoder = json.JSONEncoder(separators=separators)
+        self._group_cache = {}
+        if _make_c_encoder is not None:
+            # The same C encoder json.dumps uses, without the per call set up
+            c_encoder = _make_c_encoder(
+                None, self._encoder.default, _encode_string, None,
+                key_separator, item_separator, False, False, True)
+            self._encode_json = lambda value: ''.join(c_encoder(value, 0))
+        else:
+            self._encode_json = self._encoder.encode
+
+        def field(name):
+            return item_separator + _encode_string(name) + key_separator
+
+        def prefix(class_name, first_field):
+            return '{' + _encode_string('class') + key_separator + \
+                _encode_string(class_name) + field(first_field)
+
+        self._entity_prefix = prefix(g.Entity.CLASS, 'group')
+        self._edge_prefix = prefix(g.Edge.CLASS, 'group')
+        self._entity_seed_prefix = prefix(g.EntitySeed.CLASS, 'vertex')
+        self._edge_seed_prefix = prefix(g.EdgeSeed.CLASS, 'source')
+        self._properties_field = field('properties')
+        self._vertex_field = field('vertex')
+        self._source_field = field('source')
+        self._destination_field = field('destination')
+        self._directed_field = field('directed')
+        self._matched_vertex_field = field('matchedVertex')
+        self._directed_type_field = field('directedType')
+
+    def encode(self, obj):
+        """
+        Returns the JSON string for obj.
+        """
+        return ''.join(self.iter_encode(obj))
+
+    def iter_encode(self, obj):
+        """
+        Yields the JSON for obj in pieces, so that large inputs can be
+        written out without building the whole string.
+        """
+        if isinstance(obj, (g.Element, g.ElementSeed,
+                            gaffer_compact.CompactEntity,
+                            gaffer_compact.CompactEdge)):
+            yield self.encode_item(obj)
+            return
+        if isinstance(obj, list):
+            yield '[' + self._item_separator.join(
+                self.encode(item) for item in obj) + ']'
+            return
+
+        yield from self.iter_dumps(*self.to_json(obj))
+
+    def to_json(self, obj):
+        """
+        Returns the json objects for obj, with the inputs that can be
+        written by the fast path replaced by placeholders, and a dictionary
+        of those inputs. Passing both to iter_dumps writes the JSON for obj.
+        """
+        inputs = {}
+        obj = self._substitute_inputs(obj, inputs)
+        if isinstance(obj, g.ToJson):
+            obj = obj.to_json()
+        return obj, inputs
+
+    def iter_dumps(self, obj, inputs):
+        """
+        Yields the JSON for json objects and inputs returned by to_json in
+        pieces.
+        """
+        text = self._encoder.encode(obj)
+        if not inputs:
+            yield text
+            return
+
+        pattern = re.compile('|'.join(re.escape(key) for key in inputs))
+        pos = 0
+        for match in pattern.finditer(text):
+            yield text[pos:match.start()]
+            yield from self.iter_encode_items(inputs[match.group()])
+            pos = match.end()
+        yield text[pos:]
+
+    def iter_encode_items(self, items):
+        """
+        Yields the JSON array of the elements or seeds in items in pieces.
+        Items that are not elements or seeds are written as EntitySeeds, as
+        GetOperation.to_json does.
+        """
+        encode_item = self.encode_item
+        separator = self._item_separator
+        yield '['
+        chunk = []
+        first = True
+        for item in items:
+            if first:
+                first = False
+                chunk.append(encode_item(item))
+            else:
+                chunk.append(separator + encode_item(item))
+            if len(chunk) >= _ITEMS_PER_CHUNK:
+                yield ''.join(chunk)
+                chunk = []
+        chunk.append(']')
+        yield ''.join(chunk)
+
+    def encode_item(self, item):
+        item_type = type(item)
+        if item_type is g.Edge:
+            return self.encode_edge(item)
+        if item_type is g.Entity:
+            return self.encode_entity(item)
+        if item_type is g.EntitySeed or \
+                item_type is gaffer_compact.CompactEntitySeed:
+            return self._entity_seed_prefix + self._encode_value(
+                item.vertex) + '}'
+        if item_type is g.EdgeSeed or \
+                item_type is gaffer_compact.CompactEdgeSeed:
+            return self.encode_edge_seed(item)
+        if item_type is gaffer_compact.CompactEdge:
+            return self._encode_edge_fields(item)
+        if item_type is gaffer_compact.CompactEntity:
+            return self._encode_entity_fields(item)
+        if isinstance(item, g.ToJson):
+            return self._encode_json(item.to_json())
+        return self._entity_seed_prefix + self._encode_value(item) + '}'
+
+    def encode_entity(self, entity):
+        if entity._class_name != g.Entity.CLASS:
+            return self._encode_json(entity.to_json())
+        return self._encode_entity_fields(entity)
+
+    def _encode_entity_fields(self, entity):
+        parts = [self._entity_prefix, self._encode_group(entity.group)]
+        if entity.properties is not None:
+            parts.append(self._properties_field)
+            parts.append(self._encode_json(entity.properties))
+        parts.append(self._vertex_field)
+        parts.append(self._encode_value(entity.vertex))
+        parts.append('}')
+        return ''.join(parts)
+
+    def encode_edge(self, edge):
+        if edge._class_name != g.Edge.CLASS:
+            return self._encode_json(edge.to_json())
+        return self._encode_edge_fields(edge)
+
+    def _encode_edge_fields(self, edge):
+        encode_value = self._encode_value
+        parts = [self._edge_prefix, self._encode_group(edge.group)]
+        if edge.properties is not None:
+            parts.append(self._properties_field)
+            parts.append(self._encode_json(edge.properties))
+        parts.append(self._source_field)
+        parts.append(encode_value(edge.source))
+        parts.append(self._destination_field)
+        parts.append(encode_value(edge.destination))
+        parts.append(self._directed_field)
+        parts.append(encode_value(edge.directed))
+        if edge.matched_vertex is not None:
+            parts.append(self._matched_vertex_field)
+            parts.append(encode_value(edge.matched_vertex))
+        parts.append('}')
+        return ''.join(parts)
+
+    def encode_edge_seed(self, seed):
+        encode_value = self._encode_value
+        parts = [self._edge_seed_prefix, encode_value(seed.source),
+                 self._destination_field, encode_value(seed.destination),
+                 self._directed_type_field, encode_value(seed.directed_type)]
+        if seed.matched_vertex is not None:
+            parts.append(self._matched_vertex_field)
+            parts.append(encode_value(seed.matched_vertex))
+        parts.append('}')
+        return ''.join(parts)
+
+    def _encode_value(self, value):
+        value_type = type(value)
+        if value_type is str:
+            return _encode_string(value)
+        if value_type is bool:
+            return 'true' if value else 'false'
+        if value_type is int:
+            return int.__repr__(value)
+        return self._encode_json(value)
+
+    def _encode_group(self, group):
+        encoded = self._group_cache.get(group)
+        if encoded is None:
+            encoded = self._encode_value(group)
+            if len(self._group_cache) < 1024:
+                self._group_cache[group] = encoded
+        return encoded
+
+    def _substitute_inputs(self, obj, inputs):
+        """
+        Returns a shallow copy of obj where each input that can be written by
+        the fast path is replaced by a placeholder, recording the real input
+        against the JSON that the placeholder will produce.
+        """
+        if isinstance(obj, g.OperationChain) and \
+                type(obj).to_json in (g.OperationChain.to_json,
+                                      g.OperationChainDAO.to_json):
+            chain = copy.copy(obj)
+            chain.operations = [self._substitute_inputs(operation, inputs)
+                                for operation in obj.operations]
+            return chain
+
+        if getattr(type(obj), 'to_json', None) in _FAST_PATH_TO_JSON and \
+                getattr(obj, 'input', None) is not None:
+            token = '\0gafferpy-input-' + str(len(inputs)) + '-' + \
+                    uuid.uuid4().hex + '\0'
+            input = obj.input
+            if isinstance(obj, g.GetOperation) and \
+                    not isinstance(input, list):
+                input = [input]
+            inputs['[' + _encode_string(token) + ']'] = input
+            operation = copy.copy(obj)
+            operation.input = [_InputPlaceholder(token)]
+            return operation
+
+        return obj
+
+
+_default_encoder = ElementJsonEncoder()
+_compact_encoder = ElementJsonEncoder(COMPACT_SEPARATORS)
+
+
+def encode(obj, compact=False):
+    """
+    Returns the JSON string for an operation, operation chain, element, seed
+    or list of these, identical to json.dumps(obj.to_json()). If compact is
+    True no whitespace is written, as with
+    json.dumps(obj.to_json(), separators=COMPACT_SEPARATORS).
+    """
+    if compact:
+        return _compact_encoder.encode(obj)
+    return _default_encoder.encode(obj)
+
+
+def iter_encode(obj, compact=False):
+    """
+    Yields the JSON string for obj in pieces.
+    """
+    if compact:
+        return _compact_encoder.iter_encode(obj)
+    return _default_encoder.iter_encode(obj)
+
+
+def to_json(obj):
+    """
+    Returns the json objects for an operation or operation chain, without
+    the inputs that can be written by the fast path, and those inputs. This
+    is the first half of encode, so the two halves can be timed separately.
+    """
+    return _default_encoder.to_json(obj)
+
+
+def dumps(obj, inputs, compact=False):
+    """
+    Returns the JSON string for json objects and inputs returned by to_json.
+    """
+    if compact:
+        return ''.join(_compact_encoder.iter_dumps(obj, inputs))
+    return ''.join(_default_encoder.iter_dumps(obj, inputs))
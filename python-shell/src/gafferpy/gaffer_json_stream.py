@@ -0,0 +1,145 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module incrementally decodes JSON results as they are read from a
+Gaffer REST API response
+"""
+
+import codecs
+import json
+import re
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_NON_WHITESPACE = re.compile(r'\S')
+
+# Characters that may continue a number that ends at the end of the buffer
+_NUMBER_CHARS = frozenset('0123456789.eE+-')
+
+
+class JsonStreamDecoder:
+    """
+    This class iterates over the items of a top level JSON array, decoding
+    each one as soon as it has been read. Only the item currently being
+    decoded and one chunk of unread text are held in memory.
+
+    If the JSON is not an array, the whole value is decoded and returned as
+    the only item.
+    """
+
+    def __init__(self, readable, object_hook=None,
+                 chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        The readable must have a read(size) method returning bytes, such as
+        a HTTP response.
+        """
+        self._readable = readable
+        self._object_hook = object_hook
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json_decoder = json.JSONDecoder(object_hook=object_hook)
+        self._buffer = ''
+        self._eof = False
+
+    def __iter__(self):
+        pos = self._find_non_whitespace(0)
+        if pos is None:
+            return
+
+        if self._buffer[pos] != '[':
+            while self._read():
+                pass
+            yield self._loads(self._buffer[pos:])
+            return
+
+        pos += 1
+        while True:
+            if pos >= self._chunk_size:
+                # Drop the items that have already been decoded
+                self._buffer = self._buffer[pos:]
+                pos = 0
+
+            pos = self._find_non_whitespace(pos)
+            if pos is None:
+                raise ValueError('Unterminated JSON array')
+            if self._buffer[pos] == ']':
+                return
+
+            item, pos = self._decode_item(pos)
+            pos = self._find_non_whitespace(pos)
+            if pos is None:
+                raise ValueError('Unterminated JSON array')
+            terminator = self._buffer[pos]
+            if terminator not in ',]':
+                raise ValueError('Expecting , or ] at position ' + str(pos))
+            pos += 1
+
+            yield item
+
+            if terminator == ']':
+                return
+
+    def _loads(self, text):
+        return json.loads(text, object_hook=self._object_hook)
+
+    def _decode_item(self, pos):
+        """
+        Decodes the array item starting at pos, reading more of the response
+        until the whole item is available. Returns the item and the index
+        just after it.
+        """
+        while True:
+            try:
+                item, end = self._json_decoder.raw_decode(self._buffer, pos)
+            except ValueError:
+                # The item may not have been fully read yet
+                if not self._read():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if (end < len(self._buffer) and
+                    self._buffer[end] not in _NUMBER_CHARS) or \
+                    not self._read():
+                return item, end
+
+    def _read(self):
+        if self._eof:
+            return False
+        chunk = self._readable.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            self._buffer += self._decoder.decode(b'', final=True)
+            return False
+        self._buffer += self._decoder.decode(chunk)
+        return True
+
+    def _find_non_whitespace(self, pos):
+        while True:
+            match = _NON_WHITESPACE.search(self._buffer, pos)
+            if match is not None:
+                return match.start()
+            pos = len(self._buffer)
+            if not self._read():
+                return None
+
+
+def iter_json_array(readable, object_hook=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yields each item of the JSON array read from readable.
+    """
+    return iter(JsonStreamDecoder(readable, object_hook=object_hook,
+                                  chunk_size=chunk_size))
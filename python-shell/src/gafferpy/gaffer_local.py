@@ -0,0 +1,1087 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module runs Filter, Transform, Aggregate, Sort, Max, Min, Limit,
+ToVertices and ToSet on elements held in memory or streamed from Gaffer,
+using Python versions of the koryphe predicates, functions and binary
+operators
+"""
+
+import copy
+import datetime
+import functools
+import heapq
+import itertools
+import json
+import re
+import time
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_seed_index
+
+
+def unwrap(value):
+    """
+    Returns the value held in a json type wrapper, such as
+    {'java.lang.Long': 3}, or the value itself if it is not wrapped.
+    """
+    if type(value) is dict and len(value) == 1:
+        for key, inner in value.items():
+            if '.' in key:
+                return inner
+    return value
+
+
+def wrap_like(template, value):
+    """
+    Wraps value in the same json type wrapper as template, if it has one.
+    """
+    if type(template) is dict and len(template) == 1:
+        for key in template:
+            if '.' in key:
+                return {key: value}
+    return value
+
+
+def _to_json(obj):
+    if isinstance(obj, g.ToJson):
+        return obj.to_json()
+    return obj
+
+
+def _is_entity(element):
+    return getattr(element, 'CLASS', None) == g.Entity.CLASS
+
+
+def _matched_vertex(edge):
+    if edge.matched_vertex == 'DESTINATION':
+        return edge.destination
+    return edge.source
+
+
+def _adjacent_matched_vertex(edge):
+    if edge.matched_vertex == 'DESTINATION':
+        return edge.source
+    return edge.destination
+
+
+_IDENTIFIERS = {
+    'GROUP': lambda element: element.group,
+    'VERTEX': lambda element: element.vertex if _is_entity(element) else None,
+    'SOURCE': lambda element: None if _is_entity(element) else element.source,
+    'DESTINATION':
+        lambda element: None if _is_entity(element) else element.destination,
+    'DIRECTED':
+        lambda element: None if _is_entity(element) else element.directed,
+    'MATCHED_VERTEX': lambda element: element.vertex if _is_entity(element)
+    else _matched_vertex(element),
+    'ADJACENT_MATCHED_VERTEX': lambda element: None if _is_entity(element)
+    else _adjacent_matched_vertex(element)
+}
+
+
+def value_getter(name):
+    """
+    Returns a function getting an identifier, such as VERTEX or SOURCE, or a
+    property from an element. Missing properties are None.
+    """
+    identifier = _IDENTIFIERS.get(name)
+    if identifier is not None:
+        return identifier
+
+    def get_property(element):
+        properties = element.properties
+        if properties is None:
+            return None
+        return properties.get(name)
+
+    return get_property
+
+
+def _set_value(element, name, value):
+    if name == 'VERTEX':
+        element.vertex = value
+    elif name in ('SOURCE', 'DESTINATION', 'DIRECTED'):
+        setattr(element, name.lower(), value)
+    elif name == 'GROUP':
+        element.group = value
+    else:
+        if element.properties is None:
+            element.properties = {}
+        element.properties[name] = value
+
+
+def copy_element(element):
+    element = copy.copy(element)
+    if element.properties is not None:
+        element.properties = dict(element.properties)
+    return element
+
+
+########################################################
+# Predicates
+
+_JAVA_TYPES = {
+    'java.lang.String': str,
+    'java.lang.Long': int,
+    'java.lang.Integer': int,
+    'java.lang.Short': int,
+    'java.lang.Byte': int,
+    'java.lang.Double': float,
+    'java.lang.Float': float,
+    'java.lang.Boolean': bool,
+    'java.lang.Number': (int, float),
+    'java.util.Map': dict,
+    'java.util.List': list,
+    'java.util.Collection': (list, set, tuple)
+}
+
+# Milliseconds in each koryphe TimeUnit
+TIME_UNITS = {
+    'DAY': 86400000,
+    'HOUR': 3600000,
+    'MINUTE': 60000,
+    'SECOND': 1000,
+    'MILLISECOND': 1,
+    'MICROSECOND': 0.001
+}
+
+_DATE_FORMATS = ('%Y/%m/%d %H:%M:%S.%f', '%Y/%m/%d %H:%M:%S',
+                 '%Y/%m/%d %H:%M', '%Y/%m/%d %H', '%Y/%m/%d',
+                 '%Y-%m-%d %H:%M:%S', '%Y-%m-%d')
+
+
+def _now_millis():
+    return time.time() * 1000
+
+
+def _parse_time(value, time_zone=None):
+    """
+    Returns a time in milliseconds since the epoch from a number or a date
+    string in one of the formats koryphe accepts.
+    """
+    value = unwrap(value)
+    if isinstance(value, (int, float)):
+        return value
+    for date_format in _DATE_FORMATS:
+        try:
+            date = datetime.datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+        if time_zone is None or time_zone in ('UTC', 'GMT'):
+            date = date.replace(tzinfo=datetime.timezone.utc)
+        return date.timestamp() * 1000
+    raise ValueError('Unable to parse date: ' + str(value))
+
+
+def _compare(test, value, or_equal_to):
+    def predicate(input):
+        if input is None:
+            return False
+        if or_equal_to:
+            return test(input, value) or input == value
+        return test(input, value)
+    return predicate
+
+
+def _is_more_than(json_obj):
+    return _compare(lambda a, b: a > b, unwrap(json_obj.get('value')),
+                    json_obj.get('orEqualTo'))
+
+
+def _is_less_than(json_obj):
+    return _compare(lambda a, b: a < b, unwrap(json_obj.get('value')),
+                    json_obj.get('orEqualTo'))
+
+
+def _is_equal(json_obj):
+    value = unwrap(json_obj.get('value'))
+    return lambda input: input == value
+
+
+def _is_in(json_obj):
+    values = [unwrap(value) for value in json_obj.get('values') or []]
+    try:
+        value_set = frozenset(values)
+    except TypeError:
+        return lambda input: input in values
+
+    def is_in(input):
+        try:
+            return input in value_set
+        except TypeError:
+            # An unhashable input, such as a map property
+            return input in values
+    return is_in
+
+
+def _are_in(json_obj):
+    values = [unwrap(value) for value in json_obj.get('values') or []]
+    return lambda input: input is None or all(
+        item in values for item in input)
+
+
+def _in_range(json_obj):
+    start = unwrap(json_obj.get('start'))
+    end = unwrap(json_obj.get('end'))
+    start_inclusive = json_obj.get('startInclusive', True)
+    end_inclusive = json_obj.get('endInclusive', False)
+
+    def predicate(input):
+        if input is None:
+            return False
+        if start is not None:
+            if input < start or (not start_inclusive and input == start):
+                return False
+        if end is not None:
+            if input > end or (not end_inclusive and input == end):
+                return False
+        return True
+    return predicate
+
+
+def time_range_bounds(json_obj):
+    """
+    Returns the start and end, in milliseconds since the epoch, of the range
+    of an InTimeRange or InDateRange predicate's json. Offsets are taken from
+    the current time and an open end is None.
+    """
+    time_zone = json_obj.get('timeZone')
+    offset_unit = TIME_UNITS[json_obj.get('offsetUnit') or 'DAY']
+
+    def bound(value, offset):
+        if offset is not None:
+            return _now_millis() - unwrap(offset) * offset_unit
+        if value is not None:
+            return _parse_time(value, time_zone)
+        return None
+
+    return (bound(json_obj.get('start'), json_obj.get('startOffset')),
+            bound(json_obj.get('end'), json_obj.get('endOffset')))
+
+
+def time_range_bounds_getter(json_obj):
+    """
+    Returns a function returning the time_range_bounds of a predicate's
+    json. Bounds that are not offsets from now are only worked out once.
+    """
+    if json_obj.get('startOffset') is None and \
+            json_obj.get('endOffset') is None:
+        bounds = time_range_bounds(json_obj)
+        return lambda: bounds
+    return functools.partial(time_range_bounds, json_obj)
+
+
+def _in_time_range(json_obj, time_unit=None):
+    """
+    Tests times, in the time_unit, against a range whose start and end are
+    times, date strings or offsets from now.
+    """
+    unit = TIME_UNITS[time_unit or json_obj.get('timeUnit') or 'MILLISECOND']
+    start_inclusive = json_obj.get('startInclusive', True)
+    end_inclusive = json_obj.get('endInclusive', False)
+    bounds = time_range_bounds_getter(json_obj)
+
+    def predicate(input):
+        if input is None:
+            return False
+        millis = input * unit
+        start, end = bounds()
+        if start is not None:
+            if millis < start or (not start_inclusive and millis == start):
+                return False
+        if end is not None:
+            if millis > end or (not end_inclusive and millis == end):
+                return False
+        return True
+    return predicate
+
+
+def _length_of(input):
+    if isinstance(input, (int, float)):
+        return input
+    return len(input)
+
+
+def _is_longer_than(json_obj):
+    min_length = json_obj.get('minLength')
+    or_equal_to = json_obj.get('orEqualTo')
+    return lambda input: input is not None and (
+        _length_of(input) > min_length or
+        (or_equal_to and _length_of(input) == min_length))
+
+
+def _is_shorter_than(json_obj):
+    max_length = json_obj.get('maxLength')
+    or_equal_to = json_obj.get('orEqualTo')
+    return lambda input: input is not None and (
+        _length_of(input) < max_length or
+        (or_equal_to and _length_of(input) == max_length))
+
+
+def _regex(json_obj):
+    pattern = re.compile(json_obj.get('value'))
+    return lambda input: isinstance(input, str) and \
+        pattern.fullmatch(input) is not None
+
+
+def _multi_regex(json_obj):
+    patterns = [re.compile(value) for value in json_obj.get('value') or []]
+    return lambda input: isinstance(input, str) and any(
+        pattern.fullmatch(input) is not None for pattern in patterns)
+
+
+def _string_contains(json_obj):
+    value = json_obj.get('value')
+    if json_obj.get('ignoreCase'):
+        value = value.lower()
+        return lambda input: input is not None and value in input.lower()
+    return lambda input: input is not None and value in input
+
+
+def _is_a(json_obj):
+    python_type = _JAVA_TYPES.get(json_obj.get('type'))
+    if python_type is None:
+        raise ValueError('No local implementation for IsA type: ' +
+                         str(json_obj.get('type')))
+    return lambda input: input is None or isinstance(input, python_type)
+
+
+def _age_off(json_obj):
+    age_off_time = json_obj.get('ageOffTime')
+    if age_off_time is None:
+        age_off_time = 365 * TIME_UNITS['DAY']
+    return lambda input: input is not None and \
+        input > _now_millis() - age_off_time
+
+
+def _age_off_from_days(json_obj):
+    return lambda timestamp, days: timestamp is not None and \
+        days is not None and \
+        timestamp > _now_millis() - days * TIME_UNITS['DAY']
+
+
+def _and(json_obj):
+    predicates = [compile_predicate(predicate)
+                  for predicate in json_obj.get('predicates') or []]
+    return lambda *inputs: all(
+        predicate(*inputs) for predicate in predicates)
+
+
+def _or(json_obj):
+    predicates = [compile_predicate(predicate)
+                  for predicate in json_obj.get('predicates') or []]
+    return lambda *inputs: any(
+        predicate(*inputs) for predicate in predicates)
+
+
+def _not(json_obj):
+    predicate = compile_predicate(json_obj['predicate'])
+    return lambda *inputs: not predicate(*inputs)
+
+
+def _nested(json_obj):
+    selection = json_obj.get('selection') or []
+    predicate = compile_predicate(json_obj['predicate'])
+    return lambda *inputs: predicate(*[inputs[index] for index in selection])
+
+
+def _if(json_obj):
+    condition = json_obj.get('condition')
+    predicate = json_obj.get('predicate')
+    predicate = None if predicate is None else compile_predicate(predicate)
+    then = json_obj.get('then')
+    then = None if then is None else compile_predicate(then)
+    otherwise = json_obj.get('otherwise')
+    otherwise = None if otherwise is None else compile_predicate(otherwise)
+
+    def if_predicate(*inputs):
+        if condition is not None:
+            test = condition
+        else:
+            test = predicate is not None and predicate(*inputs)
+        branch = then if test else otherwise
+        return branch is not None and branch(*inputs)
+    return if_predicate
+
+
+def _map_contains(json_obj):
+    key = json_obj.get('key')
+    return lambda input: input is not None and key in input
+
+
+def _map_contains_predicate(json_obj):
+    key_predicate = compile_predicate(json_obj['keyPredicate'])
+    return lambda input: input is not None and any(
+        key_predicate(key) for key in input)
+
+
+def _predicate_map(json_obj):
+    key = json_obj.get('key')
+    predicate = compile_predicate(json_obj['predicate'])
+    return lambda input: input is not None and key in input and \
+        predicate(unwrap(input[key]))
+
+
+# Functions taking the json of a predicate and returning a python function
+# taking the (unwrapped) selected values and returning a bool. Extra
+# predicates can be added by their class name.
+PREDICATES = {
+    g.And.CLASS: _and,
+    g.Or.CLASS: _or,
+    g.Not.CLASS: _not,
+    g.NestedPredicate.CLASS: _nested,
+    g.If.CLASS: _if,
+    g.IsMoreThan.CLASS: _is_more_than,
+    g.IsLessThan.CLASS: _is_less_than,
+    g.IsEqual.CLASS: _is_equal,
+    g.IsIn.CLASS: _is_in,
+    g.AreIn.CLASS: _are_in,
+    g.InRange.CLASS: _in_range,
+    g.InTimeRange.CLASS: _in_time_range,
+    g.InDateRange.CLASS:
+        lambda json_obj: _in_time_range(json_obj, 'MILLISECOND'),
+    g.IsLongerThan.CLASS: _is_longer_than,
+    g.IsShorterThan.CLASS: _is_shorter_than,
+    g.Regex.CLASS: _regex,
+    g.MultiRegex.CLASS: _multi_regex,
+    g.StringContains.CLASS: _string_contains,
+    g.IsA.CLASS: _is_a,
+    g.AgeOff.CLASS: _age_off,
+    g.AgeOffFromDays.CLASS: _age_off_from_days,
+    g.MapContains.CLASS: _map_contains,
+    g.MapContainsPredicate.CLASS: _map_contains_predicate,
+    g.PredicateMap.CLASS: _predicate_map,
+    g.Exists.CLASS: lambda json_obj: lambda input: input is not None,
+    g.IsTrue.CLASS: lambda json_obj: lambda input: input is True,
+    g.IsFalse.CLASS: lambda json_obj: lambda input: input is False,
+    g.AreEqual.CLASS: lambda json_obj: lambda a, b: a == b,
+    g.IsXLessThanY.CLASS:
+        lambda json_obj: lambda x, y: x is not None and y is not None and
+        x < y,
+    g.IsXMoreThanY.CLASS:
+        lambda json_obj: lambda x, y: x is not None and y is not None and
+        x > y,
+    g.CollectionContains.CLASS:
+        lambda json_obj: lambda input: input is not None and
+        unwrap(json_obj.get('value')) in input
+}
+
+
+def compile_predicate(predicate):
+    """
+    Returns a python function for a predicate, or its json, taking the
+    selected values.
+    """
+    json_obj = _to_json(predicate)
+    class_name = json_obj.get('class')
+    factory = PREDICATES.get(class_name)
+    if factory is None:
+        raise ValueError('No local implementation for predicate: ' +
+                         str(class_name))
+    return factory(json_obj)
+
+
+def compile_element_filter(predicate_contexts):
+    """
+    Returns a function testing an element against a list of
+    PredicateContexts, or their json, which all have to pass.
+    """
+    tests = []
+    for context in predicate_contexts or []:
+        context = _to_json(context)
+        getters = [value_getter(name)
+                   for name in context.get('selection') or []]
+        tests.append((getters, compile_predicate(context['predicate'])))
+
+    def element_filter(element):
+        for getters, predicate in tests:
+            if not predicate(*[unwrap(getter(element))
+                               for getter in getters]):
+                return False
+        return True
+    return element_filter
+
+
+########################################################
+# Functions
+
+def _first(iterable):
+    return next(iter(iterable), None)
+
+
+def _last(iterable):
+    item = None
+    for item in iterable:
+        pass
+    return item
+
+
+def _nth_item(json_obj):
+    index = json_obj.get('selection')
+    return lambda input: None if input is None else next(
+        itertools.islice(input, index, None), None)
+
+
+def _length(json_obj):
+    max_length = json_obj.get('maxLength')
+
+    def length(input):
+        if input is None:
+            return 0
+        result = _length_of(input)
+        if max_length is not None and result > max_length:
+            raise ValueError('Length exceeds the max length ' +
+                             str(max_length))
+        return result
+    return length
+
+
+def _divide(a, b):
+    if isinstance(a, int) and isinstance(b, int):
+        return a // b, a % b
+    return a / b, None
+
+
+def _to_long(input):
+    if input is None:
+        return None
+    return int(input)
+
+
+def _function_map(json_obj):
+    function = compile_function(json_obj['function'])
+    return lambda input: None if input is None else {
+        key: function(unwrap(value)) for key, value in input.items()}
+
+
+def _iterable_function(json_obj):
+    functions = [compile_function(function)
+                 for function in json_obj.get('functions') or []]
+
+    def iterable_function(input):
+        if input is None:
+            return None
+        for function in functions:
+            input = [function(item) for item in input]
+        return input
+    return iterable_function
+
+
+def _extract_id(json_obj):
+    getter = value_getter(json_obj.get('id'))
+    return lambda element: None if element is None else getter(element)
+
+
+def _extract_property(json_obj):
+    getter = value_getter(json_obj.get('name'))
+    return lambda element: None if element is None else getter(element)
+
+
+def _freq_map_extractor(json_obj):
+    key = json_obj.get('key')
+    return lambda input: None if input is None else unwrap(input).get(key)
+
+
+# Functions taking the json of a koryphe function and returning a python
+# function taking the (unwrapped) selected values. A function projecting
+# into several fields returns a tuple. Extra functions can be added by
+# their class name.
+FUNCTIONS = {
+    g.Identity.CLASS: lambda json_obj: lambda input: input,
+    g.ToString.CLASS:
+        lambda json_obj: lambda input: None if input is None else str(input),
+    g.ToUpperCase.CLASS:
+        lambda json_obj: lambda input: None if input is None
+        else str(input).upper(),
+    g.ToLowerCase.CLASS:
+        lambda json_obj: lambda input: None if input is None
+        else str(input).lower(),
+    g.ToNull.CLASS: lambda json_obj: lambda *inputs: None,
+    g.ToLong.CLASS: lambda json_obj: _to_long,
+    g.ToInteger.CLASS: lambda json_obj: _to_long,
+    g.Size.CLASS:
+        lambda json_obj: lambda input: 0 if input is None else len(input),
+    g.Length.CLASS: _length,
+    g.IsEmpty.CLASS:
+        lambda json_obj: lambda input: input is None or len(input) == 0,
+    g.FirstItem.CLASS:
+        lambda json_obj: lambda input: None if input is None
+        else _first(input),
+    g.LastItem.CLASS:
+        lambda json_obj: lambda input: None if input is None
+        else _last(input),
+    g.NthItem.CLASS: _nth_item,
+    g.ExtractKeys.CLASS:
+        lambda json_obj: lambda input: None if input is None
+        else list(input.keys()),
+    g.ExtractValues.CLASS:
+        lambda json_obj: lambda input: None if input is None
+        else [unwrap(value) for value in input.values()],
+    g.ExtractValue.CLASS:
+        lambda json_obj: lambda input: None if input is None
+        else unwrap(input.get(json_obj.get('key'))),
+    g.Concat.CLASS:
+        lambda json_obj: lambda a, b: (json_obj.get('separator') or ',').join(
+            str(value) for value in (a, b) if value is not None),
+    g.Divide.CLASS: lambda json_obj: _divide,
+    g.DivideBy.CLASS:
+        lambda json_obj: lambda input: _divide(input, json_obj.get('by')),
+    g.Multiply.CLASS:
+        lambda json_obj: lambda a, b: None if a is None or b is None
+        else a * b,
+    g.MultiplyBy.CLASS:
+        lambda json_obj: lambda input: None if input is None
+        else input * json_obj.get('by'),
+    g.SetValue.CLASS:
+        lambda json_obj: lambda *inputs: unwrap(json_obj.get('value')),
+    g.IterableConcat.CLASS:
+        lambda json_obj: lambda input: None if input is None
+        else list(itertools.chain.from_iterable(input)),
+    g.IterableFunction.CLASS: _iterable_function,
+    g.FunctionMap.CLASS: _function_map,
+    g.FreqMapExtractor.CLASS: _freq_map_extractor,
+    g.ExtractGroup.CLASS:
+        lambda json_obj: lambda element: None if element is None
+        else element.group,
+    g.ExtractId.CLASS: _extract_id,
+    g.ExtractProperty.CLASS: _extract_property,
+    g.ToEntityId.CLASS:
+        lambda json_obj: lambda input: None if input is None
+        else g.EntitySeed(input),
+    g.FromEntityId.CLASS:
+        lambda json_obj: lambda input: None if input is None
+        else input.vertex
+}
+
+
+def compile_function(function):
+    """
+    Returns a python function for a koryphe function, or its json, taking
+    the selected values.
+    """
+    json_obj = _to_json(function)
+    class_name = json_obj.get('class')
+    factory = FUNCTIONS.get(class_name)
+    if factory is None:
+        raise ValueError('No local implementation for function: ' +
+                         str(class_name))
+    return factory(json_obj)
+
+
+def compile_element_transformer(function_contexts):
+    """
+    Returns a function applying a list of FunctionContexts, or their json,
+    to an element in place.
+    """
+    steps = []
+    for context in function_contexts or []:
+        context = _to_json(context)
+        getters = [value_getter(name)
+                   for name in context.get('selection') or []]
+        steps.append((getters, compile_function(context['function']),
+                      context.get('projection') or []))
+
+    def transform(element):
+        for getters, function, projection in steps:
+            result = function(*[unwrap(getter(element))
+                                for getter in getters])
+            if len(projection) == 1:
+                _set_value(element, projection[0], result)
+            else:
+                for name, value in zip(projection, result):
+                    _set_value(element, name, value)
+        return element
+    return transform
+
+
+########################################################
+# Binary operators
+
+_BINARY_OPERATOR_PACKAGE = 'uk.gov.gchq.koryphe.impl.binaryoperator.'
+
+
+def _ignore_none(operator):
+    def binary_operator(a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return operator(a, b)
+    return binary_operator
+
+
+def _string_concat(json_obj):
+    separator = json_obj.get('separator')
+    if separator is None:
+        separator = ','
+    return _ignore_none(lambda a, b: a + separator + b)
+
+
+def _collection_concat(a, b):
+    if isinstance(a, set):
+        return a | set(b)
+    return list(a) + list(b)
+
+
+def _freq_map_merge(a, b):
+    merged = dict(a)
+    for key, count in b.items():
+        merged[key] = merged.get(key, 0) + count
+    return merged
+
+
+# Functions taking the json of a koryphe binary operator and returning a
+# python function of two (unwrapped) values. Extra binary operators can be
+# added by their class name.
+BINARY_OPERATORS = {
+    _BINARY_OPERATOR_PACKAGE + 'Sum':
+        lambda json_obj: _ignore_none(lambda a, b: a + b),
+    _BINARY_OPERATOR_PACKAGE + 'Product':
+        lambda json_obj: _ignore_none(lambda a, b: a * b),
+    _BINARY_OPERATOR_PACKAGE + 'Max':
+        lambda json_obj: _ignore_none(lambda a, b: b if b > a else a),
+    _BINARY_OPERATOR_PACKAGE + 'Min':
+        lambda json_obj: _ignore_none(lambda a, b: b if b < a else a),
+    _BINARY_OPERATOR_PACKAGE + 'First':
+        lambda json_obj: _ignore_none(lambda a, b: a),
+    _BINARY_OPERATOR_PACKAGE + 'Last':
+        lambda json_obj: _ignore_none(lambda a, b: b),
+    _BINARY_OPERATOR_PACKAGE + 'And':
+        lambda json_obj: _ignore_none(lambda a, b: a and b),
+    _BINARY_OPERATOR_PACKAGE + 'Or':
+        lambda json_obj: _ignore_none(lambda a, b: a or b),
+    _BINARY_OPERATOR_PACKAGE + 'StringConcat': _string_concat,
+    _BINARY_OPERATOR_PACKAGE + 'StringDeduplicateConcat':
+        lambda json_obj: _ignore_none(lambda a, b: ','.join(
+            dict.fromkeys(a.split(',') + b.split(',')))),
+    _BINARY_OPERATOR_PACKAGE + 'CollectionConcat':
+        lambda json_obj: _ignore_none(_collection_concat),
+    _BINARY_OPERATOR_PACKAGE + 'CollectionIntersect':
+        lambda json_obj: _ignore_none(
+            lambda a, b: [item for item in a if item in b]),
+    'uk.gov.gchq.gaffer.types.function.FreqMapAggregator':
+        lambda json_obj: _ignore_none(_freq_map_merge)
+}
+
+
+def compile_binary_operator(binary_operator, unwrapped=False):
+    """
+    Returns a python function of two values for a koryphe binary operator,
+    or its json. Values in json type wrappers are unwrapped and the result
+    is wrapped in the same way as the first value, unless unwrapped is True
+    in which case the function takes and returns unwrapped values.
+    """
+    json_obj = _to_json(binary_operator)
+    class_name = json_obj.get('class')
+    factory = BINARY_OPERATORS.get(class_name)
+    if factory is None:
+        raise ValueError('No local implementation for binary operator: ' +
+                         str(class_name))
+    operator = factory(json_obj)
+    if unwrapped:
+        return operator
+
+    def wrapped_operator(a, b):
+        if type(a) is not dict and type(b) is not dict:
+            return operator(a, b)
+        return wrap_like(a if a is not None else b,
+                         operator(unwrap(a), unwrap(b)))
+    return wrapped_operator
+
+
+########################################################
+# Operations
+
+def _element_definitions(definitions):
+    if definitions is None:
+        return None
+    return {definition.group: definition for definition in definitions}
+
+
+def _handle_filter(operation, elements):
+    entity_filters = _element_definitions(operation.entities)
+    edge_filters = _element_definitions(operation.edges)
+    if entity_filters is not None:
+        entity_filters = {group: compile_element_filter(definition.predicates)
+                          for group, definition in entity_filters.items()}
+    if edge_filters is not None:
+        edge_filters = {group: compile_element_filter(definition.predicates)
+                        for group, definition in edge_filters.items()}
+
+    def global_filter(definition):
+        if definition is None:
+            return None
+        return compile_element_filter(definition.predicates)
+
+    global_elements = global_filter(operation.global_elements)
+    global_entities = global_filter(operation.global_entities)
+    global_edges = global_filter(operation.global_edges)
+
+    for element in elements:
+        if _is_entity(element):
+            group_filters = entity_filters
+            kind_filter = global_entities
+        else:
+            group_filters = edge_filters
+            kind_filter = global_edges
+        if global_elements is not None and not global_elements(element):
+            continue
+        if kind_filter is not None and not kind_filter(element):
+            continue
+        if group_filters is not None:
+            group_filter = group_filters.get(element.group)
+            if group_filter is None or not group_filter(element):
+                continue
+        yield element
+
+
+def _handle_transform(operation, elements):
+    entity_transforms = _element_definitions(operation.entities) or {}
+    edge_transforms = _element_definitions(operation.edges) or {}
+    entity_transforms = {
+        group: compile_element_transformer(definition.functions)
+        for group, definition in entity_transforms.items()}
+    edge_transforms = {
+        group: compile_element_transformer(definition.functions)
+        for group, definition in edge_transforms.items()}
+
+    for element in elements:
+        transforms = entity_transforms if _is_entity(element) \
+            else edge_transforms
+        transform = transforms.get(element.group)
+        if transform is not None:
+            element = transform(copy_element(element))
+        yield element
+
+
+def _handle_aggregate(operation, elements):
+    # gaffer_aggregate builds on this module so is imported when first used
+    from gafferpy import gaffer_aggregate
+    with gaffer_aggregate.GroupByAggregator(
+            operation, AGGREGATE_MAX_ENTRIES) as aggregator:
+        yield from aggregator.update(elements).results()
+
+
+def compile_comparator(comparators):
+    """
+    Returns a function comparing two elements using a list of
+    ElementPropertyComparators. Elements outside the comparator's groups,
+    then elements without the property, come after the others.
+    """
+    compare_functions = []
+    for comparator in comparators:
+        json_obj = _to_json(comparator)
+        if json_obj.get('class') != g.ElementPropertyComparator.CLASS:
+            raise ValueError('No local implementation for comparator: ' +
+                             str(json_obj.get('class')))
+        compare_functions.append((frozenset(json_obj.get('groups') or []),
+                                  value_getter(json_obj.get('property')),
+                                  bool(json_obj.get('reversed'))))
+
+    def compare(a, b):
+        for groups, getter, reverse in compare_functions:
+            a_in_groups = a.group in groups
+            b_in_groups = b.group in groups
+            if not a_in_groups or not b_in_groups:
+                if a_in_groups != b_in_groups:
+                    return -1 if a_in_groups else 1
+                continue
+            a_value = unwrap(getter(a))
+            b_value = unwrap(getter(b))
+            if a_value is None or b_value is None:
+                if (a_value is None) != (b_value is None):
+                    return 1 if a_value is None else -1
+                continue
+            if a_value != b_value:
+                result = -1 if a_value < b_value else 1
+                return -result if reverse else result
+        return 0
+    return compare
+
+
+def _element_key(element):
+    return json.dumps(_to_json(element), sort_keys=True)
+
+
+def _deduplicate(items, key):
+    seen = set()
+    for item in items:
+        item_key = key(item)
+        if item_key not in seen:
+            seen.add(item_key)
+            yield item
+
+
+def _handle_sort(operation, elements):
+    sort_key = functools.cmp_to_key(compile_comparator(operation.comparators))
+    # Gaffer deduplicates unless told not to
+    if operation.deduplicate is None or operation.deduplicate:
+        elements = _deduplicate(elements, _element_key)
+    if operation.result_limit is not None:
+        # Only the smallest result_limit elements are held in memory
+        return heapq.nsmallest(operation.result_limit, elements,
+                               key=sort_key)
+    return sorted(elements, key=sort_key)
+
+
+def _comparable(operation, elements):
+    compare = compile_comparator(operation.comparators)
+    comparators = [_to_json(comparator)
+                   for comparator in operation.comparators]
+    groups_and_getters = [(frozenset(comparator.get('groups') or []),
+                           value_getter(comparator.get('property')))
+                          for comparator in comparators]
+    elements = (element for element in elements
+                if all(element.group in groups and getter(element) is not None
+                       for groups, getter in groups_and_getters))
+    return elements, functools.cmp_to_key(compare)
+
+
+def _handle_max(operation, elements):
+    elements, key = _comparable(operation, elements)
+    result = max(elements, key=key, default=None)
+    return [] if result is None else [result]
+
+
+def _handle_min(operation, elements):
+    elements, key = _comparable(operation, elements)
+    result = min(elements, key=key, default=None)
+    return [] if result is None else [result]
+
+
+def _handle_limit(operation, elements):
+    limit = operation.result_limit
+    if operation.truncate is None or operation.truncate:
+        return itertools.islice(elements, limit)
+    return _limit_or_fail(elements, limit)
+
+
+def _limit_or_fail(elements, limit):
+    for count, element in enumerate(elements):
+        if count >= limit:
+            raise ValueError('Limit of ' + str(limit) + ' exceeded.')
+        yield element
+
+
+def _handle_to_vertices(operation, elements):
+    edge_vertices = operation.edge_vertices or g.EdgeVertices.NONE
+    use_matched_vertex = operation.use_matched_vertex or \
+        g.UseMatchedVertex.IGNORE
+    for element in elements:
+        if _is_entity(element):
+            yield element.vertex
+        elif use_matched_vertex == g.UseMatchedVertex.EQUAL:
+            yield _matched_vertex(element)
+        elif use_matched_vertex == g.UseMatchedVertex.OPPOSITE:
+            yield _adjacent_matched_vertex(element)
+        elif edge_vertices == g.EdgeVertices.SOURCE:
+            yield element.source
+        elif edge_vertices == g.EdgeVertices.DESTINATION:
+            yield element.destination
+        elif edge_vertices == g.EdgeVertices.BOTH:
+            yield element.source
+            yield element.destination
+
+
+def _set_key(item):
+    if isinstance(item, (g.Element, g.ElementSeed)) or \
+            getattr(item, 'CLASS', None) in (g.Entity.CLASS, g.Edge.CLASS):
+        return _element_key(item)
+    return gaffer_seed_index.vertex_key(item)
+
+
+def _handle_to_set(operation, items):
+    return _deduplicate(items, _set_key)
+
+
+def _handle_to_entity_seeds(operation, vertices):
+    return (g.EntitySeed(vertex) for vertex in vertices)
+
+
+def _handle_pass_through(operation, items):
+    return items
+
+
+# Functions taking an operation and an iterable input and returning an
+# iterable output. Extra operations can be added by their class name.
+OPERATIONS = {
+    g.Filter.CLASS: _handle_filter,
+    g.Transform.CLASS: _handle_transform,
+    g.Aggregate.CLASS: _handle_aggregate,
+    g.Sort.CLASS: _handle_sort,
+    g.Max.CLASS: _handle_max,
+    g.Min.CLASS: _handle_min,
+    g.Limit.CLASS: _handle_limit,
+    g.ToVertices.CLASS: _handle_to_vertices,
+    g.ToSet.CLASS: _handle_to_set,
+    g.ToEntitySeeds.CLASS: _handle_to_entity_seeds,
+    g.ToList.CLASS: _handle_pass_through,
+    g.ToArray.CLASS: _handle_pass_through,
+    g.ToStream.CLASS: _handle_pass_through
+}
+
+_SINGLE_RESULT_OPERATIONS = (g.Max.CLASS, g.Min.CLASS)
+
+# The number of aggregated elements Aggregate holds in memory before
+# spilling them to temporary files, or None to hold them all in memory
+AGGREGATE_MAX_ENTRIES = None
+
+
+def _operations(operation):
+    if isinstance(operation, g.OperationChain):
+        return operation.operations
+    return [operation]
+
+
+def stream(operation, input=None):
+    """
+    Runs an operation, or an operation chain of the supported operations,
+    on an iterable of elements and returns an iterator of the results.
+    If input is None the input of the (first) operation is used.
+
+    Filter, Transform, Limit, ToVertices and ToSet process one element at a
+    time, so they can be applied to streamed results. Sort, Max, Min and
+    Aggregate read their whole input first, Aggregate spilling to temporary
+    files once it holds AGGREGATE_MAX_ENTRIES aggregated elements.
+
+    Elements are not modified: Transform and Aggregate return copies.
+    """
+    operations = _operations(operation)
+    if input is None and operations:
+        input = getattr(operations[0], 'input', None)
+    results = input if input is not None else []
+    for operation in operations:
+        handler = OPERATIONS.get(operation._class_name)
+        if handler is None:
+            raise ValueError('No local implementation for operation: ' +
+                             operation._class_name)
+        results = handler(operation, results)
+    return iter(results)
+
+
+def execute(operation, input=None):
+    """
+    Runs an operation, or an operation chain, as stream does and returns a
+    list of the results. If the last operation is Max or Min the single
+    result, or None, is returned.
+    """
+    results = list(stream(operation, input))
+    operations = _operations(operation)
+    if operations and operations[-1]._class_name in _SINGLE_RESULT_OPERATIONS:
+        return results[0] if results else None
+    return results
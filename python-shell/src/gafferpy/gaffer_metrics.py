@@ -0,0 +1,383 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module contains Python copies of the Gaffer performance testing metrics
+classes, used to report the performance of connector calls.
+"""
+
+import logging
+import math
+import threading
+
+
+class Metrics:
+    """
+    Contains information about the performance of a test or call. Each metric
+    has a name and a value.
+    """
+
+    METRIC_NAMES = ()
+
+    def __init__(self):
+        self._metrics = {}
+
+    def get_metric_names(self):
+        return sorted(self.METRIC_NAMES)
+
+    def get_metric(self, metric_name):
+        return self._metrics.get(metric_name)
+
+    def put_metric(self, metric_name, metric):
+        if metric_name not in self.METRIC_NAMES:
+            raise ValueError('Unrecognised metric ' + metric_name)
+        self._metrics[metric_name] = metric
+
+    def to_dict(self):
+        return dict(self._metrics)
+
+    def __str__(self):
+        return ', '.join(name + ': ' + str(self.get_metric(name))
+                         for name in self.get_metric_names())
+
+
+class QueryMetrics(Metrics):
+    """
+    The number of seeds queried for per second and the number of results
+    returned per second.
+    """
+
+    SEEDS_PER_SECOND = 'seeds_per_second'
+    RESULTS_PER_SECOND = 'results_per_second'
+    METRIC_NAMES = (SEEDS_PER_SECOND, RESULTS_PER_SECOND)
+
+    def __init__(self, seeds_per_second, results_per_second):
+        super().__init__()
+        self.put_metric(self.SEEDS_PER_SECOND, seeds_per_second)
+        self.put_metric(self.RESULTS_PER_SECOND, results_per_second)
+
+
+class IngestMetrics(Metrics):
+    """
+    The number of elements ingested per second, for the latest batch and
+    overall.
+    """
+
+    ELEMENTS_PER_SECOND_BATCH = 'elements_per_second_batch'
+    ELEMENTS_PER_SECOND_OVERALL = 'elements_per_second_overall'
+    METRIC_NAMES = (ELEMENTS_PER_SECOND_BATCH, ELEMENTS_PER_SECOND_OVERALL)
+
+
+class CacheMetrics(Metrics):
+    """
+    The number of cache hits, misses and evictions, and the proportion of
+    lookups that were hits.
+    """
+
+    HITS = 'hits'
+    MISSES = 'misses'
+    EVICTIONS = 'evictions'
+    HIT_RATIO = 'hit_ratio'
+    METRIC_NAMES = (HITS, MISSES, EVICTIONS, HIT_RATIO)
+
+    def __init__(self, hits, misses, evictions):
+        super().__init__()
+        self.put_metric(self.HITS, hits)
+        self.put_metric(self.MISSES, misses)
+        self.put_metric(self.EVICTIONS, evictions)
+        lookups = hits + misses
+        self.put_metric(self.HIT_RATIO, hits / lookups if lookups else 0.0)
+
+
+class CoalescingMetrics(Metrics):
+    """
+    The number of requests sent to Gaffer and the number of identical
+    requests that shared their results instead of being sent.
+    """
+
+    REQUESTS_EXECUTED = 'requests_executed'
+    REQUESTS_COALESCED = 'requests_coalesced'
+    METRIC_NAMES = (REQUESTS_EXECUTED, REQUESTS_COALESCED)
+
+    def __init__(self, requests_executed, requests_coalesced):
+        super().__init__()
+        self.put_metric(self.REQUESTS_EXECUTED, requests_executed)
+        self.put_metric(self.REQUESTS_COALESCED, requests_coalesced)
+
+
+class TraversalMetrics(Metrics):
+    """
+    The number of requests sent and seeds queried by a client side
+    traversal, the number of seeds whose edges were already known and the
+    number of elements received.
+    """
+
+    REQUESTS = 'requests'
+    SEEDS_QUERIED = 'seeds_queried'
+    SEEDS_REUSED = 'seeds_reused'
+    ELEMENTS_RECEIVED = 'elements_received'
+    METRIC_NAMES = (REQUESTS, SEEDS_QUERIED, SEEDS_REUSED, ELEMENTS_RECEIVED)
+
+    def __init__(self, requests, seeds_queried, seeds_reused,
+                 elements_received):
+        super().__init__()
+        self.put_metric(self.REQUESTS, requests)
+        self.put_metric(self.SEEDS_QUERIED, seeds_queried)
+        self.put_metric(self.SEEDS_REUSED, seeds_reused)
+        self.put_metric(self.ELEMENTS_RECEIVED, elements_received)
+
+
+class RetryMetrics(Metrics):
+    """
+    The number of requests retried after a transient error, the number that
+    failed after their last attempt and the number rejected without being
+    sent because the circuit for their host was open.
+    """
+
+    RETRIES = 'retries'
+    FAILURES = 'failures'
+    REJECTIONS = 'rejections'
+    METRIC_NAMES = (RETRIES, FAILURES, REJECTIONS)
+
+    def __init__(self, retries, failures, rejections):
+        super().__init__()
+        self.put_metric(self.RETRIES, retries)
+        self.put_metric(self.FAILURES, failures)
+        self.put_metric(self.REJECTIONS, rejections)
+
+
+class HedgingMetrics(Metrics):
+    """
+    The number of requests run by a hedging policy, the number of them that
+    were sent a second time because they were slow to answer, and the number
+    of those where the second copy answered first.
+    """
+
+    REQUESTS = 'requests'
+    HEDGES_FIRED = 'hedges_fired'
+    HEDGES_WON = 'hedges_won'
+    METRIC_NAMES = (REQUESTS, HEDGES_FIRED, HEDGES_WON)
+
+    def __init__(self, requests, hedges_fired, hedges_won):
+        super().__init__()
+        self.put_metric(self.REQUESTS, requests)
+        self.put_metric(self.HEDGES_FIRED, hedges_fired)
+        self.put_metric(self.HEDGES_WON, hedges_won)
+
+
+class CallMetrics(Metrics):
+    """
+    The time in seconds spent in each phase of a call to Gaffer, the number
+    of bytes sent and received, the number of HTTP requests made and whether
+    the call failed. Phases of retried or hedged requests are summed.
+
+    The phases are converting the operations to json objects (to_json),
+    writing them as JSON text (json_dumps), opening the connection
+    (connect) and the TLS handshake (tls), waiting from sending the request
+    to receiving the response headers (time_to_first_byte), reading the
+    body (download), parsing the JSON (json_loads) and converting it to
+    gafferpy objects (from_json).
+    """
+
+    PATH = 'path'
+    TO_JSON = 'to_json'
+    JSON_DUMPS = 'json_dumps'
+    CONNECT = 'connect'
+    TLS = 'tls'
+    TIME_TO_FIRST_BYTE = 'time_to_first_byte'
+    DOWNLOAD = 'download'
+    JSON_LOADS = 'json_loads'
+    FROM_JSON = 'from_json'
+    TOTAL = 'total'
+    REQUESTS = 'requests'
+    REQUEST_BYTES = 'request_bytes'
+    RESPONSE_BYTES = 'response_bytes'
+    FAILED = 'failed'
+    PHASES = (TO_JSON, JSON_DUMPS, CONNECT, TLS, TIME_TO_FIRST_BYTE,
+              DOWNLOAD, JSON_LOADS, FROM_JSON)
+    METRIC_NAMES = (PATH,) + PHASES + (TOTAL, REQUESTS, REQUEST_BYTES,
+                                       RESPONSE_BYTES, FAILED)
+
+
+class Histogram:
+    """
+    Counts values in buckets whose bounds grow by a factor of growth, so
+    percentiles are accurate to within that factor for values of any size.
+    Values of zero or less are counted in a single bucket.
+    """
+
+    def __init__(self, growth=1.05):
+        if growth <= 1:
+            raise ValueError('growth must be more than 1')
+        self._log_growth = math.log(growth)
+        self._growth = growth
+        self._buckets = {}
+        self._non_positive = 0
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, value):
+        if value > 0:
+            bucket = math.floor(math.log(value) / self._log_growth)
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+        else:
+            self._non_positive += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def buckets(self):
+        """
+        Returns a list of (upper bound, count) for the buckets holding
+        values, in increasing order.
+        """
+        buckets = [(0, self._non_positive)] if self._non_positive else []
+        buckets.extend((self._growth ** (bucket + 1), self._buckets[bucket])
+                       for bucket in sorted(self._buckets))
+        return buckets
+
+    def percentile(self, percent):
+        """
+        Returns an upper bound for the given percentile of the values, or
+        None if there are none.
+        """
+        if not self.count:
+            return None
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for upper_bound, count in self.buckets():
+            seen += count
+            if seen >= rank:
+                return min(upper_bound, self.max)
+        return self.max
+
+    def __str__(self):
+        if not self.count:
+            return 'count: 0'
+        return 'count: %d, mean: %g, p50: %g, p99: %g, max: %g' % (
+            self.count, self.mean(), self.percentile(50),
+            self.percentile(99), self.max)
+
+
+class MetricsListener:
+    """
+    Receives Metrics describing the current performance. Implementations
+    choose what to do with them, e.g. write them to a file or a dashboard.
+    """
+
+    def initialise(self, properties):
+        pass
+
+    def update(self, metrics):
+        raise NotImplementedError('Use an implementation')
+
+    def close(self):
+        pass
+
+
+class FileWriterMetricsListener(MetricsListener):
+    """
+    Writes a line to a file for every metrics update.
+    """
+
+    FILENAME = 'gaffer.performancetesting.filewritermetricslistener.filename'
+
+    def __init__(self):
+        self._filename = None
+        self._writer = None
+
+    def initialise(self, properties):
+        if self.FILENAME not in properties:
+            raise ValueError('Properties should contain the filename to '
+                             'write to (property ' + self.FILENAME + ')')
+        self._filename = properties[self.FILENAME]
+        self._writer = open(self._filename, 'w')
+
+    def update(self, metrics):
+        self._writer.write(str(metrics) + '\n')
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __str__(self):
+        return 'FileWriterMetricsListener[filename=' + str(
+            self._filename) + ']'
+
+
+class LoggingMetricsListener(MetricsListener):
+    """
+    Logs every metrics update.
+    """
+
+    def __init__(self, logger=None, level=logging.INFO):
+        self._logger = logger or logging.getLogger(__name__)
+        self._level = level
+
+    def update(self, metrics):
+        self._logger.log(self._level, '%s', metrics)
+
+    def __str__(self):
+        return 'LoggingMetricsListener[logger=' + self._logger.name + ']'
+
+
+class HistogramMetricsListener(MetricsListener):
+    """
+    Keeps a Histogram in memory of the values of each numeric metric.
+    """
+
+    def __init__(self, growth=1.05):
+        self._growth = growth
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def update(self, metrics):
+        with self._lock:
+            for name in metrics.get_metric_names():
+                value = metrics.get_metric(name)
+                if isinstance(value, bool) or \
+                        not isinstance(value, (int, float)):
+                    continue
+                histogram = self._histograms.get(name)
+                if histogram is None:
+                    histogram = Histogram(self._growth)
+                    self._histograms[name] = histogram
+                histogram.record(value)
+
+    def get_histogram(self, metric_name):
+        """
+        Returns the Histogram of a metric, or None if it has no values.
+        """
+        with self._lock:
+            return self._histograms.get(metric_name)
+
+    def get_metric_names(self):
+        with self._lock:
+            return sorted(self._histograms)
+
+    def __str__(self):
+        with self._lock:
+            return '\n'.join(name + ': ' + str(self._histograms[name])
+                             for name in sorted(self._histograms))
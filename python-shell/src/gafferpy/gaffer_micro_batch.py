@@ -0,0 +1,210 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module combines many concurrent single seed GetElements lookups into a
+few GetElements operations with many seeds
+"""
+
+import concurrent.futures
+import json
+import threading
+import time
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_seed_index
+
+DEFAULT_MAX_DELAY = 0.002
+DEFAULT_MAX_BATCH_SIZE = 1000
+DEFAULT_MAX_WORKERS = 4
+
+
+class _Batch:
+    def __init__(self, operation_args, deadline):
+        self.operation_args = operation_args
+        self.deadline = deadline
+        # vertex key -> (vertex, futures waiting for it)
+        self.seeds = {}
+
+    def add(self, vertex, future):
+        key = gaffer_seed_index.vertex_key(vertex)
+        entry = self.seeds.get(key)
+        if entry is None:
+            self.seeds[key] = (vertex, [future])
+        else:
+            entry[1].append(future)
+
+
+class MicroBatcher:
+    """
+    This class collects single seed lookups made at about the same time,
+    possibly from many threads, and sends them to Gaffer as one GetElements
+    operation. Lookups are batched together when they use the same view,
+    directed type, include incoming outgoing and options.
+
+    A batch is sent when its first lookup has waited max_delay seconds or
+    when it holds max_batch_size distinct seeds, whichever comes first. Up to
+    max_workers batches are executed at once. Each lookup receives the
+    elements of the batch's results that matched its seed.
+    """
+
+    def __init__(self, connector, max_delay=DEFAULT_MAX_DELAY,
+                 max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 max_workers=DEFAULT_MAX_WORKERS, headers={}):
+        if max_batch_size < 1:
+            raise ValueError('max_batch_size must be at least 1')
+        self._connector = connector
+        self._max_delay = max_delay
+        self._max_batch_size = max_batch_size
+        self._headers = headers
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers)
+        self._condition = threading.Condition()
+        self._pending = {}
+        self._dispatcher = None
+        self._closed = False
+        self.calls = 0
+        self.batches = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get_elements(self, seed, view=None, directed_type=None,
+                     include_incoming_out_going=None, options=None,
+                     timeout=None):
+        """
+        Returns the list of elements matching the seed, which can be an
+        EntitySeed or a vertex.
+        """
+        return self.submit(seed, view, directed_type,
+                           include_incoming_out_going,
+                           options).result(timeout)
+
+    def submit(self, seed, view=None, directed_type=None,
+               include_incoming_out_going=None, options=None):
+        """
+        Adds a lookup to the current batch and returns a
+        concurrent.futures.Future of the list of elements matching the seed.
+        """
+        if getattr(seed, 'CLASS', None) == g.EntitySeed.CLASS:
+            vertex = seed.vertex
+        elif isinstance(seed, g.ElementSeed):
+            raise TypeError('Only entity seeds can be micro batched, got: ' +
+                            type(seed).__name__)
+        else:
+            vertex = seed
+
+        operation_args = (view, directed_type, include_incoming_out_going,
+                          options)
+        key = json.dumps([arg.to_json() if isinstance(arg, g.ToJson)
+                          else arg for arg in operation_args],
+                         sort_keys=True)
+        future = concurrent.futures.Future()
+        full_batch = None
+        with self._condition:
+            if self._closed:
+                raise ValueError('The MicroBatcher has been closed')
+            self.calls += 1
+            batch = self._pending.get(key)
+            if batch is None:
+                batch = _Batch(operation_args,
+                               time.monotonic() + self._max_delay)
+                self._pending[key] = batch
+                self._start_dispatcher()
+                self._condition.notify()
+            batch.add(vertex, future)
+            if len(batch.seeds) >= self._max_batch_size:
+                del self._pending[key]
+                self.batches += 1
+                full_batch = batch
+        if full_batch is not None:
+            self._executor.submit(self._execute, full_batch)
+        return future
+
+    def flush(self):
+        """
+        Sends every pending batch without waiting for its delay to pass.
+        """
+        with self._condition:
+            for batch in self._pending.values():
+                batch.deadline = 0
+            self._condition.notify()
+
+    def close(self):
+        """
+        Sends the pending batches and waits for all batches to complete.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+            dispatcher = self._dispatcher
+        if dispatcher is not None:
+            dispatcher.join()
+        self._executor.shutdown(wait=True)
+
+    def _start_dispatcher(self):
+        if self._dispatcher is None:
+            self._dispatcher = threading.Thread(target=self._dispatch,
+                                                daemon=True)
+            self._dispatcher.start()
+
+    def _dispatch(self):
+        with self._condition:
+            while True:
+                if not self._pending:
+                    if self._closed:
+                        return
+                    self._condition.wait()
+                    continue
+                now = time.monotonic()
+                due = [key for key, batch in self._pending.items()
+                       if batch.deadline <= now or self._closed]
+                if not due:
+                    self._condition.wait(
+                        min(batch.deadline for batch in
+                            self._pending.values()) - now)
+                    continue
+                for key in due:
+                    self.batches += 1
+                    self._executor.submit(self._execute,
+                                          self._pending.pop(key))
+
+    def _execute(self, batch):
+        view, directed_type, include_incoming_out_going, options = \
+            batch.operation_args
+        try:
+            operation = g.GetElements(
+                input=[g.EntitySeed(vertex) for vertex, futures
+                       in batch.seeds.values()],
+                view=view, directed_type=directed_type,
+                include_incoming_out_going=include_incoming_out_going,
+                options=options)
+            results = self._connector.execute_operation(operation,
+                                                        self._headers)
+            index = gaffer_seed_index.index_results(
+                [vertex for vertex, futures in batch.seeds.values()],
+                results or [])
+            for vertex, futures in batch.seeds.values():
+                for future in futures:
+                    future.set_result(list(index[vertex]))
+        except BaseException as error:
+            # Fail every lookup still waiting, so no caller blocks forever
+            for vertex, futures in batch.seeds.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(error)
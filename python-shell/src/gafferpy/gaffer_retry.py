@@ -0,0 +1,263 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module retries requests to Gaffer that fail with a transient error and
+stops sending requests to a host that keeps failing
+"""
+
+import email.utils
+import http.client
+import logging
+import random
+import threading
+import time
+
+from gafferpy import gaffer_deadline
+from gafferpy import gaffer_metrics
+
+LOGGER = logging.getLogger(__name__)
+
+# HTTP statuses meaning the server is overloaded or briefly unavailable
+RETRY_STATUSES = frozenset([429, 502, 503, 504])
+
+
+class CircuitOpenError(ConnectionError):
+    """
+    Raised instead of sending a request while the circuit for its host is
+    open.
+    """
+
+
+def parse_retry_after(value):
+    """
+    Returns the number of seconds to wait given by a Retry-After header,
+    which is either a number of seconds or an HTTP date, or None if there is
+    no valid value.
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_time = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_time is None:
+        return None
+    return max(retry_time.timestamp() - time.time(), 0.0)
+
+
+class CircuitBreaker:
+    """
+    Tracks the consecutive transient failures of requests to each host.
+    After failure_threshold of them the circuit for the host opens and
+    requests fail fast with a CircuitOpenError for reset_timeout seconds, or
+    for as long as the server's last Retry-After asked if that is longer.
+    A single trial request is then let through: if it succeeds the circuit
+    closes, otherwise it opens again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        if failure_threshold < 1:
+            raise ValueError('failure_threshold must be at least 1')
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self._clock = time.monotonic
+        self.rejections = 0
+
+    def state(self, host):
+        """
+        Returns whether the circuit for the host is closed, open or half open.
+        """
+        with self._lock:
+            return self._state(self._hosts.get(host))
+
+    def before_call(self, host):
+        """
+        Raises a CircuitOpenError if a request to the host should not be
+        sent. Otherwise the request may be sent, as the trial request if the
+        circuit was waiting for one.
+        """
+        with self._lock:
+            circuit = self._hosts.get(host)
+            state = self._state(circuit)
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not circuit['trial']:
+                circuit['trial'] = True
+                return
+            self.rejections += 1
+        raise CircuitOpenError('Circuit open for ' + host + ' after ' +
+                               str(circuit['failures']) +
+                               ' consecutive failures')
+
+    def record_success(self, host):
+        with self._lock:
+            self._hosts.pop(host, None)
+
+    def record_failure(self, host, retry_after=None):
+        """
+        Counts a transient failure of a request to the host, opening its
+        circuit if there have been too many in a row or the trial request
+        failed.
+        """
+        with self._lock:
+            circuit = self._hosts.setdefault(
+                host, {'failures': 0, 'open_until': None, 'trial': False})
+            circuit['failures'] += 1
+            if circuit['trial'] or \
+                    circuit['failures'] >= self._failure_threshold:
+                circuit['open_until'] = self._clock() + max(
+                    self._reset_timeout, retry_after or 0)
+                circuit['trial'] = False
+
+    def _state(self, circuit):
+        if circuit is None or circuit['open_until'] is None:
+            return self.CLOSED
+        if circuit['trial'] or circuit['open_until'] > self._clock():
+            return self.OPEN
+        return self.HALF_OPEN
+
+
+class RetryPolicy:
+    """
+    Decides which failed requests are retried and how long to wait first.
+
+    A request is retried up to max_retries times if it failed with an HTTP
+    status in retry_statuses, or without a response at all, for example
+    because the connection was reset. Requests that are not idempotent, such
+    as operation chains adding elements, are only retried if retry_writes is
+    True, as the server may have applied them before failing.
+
+    The wait before retry n (counting from 0) is backoff * 2 ** n seconds, up
+    to max_backoff, with full jitter if jitter is True: a random time between
+    zero and that wait. A Retry-After header on the response is honoured if
+    it asks for a longer wait.
+
+    If a CircuitBreaker is given every request goes through it, so requests
+    to a host that keeps failing are rejected at once rather than retried.
+
+    A request is not retried if the wait would take it past its deadline.
+    """
+
+    def __init__(self, max_retries=3, backoff=0.5, max_backoff=30,
+                 jitter=True, retry_writes=False,
+                 retry_statuses=RETRY_STATUSES, circuit_breaker=None):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_writes = retry_writes
+        self.retry_statuses = frozenset(retry_statuses)
+        self.circuit_breaker = circuit_breaker
+        self._lock = threading.Lock()
+        self._random = random.Random()
+        self._sleep = time.sleep
+        self.retries = 0
+        self.failures = 0
+
+    def is_transient(self, error):
+        """
+        Returns whether an error is worth retrying: an HTTP error with one of
+        the retry statuses, or a failure to get any response.
+        """
+        if isinstance(error, (CircuitOpenError,
+                              gaffer_deadline.DeadlineExceeded)):
+            return False
+        code = getattr(error, 'code', None)
+        if code is not None:
+            return code in self.retry_statuses
+        return isinstance(error, (OSError, http.client.HTTPException))
+
+    def delay(self, attempt, error=None):
+        """
+        Returns the number of seconds to wait before retry number attempt,
+        counting from 0, of a request that failed with error.
+        """
+        delay = min(self.backoff * (2 ** attempt), self.max_backoff)
+        if self.jitter:
+            with self._lock:
+                delay = self._random.uniform(0, delay)
+        retry_after = parse_retry_after(getattr(error, 'retry_after', None))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def call(self, host, request, idempotent=True, deadline=None):
+        """
+        Returns the result of calling request, retrying it if it raises a
+        transient error, and raises the last error if every attempt fails or
+        the gaffer_deadline.Deadline would pass before the next attempt.
+        """
+        attempt = 0
+        while True:
+            breaker = self.circuit_breaker
+            if breaker is not None:
+                breaker.before_call(host)
+            try:
+                result = request()
+            except BaseException as error:
+                transient = self.is_transient(error)
+                if breaker is not None:
+                    # Only transient errors suggest the server is struggling
+                    if transient:
+                        breaker.record_failure(host, parse_retry_after(
+                            getattr(error, 'retry_after', None)))
+                    else:
+                        breaker.record_success(host)
+                # A request that opened the circuit is not retried
+                if not transient or attempt >= self.max_retries or \
+                        not (idempotent or self.retry_writes) or \
+                        (breaker is not None and
+                         breaker.state(host) == breaker.OPEN):
+                    with self._lock:
+                        self.failures += 1
+                    raise
+                delay = self.delay(attempt, error)
+                if deadline is not None and delay >= deadline.remaining():
+                    with self._lock:
+                        self.failures += 1
+                    raise
+                LOGGER.warning('Request to %s failed (%s), retrying in %f '
+                               'seconds', host, error, delay)
+                with self._lock:
+                    self.retries += 1
+                self._sleep(delay)
+                attempt += 1
+                continue
+            if breaker is not None:
+                breaker.record_success(host)
+            return result
+
+    def get_metrics(self):
+        """
+        Returns the retries, failures and circuit breaker rejections as
+        RetryMetrics.
+        """
+        rejections = 0
+        if self.circuit_breaker is not None:
+            rejections = self.circuit_breaker.rejections
+        with self._lock:
+            return gaffer_metrics.RetryMetrics(self.retries, self.failures,
+                                               rejections)
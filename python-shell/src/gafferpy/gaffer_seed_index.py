@@ -0,0 +1,190 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module maps the results of GetElements and GetAdjacentIds back to the
+input seeds that produced them
+"""
+
+import collections.abc
+import json
+
+from gafferpy import gaffer as g
+
+
+def vertex_key(vertex):
+    """
+    Returns a hashable value identifying a vertex. Vertices that are json
+    objects or gaffer objects are identified by their sorted json.
+    """
+    if isinstance(vertex, g.ToJson):
+        vertex = vertex.to_json()
+    if isinstance(vertex, (dict, list)):
+        return json.dumps(vertex, sort_keys=True)
+    return vertex
+
+
+def matched_vertex_keys(element):
+    """
+    Returns the keys of the vertices of an element that an entity seed could
+    have matched: the vertex of an entity, the matched vertex of an edge or,
+    if the edge does not say which vertex was matched, both its vertices.
+    """
+    if getattr(element, 'CLASS', None) == g.Entity.CLASS:
+        return (vertex_key(element.vertex),)
+    matched_vertex = element.matched_vertex
+    if matched_vertex == 'SOURCE':
+        return (vertex_key(element.source),)
+    if matched_vertex == 'DESTINATION':
+        return (vertex_key(element.destination),)
+    source = vertex_key(element.source)
+    destination = vertex_key(element.destination)
+    if source == destination:
+        return (source,)
+    return source, destination
+
+
+def adjacent_vertex(edge, key):
+    """
+    Returns the vertex at the other end of an edge from the vertex with the
+    given key, using the matched vertex if the edge has one.
+    """
+    if edge.matched_vertex == 'SOURCE':
+        return edge.destination
+    if edge.matched_vertex == 'DESTINATION':
+        return edge.source
+    if vertex_key(edge.source) == key:
+        return edge.destination
+    return edge.source
+
+
+def _seed_key(seed):
+    class_name = getattr(seed, 'CLASS', None)
+    if class_name == g.EntitySeed.CLASS:
+        return vertex_key(seed.vertex)
+    if class_name == g.EdgeSeed.CLASS:
+        return vertex_key(seed.source), vertex_key(seed.destination)
+    if isinstance(seed, g.ElementSeed):
+        raise TypeError('Only entity and edge seeds can be indexed, got: ' +
+                        type(seed).__name__)
+    return vertex_key(seed)
+
+
+class SeedIndex(collections.abc.Mapping):
+    """
+    A read only mapping from each input seed to the list of results it
+    produced. Seeds can be EntitySeeds, EdgeSeeds or plain vertices and can
+    be looked up using any equal seed.
+
+    Results are added one at a time, so the index can be built in a single
+    pass over a stream of results. An entity is added to the entity seed for
+    its vertex and to the edge seeds with that vertex at either end. An edge
+    is added to the entity seeds of its matched vertex (or both vertices if
+    it has no matched vertex) and to the edge seed with the same source and
+    destination, either way round for undirected edges.
+
+    If adjacent_ids is True the index maps each entity seed to the adjacent
+    vertices, as EntitySeeds, at the other end of the edges it matched, as
+    GetAdjacentIds would return them. Entities are then ignored.
+    """
+
+    def __init__(self, seeds, adjacent_ids=False):
+        self._adjacent_ids = adjacent_ids
+        self._seeds = {}
+        self._results = {}
+        self._edge_seeds_by_vertex = {}
+        for seed in seeds:
+            key = _seed_key(seed)
+            if key in self._seeds:
+                continue
+            if isinstance(key, tuple):
+                if adjacent_ids:
+                    raise TypeError('Adjacent ids can only be indexed for '
+                                    'entity seeds')
+                for vertex in set(key):
+                    self._edge_seeds_by_vertex.setdefault(
+                        vertex, []).append(key)
+            self._seeds[key] = seed
+            self._results[key] = []
+
+    def __getitem__(self, seed):
+        return self._results[_seed_key(seed)]
+
+    def __iter__(self):
+        return iter(self._seeds.values())
+
+    def __len__(self):
+        return len(self._seeds)
+
+    def add(self, element):
+        """
+        Adds a result to the list of every seed it matches. Results that do
+        not match any seed are ignored.
+        """
+        results = self._results
+        if getattr(element, 'CLASS', None) == g.Entity.CLASS:
+            if self._adjacent_ids:
+                return
+            key = vertex_key(element.vertex)
+            seed_results = results.get(key)
+            if seed_results is not None:
+                seed_results.append(element)
+            for edge_key in self._edge_seeds_by_vertex.get(key, ()):
+                results[edge_key].append(element)
+            return
+
+        matched_keys = matched_vertex_keys(element)
+        if self._adjacent_ids:
+            source = vertex_key(element.source)
+            for key in matched_keys:
+                seed_results = results.get(key)
+                if seed_results is not None:
+                    seed_results.append(g.EntitySeed(
+                        element.destination if key == source
+                        else element.source))
+            return
+
+        for key in matched_keys:
+            seed_results = results.get(key)
+            if seed_results is not None:
+                seed_results.append(element)
+        if self._edge_seeds_by_vertex:
+            edge_key = (vertex_key(element.source),
+                        vertex_key(element.destination))
+            seed_results = results.get(edge_key)
+            if seed_results is not None:
+                seed_results.append(element)
+            if not element.directed and edge_key[0] != edge_key[1]:
+                seed_results = results.get((edge_key[1], edge_key[0]))
+                if seed_results is not None:
+                    seed_results.append(element)
+
+    def extend(self, elements):
+        """
+        Adds each result of an iterable, such as a streamed result.
+        """
+        add = self.add
+        for element in elements:
+            add(element)
+        return self
+
+
+def index_results(seeds, results, adjacent_ids=False):
+    """
+    Returns a SeedIndex of the results of a GetElements, or of the edges
+    found for a GetAdjacentIds if adjacent_ids is True, for the given seeds.
+    """
+    return SeedIndex(seeds, adjacent_ids).extend(results)
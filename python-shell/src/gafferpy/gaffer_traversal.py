@@ -0,0 +1,223 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module walks a graph hop by hop from the client, as GetWalks does on
+the server, querying each distinct vertex once per hop
+"""
+
+import json
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_batch
+from gafferpy import gaffer_metrics
+from gafferpy import gaffer_seed_index
+
+
+class Walk:
+    """
+    A walk through the graph: the vertices visited, starting with the seed,
+    and the edge followed for each hop.
+    """
+
+    __slots__ = ('vertices', 'edges')
+
+    def __init__(self, vertices, edges=()):
+        self.vertices = tuple(vertices)
+        self.edges = tuple(edges)
+
+    def __len__(self):
+        return len(self.edges)
+
+    def __eq__(self, other):
+        return isinstance(other, Walk) and \
+            self.vertices == other.vertices and \
+            [edge.to_json() for edge in self.edges] == \
+            [edge.to_json() for edge in other.edges]
+
+    def __repr__(self):
+        return 'Walk(' + ' -> '.join(repr(vertex)
+                                     for vertex in self.vertices) + ')'
+
+    def extend(self, edge, vertex):
+        """
+        Returns a new walk following an edge to a vertex.
+        """
+        return Walk(self.vertices + (vertex,), self.edges + (edge,))
+
+
+def _hop_key(hop):
+    return json.dumps([arg.to_json() if isinstance(arg, g.ToJson) else arg
+                       for arg in (hop.view, hop.directed_type,
+                                   hop.include_incoming_out_going,
+                                   hop.options)],
+                      sort_keys=True)
+
+
+class Traversal:
+    """
+    This class runs a multi hop traversal from the client. Each hop is a
+    GetElements operation, without input, whose view, directed type and
+    include incoming outgoing choose the edges to follow, as the operations
+    of a GetWalks do.
+
+    At each hop the distinct vertices at the ends of the current walks are
+    queried once, however many walks reach them, in batches of batch_size
+    seeds with up to max_workers batches in flight. The edges found for a
+    vertex are remembered for each distinct hop, so a vertex reached again
+    by a later hop with the same view is not queried again. At most
+    max_fan_out edges are followed from each vertex at each hop. This only
+    limits the walks built from the client: every edge of a vertex is
+    still fetched from Gaffer, as GetElements cannot limit its results per
+    seed, so it does not reduce the data transferred.
+
+    Entities in the results are ignored. The remembered edges are kept until
+    clear is called, so they are shared by later traversals.
+    """
+
+    def __init__(self, connector, hops, max_fan_out=None,
+                 batch_size=gaffer_batch.DEFAULT_BATCH_SIZE,
+                 max_workers=gaffer_batch.DEFAULT_MAX_WORKERS, headers={}):
+        if not hops:
+            raise ValueError('A traversal needs at least one hop')
+        for hop in hops:
+            if not isinstance(hop, g.GetElements):
+                raise TypeError('Hops must be GetElements operations, got: ' +
+                                type(hop).__name__)
+        self._connector = connector
+        self._hops = list(hops)
+        self._hop_keys = [_hop_key(hop) for hop in hops]
+        self._max_fan_out = max_fan_out
+        self._batch_size = batch_size
+        self._max_workers = max_workers
+        self._headers = headers
+        self._expanded = {}
+        self.requests = 0
+        self.seeds_queried = 0
+        self.seeds_reused = 0
+        self.elements_received = 0
+
+    def walks(self, seeds, results_limit=None, partial=False):
+        """
+        Returns a list of the walks from the seeds, as stream does.
+        """
+        return list(self.stream(seeds, results_limit, partial))
+
+    def stream(self, seeds, results_limit=None, partial=False):
+        """
+        Returns a generator of the walks from the seeds, which can be
+        EntitySeeds or vertices. Walks through every hop are yielded as soon
+        as the last hop's batch for their final vertex has been read. If
+        partial is True walks that stop early, because a vertex has no edges
+        to follow, are yielded as well. At most results_limit walks are
+        yielded.
+        """
+        walks = {}
+        for seed in gaffer_batch.as_seed_list(seeds):
+            if getattr(seed, 'CLASS', None) == g.EntitySeed.CLASS:
+                seed = seed.vertex
+            key = gaffer_seed_index.vertex_key(seed)
+            if key not in walks:
+                walks[key] = (seed, [Walk((seed,))])
+
+        count = 0
+        last_hop = len(self._hops) - 1
+        for hop_number in range(len(self._hops)):
+            next_walks = {}
+            for key, adjacent in self._expand(hop_number, walks):
+                vertex_walks = walks[key][1]
+                if not adjacent and partial:
+                    for walk in vertex_walks:
+                        yield walk
+                        count += 1
+                        if count == results_limit:
+                            return
+                for edge, vertex in adjacent:
+                    if hop_number == last_hop:
+                        for walk in vertex_walks:
+                            yield walk.extend(edge, vertex)
+                            count += 1
+                            if count == results_limit:
+                                return
+                        continue
+                    vertex_key = gaffer_seed_index.vertex_key(vertex)
+                    entry = next_walks.get(vertex_key)
+                    if entry is None:
+                        entry = (vertex, [])
+                        next_walks[vertex_key] = entry
+                    entry[1].extend(walk.extend(edge, vertex)
+                                    for walk in vertex_walks)
+            walks = next_walks
+            if not walks:
+                return
+
+    def _expand(self, hop_number, walks):
+        """
+        Yields (vertex key, list of (edge, adjacent vertex)) for the vertices
+        at the end of the walks, remembered ones first and then the others
+        as each batch of them is read.
+        """
+        hop = self._hops[hop_number]
+        expanded = self._expanded.setdefault(self._hop_keys[hop_number], {})
+        misses = []
+        for key, (vertex, vertex_walks) in walks.items():
+            adjacent = expanded.get(key)
+            if adjacent is None:
+                misses.append((key, vertex))
+            else:
+                self.seeds_reused += 1
+                yield key, adjacent
+        if not misses:
+            return
+
+        self.seeds_queried += len(misses)
+        operation = g.GetElements(
+            input=[g.EntitySeed(vertex) for key, vertex in misses],
+            view=hop.view, directed_type=hop.directed_type,
+            include_incoming_out_going=hop.include_incoming_out_going,
+            options=hop.options)
+        batches = gaffer_batch.split_batches(misses, self._batch_size)
+        for batch, results in zip(batches, self._connector.stream_batched(
+                operation, self._batch_size, self._max_workers,
+                headers=self._headers)):
+            self.requests += 1
+            self.elements_received += len(results)
+            index = gaffer_seed_index.index_results(
+                [vertex for key, vertex in batch], results)
+            for key, vertex in batch:
+                adjacent = [
+                    (edge, gaffer_seed_index.adjacent_vertex(edge, key))
+                    for edge in index[vertex]
+                    if getattr(edge, 'CLASS', None) == g.Edge.CLASS]
+                if self._max_fan_out is not None:
+                    adjacent = adjacent[:self._max_fan_out]
+                expanded[key] = adjacent
+                yield key, adjacent
+
+    def clear(self):
+        """
+        Forgets the edges found for every vertex.
+        """
+        self._expanded = {}
+
+    def get_metrics(self):
+        """
+        Returns the requests sent, seeds queried and reused and elements
+        received as TraversalMetrics.
+        """
+        return gaffer_metrics.TraversalMetrics(
+            self.requests, self.seeds_queried, self.seeds_reused,
+            self.elements_received)
@@ -0,0 +1,502 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+This module evaluates predicates on the columns of an ElementBatch with
+NumPy, returning a boolean mask with a value per row
+"""
+
+import re
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_element_batch
+from gafferpy import gaffer_local
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_MISSING = gaffer_element_batch.MISSING
+
+
+class _Unsupported(ValueError):
+    pass
+
+
+class Column:
+    """
+    A column of an ElementBatch as a NumPy array. present is a boolean mask
+    of the rows holding a value (not missing or None) and values holds the
+    unwrapped values of those rows only.
+    """
+
+    __slots__ = ('present', 'values')
+
+    def __init__(self, present, values):
+        self.present = present
+        self.values = values
+
+
+def _values_array(values):
+    """
+    Returns a NumPy array of the values, with a numeric, boolean or string
+    dtype if all the values have that type, otherwise an object array.
+    """
+    types = set(map(type, values))
+    if types == {bool}:
+        return numpy.array(values, dtype=numpy.bool_)
+    if types and types <= {int, float}:
+        try:
+            return numpy.array(
+                values, dtype=numpy.int64 if types == {int}
+                else numpy.float64)
+        except OverflowError:
+            pass
+    elif types == {str}:
+        return numpy.array(values, dtype=numpy.str_)
+    array = numpy.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+class BatchColumns:
+    """
+    This class converts the columns of an ElementBatch to NumPy arrays, for
+    the identifiers understood by gaffer_local (VERTEX, SOURCE, DESTINATION,
+    DIRECTED, MATCHED_VERTEX, ADJACENT_MATCHED_VERTEX and GROUP) and for
+    properties. Each column is converted once, so filters evaluated with
+    the same BatchColumns share the conversions.
+    """
+
+    def __init__(self, batch):
+        if numpy is None:
+            raise ImportError('NumPy is required to evaluate vectorised '
+                              'predicates')
+        self.batch = batch
+        self._columns = {}
+        self._rows = {}
+        self._kinds = None
+
+    def __len__(self):
+        return len(self.batch)
+
+    @property
+    def kinds(self):
+        if self._kinds is None:
+            self._kinds = self.batch.to_numpy('kind')
+        return self._kinds
+
+    def rows(self, name):
+        """
+        Returns the unwrapped values of a column as a list with a value per
+        row, None where the value is missing.
+        """
+        rows = self._rows.get(name)
+        if rows is None:
+            rows = self._read_rows(name)
+            self._rows[name] = rows
+        return rows
+
+    def _read_rows(self, name):
+        batch = self.batch
+        if name == 'GROUP':
+            return batch.column('group')
+        if name == 'DIRECTED':
+            return batch.column('directed')
+        if name in ('VERTEX', 'SOURCE', 'DESTINATION', 'MATCHED_VERTEX',
+                    'ADJACENT_MATCHED_VERTEX'):
+            return [gaffer_local.value_getter(name)(element)
+                    for element in _VertexRows(batch)]
+        if name not in batch.properties:
+            return [None] * len(batch)
+        unwrap = gaffer_local.unwrap
+        return [None if value is _MISSING else unwrap(value)
+                for value in batch.properties[name]]
+
+    def column(self, name):
+        """
+        Returns a Column for an identifier or property.
+        """
+        column = self._columns.get(name)
+        if column is None:
+            column = self._read_column(name)
+            self._columns[name] = column
+        return column
+
+    def _read_column(self, name):
+        batch = self.batch
+        if name == 'GROUP':
+            names = numpy.array(batch.group_names, dtype=numpy.str_)
+            return Column(numpy.ones(len(batch), dtype=numpy.bool_),
+                          names[batch.to_numpy('group')])
+        if name == 'DIRECTED':
+            directed = numpy.frombuffer(batch.directed, dtype=numpy.int8)
+            present = directed >= 0
+            return Column(present, directed[present] > 0)
+        rows = self.rows(name)
+        present = numpy.fromiter((value is not None for value in rows),
+                                 dtype=numpy.bool_, count=len(rows))
+        return Column(present,
+                      _values_array([value for value in rows
+                                     if value is not None]))
+
+
+class _VertexRows:
+    """
+    Presents the vertex columns of a batch as objects with the attributes
+    gaffer_local.value_getter reads, without creating elements.
+    """
+
+    __slots__ = ('batch', 'index')
+
+    _MATCHED = (None, 'SOURCE', 'DESTINATION')
+
+    def __init__(self, batch):
+        self.batch = batch
+        self.index = -1
+
+    def __iter__(self):
+        for self.index in range(len(self.batch)):
+            yield self
+
+    @property
+    def CLASS(self):
+        if self.batch.kinds[self.index] == gaffer_element_batch.ENTITY:
+            return g.Entity.CLASS
+        return g.Edge.CLASS
+
+    @property
+    def vertex(self):
+        return self.batch.sources[self.index]
+
+    source = vertex
+
+    @property
+    def destination(self):
+        return self.batch.destinations[self.index]
+
+    @property
+    def matched_vertex(self):
+        return self._MATCHED[self.batch.matched_vertices[self.index]]
+
+
+########################################################
+# Predicates
+
+def _present_mask(test):
+    """
+    Returns a function computing a mask from a Column, applying test to the
+    values of the present rows. Missing rows are False.
+    """
+    def mask(column, length):
+        result = numpy.zeros(length, dtype=numpy.bool_)
+        if len(column.values):
+            result[column.present] = test(column.values)
+        return result
+    return mask
+
+
+def _compare(json_obj, operator, or_equal_operator):
+    value = gaffer_local.unwrap(json_obj.get('value'))
+    if value is None:
+        raise _Unsupported()
+    if json_obj.get('orEqualTo'):
+        operator = or_equal_operator
+    return _present_mask(lambda values: operator(values, value))
+
+
+def _is_more_than(json_obj):
+    return _compare(json_obj, numpy.greater, numpy.greater_equal)
+
+
+def _is_less_than(json_obj):
+    return _compare(json_obj, numpy.less, numpy.less_equal)
+
+
+def _is_equal(json_obj):
+    value = gaffer_local.unwrap(json_obj.get('value'))
+    if isinstance(value, (dict, list)):
+        raise _Unsupported()
+    return _present_mask(lambda values: values == value)
+
+
+# The dtype kinds whose values compare as values of each python type do
+_DTYPE_KINDS = {
+    bool: 'b',
+    int: 'iuf',
+    float: 'iuf',
+    str: 'U'
+}
+
+
+def _is_in(json_obj):
+    values_in = [gaffer_local.unwrap(value)
+                 for value in json_obj.get('values') or []]
+    # numpy.isin converts both sides to a common dtype, so values of other
+    # types, such as 1 and '1', could match
+    types = set(map(type, values_in))
+    if len(types) > 1 or not types.issubset(_DTYPE_KINDS):
+        raise _Unsupported()
+    kinds = _DTYPE_KINDS[types.pop()] if types else None
+
+    def test(values):
+        if kinds is not None and values.dtype.kind not in kinds:
+            raise TypeError('IsIn values do not match the column type')
+        return numpy.isin(values, values_in)
+    return _present_mask(test)
+
+
+def _range_mask(values, start, end, start_inclusive, end_inclusive):
+    result = numpy.ones(len(values), dtype=numpy.bool_)
+    if start is not None:
+        result &= values >= start if start_inclusive else values > start
+    if end is not None:
+        result &= values <= end if end_inclusive else values < end
+    return result
+
+
+def _in_range(json_obj):
+    start = gaffer_local.unwrap(json_obj.get('start'))
+    end = gaffer_local.unwrap(json_obj.get('end'))
+    start_inclusive = json_obj.get('startInclusive', True)
+    end_inclusive = json_obj.get('endInclusive', False)
+    return _present_mask(lambda values: _range_mask(
+        values, start, end, start_inclusive, end_inclusive))
+
+
+def _in_time_range(json_obj, time_unit=None):
+    unit = gaffer_local.TIME_UNITS[time_unit or json_obj.get('timeUnit') or
+                                   'MILLISECOND']
+    start_inclusive = json_obj.get('startInclusive', True)
+    end_inclusive = json_obj.get('endInclusive', False)
+    bounds = gaffer_local.time_range_bounds_getter(json_obj)
+
+    def test(values):
+        start, end = bounds()
+        if unit != 1:
+            values = values * unit
+        return _range_mask(values, start, end, start_inclusive,
+                           end_inclusive)
+    return _present_mask(test)
+
+
+def _regex(json_obj):
+    pattern = re.compile(json_obj.get('value'))
+
+    def test(values):
+        if values.dtype.kind != 'U':
+            raise TypeError('Regex can only be vectorised over strings')
+        # Each distinct string is matched once
+        distinct, inverse = numpy.unique(values, return_inverse=True)
+        matches = numpy.fromiter(
+            (pattern.fullmatch(value) is not None for value in distinct),
+            dtype=numpy.bool_, count=len(distinct))
+        return matches[inverse]
+    return _present_mask(test)
+
+
+def _is_bool(expected):
+    def test(values):
+        if values.dtype != numpy.bool_:
+            raise TypeError('IsTrue and IsFalse are only vectorised over '
+                            'booleans')
+        return values if expected else ~values
+    return _present_mask(test)
+
+
+def _and(json_obj):
+    masks = [compile_column_predicate(predicate)
+             for predicate in json_obj.get('predicates') or []]
+
+    def mask(column, length):
+        result = numpy.ones(length, dtype=numpy.bool_)
+        for predicate_mask in masks:
+            result &= predicate_mask(column, length)
+        return result
+    return mask
+
+
+def _or(json_obj):
+    masks = [compile_column_predicate(predicate)
+             for predicate in json_obj.get('predicates') or []]
+
+    def mask(column, length):
+        result = numpy.zeros(length, dtype=numpy.bool_)
+        for predicate_mask in masks:
+            result |= predicate_mask(column, length)
+        return result
+    return mask
+
+
+def _not(json_obj):
+    predicate_mask = compile_column_predicate(json_obj['predicate'])
+    return lambda column, length: ~predicate_mask(column, length)
+
+
+# Functions taking the json of a single input predicate and returning a
+# function of a Column and the number of rows that returns a mask. Extra
+# predicates can be added by their class name.
+COLUMN_PREDICATES = {
+    g.And.CLASS: _and,
+    g.Or.CLASS: _or,
+    g.Not.CLASS: _not,
+    g.IsMoreThan.CLASS: _is_more_than,
+    g.IsLessThan.CLASS: _is_less_than,
+    g.IsEqual.CLASS: _is_equal,
+    g.IsIn.CLASS: _is_in,
+    g.InRange.CLASS: _in_range,
+    g.InTimeRange.CLASS: _in_time_range,
+    g.InDateRange.CLASS:
+        lambda json_obj: _in_time_range(json_obj, 'MILLISECOND'),
+    g.Regex.CLASS: _regex,
+    g.IsTrue.CLASS: lambda json_obj: _is_bool(True),
+    g.IsFalse.CLASS: lambda json_obj: _is_bool(False),
+    g.Exists.CLASS: lambda json_obj: lambda column, length:
+        column.present.copy()
+}
+
+
+def compile_column_predicate(predicate):
+    """
+    Returns a function of a Column and the number of rows that returns the
+    mask of rows passing a predicate, or its json. Raises ValueError if the
+    predicate, or one it contains, cannot be vectorised.
+    """
+    json_obj = predicate.to_json() if isinstance(predicate, g.ToJson) \
+        else predicate
+    factory = COLUMN_PREDICATES.get(json_obj.get('class'))
+    if factory is None:
+        raise _Unsupported('Predicate can not be vectorised: ' +
+                           str(json_obj.get('class')))
+    return factory(json_obj)
+
+
+def _row_wise(selection, predicate):
+    predicate = gaffer_local.compile_predicate(predicate)
+
+    def mask(columns):
+        return numpy.fromiter(
+            map(predicate, *[columns.rows(name) for name in selection]),
+            dtype=numpy.bool_, count=len(columns))
+    return mask
+
+
+def compile_context(predicate_context):
+    """
+    Returns a function of BatchColumns returning the mask of rows passing a
+    PredicateContext, or its json. Predicates of a single selected value
+    made of the COLUMN_PREDICATES are evaluated on NumPy arrays; others, or
+    ones that fail on the column's values, are evaluated row by row with
+    gaffer_local.
+    """
+    if isinstance(predicate_context, g.ToJson):
+        predicate_context = predicate_context.to_json()
+    selection = predicate_context.get('selection') or []
+    predicate = predicate_context['predicate']
+    row_wise = _row_wise(selection, predicate)
+    if len(selection) != 1:
+        return row_wise
+    try:
+        column_mask = compile_column_predicate(predicate)
+    except _Unsupported:
+        return row_wise
+    name = selection[0]
+
+    def mask(columns):
+        try:
+            return column_mask(columns.column(name), len(columns))
+        except TypeError:
+            return row_wise(columns)
+    return mask
+
+
+def compile_filter(predicate_contexts):
+    """
+    Returns a function of BatchColumns returning the mask of rows passing
+    all of a list of PredicateContexts, or their json.
+    """
+    masks = [compile_context(context)
+             for context in predicate_contexts or []]
+
+    def mask(columns):
+        result = numpy.ones(len(columns), dtype=numpy.bool_)
+        for context_mask in masks:
+            if not result.any():
+                break
+            result &= context_mask(columns)
+        return result
+    return mask
+
+
+def _columns(batch):
+    if isinstance(batch, BatchColumns):
+        return batch
+    return BatchColumns(batch)
+
+
+def predicate_mask(batch, predicate_contexts):
+    """
+    Returns a NumPy boolean mask of the rows of an ElementBatch, or of its
+    BatchColumns, that pass all of a list of PredicateContexts.
+    """
+    return compile_filter(predicate_contexts)(_columns(batch))
+
+
+def filter_mask(batch, filter_operation):
+    """
+    Returns a NumPy boolean mask of the rows of an ElementBatch, or of its
+    BatchColumns, that a Filter operation keeps, with the same group rules
+    as gaffer_local.
+    """
+    columns = _columns(batch)
+    batch = columns.batch
+    is_entity = columns.kinds == gaffer_element_batch.ENTITY
+    result = numpy.ones(len(columns), dtype=numpy.bool_)
+
+    for definition, rows in ((filter_operation.global_elements, None),
+                             (filter_operation.global_entities, is_entity),
+                             (filter_operation.global_edges, ~is_entity)):
+        if definition is not None:
+            passed = compile_filter(definition.predicates)(columns)
+            result &= passed if rows is None else passed | ~rows
+
+    groups = None
+    for definitions, rows in ((filter_operation.entities, is_entity),
+                              (filter_operation.edges, ~is_entity)):
+        if definitions is None:
+            continue
+        if groups is None:
+            groups = batch.to_numpy('group')
+        kept = numpy.zeros(len(columns), dtype=numpy.bool_)
+        for definition in definitions:
+            code = batch.group_names.index(definition.group) \
+                if definition.group in batch.group_names else -1
+            group_rows = rows & (groups == code)
+            if group_rows.any():
+                kept |= group_rows & compile_filter(
+                    definition.predicates)(columns)
+        result &= kept | ~rows
+    return result
+
+
+def filter_batch(batch, filter_operation):
+    """
+    Returns a new ElementBatch holding the rows of batch that a Filter
+    operation keeps.
+    """
+    columns = _columns(batch)
+    return columns.batch.select(filter_mask(columns, filter_operation))
@@ -0,0 +1,105 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+A local stand-in for the Gaffer REST API, used by the connector unit tests.
+"""
+
+import http.server
+import json
+import threading
+
+BASE_PATH = '/rest'
+
+
+class GafferStubServer:
+    """
+    Serves canned responses on a local port. Routes map (method, path) to a
+    function taking (body, headers) and returning either a JSON-serialisable
+    object or a (status, body, headers) tuple, where body is bytes or a str.
+    """
+
+    def __init__(self, routes=None):
+        self.routes = dict(routes or {})
+        self.requests = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_GET(self):
+                self._respond()
+
+            def do_POST(self):
+                self._respond()
+
+            def _respond(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                path = self.path[len(BASE_PATH):]
+                with stub._lock:
+                    stub.requests.append((self.command, path, body,
+                                          dict(self.headers)))
+                route = stub.routes.get((self.command, path))
+                if route is None:
+                    status, response_body, headers = 404, 'Not found', {}
+                else:
+                    result = route(body, self.headers)
+                    if isinstance(result, tuple):
+                        status, response_body, headers = result
+                    else:
+                        status, response_body, headers = \
+                            200, json.dumps(result), {}
+                if isinstance(response_body, str):
+                    response_body = response_body.encode('utf-8')
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(response_body)))
+                self.end_headers()
+                self.wfile.write(response_body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = http.server.ThreadingHTTPServer(('127.0.0.1', 0),
+                                                       Handler)
+        self._server.daemon_threads = True
+        self.host = 'http://127.0.0.1:' + str(
+            self._server.server_address[1]) + BASE_PATH
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        daemon=True)
+
+    def request_count(self, method=None, path=None):
+        with self._lock:
+            return len([r for r in self.requests
+                        if (method is None or r[0] == method)
+                        and (path is None or r[1] == path)])
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._server.shutdown()
+        self._server.server_close()
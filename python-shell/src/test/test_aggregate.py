@@ -0,0 +1,129 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import unittest
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_aggregate
+from gafferpy import gaffer_compact
+from gafferpy import gaffer_types
+
+BINARY_OPERATOR = 'uk.gov.gchq.koryphe.impl.binaryoperator.'
+FREQ_MAP_AGGREGATOR = 'uk.gov.gchq.gaffer.types.function.FreqMapAggregator'
+
+
+def operator_context(property, class_name):
+    return g.BinaryOperatorContext(
+        selection=[property],
+        binary_operator=g.BinaryOperator(class_name))
+
+
+AGGREGATE = g.Aggregate(
+    edges=[g.AggregatePair(
+        group='RoadUse',
+        element_aggregator=g.ElementAggregateDefinition(operators=[
+            operator_context('count', BINARY_OPERATOR + 'Sum'),
+            operator_context('maxSpeed', BINARY_OPERATOR + 'Max'),
+            operator_context('minSpeed', BINARY_OPERATOR + 'Min'),
+            operator_context('vehicles', FREQ_MAP_AGGREGATOR)
+        ]))],
+    entities=[g.AggregatePair(
+        group='Cardinality',
+        group_by=['hour'],
+        element_aggregator=g.ElementAggregateDefinition(operators=[
+            operator_context('count', BINARY_OPERATOR + 'Sum')
+        ]))])
+
+
+def road_use(source, destination, count, speed, vehicles):
+    return g.Edge('RoadUse', source, destination, True, {
+        'count': gaffer_types.long(count),
+        'maxSpeed': speed,
+        'minSpeed': speed,
+        'vehicles': gaffer_types.freq_map(vehicles)
+    })
+
+
+def cardinality(vertex, hour, count):
+    return g.Entity('Cardinality', vertex, {'hour': hour, 'count': count})
+
+
+def sorted_json(elements):
+    return sorted([element.to_json() for element in elements],
+                  key=lambda element: repr(sorted(element.items())))
+
+
+class GafferAggregateTest(unittest.TestCase):
+    elements = [
+        road_use('M1', 'J1', 1, 60, {'car': 1}),
+        road_use('M1', 'J2', 2, 50, {'bus': 2}),
+        road_use('M1', 'J1', 3, 70, {'car': 2, 'bus': 1}),
+        cardinality('M1', 1, 5),
+        cardinality('M1', 2, 6),
+        cardinality('M1', 1, 7),
+        g.Edge('RoadHasJunction', 'M1', 'J1', True),
+        road_use('M1', 'J1', 4, 40, {'lorry': 1})
+    ]
+
+    expected = [
+        road_use('M1', 'J1', 8, 70, {'car': 3, 'bus': 1, 'lorry': 1}),
+        road_use('M1', 'J2', 2, 50, {'bus': 2}),
+        cardinality('M1', 1, 12),
+        cardinality('M1', 2, 6),
+        g.Edge('RoadHasJunction', 'M1', 'J1', True)
+    ]
+    expected[0].properties['minSpeed'] = 40
+
+    def test_aggregates_in_memory(self):
+        aggregator = gaffer_aggregate.GroupByAggregator(AGGREGATE)
+        aggregator.update(self.elements[:4])
+        aggregator.update(self.elements[4:])
+
+        self.assertEqual(5, len(aggregator))
+        self.assertEqual(0, aggregator.spills)
+        self.assertEqual(sorted_json(self.expected),
+                         sorted_json(aggregator.results()))
+        self.assertEqual({'java.lang.Long': 1},
+                         self.elements[0].properties['count'])
+        self.assertEqual({'car': 1}, self.elements[0].properties[
+            'vehicles']['uk.gov.gchq.gaffer.types.FreqMap'])
+
+    def test_spills_when_max_entries_is_reached(self):
+        with gaffer_aggregate.GroupByAggregator(
+                AGGREGATE, max_entries=2, spill_partitions=3) as aggregator:
+            aggregator.update(self.elements)
+
+            self.assertLess(len(aggregator), 2)
+            self.assertGreater(aggregator.spills, 0)
+            self.assertEqual(sorted_json(self.expected),
+                             sorted_json(aggregator.results()))
+
+    def test_aggregates_compact_elements(self):
+        elements = [gaffer_compact.object_decoder(element.to_json())
+                    for element in self.elements]
+
+        results = gaffer_aggregate.aggregate(AGGREGATE, elements,
+                                             max_entries=3)
+
+        self.assertEqual(sorted_json(self.expected), sorted_json(results))
+
+    def test_max_entries_must_be_positive(self):
+        self.assertRaises(ValueError, gaffer_aggregate.GroupByAggregator,
+                          AGGREGATE, max_entries=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import os
+import tempfile
+import unittest
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_batch
+from gafferpy import gaffer_connector
+from gafferpy import gaffer_metrics
+from test.gaffer_stub_server import GafferStubServer
+
+
+def echo_seeds(body, headers):
+    operation = json.loads(body)
+    if 'operations' in operation:
+        operation = operation['operations'][0]
+    return [g.Entity('count', seed['vertex']).to_json()
+            for seed in operation.get('input', [])]
+
+
+ROUTES = {('POST', '/graph/operations/execute'): echo_seeds}
+
+
+class RecordingMetricsListener(gaffer_metrics.MetricsListener):
+    def __init__(self):
+        self.metrics = []
+
+    def update(self, metrics):
+        self.metrics.append(metrics)
+
+
+class GafferBatchTest(unittest.TestCase):
+    def test_split_batches(self):
+        self.assertEqual([[0, 1, 2], [3, 4, 5], [6]],
+                         list(gaffer_batch.split_batches(range(7), 3)))
+        self.assertEqual([], list(gaffer_batch.split_batches([], 3)))
+
+    def test_with_input_does_not_modify_original(self):
+        chain = g.OperationChain([
+            g.GetElements(input=['a', 'b'], view=g.View(all_edges=True)),
+            g.Limit(10)
+        ])
+        batch_chain = gaffer_batch.with_input(chain, ['c'])
+
+        self.assertEqual(['a', 'b'], chain.operations[0].input)
+        self.assertEqual(['c'], batch_chain.operations[0].input)
+        self.assertEqual(chain.operations[0].view,
+                         batch_chain.operations[0].view)
+        self.assertIs(chain.operations[1], batch_chain.operations[1])
+
+    def test_as_get_elements(self):
+        view = g.View(edges=[g.ElementDefinition('Road')])
+        adjacent_ids = g.GetAdjacentIds(input=['a'], view=view,
+                                        include_incoming_out_going='OUTGOING',
+                                        options={'k': 'v'})
+        adjacent_ids.views = [view, view]
+        get_elements = gaffer_batch.as_get_elements(adjacent_ids, ['b'])
+
+        self.assertIsInstance(get_elements, g.GetElements)
+        self.assertEqual(['b'], get_elements.input)
+        self.assertEqual('OUTGOING', get_elements.include_incoming_out_going)
+        self.assertEqual({'k': 'v'}, get_elements.options)
+        self.assertEqual([view, view], get_elements.views)
+
+        operation = g.GetElements(input=['a'], directed_type='DIRECTED')
+        copied = gaffer_batch.as_get_elements(operation, ['b'])
+        self.assertEqual(['b'], copied.input)
+        self.assertEqual('DIRECTED', copied.directed_type)
+        self.assertEqual(['a'], operation.input)
+
+    def test_execute_batched_returns_results_in_input_order(self):
+        listener = RecordingMetricsListener()
+        seeds = [g.EntitySeed(str(i)) for i in range(25)]
+        with GafferStubServer(ROUTES) as server:
+            gc = gaffer_connector.GafferConnector(server.host, pooled=True)
+            results = gc.execute_batched(
+                g.OperationChain([g.GetElements(input=seeds),
+                                  g.ToList()]),
+                batch_size=4, max_workers=3, metrics_listener=listener)
+            gc.close()
+
+            self.assertEqual(7, len(server.requests))
+
+        self.assertEqual([g.Entity('count', str(i)) for i in range(25)],
+                         results)
+        self.assertEqual(7, len(listener.metrics))
+        for metrics in listener.metrics:
+            self.assertEqual(['results_per_second', 'seeds_per_second'],
+                             metrics.get_metric_names())
+            self.assertTrue(metrics.get_metric('seeds_per_second') > 0)
+
+    def test_stream_batched_reads_seeds_lazily(self):
+        read = []
+
+        def seeds():
+            for i in range(100):
+                read.append(i)
+                yield str(i)
+
+        with GafferStubServer(ROUTES) as server:
+            gc = gaffer_connector.GafferConnector(server.host)
+            batches = gc.stream_batched(
+                g.GetAdjacentIds(input=seeds()), batch_size=10,
+                max_workers=2)
+            self.assertEqual([g.Entity('count', str(i)) for i in range(10)],
+                             next(batches))
+            self.assertTrue(len(read) <= 50)
+            batches.close()
+
+    def test_operations_without_seeds_are_executed_once(self):
+        with GafferStubServer(ROUTES) as server:
+            gc = gaffer_connector.GafferConnector(server.host)
+            self.assertEqual([], gc.execute_batched(g.GetAllElements(),
+                                                    batch_size=2))
+            self.assertEqual(1, len(server.requests))
+
+    def test_file_writer_metrics_listener(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'metrics.txt')
+            listener = gaffer_metrics.FileWriterMetricsListener()
+            listener.initialise({
+                gaffer_metrics.FileWriterMetricsListener.FILENAME: filename
+            })
+            listener.update(gaffer_metrics.QueryMetrics(10.0, 20.0))
+            listener.close()
+
+            with open(filename) as metrics_file:
+                self.assertEqual(
+                    'results_per_second: 20.0, seeds_per_second: 10.0\n',
+                    metrics_file.read())
+
+        with self.assertRaises(ValueError):
+            gaffer_metrics.QueryMetrics(1.0, 1.0).put_metric('unknown', 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,334 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import unittest
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_cache
+from gafferpy import gaffer_connector
+from test.gaffer_stub_server import GafferStubServer
+
+ROUTES = {
+    ('GET', '/graph/config/schema'): lambda body, headers: {'edges': {}},
+    ('GET', '/graph/operations'):
+        lambda body, headers: [g.GetElements.CLASS, g.AddElements.CLASS],
+    ('GET', '/graph/operations/' + g.GetElements.CLASS):
+        lambda body, headers: {'name': g.GetElements.CLASS},
+    ('POST', '/graph/operations/execute'):
+        lambda body, headers: [{'class': g.Entity.CLASS,
+                                'group': 'Cardinality', 'vertex': 'M5'}]
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TtlLruCacheTest(unittest.TestCase):
+    def test_entries_expire(self):
+        cache = gaffer_cache.TtlLruCache()
+        cache._clock = clock = FakeClock()
+        cache.put('a', 1, ttl=10)
+        cache.put('b', 2)
+        clock.now = 9
+        self.assertEqual(1, cache.get('a'))
+        clock.now = 10
+        self.assertIs(gaffer_cache.MISSING, cache.get('a'))
+        self.assertEqual(2, cache.get('b'))
+        self.assertEqual(1, len(cache))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = gaffer_cache.TtlLruCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertEqual(1, cache.get('a'))
+        self.assertIs(gaffer_cache.MISSING, cache.get('b'))
+        self.assertEqual(3, cache.get('c'))
+        self.assertEqual(1, cache.evictions)
+
+    def test_max_size(self):
+        cache = gaffer_cache.TtlLruCache(max_size=10)
+        cache.put('a', 'a', size=6)
+        cache.put('b', 'b', size=4)
+        cache.put('c', 'c', size=5)
+        cache.put('d', 'd', size=11)
+        self.assertIs(gaffer_cache.MISSING, cache.get('a'))
+        self.assertIs(gaffer_cache.MISSING, cache.get('d'))
+        self.assertEqual(9, cache.size())
+
+    def test_metrics(self):
+        cache = gaffer_cache.TtlLruCache()
+        cache.put('a', 1)
+        cache.get('a')
+        cache.get('a')
+        cache.get('b')
+        metrics = cache.get_metrics()
+        self.assertEqual(2, metrics.get_metric('hits'))
+        self.assertEqual(1, metrics.get_metric('misses'))
+        self.assertEqual(2 / 3, metrics.get_metric('hit_ratio'))
+
+
+class MetadataCacheTest(unittest.TestCase):
+    def test_ttl_for_uses_longest_prefix(self):
+        cache = gaffer_cache.MetadataCache(
+            default_ttl=5, ttls={'/graph/operations/details': 20})
+        self.assertEqual(300, cache.ttl_for('/graph/config/schema'))
+        self.assertEqual(3600, cache.ttl_for('/graph/config/storeTraits'))
+        self.assertEqual(20, cache.ttl_for('/graph/operations/details'))
+        self.assertEqual(5, cache.ttl_for('/graph/status'))
+
+    def test_invalidate_path(self):
+        cache = gaffer_cache.MetadataCache()
+        cache.put_response('host', '/graph/config/schema', {}, 'schema')
+        cache.put_response('host', '/graph/operations', {}, 'operations')
+        cache.invalidate_path('/graph/config')
+        self.assertIs(gaffer_cache.MISSING, cache.get_response(
+            'host', '/graph/config/schema', {}))
+        self.assertEqual('operations', cache.get_response(
+            'host', '/graph/operations', {}))
+
+    def test_connector_caches_get_requests(self):
+        with GafferStubServer(ROUTES) as server:
+            cache = gaffer_cache.MetadataCache()
+            gc = gaffer_connector.GafferConnector(server.host,
+                                                  metadata_cache=cache)
+            for i in range(3):
+                self.assertEqual('{"edges": {}}',
+                                 gc.execute_get(g.GetSchema()))
+                gc.is_operation_supported(
+                    g.IsOperationSupported(g.GetElements.CLASS))
+            gc.execute_get(g.GetSchema(), headers={'User': 'other'})
+
+            self.assertEqual(2, server.request_count(
+                'GET', '/graph/config/schema'))
+            self.assertEqual(1, server.request_count(
+                'GET', '/graph/operations/' + g.GetElements.CLASS))
+
+            cache.invalidate_path('/graph/config/schema')
+            gc.execute_get(g.GetSchema())
+            self.assertEqual(3, server.request_count(
+                'GET', '/graph/config/schema'))
+
+    def test_supports_operation_uses_one_request(self):
+        with GafferStubServer(ROUTES) as server:
+            gc = gaffer_connector.GafferConnector(
+                server.host, metadata_cache=gaffer_cache.MetadataCache())
+            self.assertTrue(gc.supports_operation(g.GetElements))
+            self.assertTrue(gc.supports_operation(g.AddElements()))
+            self.assertTrue(gc.supports_operation(
+                g.IsOperationSupported(g.GetElements.CLASS)))
+            self.assertFalse(gc.supports_operation(g.GetAllElements.CLASS))
+            self.assertEqual(1, server.request_count(
+                'GET', '/graph/operations'))
+
+
+class ResultCacheTest(unittest.TestCase):
+    def test_fingerprint_ignores_key_and_seed_order(self):
+        chain = g.OperationChain([g.GetElements(
+            input=[g.EntitySeed('M5'), g.EntitySeed('M4')],
+            view=g.View(entities=[g.ElementDefinition('Cardinality')]))])
+        reordered = json.loads(json.dumps(chain.to_json()))
+        reordered['operations'][0]['input'].reverse()
+        reordered['operations'][0] = dict(
+            reversed(list(reordered['operations'][0].items())))
+
+        self.assertEqual(gaffer_cache.fingerprint(chain),
+                         gaffer_cache.fingerprint(reordered))
+        self.assertNotEqual(
+            gaffer_cache.fingerprint(chain),
+            gaffer_cache.fingerprint(g.OperationChain([g.GetElements(
+                input=[g.EntitySeed('M5')])])))
+
+    def test_ttl_is_smallest_for_chain(self):
+        cache = gaffer_cache.ResultCache(
+            default_ttl=30, ttls={g.GetAllElements.CLASS: 5,
+                                  g.Limit.CLASS: 10})
+        self.assertEqual(5, cache.ttl_for({g.GetAllElements.CLASS,
+                                           g.Limit.CLASS}))
+        self.assertEqual(30, cache.ttl_for({g.GetElements.CLASS}))
+
+    def test_connector_caches_results(self):
+        with GafferStubServer(ROUTES) as server:
+            cache = gaffer_cache.ResultCache()
+            gc = gaffer_connector.GafferConnector(server.host,
+                                                  result_cache=cache)
+            for i in range(3):
+                self.assertEqual(
+                    [g.Entity('Cardinality', 'M5')],
+                    gc.execute_operation(
+                        g.GetElements(input=[g.EntitySeed('M5')])))
+            gc.execute_operation(g.GetElements(input=[g.EntitySeed('M4')]))
+
+            self.assertEqual(2, server.request_count(
+                'POST', '/graph/operations/execute'))
+            self.assertEqual(2, cache.hits)
+            self.assertEqual(2, len(cache))
+
+    def test_writes_bypass_and_invalidate(self):
+        with GafferStubServer(ROUTES) as server:
+            cache = gaffer_cache.ResultCache()
+            gc = gaffer_connector.GafferConnector(server.host,
+                                                  result_cache=cache)
+            get_elements = g.GetElements(input=[g.EntitySeed('M5')])
+            gc.execute_operation(get_elements)
+            for i in range(2):
+                gc.execute_operation(g.AddElements(
+                    input=[g.Entity('Cardinality', 'M5')]))
+            self.assertEqual(0, len(cache))
+            self.assertEqual(2, cache.bypasses)
+
+            gc.execute_operation(get_elements)
+            self.assertEqual(4, server.request_count(
+                'POST', '/graph/operations/execute'))
+
+    def test_write_without_invalidation(self):
+        cache = gaffer_cache.ResultCache(invalidate_on_write=False)
+        get_elements = g.GetElements(input=[g.EntitySeed('M5')])
+        cache.get_or_execute('host', get_elements, {}, lambda: '[]')
+        cache.get_or_execute('host', g.SetVariable(input=1, variable_name='a'),
+                             {}, lambda: '')
+        self.assertEqual(1, len(cache))
+
+
+GRAPH = {
+    'A': ['B', 'C'],
+    'B': ['C'],
+    'C': []
+}
+
+
+def get_outgoing_edges(body, headers):
+    operation = json.loads(body)
+    if 'operations' in operation:
+        operation = operation['operations'][0]
+    results = []
+    for seed in operation['input']:
+        vertex = seed['vertex']
+        results.append({'class': g.Entity.CLASS, 'group': 'Junction',
+                        'vertex': vertex})
+        for destination in GRAPH.get(vertex, []):
+            results.append({'class': g.Edge.CLASS, 'group': 'Road',
+                            'source': vertex, 'destination': destination,
+                            'directed': True, 'matchedVertex': 'SOURCE'})
+    return results
+
+
+ADJACENCY_ROUTES = {('POST', '/graph/operations/execute'): get_outgoing_edges}
+
+ROADS = g.View(edges=[g.ElementDefinition('Road')])
+
+
+def requested_vertices(server):
+    vertices = []
+    for method, path, body, headers in server.requests:
+        operation = json.loads(body)
+        if 'operations' in operation:
+            operation = operation['operations'][0]
+        vertices.append([seed['vertex'] for seed in operation['input']])
+    return vertices
+
+
+class AdjacencyCacheTest(unittest.TestCase):
+    def test_only_misses_are_fetched(self):
+        with GafferStubServer(ADJACENCY_ROUTES) as server:
+            cache = gaffer_cache.AdjacencyCache()
+            gc = gaffer_connector.GafferConnector(server.host,
+                                                  adjacency_cache=cache)
+            gc.execute_operation(g.GetElements(input=['A'], view=ROADS))
+            results = gc.execute_operation(
+                g.GetElements(input=[g.EntitySeed('B'), 'A', 'B'],
+                              view=ROADS))
+            gc.execute_operation(g.GetElements(input=['A', 'B'],
+                                               view=ROADS))
+
+            self.assertEqual([['A'], ['B']], requested_vertices(server))
+        self.assertEqual([('B', 'C'), ('A', 'B'), ('A', 'C')],
+                         [(edge.source, edge.destination)
+                          for edge in results
+                          if isinstance(edge, g.Edge)])
+        metrics = cache.get_metrics()
+        self.assertEqual(3, metrics.get_metric('hits'))
+        self.assertEqual(2, metrics.get_metric('misses'))
+        self.assertEqual(0.6, metrics.get_metric('hit_ratio'))
+
+    def test_views_are_cached_separately(self):
+        with GafferStubServer(ADJACENCY_ROUTES) as server:
+            cache = gaffer_cache.AdjacencyCache()
+            gc = gaffer_connector.GafferConnector(server.host,
+                                                  adjacency_cache=cache)
+            gc.execute_operation(g.GetElements(input=['A'], view=ROADS))
+            gc.execute_operation(g.GetElements(
+                input=['A'], view=ROADS,
+                include_incoming_out_going='OUTGOING'))
+            gc.execute_operation(g.GetElements(input=['A']))
+
+            self.assertEqual(3, len(server.requests))
+            self.assertEqual(3, len(cache))
+
+    def test_adjacent_ids_share_cached_edges(self):
+        with GafferStubServer(ADJACENCY_ROUTES) as server:
+            cache = gaffer_cache.AdjacencyCache()
+            gc = gaffer_connector.GafferConnector(server.host,
+                                                  adjacency_cache=cache)
+            gc.execute_operation(g.GetElements(input=['A'], view=ROADS))
+            adjacent_ids = gc.execute_operation(
+                g.GetAdjacentIds(input=['A', 'B'], view=ROADS))
+
+            self.assertEqual([['A'], ['B']], requested_vertices(server))
+            self.assertEqual(g.GetElements.CLASS,
+                             json.loads(server.requests[1][2])['class'])
+        self.assertEqual([g.EntitySeed('B'), g.EntitySeed('C'),
+                          g.EntitySeed('C')], adjacent_ids)
+
+    def test_edge_seeds_and_chains_are_not_cached(self):
+        with GafferStubServer(ROUTES) as server:
+            cache = gaffer_cache.AdjacencyCache()
+            gc = gaffer_connector.GafferConnector(server.host,
+                                                  adjacency_cache=cache)
+            for i in range(2):
+                gc.execute_operation(
+                    g.GetElements(input=[g.EdgeSeed('M5', 'M4', True)]))
+                gc.execute_operations([g.GetElements(input=['M5']),
+                                       g.Limit(1)])
+
+            self.assertEqual(4, len(server.requests))
+            self.assertEqual(0, len(cache))
+
+    def test_bounded_and_invalidated_on_write(self):
+        with GafferStubServer(ADJACENCY_ROUTES) as server:
+            cache = gaffer_cache.AdjacencyCache(max_vertices=10,
+                                                max_elements=4)
+            gc = gaffer_connector.GafferConnector(server.host,
+                                                  adjacency_cache=cache)
+            gc.execute_operation(g.GetElements(input=['A', 'B', 'C']))
+            # A has 3 elements, B has 2 and C has 1, so A is evicted
+            self.assertEqual(2, len(cache))
+            self.assertEqual(1, cache.evictions)
+
+            gc.execute_operation(g.AddElements(
+                input=[g.Entity('Junction', 'D')]))
+            self.assertEqual(0, len(cache))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import subprocess
+import sys
+import unittest
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_class_index
+from gafferpy import gaffer_class_index_builder
+
+
+def run_python(code):
+    return subprocess.check_output(
+        [sys.executable, '-W', 'ignore', '-c', code],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        universal_newlines=True).strip()
+
+
+class GafferClassIndexTest(unittest.TestCase):
+    def test_index_is_up_to_date(self):
+        with open(gaffer_class_index.__file__) as index_file:
+            self.assertEqual(
+                gaffer_class_index_builder.render_index(
+                    *gaffer_class_index_builder.build_index()),
+                index_file.read(),
+                'Run python3 -m gafferpy.gaffer_class_index_builder')
+
+    def test_gaffer_provides_every_name(self):
+        for name in gaffer_class_index.NAMES:
+            self.assertIsNotNone(getattr(g, name))
+        self.assertIs(g.op.GetElements, g.GetElements)
+        self.assertIn('GetElements', dir(g))
+        self.assertIn('JsonConverter', g.__all__)
+        with self.assertRaises(AttributeError):
+            g.NotAGafferClass
+
+    def test_modules_are_imported_when_first_used(self):
+        self.assertEqual(
+            'False True',
+            run_python(
+                'import sys\n'
+                'from gafferpy import gaffer as g\n'
+                'loaded = "gafferpy.gaffer_operations" in sys.modules\n'
+                'op = g.JsonConverter.from_json({"class": '
+                '"uk.gov.gchq.gaffer.operation.impl.get.GetElements"})\n'
+                'print(loaded, isinstance(op, g.GetElements))'))
+
+    def test_registry_lookups_import_modules(self):
+        self.assertEqual(
+            'True True ' + str(len(g.JsonConverter.GENERIC_JSON_CONVERTERS)),
+            run_python(
+                'from gafferpy import gaffer as g\n'
+                'converters = g.JsonConverter.GENERIC_JSON_CONVERTERS\n'
+                'print("uk.gov.gchq.koryphe.impl.predicate.IsMoreThan" in '
+                'converters, "java.util.function.Predicate" in '
+                'g.JsonConverter.CUSTOM_JSON_CONVERTERS, len(converters))'))
+
+if __name__ == "__main__":
+    unittest.main()
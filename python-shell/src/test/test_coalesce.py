@@ -0,0 +1,140 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_coalesce
+from gafferpy import gaffer_connector
+from gafferpy import gaffer_deadline
+from test.gaffer_stub_server import GafferStubServer
+
+ENTITY_JSON = {
+    'class': g.Entity.CLASS,
+    'group': 'Cardinality',
+    'vertex': 'M5'
+}
+
+
+def wait_for(condition):
+    deadline = time.monotonic() + 5
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError('Timed out')
+        time.sleep(0.01)
+
+
+def waiters(coalescer):
+    with coalescer._lock:
+        return sum(call.waiters for call in coalescer._calls.values())
+
+
+class RequestCoalescerTest(unittest.TestCase):
+    def test_identical_requests_are_sent_once(self):
+        release = threading.Event()
+
+        def execute(body, headers):
+            release.wait(5)
+            return [ENTITY_JSON]
+
+        routes = {('POST', '/graph/operations/execute'): execute}
+        with GafferStubServer(routes) as server:
+            coalescer = gaffer_coalesce.RequestCoalescer()
+            gc = gaffer_connector.GafferConnector(server.host,
+                                                  coalescer=coalescer)
+            with ThreadPoolExecutor(5) as executor:
+                futures = [executor.submit(
+                    gc.execute_operation,
+                    g.GetElements(input=[g.EntitySeed('M5')]))
+                    for i in range(5)]
+                wait_for(lambda: waiters(coalescer) == 4)
+                release.set()
+                results = [future.result() for future in futures]
+
+            self.assertEqual([[g.Entity('Cardinality', 'M5')]] * 5, results)
+            self.assertIsNot(results[0][0], results[1][0])
+            self.assertEqual(1, server.request_count())
+            metrics = coalescer.get_metrics()
+            self.assertEqual(1, metrics.get_metric('requests_executed'))
+            self.assertEqual(4, metrics.get_metric('requests_coalesced'))
+
+    def test_errors_are_not_shared(self):
+        coalescer = gaffer_coalesce.RequestCoalescer()
+        started = threading.Event()
+        release = threading.Event()
+
+        def fail():
+            started.set()
+            release.wait(5)
+            raise gaffer_deadline.DeadlineExceeded('Deadline exceeded')
+
+        chain = g.GetAllElements()
+        with ThreadPoolExecutor(2) as executor:
+            first = executor.submit(coalescer.run, 'host', chain, {}, fail)
+            started.wait(5)
+            second = executor.submit(coalescer.run, 'host', chain, {},
+                                     lambda: '[]')
+            wait_for(lambda: waiters(coalescer) == 1)
+            release.set()
+            self.assertRaises(gaffer_deadline.DeadlineExceeded, first.result)
+            self.assertEqual('[]', second.result())
+
+        self.assertEqual(2, coalescer.executed)
+        self.assertEqual(0, coalescer.coalesced)
+
+    def test_followers_wait_until_their_deadline(self):
+        coalescer = gaffer_coalesce.RequestCoalescer()
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return '[]'
+
+        chain = g.GetAllElements()
+        with ThreadPoolExecutor(1) as executor:
+            first = executor.submit(coalescer.run, 'host', chain, {}, slow)
+            started.wait(5)
+            start = time.monotonic()
+            self.assertRaises(gaffer_deadline.DeadlineExceeded,
+                              coalescer.run, 'host', chain, {}, slow,
+                              gaffer_deadline.Deadline(0.05))
+            self.assertLess(time.monotonic() - start, 1)
+            release.set()
+            self.assertEqual('[]', first.result())
+
+    def test_writes_and_stateful_chains_are_not_coalesced(self):
+        coalescer = gaffer_coalesce.RequestCoalescer()
+        add = g.AddElements(input=[g.Entity('Cardinality', 'M5')])
+        calls = []
+
+        def execute():
+            calls.append(1)
+            return ''
+
+        coalescer.run('host', add, {}, execute)
+        self.assertEqual(1, len(calls))
+        coalescer.run('host', g.GetVariable(variable_name='a'), {}, execute)
+        self.assertEqual(2, len(calls))
+        self.assertEqual(0, coalescer.executed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import unittest
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_compact
+from gafferpy import gaffer_connector
+from gafferpy import gaffer_json_encoder
+from test.gaffer_stub_server import GafferStubServer
+
+
+class GafferCompactTest(unittest.TestCase):
+    standard = [
+        g.Entity('entity', 'vertex', {'count': 1}),
+        g.Entity('entity', 6),
+        g.Edge('edge', 'a', 'b', True),
+        g.Edge('edge', 'a', 'b', False, {'count': {'java.lang.Long': 3}},
+               matched_vertex='SOURCE'),
+        g.EntitySeed('vertex'),
+        g.EdgeSeed('a', 'b', g.DirectedType.EITHER),
+        g.EdgeSeed('a', 'b', True, matched_vertex='DESTINATION'),
+        g.SeedPair('a', g.EdgeSeed('b', 'c', False))
+    ]
+
+    def test_compact_objects_match_standard_objects(self):
+        for obj in self.standard:
+            compact = gaffer_compact.to_compact(obj)
+            self.assertIsNot(type(obj), type(compact))
+            self.assertFalse(hasattr(compact, '__dict__'))
+            self.assertEqual(obj.to_json(), compact.to_json())
+            self.assertEqual(obj, compact)
+            self.assertEqual(obj.to_code_string(), compact.to_code_string())
+            self.assertEqual(json.dumps(obj.to_json()),
+                             gaffer_json_encoder.encode(compact))
+            standard = gaffer_compact.to_standard(compact)
+            self.assertIs(type(obj), type(standard))
+            self.assertEqual(obj.to_json(), standard.to_json())
+
+    def test_compact_seeds_can_be_used_as_operation_input(self):
+        seeds = [gaffer_compact.CompactEntitySeed('a'),
+                 gaffer_compact.CompactEdgeSeed('a', 'b', True)]
+        self.assertEqual(
+            g.GetElements(input=[g.EntitySeed('a'),
+                                 g.EdgeSeed('a', 'b', True)]).to_json(),
+            g.GetElements(input=seeds).to_json())
+
+    def test_constructor_validation_matches_standard_classes(self):
+        with self.assertRaises(TypeError):
+            gaffer_compact.CompactEdge('edge', 'a', 'b', 'true')
+        with self.assertRaises(TypeError):
+            gaffer_compact.CompactEntity(1, 'a')
+        with self.assertRaises(TypeError):
+            gaffer_compact.CompactEntity('entity', 'a', properties=[])
+
+    def test_from_json_decodes_compact_elements(self):
+        json_obj = [obj.to_json() for obj in self.standard[:7]]
+        decoded = gaffer_compact.from_json(json_obj)
+        self.assertEqual(
+            [gaffer_compact.CompactEntity, gaffer_compact.CompactEntity,
+             gaffer_compact.CompactEdge, gaffer_compact.CompactEdge,
+             gaffer_compact.CompactEntitySeed, gaffer_compact.CompactEdgeSeed,
+             gaffer_compact.CompactEdgeSeed],
+            [type(obj) for obj in decoded])
+        self.assertEqual(json_obj, [obj.to_json() for obj in decoded])
+        self.assertEqual(g.Limit(3).to_json(), gaffer_compact.from_json(
+            json.dumps(g.Limit(3).to_json())).to_json())
+
+    def test_stream_operation_with_compact_decoder(self):
+        edges = [g.Edge('edge', str(i), str(i + 1), True).to_json()
+                 for i in range(5)]
+        with GafferStubServer({
+            ('POST', '/graph/operations/execute'): lambda body, headers: edges
+        }) as server:
+            gc = gaffer_connector.GafferConnector(server.host)
+            results = list(gc.stream_operation(
+                g.GetAllElements(),
+                object_hook=gaffer_compact.object_decoder))
+
+        self.assertEqual(5, len(results))
+        self.assertIsInstance(results[0], gaffer_compact.CompactEdge)
+        self.assertEqual(edges, [result.to_json() for result in results])
+
+
+if __name__ == "__main__":
+    unittest.main()
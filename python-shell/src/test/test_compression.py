@@ -0,0 +1,132 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import gzip
+import io
+import json
+import unittest
+import zlib
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_compression
+from gafferpy import gaffer_connector
+from gafferpy import gaffer_connector_async
+from test.gaffer_stub_server import GafferStubServer
+
+
+class CountingReader(io.BytesIO):
+    def __init__(self, data, headers):
+        super().__init__(data)
+        self.headers = headers
+        self.reads = 0
+
+    def read(self, size=-1):
+        self.reads += 1
+        return super().read(size)
+
+
+def lower_case_keys(headers):
+    return {name.lower(): value for name, value in headers.items()}
+
+
+def edge_json(i):
+    return {'class': g.Edge.CLASS, 'group': 'RoadUse', 'source': i,
+            'destination': i + 1, 'directed': True}
+
+
+def gzip_route(body, headers):
+    request = body
+    if headers.get('Content-Encoding') == 'gzip':
+        request = gzip.decompress(body)
+    num_edges = len(json.loads(request)['operations'][0]['input'])
+    response = gzip.compress(json.dumps(
+        [edge_json(i) for i in range(num_edges)]).encode('utf-8'))
+    return 200, response, {'Content-Encoding': 'gzip'}
+
+
+ROUTES = {('POST', '/graph/operations/execute'): gzip_route}
+
+
+class CompressionTest(unittest.TestCase):
+    def test_decompress(self):
+        data = b'{"class": "uk.gov.gchq.gaffer.data.element.Edge"}' * 10
+        self.assertEqual(data, gaffer_compression.decompress(
+            gaffer_compression.compress(data), 'gzip'))
+        self.assertEqual(data, gaffer_compression.decompress(
+            zlib.compress(data), 'deflate'))
+        self.assertEqual(data, gaffer_compression.decompress(data, None))
+        self.assertRaises(ValueError, gaffer_compression.decompress, data,
+                          'br')
+
+    def test_response_is_decompressed_incrementally(self):
+        data = json.dumps([edge_json(i) for i in range(50000)]).encode()
+        compressed = gzip.compress(data)
+        response = gaffer_compression.decompress_response(
+            CountingReader(compressed, {'Content-Encoding': 'gzip'}))
+
+        first = response.read(100)
+        self.assertEqual(data[:100], first)
+        self.assertEqual(1, response.reads)
+        self.assertEqual(data[100:], response.read())
+
+    def test_uncompressed_response_is_unchanged(self):
+        response = CountingReader(b'[]', {})
+        self.assertIs(response,
+                      gaffer_compression.decompress_response(response))
+
+    def test_connector_compresses_and_decompresses(self):
+        with GafferStubServer(ROUTES) as server:
+            for pooled in (False, True):
+                gc = gaffer_connector.GafferConnector(
+                    server.host, compress_requests=True, pooled=pooled)
+                edges = [g.Edge('RoadUse', i, i + 1, True)
+                         for i in range(1000)]
+                self.assertEqual(edges, gc.execute_operation(
+                    g.AddElements(input=edges)))
+                self.assertEqual(edges, list(gc.stream_operation(
+                    g.AddElements(input=edges), chunk_size=1024)))
+                gc.close()
+
+            method, path, body, headers = server.requests[-1]
+            headers = lower_case_keys(headers)
+            self.assertEqual('gzip', headers['content-encoding'])
+            self.assertEqual(gaffer_compression.ACCEPT_ENCODING,
+                             headers['accept-encoding'])
+            self.assertNotIn(b' ', gzip.decompress(body))
+
+            gc = gaffer_connector.GafferConnector(server.host)
+            gc.execute_operation(g.AddElements(input=edges))
+            self.assertNotIn('content-encoding',
+                             lower_case_keys(server.requests[-1][3]))
+
+    def test_async_connector_compresses_and_decompresses(self):
+        async def run(host):
+            async with gaffer_connector_async.AsyncGafferConnector(
+                    host, compress_requests=True) as gc:
+                return await gc.execute_operation(g.AddElements(
+                    input=[g.Edge('RoadUse', i, i + 1, True)
+                           for i in range(100)]))
+
+        with GafferStubServer(ROUTES) as server:
+            edges = asyncio.run(run(server.host))
+            self.assertEqual(100, len(edges))
+            self.assertEqual('gzip', lower_case_keys(
+                server.requests[-1][3])['content-encoding'])
+
+
+if __name__ == '__main__':
+    unittest.main()
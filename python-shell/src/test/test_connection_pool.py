@@ -0,0 +1,209 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import socket
+import threading
+import time
+import unittest
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_connection_pool
+from gafferpy import gaffer_connector
+from test.gaffer_stub_server import GafferStubServer
+
+EDGE_JSON = {
+    'class': 'uk.gov.gchq.gaffer.data.element.Edge',
+    'group': 'JunctionLocatedAt',
+    'source': 'M5:10',
+    'destination': '390466,225615',
+    'directed': True,
+    'properties': {},
+    'matchedVertex': 'SOURCE'
+}
+
+ROUTES = {
+    ('POST', '/graph/operations/execute'): lambda body, headers: [EDGE_JSON],
+    ('GET', '/graph/config/schema'): lambda body, headers: {'edges': {}},
+    ('GET', '/graph/operations/' + g.GetElements.CLASS):
+        lambda body, headers: {'name': g.GetElements.CLASS},
+    ('POST', '/graph/operations/fail'):
+        lambda body, headers: (503, 'Server busy', {})
+}
+
+
+class DroppingServer:
+    """
+    Answers the first request on each connection, then reads the next one
+    and closes the connection without answering, as a server dropping an
+    idle keep-alive connection at the wrong moment does.
+    """
+
+    RESPONSE = (b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                b'Content-Length: 2\r\n\r\n[]')
+
+    def __init__(self):
+        self.requests = 0
+        self._socket = socket.socket()
+        self._socket.bind(('127.0.0.1', 0))
+        self._socket.listen()
+        self.url = 'http://127.0.0.1:%d/' % self._socket.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                connection, address = self._socket.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(connection,),
+                             daemon=True).start()
+
+    def _read_request(self, stream):
+        length = 0
+        while True:
+            line = stream.readline()
+            if not line:
+                return False
+            if line.lower().startswith(b'content-length:'):
+                length = int(line.split(b':')[1])
+            if line == b'\r\n':
+                stream.read(length)
+                self.requests += 1
+                return True
+
+    def _handle(self, connection):
+        with connection, connection.makefile('rb') as stream:
+            if self._read_request(stream):
+                connection.sendall(self.RESPONSE)
+                self._read_request(stream)
+
+    def close(self):
+        self._socket.close()
+
+
+class ConnectionPoolTest(unittest.TestCase):
+    def test_unanswered_request_is_only_resent_if_idempotent(self):
+        server = DroppingServer()
+        pool = gaffer_connection_pool.ConnectionPool()
+        try:
+            def post(idempotent):
+                return pool.open(gaffer_connection_pool.Request(
+                    server.url, data=b'{}', idempotent=idempotent)).read()
+
+            self.assertEqual(b'[]', post(False))
+            self.assertRaises(ConnectionError, post, False)
+            self.assertEqual(2, server.requests)
+
+            self.assertEqual(b'[]', post(True))
+            self.assertEqual(b'[]', post(True))
+            self.assertEqual(5, server.requests)
+        finally:
+            pool.close()
+            server.close()
+
+    def test_pooled_connector_reuses_connection(self):
+        with GafferStubServer(ROUTES) as server:
+            gc = gaffer_connector.GafferConnector(server.host, pooled=True)
+            for i in range(5):
+                elements = gc.execute_operation(
+                    g.GetElements(input=[g.EntitySeed('M5:10')]))
+                self.assertEqual(
+                    [g.Edge('JunctionLocatedAt', 'M5:10', '390466,225615',
+                            True, {}, 'SOURCE')],
+                    elements)
+            gc.execute_get(g.GetSchema())
+            gc.is_operation_supported(
+                g.IsOperationSupported(g.GetElements.CLASS))
+            gc.close()
+
+            self.assertEqual(7, len(server.requests))
+            self.assertEqual(1, server.connections)
+
+    def test_callers_wait_for_a_free_connection(self):
+        def slow_elements(body, headers):
+            time.sleep(0.2)
+            return [EDGE_JSON]
+
+        errors = []
+        results = []
+
+        def execute():
+            try:
+                results.append(gc.execute_operation(
+                    g.GetElements(input=[g.EntitySeed('M5:10')])))
+            except Exception as e:
+                errors.append(e)
+
+        with GafferStubServer({
+            ('POST', '/graph/operations/execute'): slow_elements
+        }) as server:
+            gc = gaffer_connector.GafferConnector(server.host, pooled=True,
+                                                  pool_size=1)
+            threads = [threading.Thread(target=execute) for i in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            gc.close()
+
+            self.assertEqual([], errors)
+            self.assertEqual(3, len(results))
+            self.assertEqual(1, server.connections)
+
+    def test_unpooled_connector_opens_a_connection_per_call(self):
+        with GafferStubServer(ROUTES) as server:
+            gc = gaffer_connector.GafferConnector(server.host)
+            for i in range(3):
+                gc.execute_get(g.GetSchema())
+
+            self.assertEqual(3, server.connections)
+
+    def test_connection_is_replaced_after_max_requests(self):
+        with GafferStubServer(ROUTES) as server:
+            gc = gaffer_connector.GafferConnector(server.host, pooled=True,
+                                                  pool_max_requests=2)
+            for i in range(5):
+                gc.execute_get(g.GetSchema())
+            gc.close()
+
+            self.assertEqual(3, server.connections)
+
+    def test_idle_connection_is_dropped_after_idle_timeout(self):
+        with GafferStubServer(ROUTES) as server:
+            gc = gaffer_connector.GafferConnector(server.host, pooled=True,
+                                                  pool_idle_timeout=0.05)
+            gc.execute_get(g.GetSchema())
+            time.sleep(0.1)
+            gc.execute_get(g.GetSchema())
+            gc.close()
+
+            self.assertEqual(2, server.connections)
+
+    def test_http_error_is_raised_and_connection_kept(self):
+        with GafferStubServer(ROUTES) as server:
+            gc = gaffer_connector.GafferConnector(server.host, pooled=True)
+            with self.assertRaises(ConnectionError) as context:
+                gc._open(server.host + '/graph/operations/fail', {}, b'{}')
+            self.assertEqual('HTTP error 503 Service Unavailable: Server busy',
+                             str(context.exception))
+            gc.execute_get(g.GetSchema())
+            gc.close()
+
+            self.assertEqual(1, server.connections)
+
+
+if __name__ == "__main__":
+    unittest.main()
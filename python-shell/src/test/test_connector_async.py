@@ -0,0 +1,109 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import json
+import threading
+import time
+import unittest
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_connector_async
+from test.gaffer_stub_server import GafferStubServer
+
+
+class InFlightCounter:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, body, headers):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.02)
+        with self._lock:
+            self.in_flight -= 1
+        seed = json.loads(body)['operations'][0]['input'][0]['vertex']
+        return [g.Entity('count', seed, {'count': 1}).to_json()]
+
+
+class AsyncGafferConnectorTest(unittest.TestCase):
+    def test_execute_operations_concurrently_with_bounded_concurrency(self):
+        counter = InFlightCounter()
+        routes = {('POST', '/graph/operations/execute'): counter}
+
+        async def run(host):
+            async with gaffer_connector_async.AsyncGafferConnector(
+                    host, max_concurrency=3) as gc:
+                return await asyncio.gather(*[
+                    gc.execute_operation(
+                        g.GetElements(input=[g.EntitySeed(str(i))]))
+                    for i in range(12)
+                ])
+
+        with GafferStubServer(routes) as server:
+            results = asyncio.run(run(server.host))
+            self.assertEqual(3, server.connections)
+
+        self.assertEqual(
+            [[g.Entity('count', str(i), {'count': 1})] for i in range(12)],
+            results)
+        self.assertEqual(3, counter.max_in_flight)
+
+    def test_execute_get_and_is_operation_supported(self):
+        routes = {
+            ('GET', '/graph/config/schema'): lambda body, headers: {
+                'edges': {}},
+            ('GET', '/graph/operations/' + g.GetElements.CLASS):
+                lambda body, headers: {'name': g.GetElements.CLASS}
+        }
+
+        async def run(host):
+            async with gaffer_connector_async.AsyncGafferConnector(
+                    host) as gc:
+                schema = await gc.execute_get(g.GetSchema())
+                supported = await gc.is_operation_supported(
+                    g.IsOperationSupported(g.GetElements.CLASS))
+                return schema, supported
+
+        with GafferStubServer(routes) as server:
+            schema, supported = asyncio.run(run(server.host))
+            self.assertEqual(1, server.connections)
+
+        self.assertEqual({'edges': {}}, json.loads(schema))
+        self.assertEqual({'name': g.GetElements.CLASS}, json.loads(supported))
+
+    def test_http_error_raises_connection_error(self):
+        routes = {('POST', '/graph/operations/execute'):
+                      lambda body, headers: (500, 'Broken', {})}
+
+        async def run(host):
+            async with gaffer_connector_async.AsyncGafferConnector(
+                    host) as gc:
+                await gc.execute_operation(g.GetAllElements())
+
+        with GafferStubServer(routes) as server:
+            with self.assertRaises(ConnectionError) as context:
+                asyncio.run(run(server.host))
+
+        self.assertEqual('HTTP error 500 Internal Server Error: Broken',
+                         str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
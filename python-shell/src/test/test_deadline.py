@@ -0,0 +1,153 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import time
+import unittest
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_connector
+from gafferpy import gaffer_deadline
+from gafferpy import gaffer_retry
+from test.gaffer_stub_server import GafferStubServer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def slow_route(delay):
+    def respond(body, headers):
+        time.sleep(delay)
+        return []
+    return respond
+
+
+class DeadlineTest(unittest.TestCase):
+    def test_deadline(self):
+        clock = FakeClock()
+        deadline = gaffer_deadline.Deadline(10, clock)
+        clock.now = 4
+        self.assertEqual(6, deadline.remaining())
+        self.assertEqual(6, deadline.timeout())
+        self.assertEqual(2, deadline.timeout(2))
+        deadline.check()
+        clock.now = 10
+        self.assertTrue(deadline.expired())
+        self.assertEqual(0, deadline.remaining())
+        self.assertRaises(gaffer_deadline.DeadlineExceeded, deadline.check)
+        self.assertRaises(gaffer_deadline.DeadlineExceeded, deadline.timeout,
+                          2)
+
+    def test_as_deadline(self):
+        deadline = gaffer_deadline.Deadline(5)
+        self.assertIs(deadline, gaffer_deadline.as_deadline(deadline))
+        self.assertIsNone(gaffer_deadline.as_deadline(None))
+        self.assertTrue(4 < gaffer_deadline.as_deadline(5).remaining() <= 5)
+
+    def test_with_deadline_option(self):
+        clock = FakeClock()
+        deadline = gaffer_deadline.Deadline(1.5, clock)
+        get_elements = g.GetElements(input=['A'], options={'a': 'b'})
+        chain = g.OperationChain([get_elements, g.Limit(1)])
+
+        option = gaffer_deadline.DEADLINE_OPTION
+        copied = gaffer_deadline.with_deadline_option(chain, deadline)
+        self.assertEqual({'a': 'b', option: '1500'},
+                         copied.operations[0].options)
+        self.assertEqual({option: '1500'}, copied.operations[1].options)
+        self.assertEqual({'a': 'b'}, get_elements.options)
+        self.assertIsNone(chain.operations[1].options)
+
+        json_chain = gaffer_deadline.with_deadline_option(
+            chain.to_json(), deadline, 'timeout')
+        self.assertEqual({'timeout': '1500'},
+                         json_chain['operations'][1]['options'])
+        self.assertNotIn('options', chain.to_json()['operations'][1])
+
+
+class ConnectorDeadlineTest(unittest.TestCase):
+    def test_read_timeout(self):
+        for pooled in (False, True):
+            with GafferStubServer({
+                ('POST', '/graph/operations/execute'): slow_route(1)
+            }) as server:
+                gc = gaffer_connector.GafferConnector(
+                    server.host, pooled=pooled, connect_timeout=5,
+                    read_timeout=0.1)
+                start_time = time.perf_counter()
+                self.assertRaises(OSError, gc.execute_operation,
+                                  g.GetAllElements())
+                self.assertLess(time.perf_counter() - start_time, 0.8)
+                gc.close()
+
+    def test_deadline_is_sent_as_option(self):
+        with GafferStubServer({
+            ('POST', '/graph/operations/execute'): slow_route(0)
+        }) as server:
+            gc = gaffer_connector.GafferConnector(server.host)
+            gc.execute_operation(g.GetAllElements(), deadline=10)
+            gc.execute_operation(g.GetAllElements())
+            bodies = [json.loads(request[2]) for request in server.requests]
+
+        options = bodies[0]['operations'][0]['options']
+        self.assertTrue(9000 < int(options[gaffer_deadline.DEADLINE_OPTION])
+                        <= 10000)
+        self.assertNotIn('options', bodies[1]['operations'][0])
+
+    def test_expired_deadline_sends_nothing(self):
+        with GafferStubServer({
+            ('POST', '/graph/operations/execute'): slow_route(0)
+        }) as server:
+            gc = gaffer_connector.GafferConnector(server.host)
+            self.assertRaises(gaffer_deadline.DeadlineExceeded,
+                              gc.execute_operation, g.GetAllElements(),
+                              deadline=0)
+            self.assertEqual(0, len(server.requests))
+
+    def test_batches_after_deadline_are_cancelled(self):
+        with GafferStubServer({
+            ('POST', '/graph/operations/execute'): slow_route(0.2)
+        }) as server:
+            gc = gaffer_connector.GafferConnector(server.host)
+            start_time = time.perf_counter()
+            self.assertRaises(gaffer_deadline.DeadlineExceeded,
+                              gc.execute_batched,
+                              g.GetElements(input=list(range(10))),
+                              batch_size=1, max_workers=1, deadline=0.3)
+            self.assertLess(time.perf_counter() - start_time, 0.8)
+            self.assertLess(len(server.requests), 4)
+
+    def test_retries_stop_at_deadline(self):
+        policy = gaffer_retry.RetryPolicy(backoff=1, jitter=False)
+        with GafferStubServer({
+            ('POST', '/graph/operations/execute'):
+                lambda body, headers: (503, 'Busy', {})
+        }) as server:
+            gc = gaffer_connector.GafferConnector(server.host,
+                                                  retry_policy=policy)
+            self.assertRaises(gaffer_connector.GafferHttpError,
+                              gc.execute_operation, g.GetAllElements(),
+                              deadline=0.5)
+            self.assertEqual(1, len(server.requests))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import io
+import json
+import unittest
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_compact
+from gafferpy import gaffer_connector
+from gafferpy import gaffer_element_batch
+from test.gaffer_stub_server import GafferStubServer
+
+
+class ElementBatchTest(unittest.TestCase):
+    elements = [
+        g.Entity('junction', 'j1', {'count': {'java.lang.Long': 4}}),
+        g.Edge('road', 'j1', 'j2', True, {'count': {'java.lang.Long': 2},
+                                           'name': 'M4'}),
+        g.Edge('road', 'j2', 'j3', False, matched_vertex='DESTINATION'),
+        g.Entity('junction', 'j3', {}),
+        g.Edge('rail', 'j3', 'j1', True, {'name': 'GWR'},
+               matched_vertex='SOURCE')
+    ]
+
+    def test_elements_round_trip(self):
+        batch = gaffer_element_batch.ElementBatch.from_elements(self.elements)
+        self.assertEqual(5, len(batch))
+        self.assertEqual(['junction', 'road'], batch.group_names[:2])
+        self.assertEqual([e.to_json() for e in self.elements],
+                         [e.to_json() for e in batch.to_elements()])
+        self.assertEqual(self.elements[1].to_json(), batch[1].to_json())
+
+    def test_columns(self):
+        batch = gaffer_element_batch.ElementBatch.from_elements(
+            [e.to_json() for e in self.elements])
+        self.assertEqual(['junction', 'road', 'road', 'junction', 'rail'],
+                         batch.column('group'))
+        self.assertEqual(['j1', 'j1', 'j2', 'j3', 'j3'],
+                         batch.column('source'))
+        self.assertEqual([None, 'j2', 'j3', None, 'j1'],
+                         batch.column('destination'))
+        self.assertEqual([None, True, False, None, True],
+                         batch.column('directed'))
+        self.assertEqual([None, None, 'DESTINATION', None, 'SOURCE'],
+                         batch.column('matched_vertex'))
+        missing = gaffer_element_batch.MISSING
+        self.assertEqual([missing, 'M4', missing, missing, 'GWR'],
+                         batch.column('name'))
+        with self.assertRaises(KeyError):
+            batch.column('unknown')
+
+    def test_selected_properties(self):
+        batch = gaffer_element_batch.ElementBatch.from_elements(
+            map(gaffer_compact.to_compact, self.elements),
+            property_names=['count'])
+        self.assertEqual(['count'], list(batch.properties))
+        self.assertEqual({'count': {'java.lang.Long': 2}},
+                         batch[1].properties)
+        self.assertEqual({}, batch[4].properties)
+
+    def test_only_elements_can_be_added(self):
+        batch = gaffer_element_batch.ElementBatch()
+        with self.assertRaises(TypeError):
+            batch.append(g.EntitySeed('a'))
+        with self.assertRaises(TypeError):
+            batch.append({'class': g.EntitySeed.CLASS, 'vertex': 'a'})
+
+    def test_from_json_stream_and_operation(self):
+        text = json.dumps([e.to_json() for e in self.elements])
+        batch = gaffer_element_batch.ElementBatch.from_json_stream(
+            io.BytesIO(text.encode('utf-8')), chunk_size=16)
+        self.assertEqual(self.elements, batch.to_elements())
+
+        with GafferStubServer({
+            ('POST', '/graph/operations/execute'):
+                lambda body, headers: json.loads(text)
+        }) as server:
+            gc = gaffer_connector.GafferConnector(server.host)
+            batch = gaffer_element_batch.ElementBatch.from_operation(
+                gc, g.GetAllElements())
+        self.assertEqual(self.elements, batch.to_elements())
+
+    def test_to_numpy(self):
+        if gaffer_element_batch.numpy is None:
+            self.skipTest('NumPy is not installed')
+        batch = gaffer_element_batch.ElementBatch.from_elements(self.elements)
+        self.assertEqual([4, 2, 0, 0, 0],
+                         batch.to_numpy('count', missing=0).tolist())
+        self.assertEqual([0, 1, 1, 0, 2], batch.to_numpy('group').tolist())
+        self.assertEqual([False, True, False, False, True],
+                         batch.to_numpy('directed').tolist())
+
+    def test_to_numpy_keeps_map_properties(self):
+        if gaffer_element_batch.numpy is None:
+            self.skipTest('NumPy is not installed')
+        batch = gaffer_element_batch.ElementBatch.from_elements([
+            g.Entity('junction', 'j1', {'counts': {'x': 1}}),
+            g.Entity('junction', 'j2', {'counts': {
+                'java.util.HashMap': {'y': 2}}})
+        ])
+        self.assertEqual([{'x': 1}, {'y': 2}],
+                         batch.to_numpy('counts', dtype=object).tolist())
+
+    def test_select(self):
+        batch = gaffer_element_batch.ElementBatch.from_elements(self.elements)
+        selected = batch.select([4, 1])
+        self.assertEqual([self.elements[4].to_json(),
+                          self.elements[1].to_json()],
+                         [e.to_json() for e in selected])
+        self.assertEqual(5, len(batch))
+
+        if gaffer_element_batch.numpy is not None:
+            mask = batch.to_numpy('group') == 0
+            self.assertEqual([self.elements[0].to_json(),
+                              self.elements[3].to_json()],
+                             [e.to_json() for e in batch.select(mask)])
+
+
+if __name__ == "__main__":
+    unittest.main()
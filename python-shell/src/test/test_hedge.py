@@ -0,0 +1,185 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+import time
+import unittest
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_connector
+from gafferpy import gaffer_hedge
+from gafferpy import gaffer_metrics
+from test.gaffer_stub_server import GafferStubServer
+from test.test_instrumentation import RecordingListener
+
+
+class SlowFirstRequest:
+    """
+    Answers the first request after a delay and the others at once.
+    """
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, body, headers):
+        with self._lock:
+            self.count += 1
+            count = self.count
+        if count == 1:
+            time.sleep(self.delay)
+            return [{'class': g.EntitySeed.CLASS, 'vertex': 'slow'}]
+        return [{'class': g.EntitySeed.CLASS, 'vertex': 'fast'}]
+
+
+class HedgingPolicyTest(unittest.TestCase):
+    def test_slow_request_is_hedged(self):
+        policy = gaffer_hedge.HedgingPolicy(initial_delay=0.05,
+                                            max_hedge_ratio=1)
+        with GafferStubServer({
+            ('POST', '/graph/operations/execute'): SlowFirstRequest(1)
+        }) as server:
+            gc = gaffer_connector.GafferConnector(server.host,
+                                                  hedging_policy=policy)
+            start_time = time.perf_counter()
+            results = gc.execute_operation(g.GetAllElements())
+            duration = time.perf_counter() - start_time
+            policy.close()
+
+        self.assertEqual([g.EntitySeed('fast')], results)
+        self.assertLess(duration, 0.5)
+        metrics = policy.get_metrics()
+        self.assertEqual(1, metrics.get_metric('requests'))
+        self.assertEqual(1, metrics.get_metric('hedges_fired'))
+        self.assertEqual(1, metrics.get_metric('hedges_won'))
+
+    def test_hedged_call_records_the_winning_copy(self):
+        policy = gaffer_hedge.HedgingPolicy(initial_delay=0.05,
+                                            max_hedge_ratio=1)
+        listener = RecordingListener()
+        with GafferStubServer({
+            ('POST', '/graph/operations/execute'): SlowFirstRequest(0.3)
+        }) as server:
+            gc = gaffer_connector.GafferConnector(
+                server.host, pool_size=3, hedging_policy=policy,
+                call_metrics_listeners=[listener])
+            self.assertEqual([g.EntitySeed('fast')],
+                             gc.execute_operation(g.GetAllElements()))
+            time.sleep(0.4)
+            policy.close()
+
+        self.assertEqual(6, policy._max_workers)
+        metrics, = listener.metrics
+        self.assertEqual(
+            1, metrics.get_metric(gaffer_metrics.CallMetrics.REQUESTS))
+        self.assertLess(
+            metrics.get_metric(gaffer_metrics.CallMetrics.DOWNLOAD), 0.3)
+
+    def test_requests_run_on_the_callers_thread_without_a_hedge(self):
+        threads = []
+        release = threading.Event()
+
+        def request():
+            threads.append(threading.current_thread())
+            if len(threads) == 1:
+                release.wait()
+            return 'answer'
+
+        # The only worker is busy with the first request, so the second
+        # runs unhedged rather than queueing for it
+        policy = gaffer_hedge.HedgingPolicy(initial_delay=1,
+                                            max_hedge_ratio=1, max_workers=1)
+        thread = threading.Thread(target=policy.run, args=(request,))
+        thread.start()
+        while not threads:
+            time.sleep(0.001)
+        self.assertEqual('answer', policy.run(request))
+        self.assertIs(threading.current_thread(), threads[1])
+        release.set()
+        thread.join()
+        self.assertIsNot(thread, threads[0])
+        self.assertEqual(0, policy.hedges_fired)
+        policy.close()
+
+        # The budget allows no hedge for the first request
+        policy = gaffer_hedge.HedgingPolicy(max_hedge_ratio=0.5)
+        self.assertEqual('answer', policy.run(request))
+        self.assertIs(threading.current_thread(), threads[2])
+        policy.close()
+
+    def test_hedges_are_limited_by_budget(self):
+        policy = gaffer_hedge.HedgingPolicy(initial_delay=0.01,
+                                            max_hedge_ratio=0.5)
+        with GafferStubServer({
+            ('POST', '/graph/operations/execute'): SlowFirstRequest(0.1)
+        }) as server:
+            gc = gaffer_connector.GafferConnector(server.host,
+                                                  hedging_policy=policy)
+            # The first request can't be hedged as 1 hedge in 1 request
+            # would exceed the budget
+            self.assertEqual([g.EntitySeed('slow')],
+                             gc.execute_operation(g.GetAllElements()))
+            policy.close()
+            self.assertEqual(1, len(server.requests))
+        self.assertEqual(0, policy.hedges_fired)
+
+    def test_writes_are_not_hedged(self):
+        policy = gaffer_hedge.HedgingPolicy(initial_delay=0.01,
+                                            max_hedge_ratio=1)
+        with GafferStubServer({
+            ('POST', '/graph/operations/execute'): SlowFirstRequest(0.1)
+        }) as server:
+            gc = gaffer_connector.GafferConnector(server.host,
+                                                  hedging_policy=policy)
+            gc.execute_operation(g.AddElements(
+                input=[g.Entity('Junction', 'A')]))
+            policy.close()
+            self.assertEqual(1, len(server.requests))
+        self.assertEqual(0, policy.requests)
+
+    def test_failed_copy_waits_for_the_other(self):
+        calls = []
+
+        def request():
+            calls.append(None)
+            if len(calls) == 1:
+                time.sleep(0.05)
+                raise ConnectionError('failed')
+            time.sleep(0.1)
+            return 'answer'
+
+        policy = gaffer_hedge.HedgingPolicy(initial_delay=0.01,
+                                            max_hedge_ratio=1)
+        self.assertEqual('answer', policy.run(request))
+        self.assertEqual(1, policy.hedges_won)
+        policy.close()
+
+    def test_delay_is_latency_percentile(self):
+        policy = gaffer_hedge.HedgingPolicy(percentile=90, initial_delay=1,
+                                            min_delay=0.002, max_delay=0.05,
+                                            min_samples=10)
+        self.assertEqual(1, policy.delay())
+        for i in range(1, 11):
+            policy._latencies.append(i / 1000)
+        self.assertEqual(0.009, policy.delay())
+        policy._latencies.extend([1, 1])
+        self.assertEqual(0.05, policy.delay())
+        policy.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
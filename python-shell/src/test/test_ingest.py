@@ -0,0 +1,133 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import threading
+import unittest
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_connector
+from gafferpy import gaffer_ingest
+from gafferpy import gaffer_metrics
+from gafferpy import gaffer_retry
+from test.gaffer_stub_server import GafferStubServer
+
+
+class RecordingStore:
+    def __init__(self, failures=0):
+        self.elements = []
+        self.failures = failures
+        self._lock = threading.Lock()
+
+    def __call__(self, body, headers):
+        with self._lock:
+            if self.failures > 0:
+                self.failures -= 1
+                return 503, 'Busy', {}
+            operation = json.loads(body)
+            self.elements.extend(operation['input'])
+        return 200, '', {}
+
+
+class RecordingMetricsListener(gaffer_metrics.MetricsListener):
+    def __init__(self):
+        self.metrics = []
+
+    def update(self, metrics):
+        self.metrics.append(metrics)
+
+
+def edges(count):
+    for i in range(count):
+        yield g.Edge('road', str(i), str(i + 1), True, {'count': i})
+
+
+class BulkIngesterTest(unittest.TestCase):
+    def test_ingest_sends_chunks_and_reports_metrics(self):
+        store = RecordingStore()
+        listener = RecordingMetricsListener()
+        with GafferStubServer({
+            ('POST', '/graph/operations/execute'): store
+        }) as server:
+            gc = gaffer_connector.GafferConnector(server.host, pooled=True)
+            ingester = gaffer_ingest.BulkIngester(
+                gc, chunk_size=10, max_in_flight=3, validate=True,
+                metrics_listener=listener)
+            self.assertEqual(95, ingester.ingest(edges(95)))
+            gc.close()
+
+            self.assertEqual(10, len(server.requests))
+            first = json.loads(server.requests[0][2])
+            self.assertEqual(g.AddElements.CLASS, first['class'])
+            self.assertTrue(first['validate'])
+
+        self.assertEqual(
+            sorted([e.to_json() for e in edges(95)],
+                   key=lambda e: int(e['source'])),
+            sorted(store.elements, key=lambda e: int(e['source'])))
+        self.assertEqual(10, len(listener.metrics))
+        self.assertEqual(
+            ['elements_per_second_batch', 'elements_per_second_overall'],
+            listener.metrics[0].get_metric_names())
+
+    def test_failed_chunks_are_retried(self):
+        store = RecordingStore(failures=2)
+        with GafferStubServer({
+            ('POST', '/graph/operations/execute'): store
+        }) as server:
+            gc = gaffer_connector.GafferConnector(server.host)
+            ingester = gaffer_ingest.BulkIngester(
+                gc, chunk_size=50, max_in_flight=1, backoff=0.01)
+            self.assertEqual(100, ingester.ingest(edges(100)))
+
+            self.assertEqual(4, len(server.requests))
+        self.assertEqual(100, len(store.elements))
+
+    def test_chunk_failing_after_retries_raises(self):
+        store = RecordingStore(failures=10)
+        with GafferStubServer({
+            ('POST', '/graph/operations/execute'): store
+        }) as server:
+            gc = gaffer_connector.GafferConnector(server.host)
+            ingester = gaffer_ingest.BulkIngester(
+                gc, chunk_size=50, max_in_flight=1, max_retries=2,
+                backoff=0.01)
+            with self.assertRaises(ConnectionError):
+                ingester.ingest(edges(100))
+
+            self.assertEqual(3, len(server.requests))
+
+    def test_connector_retry_policy_is_not_multiplied(self):
+        store = RecordingStore(failures=10)
+        with GafferStubServer({
+            ('POST', '/graph/operations/execute'): store
+        }) as server:
+            policy = gaffer_retry.RetryPolicy(max_retries=2, backoff=0.01,
+                                              retry_writes=True)
+            gc = gaffer_connector.GafferConnector(server.host,
+                                                  retry_policy=policy)
+            self.assertRaises(ValueError, gaffer_ingest.BulkIngester, gc,
+                              retry_policy=gaffer_retry.RetryPolicy())
+            ingester = gaffer_ingest.BulkIngester(
+                gc, chunk_size=50, max_in_flight=1, max_retries=5)
+            with self.assertRaises(ConnectionError):
+                ingester.ingest(edges(100))
+
+            self.assertEqual(3, len(server.requests))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import logging
+import time
+import unittest
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_connector
+from gafferpy import gaffer_instrumentation
+from gafferpy import gaffer_metrics
+from test.gaffer_stub_server import GafferStubServer
+
+CallMetrics = gaffer_metrics.CallMetrics
+
+ELEMENTS = [{'class': g.Entity.CLASS, 'group': 'Junction',
+             'vertex': str(vertex)} for vertex in range(100)]
+
+
+def slow_elements(body, headers):
+    time.sleep(0.05)
+    return ELEMENTS
+
+
+ROUTES = {
+    ('POST', '/graph/operations/execute'): slow_elements,
+    ('GET', '/graph/config/schema'): lambda body, headers: {'edges': {}},
+    ('GET', '/graph/operations/missing'):
+        lambda body, headers: (500, 'Broken', {})
+}
+
+
+class RecordingListener(gaffer_metrics.MetricsListener):
+    def __init__(self):
+        self.metrics = []
+
+    def update(self, metrics):
+        self.metrics.append(metrics)
+
+
+class InstrumentationTest(unittest.TestCase):
+    def assert_call_metrics(self, metrics, request_bytes):
+        self.assertEqual('/graph/operations/execute',
+                         metrics.get_metric(CallMetrics.PATH))
+        self.assertFalse(metrics.get_metric(CallMetrics.FAILED))
+        self.assertEqual(1, metrics.get_metric(CallMetrics.REQUESTS))
+        self.assertEqual(request_bytes,
+                         metrics.get_metric(CallMetrics.REQUEST_BYTES))
+        self.assertGreater(metrics.get_metric(CallMetrics.RESPONSE_BYTES),
+                           3000)
+        self.assertGreaterEqual(
+            metrics.get_metric(CallMetrics.TIME_TO_FIRST_BYTE), 0.04)
+        for phase in (CallMetrics.TO_JSON, CallMetrics.JSON_DUMPS,
+                      CallMetrics.CONNECT, CallMetrics.DOWNLOAD,
+                      CallMetrics.JSON_LOADS, CallMetrics.FROM_JSON):
+            self.assertGreater(metrics.get_metric(phase), 0, phase)
+        self.assertEqual(0, metrics.get_metric(CallMetrics.TLS))
+        self.assertGreaterEqual(
+            metrics.get_metric(CallMetrics.TOTAL),
+            sum(metrics.get_metric(phase) for phase in CallMetrics.PHASES))
+
+    def test_execute_records_phases(self):
+        for pooled in (False, True):
+            listener = RecordingListener()
+            with GafferStubServer(ROUTES) as server:
+                gc = gaffer_connector.GafferConnector(
+                    server.host, pooled=pooled,
+                    call_metrics_listeners=[listener])
+                results = gc.execute_operation(
+                    g.GetElements(input=['1', '2']))
+                gc.close()
+                request_bytes = len(server.requests[0][2])
+
+            self.assertEqual(100, len(results))
+            self.assertEqual(1, len(listener.metrics))
+            self.assert_call_metrics(listener.metrics[0], request_bytes)
+
+    def test_stream_records_phases_when_closed(self):
+        listener = RecordingListener()
+        with GafferStubServer(ROUTES) as server:
+            gc = gaffer_connector.GafferConnector(
+                server.host, call_metrics_listeners=[listener])
+            results = gc.stream_operation(g.GetElements(input=['1', '2']),
+                                          chunk_size=512)
+            self.assertEqual([], listener.metrics)
+            self.assertEqual(100, len(list(results)))
+            request_bytes = len(server.requests[0][2])
+
+        self.assertEqual(1, len(listener.metrics))
+        self.assert_call_metrics(listener.metrics[0], request_bytes)
+
+    def test_get_and_failed_calls(self):
+        listener = RecordingListener()
+        with GafferStubServer(ROUTES) as server:
+            gc = gaffer_connector.GafferConnector(
+                server.host, call_metrics_listeners=[listener])
+            gc.execute_get(g.GetSchema())
+            self.assertRaises(ConnectionError, gc._get,
+                              '/graph/operations/missing', {})
+
+        ok, failed = listener.metrics
+        self.assertEqual('/graph/config/schema',
+                         ok.get_metric(CallMetrics.PATH))
+        self.assertFalse(ok.get_metric(CallMetrics.FAILED))
+        self.assertEqual(0, ok.get_metric(CallMetrics.REQUEST_BYTES))
+        self.assertEqual(len('{"edges": {}}'),
+                         ok.get_metric(CallMetrics.RESPONSE_BYTES))
+        self.assertTrue(failed.get_metric(CallMetrics.FAILED))
+        self.assertEqual(1, failed.get_metric(CallMetrics.REQUESTS))
+
+    def test_no_listeners(self):
+        with GafferStubServer(ROUTES) as server:
+            gc = gaffer_connector.GafferConnector(server.host)
+            self.assertIsNone(gc._recorder('/graph/operations/execute'))
+            self.assertEqual(100, len(gc.execute_operation(
+                g.GetElements(input=['1']))))
+
+    def test_recorder_loads(self):
+        recorder = gaffer_instrumentation.CallRecorder('/path')
+        result = recorder.loads('[{"a": 1}, {"b": 2}]', lambda obj: 'x')
+        self.assertEqual(['x', 'x'], result)
+        metrics = recorder.metrics()
+        self.assertGreater(metrics.get_metric(CallMetrics.FROM_JSON), 0)
+        self.assertGreater(metrics.get_metric(CallMetrics.JSON_LOADS), 0)
+        self.assertEqual(0, metrics.get_metric(CallMetrics.REQUESTS))
+
+
+class HistogramTest(unittest.TestCase):
+    def test_percentiles(self):
+        histogram = gaffer_metrics.Histogram(growth=1.01)
+        self.assertIsNone(histogram.percentile(50))
+        for value in range(1, 1001):
+            histogram.record(value / 1000)
+        histogram.record(0)
+
+        self.assertEqual(1001, histogram.count)
+        self.assertEqual(0, histogram.min)
+        self.assertEqual(1, histogram.max)
+        self.assertAlmostEqual(0.5, histogram.percentile(50), delta=0.01)
+        self.assertAlmostEqual(0.99, histogram.percentile(99), delta=0.01)
+        self.assertEqual(1, histogram.percentile(100))
+        self.assertEqual((0, 1), histogram.buckets()[0])
+        self.assertAlmostEqual(500.5 / 1001, histogram.mean())
+        self.assertRaises(ValueError, gaffer_metrics.Histogram, 1)
+
+    def test_histogram_listener(self):
+        listener = gaffer_metrics.HistogramMetricsListener()
+        for seconds in (0.1, 0.2, 0.3):
+            listener.update(self.call_metrics(seconds))
+
+        self.assertEqual(['total'], listener.get_metric_names())
+        self.assertEqual(3, listener.get_histogram('total').count)
+        self.assertIsNone(listener.get_histogram('path'))
+        self.assertIsNone(listener.get_histogram('failed'))
+        self.assertIn('total: count: 3', str(listener))
+
+    @staticmethod
+    def call_metrics(seconds):
+        metrics = gaffer_metrics.CallMetrics()
+        metrics.put_metric(CallMetrics.PATH, '/p')
+        metrics.put_metric(CallMetrics.TOTAL, seconds)
+        metrics.put_metric(CallMetrics.FAILED, False)
+        return metrics
+
+    def test_logging_listener(self):
+        listener = gaffer_metrics.LoggingMetricsListener(
+            logging.getLogger('gafferpy.test'))
+        with self.assertLogs('gafferpy.test', logging.INFO) as logs:
+            listener.update(self.call_metrics(0.5))
+        self.assertIn('total: 0.5', logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
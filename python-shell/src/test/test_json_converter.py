@@ -0,0 +1,62 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import unittest
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_connector
+from test.test_gaffer_operations import GafferOperationsTest
+
+
+class JsonConverterTest(unittest.TestCase):
+    def test_to_snake_case(self):
+        for name, expected in [('matchedVertex', 'matched_vertex'),
+                               ('class', 'class'),
+                               ('directedType', 'directed_type'),
+                               ('includeIncomingOutGoing',
+                                'include_incoming_out_going'),
+                               ('HTTPResponseCode', 'http_response_code'),
+                               ('input2', 'input2')]:
+            self.assertEqual(expected, g.JsonConverter.to_snake_case(name))
+            self.assertEqual(expected, g.JsonConverter.to_snake_case(name))
+
+    def test_replaced_converters_are_used(self):
+        edge_json = g.Edge('road', 'a', 'b', True).to_json()
+        self.assertIsInstance(g.JsonConverter.from_json(edge_json), g.Edge)
+
+        original = g.JsonConverter.GENERIC_JSON_CONVERTERS[g.Edge.CLASS]
+        g.JsonConverter.GENERIC_JSON_CONVERTERS[g.Edge.CLASS] = \
+            lambda obj: ('edge', obj['source'], obj['matched_vertex'])
+        try:
+            edge_json['matchedVertex'] = 'SOURCE'
+            self.assertEqual(('edge', 'a', 'SOURCE'),
+                             g.JsonConverter.from_json(edge_json))
+        finally:
+            g.JsonConverter.GENERIC_JSON_CONVERTERS[g.Edge.CLASS] = original
+        self.assertIsInstance(g.JsonConverter.from_json(edge_json), g.Edge)
+
+    def test_result_from_json_matches_from_json(self):
+        for example in GafferOperationsTest.examples:
+            self.assertEqual(
+                g.JsonConverter.from_json(json.loads(example[0])).to_json(),
+                gaffer_connector.result_from_json(example[0]).to_json())
+        self.assertEqual('text', gaffer_connector.result_from_json('"text"'))
+        self.assertEqual(None, gaffer_connector.result_from_json(''))
+
+
+if __name__ == "__main__":
+    unittest.main()
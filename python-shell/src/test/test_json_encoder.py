@@ -0,0 +1,115 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import unittest
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_json_encoder
+from test.test_gaffer_operations import GafferOperationsTest
+
+
+class GafferJsonEncoderTest(unittest.TestCase):
+    elements = [
+        g.Entity('entity', 'vertex'),
+        g.Entity('entity', 6, {'count': g.long(1), 'name': 'café ☃'}),
+        g.Entity('entity', g.type_value('t', 'v'), {}),
+        g.Edge('edge', 'a', 'b', True),
+        g.Edge('edge "quoted"', 1, 2.5, False, {'count': 1}),
+        g.Edge('edge', 'a', 'b', True, {'map': g.freq_map({'x': 1})},
+               matched_vertex='DESTINATION'),
+    ]
+
+    seeds = [
+        g.EntitySeed('vertex'),
+        g.EntitySeed(7),
+        g.EntitySeed({'java.lang.Long': 7}),
+        g.EdgeSeed('a', 'b', True),
+        g.EdgeSeed('a', 'b', g.DirectedType.EITHER, matched_vertex='SOURCE'),
+        'raw vertex',
+        12
+    ]
+
+    def assert_identical(self, obj):
+        self.assertEqual(json.dumps(obj.to_json()),
+                         gaffer_json_encoder.encode(obj))
+        self.assertEqual(json.dumps(obj.to_json(), separators=(',', ':')),
+                         gaffer_json_encoder.encode(obj, compact=True))
+
+    def test_elements_and_seeds_are_identical_to_to_json(self):
+        for element in self.elements:
+            self.assert_identical(element)
+        for seed in self.seeds:
+            if isinstance(seed, g.ElementSeed):
+                self.assert_identical(seed)
+
+    def test_operations_are_identical_to_to_json(self):
+        operations = [
+            g.AddElements(input=self.elements, validate=True,
+                          skip_invalid_elements=False,
+                          options={'key': 'value'}),
+            g.GetElements(input=self.seeds,
+                          view=g.View(edges=[g.ElementDefinition('edge')]),
+                          directed_type=g.DirectedType.DIRECTED,
+                          include_incoming_out_going=g.InOutType.OUT,
+                          seed_matching=g.SeedMatchingType.EQUAL),
+            g.GetElements(input='single'),
+            g.GetAdjacentIds(input=[g.EntitySeed(1), 2]),
+            g.GetElementsWithinSet(input=self.seeds),
+            g.GetElementsBetweenSets(input=['a'], input_b=['b', 'c']),
+            g.GetAllElements(),
+            g.OperationChain([
+                g.GetElements(input=self.seeds),
+                g.Limit(3),
+                g.OperationChain([g.AddElements(input=self.elements)])
+            ]),
+            g.OperationChainDAO([g.GetAdjacentIds(input=['x'])])
+        ]
+        for operation in operations:
+            self.assert_identical(operation)
+
+    def test_repo_operation_examples_are_identical_to_to_json(self):
+        for example in GafferOperationsTest.examples:
+            self.assert_identical(example[1])
+
+    def test_generator_input_is_written_lazily(self):
+        def edges():
+            for i in range(2500):
+                yield g.Edge('edge', i, i + 1, True)
+
+        pieces = list(gaffer_json_encoder.iter_encode(
+            g.AddElements(input=edges())))
+
+        self.assertTrue(len(pieces) > 3)
+        self.assertEqual(
+            json.dumps(g.AddElements(input=list(edges())).to_json()),
+            ''.join(pieces))
+
+    def test_dictionaries_and_lists_are_encoded(self):
+        self.assertEqual(json.dumps({'class': 'x'}),
+                         gaffer_json_encoder.encode({'class': 'x'}))
+        self.assertEqual(
+            json.dumps([e.to_json() for e in self.elements]),
+            gaffer_json_encoder.encode(self.elements))
+
+    def test_operation_is_not_modified(self):
+        operation = g.GetElements(input=['a'])
+        gaffer_json_encoder.encode(g.OperationChain([operation]))
+        self.assertEqual(['a'], operation.input)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import io
+import json
+import unittest
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_connector
+from gafferpy import gaffer_json_stream
+from test.gaffer_stub_server import GafferStubServer
+
+
+class GafferJsonStreamTest(unittest.TestCase):
+    values = [
+        {'class': 'uk.gov.gchq.gaffer.data.element.Entity',
+         'group': 'a,]}', 'vertex': 'quote " and \\ backslash [{',
+         'properties': {'count': {'java.lang.Long': 3}}},
+        'café ☃',
+        12345,
+        -1.5e3,
+        True,
+        None,
+        [1, [2, {'x': []}]],
+        {}
+    ]
+
+    def test_iter_json_array_decodes_every_item_for_any_chunk_size(self):
+        text = json.dumps(self.values, indent=2, ensure_ascii=False)
+        for chunk_size in [1, 2, 3, 7, 64, 100000]:
+            items = list(gaffer_json_stream.iter_json_array(
+                io.BytesIO(text.encode('utf-8')), chunk_size=chunk_size))
+            self.assertEqual(self.values, items, 'chunk size ' +
+                             str(chunk_size))
+
+    def test_iter_json_array_handles_empty_and_non_array_results(self):
+        self.assertEqual([], list(gaffer_json_stream.iter_json_array(
+            io.BytesIO(b''))))
+        self.assertEqual([], list(gaffer_json_stream.iter_json_array(
+            io.BytesIO(b' [ ] '))))
+        self.assertEqual([42], list(gaffer_json_stream.iter_json_array(
+            io.BytesIO(b'42'), chunk_size=1)))
+        self.assertEqual([{'a': 1}], list(gaffer_json_stream.iter_json_array(
+            io.BytesIO(b'{"a": 1}'), chunk_size=2)))
+
+    def test_iter_json_array_rejects_truncated_arrays(self):
+        with self.assertRaises(ValueError):
+            list(gaffer_json_stream.iter_json_array(
+                io.BytesIO(b'[{"a": 1}, {"b"'), chunk_size=4))
+
+    def test_iter_json_array_yields_items_before_reading_everything(self):
+        body = io.BytesIO(json.dumps(
+            [g.Entity('count', i).to_json() for i in range(1000)]).encode())
+        items = gaffer_json_stream.iter_json_array(
+            body, object_hook=g.JsonConverter.object_decoder, chunk_size=256)
+
+        self.assertEqual(g.Entity('count', 0), next(items))
+        self.assertTrue(body.tell() <= 512)
+        self.assertEqual(999, len(list(items)))
+
+    def test_connector_streams_elements(self):
+        edges = [g.Edge('road', str(i), str(i + 1), True, {'count': i})
+                 for i in range(50)]
+        routes = {('POST', '/graph/operations/execute'):
+                      lambda body, headers: [e.to_json() for e in edges]}
+
+        with GafferStubServer(routes) as server:
+            gc = gaffer_connector.GafferConnector(server.host, pooled=True)
+            results = gc.stream_operation(g.GetAllElements(), chunk_size=100)
+            self.assertEqual(edges, list(results))
+
+            # The connection is returned to the pool and reused
+            results = gc.stream_operation(g.GetAllElements())
+            self.assertEqual(edges[0], next(results))
+            results.close()
+            self.assertEqual(edges, list(gc.stream_operation(
+                g.GetAllElements())))
+            gc.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
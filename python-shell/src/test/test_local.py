@@ -0,0 +1,267 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import unittest
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_local
+
+SUM = g.BinaryOperator('uk.gov.gchq.koryphe.impl.binaryoperator.Sum')
+MAX = g.BinaryOperator('uk.gov.gchq.koryphe.impl.binaryoperator.Max')
+
+
+def edge(source, destination, count, group='RoadUse', **properties):
+    properties['count'] = {'java.lang.Long': count}
+    return g.Edge(group=group, source=source, destination=destination,
+                  directed=True, properties=properties,
+                  matched_vertex='SOURCE')
+
+
+def entity(vertex, count, group='Cardinality'):
+    return g.Entity(group=group, vertex=vertex,
+                    properties={'count': count})
+
+
+def counts(elements):
+    return [gaffer_local.unwrap(element.properties['count'])
+            for element in elements]
+
+
+class GafferLocalTest(unittest.TestCase):
+    elements = [
+        edge('M1', 'J1', 5, speed=70),
+        edge('M1', 'J2', 20, speed=50),
+        edge('M1', 'J1', 10, speed=60),
+        edge('M4', 'J3', 1, group='RoadHasJunction'),
+        entity('M1', 3)
+    ]
+
+    def test_predicates(self):
+        cases = [
+            (g.IsMoreThan(5), [6], True),
+            (g.IsMoreThan(5), [5], False),
+            (g.IsMoreThan(5, or_equal_to=True), [5], True),
+            (g.IsLessThan({'java.lang.Long': 5}), [4], True),
+            (g.IsLessThan(5), [None], False),
+            (g.IsEqual('a'), ['a'], True),
+            (g.IsIn(['a', 'b']), ['c'], False),
+            (g.IsIn(['a', 'b']), [{'a': 1}], False),
+            (g.IsIn([{'a': 1}]), [{'a': 1}], True),
+            (g.InRange(start=1, end=5), [1], True),
+            (g.InRange(start=1, end=5), [5], False),
+            (g.Regex('M[0-9]+'), ['M32'], True),
+            (g.Regex('M[0-9]+'), ['xM32'], False),
+            (g.StringContains('ab', ignore_case=True), ['xABy'], True),
+            (g.IsLongerThan(2), ['abc'], True),
+            (g.Exists(), [None], False),
+            (g.Not(g.IsTrue()), [False], True),
+            (g.And(predicates=[g.IsMoreThan(1), g.IsLessThan(3)]), [2],
+             True),
+            (g.Or(predicates=[g.IsMoreThan(5), g.IsLessThan(3)]), [4],
+             False),
+            (g.AreEqual(), [1, 1], True),
+            (g.IsXLessThanY(), [1, 2], True),
+            (g.NestedPredicate(selection=[1], predicate=g.IsTrue()),
+             [False, True], True),
+            (g.MapContains('a'), [{'a': 1}], True),
+            (g.InDateRange(start='2019/01/01', end='2019/01/02'),
+             [1546300800000], True),
+            (g.InDateRange(start='2019/01/01', end='2019/01/02'),
+             [1546387200000], False)
+        ]
+        for predicate, inputs, expected in cases:
+            self.assertEqual(
+                expected, gaffer_local.compile_predicate(predicate)(*inputs),
+                predicate.to_json())
+
+    def test_time_range_bounds_are_parsed_once(self):
+        parse_time = gaffer_local._parse_time
+        now_millis = gaffer_local._now_millis
+        parsed = []
+        now = [1546300800000]
+
+        def counting_parse_time(*args):
+            parsed.append(args)
+            return parse_time(*args)
+        gaffer_local._parse_time = counting_parse_time
+        gaffer_local._now_millis = lambda: now[0]
+        try:
+            predicate = gaffer_local.compile_predicate(
+                g.InDateRange(start='2019/01/01', end='2019/01/02'))
+            for millis in range(1546300800000, 1546300800100):
+                self.assertTrue(predicate(millis))
+            self.assertEqual(2, len(parsed))
+
+            predicate = gaffer_local.compile_predicate(
+                g.InTimeRange(start_offset=1, offset_unit='HOUR'))
+            self.assertTrue(predicate(now[0] - 1000))
+            now[0] += 2 * 60 * 60 * 1000
+            self.assertFalse(predicate(now[0] - 2 * 60 * 60 * 1000 + 1000))
+        finally:
+            gaffer_local._parse_time = parse_time
+            gaffer_local._now_millis = now_millis
+
+    def test_unknown_class_raises_error(self):
+        predicate = g.Predicate(class_name='example.Unknown')
+        self.assertRaises(ValueError, gaffer_local.compile_predicate,
+                          predicate)
+        self.assertRaises(ValueError, gaffer_local.stream,
+                          g.GetAllElements(), [])
+
+    def test_filter(self):
+        operation = g.Filter(
+            edges=[g.ElementFilterDefinition(
+                group='RoadUse',
+                predicates=[g.PredicateContext(
+                    selection=['count'], predicate=g.IsMoreThan(5))])],
+            global_elements=g.GlobalElementFilterDefinition(
+                predicates=[g.PredicateContext(
+                    selection=['SOURCE'], predicate=g.IsEqual('M1'))]))
+
+        results = gaffer_local.execute(operation, self.elements)
+
+        # Edges of unlisted groups are dropped, entities are kept but fail
+        # the global source filter
+        self.assertEqual([20, 10], counts(results))
+
+    def test_transform_copies_elements(self):
+        operation = g.Transform(
+            edges=[g.ElementTransformDefinition(
+                group='RoadUse',
+                functions=[g.FunctionContext(
+                    selection=['SOURCE', 'DESTINATION'],
+                    function=g.Concat(separator='-'),
+                    projection=['route'])])])
+
+        results = gaffer_local.execute(operation, self.elements)
+
+        self.assertEqual('M1-J1', results[0].properties['route'])
+        self.assertEqual(1, results[3].properties['count']['java.lang.Long'])
+        self.assertNotIn('route', self.elements[0].properties)
+        self.assertIs(self.elements[4], results[4])
+
+    def test_aggregate(self):
+        operation = g.Aggregate(
+            edges=[g.AggregatePair(
+                group='RoadUse',
+                element_aggregator=g.ElementAggregateDefinition(
+                    operators=[
+                        g.BinaryOperatorContext(selection=['count'],
+                                                binary_operator=SUM),
+                        {'selection': ['speed'],
+                         'binaryOperator': MAX.to_json()}]))])
+
+        for max_entries in (None, 1):
+            gaffer_local.AGGREGATE_MAX_ENTRIES = max_entries
+            try:
+                results = gaffer_local.execute(operation, self.elements)
+            finally:
+                gaffer_local.AGGREGATE_MAX_ENTRIES = None
+
+            self.assertEqual(4, len(results))
+            road_use = sorted(
+                (element.properties for element in results
+                 if element.group == 'RoadUse'),
+                key=lambda properties: properties['speed'], reverse=True)
+            self.assertEqual(
+                [{'count': {'java.lang.Long': 15}, 'speed': 70},
+                 {'count': {'java.lang.Long': 20}, 'speed': 50}], road_use)
+            self.assertEqual({'java.lang.Long': 5},
+                             self.elements[0].properties['count'])
+
+    def test_sort_max_min_and_limit(self):
+        comparator = g.ElementPropertyComparator(groups=['RoadUse'],
+                                                 property='count')
+        self.assertEqual(
+            [5, 10, 20, 1, 3],
+            counts(gaffer_local.execute(
+                g.Sort(comparators=[comparator]), self.elements)))
+        self.assertEqual(
+            [5, 10],
+            counts(gaffer_local.execute(
+                g.Sort(comparators=[comparator], result_limit=2),
+                self.elements)))
+        self.assertEqual(
+            [5, 5, 10],
+            counts(gaffer_local.execute(
+                g.Sort(comparators=[comparator], deduplicate=False),
+                self.elements[:1] * 2 + self.elements[2:3])))
+        self.assertEqual(
+            [5, 10],
+            counts(gaffer_local.execute(
+                g.Sort(comparators=[comparator]),
+                self.elements[:1] * 2 + self.elements[2:3])))
+
+        reversed_comparator = g.ElementPropertyComparator(
+            groups=['RoadUse'], property='count', reversed=True)
+        self.assertEqual(
+            [20, 10],
+            counts(gaffer_local.execute(
+                g.OperationChain([g.Sort(comparators=[reversed_comparator]),
+                                  g.Limit(2)]),
+                self.elements)))
+
+        self.assertEqual(20, counts([gaffer_local.execute(
+            g.Max(comparators=[comparator]), self.elements)])[0])
+        self.assertEqual(5, counts([gaffer_local.execute(
+            g.Min(comparators=[comparator]), self.elements)])[0])
+        self.assertEqual(20, counts([gaffer_local.execute(
+            g.Max(comparators=[comparator.to_json()]), self.elements)])[0])
+        self.assertIsNone(gaffer_local.execute(
+            g.Max(comparators=[comparator]), []))
+
+        self.assertRaises(ValueError, gaffer_local.execute,
+                          g.Limit(2, truncate=False), self.elements)
+
+    def test_to_vertices_and_to_set(self):
+        chain = g.OperationChain([
+            g.ToVertices(edge_vertices=g.EdgeVertices.DESTINATION),
+            g.ToSet()
+        ])
+        self.assertEqual(['J1', 'J2', 'J3', 'M1'],
+                         gaffer_local.execute(chain, self.elements))
+
+        chain = g.OperationChain([
+            g.ToVertices(use_matched_vertex=g.UseMatchedVertex.OPPOSITE),
+            g.ToSet(),
+            g.ToEntitySeeds()
+        ])
+        self.assertEqual(
+            [g.EntitySeed('J1').to_json(), g.EntitySeed('J2').to_json(),
+             g.EntitySeed('J3').to_json(), g.EntitySeed('M1').to_json()],
+            [seed.to_json() for seed in
+             gaffer_local.execute(chain, self.elements)])
+
+    def test_stream_is_lazy(self):
+        def elements():
+            yield edge('M1', 'J1', 1)
+            yield edge('M1', 'J2', 2)
+            raise AssertionError('Read past the limit')
+
+        results = gaffer_local.stream(g.Limit(2), elements())
+
+        self.assertEqual([1, 2], counts(results))
+
+    def test_uses_operation_input(self):
+        comparator = g.ElementPropertyComparator(groups=['RoadUse'],
+                                                 property='count')
+        operation = g.Max(comparators=[comparator], input=self.elements)
+
+        self.assertEqual([20], counts([gaffer_local.execute(operation)]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_connector
+from gafferpy import gaffer_micro_batch
+from test.gaffer_stub_server import GafferStubServer
+
+
+def get_elements(body, headers):
+    results = []
+    for seed in json.loads(body)['operations'][0]['input']:
+        vertex = seed['vertex']
+        results.append({'class': g.Entity.CLASS, 'group': 'Cardinality',
+                        'vertex': vertex})
+        results.append({'class': g.Edge.CLASS, 'group': 'RoadUse',
+                        'source': vertex, 'destination': 'M1',
+                        'directed': True, 'matchedVertex': 'SOURCE'})
+    return results
+
+
+ROUTES = {('POST', '/graph/operations/execute'): get_elements}
+
+
+class MicroBatcherTest(unittest.TestCase):
+    def test_concurrent_lookups_are_batched(self):
+        with GafferStubServer(ROUTES) as server:
+            gc = gaffer_connector.GafferConnector(server.host)
+            with gaffer_micro_batch.MicroBatcher(gc, max_delay=0.2) as batcher:
+                with ThreadPoolExecutor(20) as executor:
+                    results = list(executor.map(
+                        lambda i: batcher.get_elements(g.EntitySeed(i % 10)),
+                        range(20)))
+
+            self.assertEqual(1, server.request_count())
+            self.assertEqual(10, len(json.loads(
+                server.requests[0][2])['operations'][0]['input']))
+            self.assertEqual(20, batcher.calls)
+            self.assertEqual(1, batcher.batches)
+            for i, elements in enumerate(results):
+                self.assertEqual(
+                    [g.Entity('Cardinality', i % 10),
+                     g.Edge('RoadUse', i % 10, 'M1', True, None, 'SOURCE')],
+                    elements)
+
+    def test_full_batches_are_sent_immediately(self):
+        with GafferStubServer(ROUTES) as server:
+            gc = gaffer_connector.GafferConnector(server.host)
+            batcher = gaffer_micro_batch.MicroBatcher(gc, max_delay=10,
+                                                      max_batch_size=10)
+            futures = [batcher.submit(vertex) for vertex in range(25)]
+            for future in futures[:20]:
+                future.result(5)
+            self.assertEqual(2, server.request_count())
+            batcher.close()
+            self.assertEqual(3, server.request_count())
+            self.assertEqual([g.Entity('Cardinality', 24),
+                              g.Edge('RoadUse', 24, 'M1', True, None,
+                                     'SOURCE')], futures[24].result())
+
+    def test_different_views_are_not_batched_together(self):
+        with GafferStubServer(ROUTES) as server:
+            gc = gaffer_connector.GafferConnector(server.host)
+            with gaffer_micro_batch.MicroBatcher(gc, max_delay=10) as batcher:
+                batcher.submit('M5')
+                batcher.submit('M4', view=g.View(
+                    entities=[g.ElementDefinition('Cardinality')]))
+                batcher.flush()
+            self.assertEqual(2, server.request_count())
+
+    def test_errors_are_passed_to_every_lookup(self):
+        routes = {('POST', '/graph/operations/execute'):
+                  lambda body, headers: (500, 'Failed', {})}
+        with GafferStubServer(routes) as server:
+            gc = gaffer_connector.GafferConnector(server.host)
+            with gaffer_micro_batch.MicroBatcher(gc) as batcher:
+                futures = [batcher.submit('M5'), batcher.submit('M4')]
+            for future in futures:
+                self.assertRaises(ConnectionError, future.result)
+
+    def test_unreadable_results_fail_every_lookup(self):
+        class Connector:
+            def execute_operation(self, operation, headers):
+                return 5
+
+        with gaffer_micro_batch.MicroBatcher(Connector()) as batcher:
+            futures = [batcher.submit('M5'), batcher.submit('M4')]
+        for future in futures:
+            self.assertRaises(TypeError, future.result, 5)
+
+    def test_edge_seeds_are_rejected(self):
+        with gaffer_micro_batch.MicroBatcher(None) as batcher:
+            self.assertRaises(TypeError, batcher.submit,
+                              g.EdgeSeed('M4', 'M5', True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import email.utils
+import time
+import unittest
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_connector
+from gafferpy import gaffer_retry
+from test.gaffer_stub_server import GafferStubServer
+
+
+class FailingRoute:
+    def __init__(self, failures, status=503, headers=None):
+        self.failures = failures
+        self.status = status
+        self.headers = headers or {}
+
+    def __call__(self, body, headers):
+        if self.failures > 0:
+            self.failures -= 1
+            return self.status, 'Busy', self.headers
+        return []
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def retry_policy(**kwargs):
+    policy = gaffer_retry.RetryPolicy(jitter=False, **kwargs)
+    policy.delays = []
+    policy._sleep = policy.delays.append
+    return policy
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def test_transient_errors_are_retried(self):
+        policy = retry_policy(backoff=1, max_backoff=3)
+        with GafferStubServer({
+            ('POST', '/graph/operations/execute'): FailingRoute(3)
+        }) as server:
+            gc = gaffer_connector.GafferConnector(server.host,
+                                                  retry_policy=policy)
+            self.assertEqual([], gc.execute_operation(g.GetAllElements()))
+            self.assertEqual(4, len(server.requests))
+        self.assertEqual([1, 2, 3], policy.delays)
+        self.assertEqual(3, policy.get_metrics().get_metric('retries'))
+
+    def test_retry_after_is_honoured(self):
+        policy = retry_policy(backoff=1)
+        with GafferStubServer({
+            ('GET', '/graph/config/schema'):
+                FailingRoute(1, 429, {'Retry-After': '7'})
+        }) as server:
+            gc = gaffer_connector.GafferConnector(server.host,
+                                                  retry_policy=policy)
+            gc.execute_get(g.GetSchema())
+        self.assertEqual([7], policy.delays)
+
+    def test_writes_are_only_retried_if_allowed(self):
+        for retry_writes, expected_requests in [(False, 1), (True, 2)]:
+            policy = retry_policy(retry_writes=retry_writes)
+            with GafferStubServer({
+                ('POST', '/graph/operations/execute'): FailingRoute(1)
+            }) as server:
+                gc = gaffer_connector.GafferConnector(server.host,
+                                                      retry_policy=policy)
+                operation = g.AddElements(input=[g.Entity('Junction', 'A')])
+                if retry_writes:
+                    gc.execute_operation(operation)
+                else:
+                    self.assertRaises(gaffer_connector.GafferHttpError,
+                                      gc.execute_operation, operation)
+                self.assertEqual(expected_requests, len(server.requests))
+
+    def test_other_errors_are_not_retried(self):
+        policy = retry_policy()
+        with GafferStubServer({
+            ('POST', '/graph/operations/execute'): FailingRoute(1, 500)
+        }) as server:
+            gc = gaffer_connector.GafferConnector(server.host,
+                                                  retry_policy=policy)
+            with self.assertRaises(gaffer_connector.GafferHttpError) as cm:
+                gc.execute_operation(g.GetAllElements())
+            self.assertEqual(500, cm.exception.code)
+            self.assertEqual(1, len(server.requests))
+        self.assertEqual(1, policy.get_metrics().get_metric('failures'))
+
+    def test_connection_errors_are_retried(self):
+        policy = retry_policy(max_retries=2)
+        gc = gaffer_connector.GafferConnector('http://127.0.0.1:1/rest',
+                                              retry_policy=policy)
+        self.assertRaises(OSError, gc.execute_operation, g.GetAllElements())
+        self.assertEqual(2, len(policy.delays))
+
+    def test_jitter(self):
+        policy = gaffer_retry.RetryPolicy(backoff=1, max_backoff=10)
+        for attempt in range(6):
+            self.assertTrue(0 <= policy.delay(attempt) <=
+                            min(2 ** attempt, 10))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(120, gaffer_retry.parse_retry_after('120'))
+        self.assertIsNone(gaffer_retry.parse_retry_after(None))
+        self.assertIsNone(gaffer_retry.parse_retry_after('soon'))
+        date = email.utils.formatdate(time.time() + 60, usegmt=True)
+        self.assertTrue(55 < gaffer_retry.parse_retry_after(date) <= 60)
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def test_circuit_opens_and_closes(self):
+        breaker = gaffer_retry.CircuitBreaker(failure_threshold=2,
+                                              reset_timeout=10)
+        breaker._clock = clock = FakeClock()
+        breaker.record_failure('a')
+        self.assertEqual(breaker.CLOSED, breaker.state('a'))
+        breaker.record_failure('a', retry_after=20)
+        self.assertEqual(breaker.OPEN, breaker.state('a'))
+        self.assertEqual(breaker.CLOSED, breaker.state('b'))
+        self.assertRaises(gaffer_retry.CircuitOpenError,
+                          breaker.before_call, 'a')
+
+        clock.now = 20
+        self.assertEqual(breaker.HALF_OPEN, breaker.state('a'))
+        breaker.before_call('a')
+        # Only one trial request is let through
+        self.assertRaises(gaffer_retry.CircuitOpenError,
+                          breaker.before_call, 'a')
+        breaker.record_failure('a')
+        self.assertEqual(breaker.OPEN, breaker.state('a'))
+
+        clock.now = 30
+        breaker.before_call('a')
+        breaker.record_success('a')
+        self.assertEqual(breaker.CLOSED, breaker.state('a'))
+        self.assertEqual(2, breaker.rejections)
+
+    def test_open_circuit_fails_fast(self):
+        breaker = gaffer_retry.CircuitBreaker(failure_threshold=2)
+        policy = retry_policy(max_retries=5, circuit_breaker=breaker)
+        with GafferStubServer({
+            ('POST', '/graph/operations/execute'): FailingRoute(10)
+        }) as server:
+            gc = gaffer_connector.GafferConnector(server.host,
+                                                  retry_policy=policy)
+            # The second failure opens the circuit and is not retried
+            self.assertRaises(gaffer_connector.GafferHttpError,
+                              gc.execute_operation, g.GetAllElements())
+            for i in range(2):
+                self.assertRaises(gaffer_retry.CircuitOpenError,
+                                  gc.execute_operation, g.GetAllElements())
+            self.assertEqual(2, len(server.requests))
+        metrics = policy.get_metrics()
+        self.assertEqual(1, metrics.get_metric('retries'))
+        self.assertEqual(1, metrics.get_metric('failures'))
+        self.assertEqual(2, metrics.get_metric('rejections'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import unittest
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_compact
+from gafferpy import gaffer_connector
+from gafferpy import gaffer_seed_index
+from test.gaffer_stub_server import GafferStubServer
+
+
+def get_elements(body, headers):
+    operation = json.loads(body)
+    if 'operations' in operation:
+        operation = operation['operations'][0]
+    results = []
+    for seed in operation['input']:
+        vertex = seed['vertex']
+        results.append({'class': g.Entity.CLASS, 'group': 'Cardinality',
+                        'vertex': vertex})
+        results.append({'class': g.Edge.CLASS, 'group': 'RoadUse',
+                        'source': 'M1', 'destination': vertex,
+                        'directed': True, 'matchedVertex': 'DESTINATION'})
+    return results
+
+
+ROUTES = {('POST', '/graph/operations/execute'): get_elements}
+
+
+class SeedIndexTest(unittest.TestCase):
+    def test_entity_seeds(self):
+        entity = g.Entity('Cardinality', 'M5')
+        outgoing = g.Edge('RoadUse', 'M5', 'M4', True, None, 'SOURCE')
+        incoming = g.Edge('RoadUse', 'M4', 'M5', True, None, 'DESTINATION')
+        unmatched = g.Edge('RoadUse', 'M5', 'M4', True)
+        index = gaffer_seed_index.index_results(
+            [g.EntitySeed('M5'), g.EntitySeed('M4'), g.EntitySeed('M3')],
+            [entity, outgoing, incoming, unmatched])
+
+        self.assertEqual([entity, outgoing, incoming, unmatched],
+                         index[g.EntitySeed('M5')])
+        self.assertEqual([unmatched], index['M4'])
+        self.assertEqual([], index[gaffer_compact.CompactEntitySeed('M3')])
+        self.assertEqual([g.EntitySeed('M5'), g.EntitySeed('M4'),
+                          g.EntitySeed('M3')], list(index))
+        self.assertRaises(KeyError, index.__getitem__, 'M1')
+
+    def test_edge_seeds(self):
+        directed = g.Edge('RoadUse', 'M5', 'M4', True)
+        undirected = g.Edge('RoadUse', 'M4', 'M5', False)
+        entity = g.Entity('Cardinality', 'M4')
+        index = gaffer_seed_index.SeedIndex(
+            [g.EdgeSeed('M5', 'M4', g.DirectedType.EITHER),
+             g.EntitySeed('M4')])
+        index.extend(iter([directed, undirected, entity]))
+
+        self.assertEqual([directed, undirected, entity],
+                         index[g.EdgeSeed('M5', 'M4', True)])
+        self.assertEqual([directed, undirected, entity], index['M4'])
+
+    def test_adjacent_ids(self):
+        index = gaffer_seed_index.index_results(
+            ['M5', 'M4'],
+            [g.Entity('Cardinality', 'M5'),
+             g.Edge('RoadUse', 'M5', 'M3', True, None, 'SOURCE'),
+             g.Edge('RoadUse', 'M2', 'M5', True, None, 'DESTINATION'),
+             g.Edge('RoadUse', 'M5', 'M4', False)],
+            adjacent_ids=True)
+
+        self.assertEqual([g.EntitySeed('M3'), g.EntitySeed('M2'),
+                          g.EntitySeed('M4')], index['M5'])
+        self.assertEqual([g.EntitySeed('M5')], index['M4'])
+
+    def test_json_vertices(self):
+        vertex = {'type': 't', 'value': 'v'}
+        entity = g.Entity('Cardinality', {'value': 'v', 'type': 't'})
+        index = gaffer_seed_index.index_results([g.EntitySeed(vertex)],
+                                                [entity])
+        self.assertEqual([entity], index[vertex])
+
+    def test_connector_execute_indexed(self):
+        with GafferStubServer(ROUTES) as server:
+            gc = gaffer_connector.GafferConnector(server.host)
+            seeds = [g.EntitySeed('M' + str(i)) for i in range(5)]
+            for batch_size in (None, 2):
+                index = gc.execute_indexed(g.GetElements(input=seeds),
+                                           batch_size=batch_size)
+                self.assertEqual(seeds, list(index))
+                self.assertEqual(
+                    [g.Entity('Cardinality', 'M3'),
+                     g.Edge('RoadUse', 'M1', 'M3', True, None,
+                            'DESTINATION')],
+                    index['M3'])
+
+            index = gc.execute_indexed(g.GetAdjacentIds(input=seeds))
+            self.assertEqual([g.EntitySeed('M1')], index['M3'])
+            self.assertEqual(
+                g.GetElements.CLASS,
+                json.loads(server.requests[-1][2])['operations'][0]['class'])
+            self.assertEqual(5, server.request_count())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import unittest
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_connector
+from gafferpy import gaffer_traversal
+from test.gaffer_stub_server import GafferStubServer
+
+GRAPH = {
+    'A': ['B', 'C'],
+    'B': ['D'],
+    'C': ['D'],
+    'D': ['E', 'A']
+}
+
+
+def get_outgoing_edges(body, headers):
+    operation = json.loads(body)
+    if 'operations' in operation:
+        operation = operation['operations'][0]
+    results = []
+    for seed in operation['input']:
+        vertex = seed['vertex']
+        results.append({'class': g.Entity.CLASS, 'group': 'Junction',
+                        'vertex': vertex})
+        for destination in GRAPH.get(vertex, []):
+            results.append({'class': g.Edge.CLASS, 'group': 'Road',
+                            'source': vertex, 'destination': destination,
+                            'directed': True, 'matchedVertex': 'SOURCE'})
+    return results
+
+
+ROUTES = {('POST', '/graph/operations/execute'): get_outgoing_edges}
+
+HOP = g.GetElements(view=g.View(edges=[g.ElementDefinition('Road')]),
+                    include_incoming_out_going='OUTGOING')
+
+
+def paths(walks):
+    return sorted(''.join(walk.vertices) for walk in walks)
+
+
+class GafferTraversalTest(unittest.TestCase):
+    def test_walks(self):
+        with GafferStubServer(ROUTES) as server:
+            gc = gaffer_connector.GafferConnector(server.host)
+            traversal = gaffer_traversal.Traversal(gc, [HOP, HOP])
+            walks = traversal.walks([g.EntitySeed('A')])
+
+        self.assertEqual(['ABD', 'ACD'], paths(walks))
+        walk = [walk for walk in walks if walk.vertices[1] == 'B'][0]
+        self.assertEqual(2, len(walk))
+        self.assertEqual(('A', 'B'), (walk.edges[0].source,
+                                      walk.edges[0].destination))
+        self.assertEqual(('B', 'D'), (walk.edges[1].source,
+                                      walk.edges[1].destination))
+
+    def test_frontier_is_deduplicated_within_and_across_hops(self):
+        with GafferStubServer(ROUTES) as server:
+            gc = gaffer_connector.GafferConnector(server.host)
+            traversal = gaffer_traversal.Traversal(gc, [HOP] * 4)
+            walks = traversal.walks(['A', 'A'])
+            num_requests = len(server.requests)
+
+        self.assertEqual(['ABDAB', 'ABDAC', 'ACDAB', 'ACDAC'], paths(walks))
+        # A, then B and C, then D once for both walks, then E. A is not
+        # queried again at the fourth hop.
+        self.assertEqual(4, num_requests)
+        metrics = traversal.get_metrics()
+        self.assertEqual(4, metrics.get_metric('requests'))
+        self.assertEqual(5, metrics.get_metric('seeds_queried'))
+        self.assertEqual(1, metrics.get_metric('seeds_reused'))
+
+    def test_partial_walks_and_results_limit(self):
+        with GafferStubServer(ROUTES) as server:
+            gc = gaffer_connector.GafferConnector(server.host)
+            traversal = gaffer_traversal.Traversal(gc, [HOP] * 4)
+
+            self.assertEqual(['ABDAB', 'ABDAC', 'ABDE', 'ACDAB', 'ACDAC',
+                              'ACDE'],
+                             paths(traversal.walks('A', partial=True)))
+            self.assertEqual(3, len(traversal.walks('A', results_limit=3)))
+
+    def test_max_fan_out(self):
+        with GafferStubServer(ROUTES) as server:
+            gc = gaffer_connector.GafferConnector(server.host)
+            traversal = gaffer_traversal.Traversal(gc, [HOP, HOP],
+                                                   max_fan_out=1)
+
+            self.assertEqual(['ABD'], paths(traversal.walks('A')))
+
+    def test_seed_batches(self):
+        with GafferStubServer(ROUTES) as server:
+            gc = gaffer_connector.GafferConnector(server.host)
+            traversal = gaffer_traversal.Traversal(gc, [HOP], batch_size=2,
+                                                   max_workers=2)
+            walks = traversal.walks(['A', 'B', 'C', 'D'])
+            num_requests = len(server.requests)
+
+        self.assertEqual(['AB', 'AC', 'BD', 'CD', 'DA', 'DE'], paths(walks))
+        self.assertEqual(2, num_requests)
+
+    def test_hops_must_be_get_elements(self):
+        self.assertRaises(TypeError, gaffer_traversal.Traversal, None,
+                          [g.GetAdjacentIds()])
+        self.assertRaises(ValueError, gaffer_traversal.Traversal, None, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
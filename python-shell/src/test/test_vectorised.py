@@ -0,0 +1,159 @@
+#
+# Copyright 2019 Crown Copyright
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import unittest
+
+from gafferpy import gaffer as g
+from gafferpy import gaffer_element_batch
+from gafferpy import gaffer_local
+from gafferpy import gaffer_vectorised
+
+
+@unittest.skipIf(gaffer_vectorised.numpy is None, 'NumPy is not installed')
+class GafferVectorisedTest(unittest.TestCase):
+    elements = [
+        g.Entity('junction', 'j1', {'count': {'java.lang.Long': 4},
+                                    'name': 'J1'}),
+        g.Edge('road', 'j1', 'j2', True,
+               {'count': {'java.lang.Long': 2}, 'name': 'M4',
+                'time': {'java.util.Date': 1546300800000}},
+               matched_vertex='SOURCE'),
+        g.Edge('road', 'j2', 'j3', False, {'name': 'M32'},
+               matched_vertex='DESTINATION'),
+        g.Entity('junction', 'j3', {}),
+        g.Edge('rail', 'j3', 'j1', True,
+               {'count': {'java.lang.Long': 9}, 'name': 'GWR',
+                'time': {'java.util.Date': 1546387200000},
+                'mixed': 'a'}),
+        g.Entity('junction', 'j4', {'count': {'java.lang.Long': 6},
+                                    'mixed': 1})
+    ]
+
+    def setUp(self):
+        self.batch = gaffer_element_batch.ElementBatch.from_elements(
+            self.elements)
+
+    def assert_matches_row_wise(self, contexts):
+        expected = [gaffer_local.compile_element_filter(contexts)(element)
+                    for element in self.elements]
+        mask = gaffer_vectorised.predicate_mask(self.batch, contexts)
+        self.assertEqual(expected, mask.tolist(),
+                         [context.to_json() for context in contexts])
+
+    def test_predicates_match_row_wise_evaluation(self):
+        cases = [
+            ('count', g.IsMoreThan(4)),
+            ('count', g.IsMoreThan(4, or_equal_to=True)),
+            ('count', g.IsLessThan({'java.lang.Long': 5})),
+            ('count', g.InRange(start=2, end=6)),
+            ('count', g.InRange(start=2, end=6, start_inclusive=False,
+                                end_inclusive=True)),
+            ('count', g.IsIn([2, 9])),
+            ('count', g.IsIn([4, '9'])),
+            ('count', g.IsIn(['4', '9'])),
+            ('name', g.IsIn([4])),
+            ('mixed', g.IsIn([1, 'a'])),
+            ('mixed', g.IsIn(['1'])),
+            ('count', g.IsEqual(4)),
+            ('count', g.Not(g.IsMoreThan(4))),
+            ('count', g.And(predicates=[g.IsMoreThan(1),
+                                        g.IsLessThan(7)])),
+            ('count', g.Or(predicates=[g.IsLessThan(3), g.IsMoreThan(8)])),
+            ('count', g.Exists()),
+            ('name', g.Regex('M[0-9]+')),
+            ('name', g.IsIn(['J1', 'GWR'])),
+            ('name', g.IsMoreThan('J')),
+            ('time', g.InDateRange(start='2019/01/01', end='2019/01/02')),
+            ('GROUP', g.IsEqual('road')),
+            ('SOURCE', g.IsEqual('j1')),
+            ('VERTEX', g.IsIn(['j1', 'j4'])),
+            ('MATCHED_VERTEX', g.IsEqual('j3')),
+            ('DIRECTED', g.IsTrue()),
+            ('DIRECTED', g.IsFalse()),
+            ('name', g.IsTrue()),
+            ('DIRECTED', g.IsEqual(False)),
+            ('mixed', g.IsEqual(1)),
+            ('missing', g.Not(g.Exists())),
+            # Not vectorised, evaluated row by row
+            ('name', g.StringContains('m', ignore_case=True))
+        ]
+        for name, predicate in cases:
+            self.assert_matches_row_wise([g.PredicateContext(
+                selection=[name], predicate=predicate)])
+
+    def test_multiple_selections_are_evaluated_row_wise(self):
+        self.assert_matches_row_wise([
+            g.PredicateContext(selection=['SOURCE', 'DESTINATION'],
+                               predicate=g.AreEqual()),
+            g.PredicateContext(selection=['count'],
+                               predicate=g.IsMoreThan(1))
+        ])
+        self.assert_matches_row_wise([
+            g.PredicateContext(selection=['count', 'name'],
+                               predicate=g.NestedPredicate(
+                                   selection=[1],
+                                   predicate=g.IsEqual('M4')))
+        ])
+
+    def test_incomparable_values_raise_type_error(self):
+        # The vectorised comparison fails and so does the row wise one
+        contexts = [g.PredicateContext(selection=['mixed'],
+                                       predicate=g.IsMoreThan(0))]
+        self.assertRaises(TypeError, gaffer_vectorised.predicate_mask,
+                          self.batch, contexts)
+
+    def test_unsupported_predicate(self):
+        self.assertRaises(ValueError,
+                          gaffer_vectorised.compile_column_predicate,
+                          g.IsXLessThanY())
+
+    def test_filter_matches_local_filter(self):
+        operation = g.Filter(
+            entities=[g.ElementFilterDefinition(
+                group='junction',
+                predicates=[g.PredicateContext(
+                    selection=['count'], predicate=g.IsMoreThan(4))])],
+            edges=[g.ElementFilterDefinition(
+                group='road',
+                predicates=[g.PredicateContext(
+                    selection=['name'], predicate=g.Regex('M.*'))])],
+            global_edges=g.GlobalElementFilterDefinition(
+                predicates=[g.PredicateContext(
+                    selection=['DIRECTED'], predicate=g.IsTrue())]))
+
+        expected = gaffer_local.execute(operation, self.elements)
+        filtered = gaffer_vectorised.filter_batch(self.batch, operation)
+
+        self.assertEqual([element.to_json() for element in expected],
+                         [element.to_json() for element in filtered])
+        self.assertEqual([False, True, False, False, False, True],
+                         gaffer_vectorised.filter_mask(
+                             self.batch, operation).tolist())
+
+    def test_columns_are_shared(self):
+        columns = gaffer_vectorised.BatchColumns(self.batch)
+        contexts = [g.PredicateContext(selection=['count'],
+                                       predicate=g.IsMoreThan(4))]
+        gaffer_vectorised.predicate_mask(columns, contexts)
+        column = columns.column('count')
+        gaffer_vectorised.predicate_mask(columns, contexts)
+
+        self.assertIs(column, columns.column('count'))
+        self.assertEqual([4, 2, 9, 6], column.values.tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()